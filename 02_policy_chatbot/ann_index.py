@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, Dict, Optional
+
+from lazy_import import lazy_import
+
+# faiss/numpy는 인덱스를 만들거나 읽을 때 로드 (index_config만 쓰는 챗봇 생성은 가볍게 유지)
+faiss = lazy_import("faiss")
+np = lazy_import("numpy")
+
+# 지원하는 인덱스 종류
+#   flat     - IndexFlatIP, 전수 내적 (정확, 기본값)
+#   hnsw     - IndexHNSWFlat, 그래프 탐색 (efSearch로 속도/정확도 조절, 학습 불필요)
+#   ivf_flat - IndexIVFFlat, 클러스터 nprobe개만 탐색 (코퍼스로 학습)
+#   ivf_pq   - IndexIVFPQ, IVF + 곱 양자화로 메모리 절감 (코퍼스로 학습, 후보를 원본 임베딩으로 다시 채점)
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+
+# 인덱스 종류별 기본 설정
+INDEX_DEFAULTS = {
+    "hnsw_m": 32,             # HNSW 노드당 연결 수
+    "ef_construction": 200,   # HNSW 구축 시 탐색 폭
+    "ef_search": 64,          # HNSW 검색 시 탐색 폭 (요청별로 변경 가능)
+    "nlist": None,            # IVF 클러스터 수 (None이면 4 * sqrt(n))
+    "nprobe": 16,             # IVF 검색 시 탐색할 클러스터 수 (요청별로 변경 가능)
+    "pq_m": None,             # PQ 부분 벡터 수 (None이면 차원/8 이하의 약수)
+    "pq_nbits": 8,            # PQ 부분 벡터당 비트 수
+    "pq_refine": 4,           # PQ 검색 시 k * pq_refine개 후보를 가져와 정확한 내적으로 다시 정렬
+}
+
+# k-means 학습 시 클러스터당 최소 학습 벡터 수 (faiss 권장값)
+_MIN_POINTS_PER_CENTROID = 39
+
+
+def index_config(index_type: str = "flat", **options) -> Dict:
+    """인덱스 종류와 옵션을 기본값과 합친 설정 (번들 manifest에 저장)"""
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"지원하지 않는 인덱스 종류: {index_type} (가능: {', '.join(INDEX_TYPES)})")
+    unknown = set(options) - set(INDEX_DEFAULTS)
+    if unknown:
+        raise ValueError(f"알 수 없는 인덱스 옵션: {', '.join(sorted(unknown))}")
+    config = dict(INDEX_DEFAULTS, **{k: v for k, v in options.items() if v is not None})
+    config["index_type"] = index_type
+    return config
+
+
+def _default_nlist(n: int) -> int:
+    nlist = int(4 * math.sqrt(n))
+    return max(1, min(nlist, n // _MIN_POINTS_PER_CENTROID))
+
+
+def _default_pq_m(dimension: int) -> int:
+    # 부분 벡터당 8차원 이상이 되는 가장 큰 약수
+    for m in range(max(1, dimension // 8), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+def build_index(embeddings: np.ndarray, ids: np.ndarray, config: Optional[Dict] = None):
+    """
+    정책 ID를 붙인 FAISS 인덱스 생성 (IVF 계열은 코퍼스 임베딩으로 학습)
+
+    Args:
+        embeddings: L2 정규화된 float32 임베딩 (n, d)
+        ids: 정책 ID (int64, n개)
+        config: index_config() 결과 (None이면 flat)
+
+    Returns:
+        정책 ID로 검색/삭제하는 인덱스 (내적 = 코사인 유사도)
+        - flat/hnsw: IndexIDMap2로 감쌈
+        - IVF 계열: 역리스트에 ID를 직접 저장 (IndexIDMap은 삭제 후 내부 번호가 당겨진다고 가정하지만
+          IVF는 번호를 당기지 않아, 감싸면 삭제 이후 ID가 다른 벡터를 가리킴)
+    """
+    config = config or index_config()
+    embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+    n, dimension = embeddings.shape
+    index_type = config["index_type"]
+
+    if index_type == "hnsw":
+        base = faiss.IndexHNSWFlat(dimension, config["hnsw_m"], faiss.METRIC_INNER_PRODUCT)
+        base.hnsw.efConstruction = config["ef_construction"]
+        base.hnsw.efSearch = config["ef_search"]
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        nlist = config["nlist"] or _default_nlist(n)
+        quantizer = faiss.IndexFlatIP(dimension)
+        if index_type == "ivf_flat":
+            base = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            pq_m = config["pq_m"] or _default_pq_m(dimension)
+            # 코퍼스가 작으면 코드북 크기(2^nbits)를 학습 데이터에 맞게 줄임
+            nbits = min(config["pq_nbits"], max(1, int(math.log2(max(2, n // _MIN_POINTS_PER_CENTROID)))))
+            base = faiss.IndexIVFPQ(quantizer, dimension, nlist, pq_m, nbits, faiss.METRIC_INNER_PRODUCT)
+        base.train(embeddings)
+        base.nprobe = min(config["nprobe"], nlist)
+    else:
+        base = faiss.IndexFlatIP(dimension)  # Inner Product (cosine similarity)
+
+    index = base if isinstance(base, faiss.IndexIVF) else faiss.IndexIDMap2(base)
+    if n:
+        index.add_with_ids(embeddings, np.asarray(ids, dtype='int64'))
+    return index
+
+
+def read_index(path: str, mmap: bool = False):
+    """
+    저장된 FAISS 인덱스 로드
+
+    mmap이면 읽기 전용 메모리 매핑으로 읽어 같은 파일을 연 프로세스들이 페이지를 공유합니다.
+    IVF 계열의 역리스트는 매핑되지 않고 프로세스마다 메모리로 읽힙니다 (shares_mmap_pages 참고).
+    """
+    if not mmap:
+        return faiss.read_index(path)
+    # 인덱스 코드 영역을 메모리 매핑으로 읽는 플래그 (지원하지 않는 faiss 버전이면 일반 mmap)
+    flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+    return faiss.read_index(path, flags)
+
+
+def shares_mmap_pages(index_type: str) -> bool:
+    """메모리 매핑 로드 시 인덱스 본체를 프로세스 간에 공유하는지 여부 (IVF 역리스트는 복사됨)"""
+    return not index_type.startswith("ivf")
+
+
+def base_index(index):
+    """IndexIDMap으로 감싼 실제 인덱스"""
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def supports_remove(index) -> bool:
+    """
+    remove_ids 지원 여부 (HNSW는 삭제를 지원하지 않고, 이전 버전이 IndexIDMap으로 감싼 IVF는
+    삭제하면 ID 매핑이 어긋나므로 재구축 필요)
+    """
+    base = base_index(index)
+    if isinstance(base, faiss.IndexHNSW):
+        return False
+    return base is index or not isinstance(base, faiss.IndexIVF)
+
+
+def index_nbytes(index) -> int:
+    """인덱스 메모리 사용량 추정(바이트): 벡터 코드 + ID 매핑 + HNSW 그래프/IVF 클러스터 중심"""
+    base = base_index(index)
+    n = index.ntotal
+    nbytes = n * 8 if base is not index else 0
+    if isinstance(base, faiss.IndexHNSW):
+        nbytes += base.hnsw.neighbors.size() * 4 + index_nbytes(faiss.downcast_index(base.storage))
+    elif isinstance(base, faiss.IndexIVF):
+        nbytes += n * (base.code_size + 8) + base.nlist * base.d * 4
+    else:
+        nbytes += n * getattr(base, "code_size", base.d * 4)
+    return int(nbytes)
+
+
+def search_params(index, ef_search: Optional[int] = None, nprobe: Optional[int] = None):
+    """요청별 efSearch/nprobe 검색 파라미터 (해당 없는 인덱스이거나 미지정이면 None)"""
+    base = base_index(index)
+    if ef_search and isinstance(base, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=int(ef_search))
+    if nprobe and isinstance(base, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(nprobe=int(min(nprobe, base.nlist)))
+    return None
+
+
+def search(index, queries: np.ndarray, k: int, ef_search: Optional[int] = None, nprobe: Optional[int] = None):
+    """요청별 파라미터를 적용한 인덱스 검색 (유사도, ID)"""
+    params = search_params(index, ef_search, nprobe)
+    if params is None:
+        return index.search(queries, k)
+    return index.search(queries, k, params=params)
+
+
+def approximate_scores(index) -> bool:
+    """인덱스가 돌려주는 유사도가 근사값인지 (PQ 코드로 계산한 내적)"""
+    return isinstance(base_index(index), faiss.IndexIVFPQ)
+
+
+def search_rows(index, queries: np.ndarray, k: int, embeddings: np.ndarray, rows_for: Callable[[np.ndarray], np.ndarray],
+                refine: Optional[int] = None, ef_search: Optional[int] = None, nprobe: Optional[int] = None):
+    """
+    인덱스 검색 결과를 embeddings 행 번호로 변환 (ivf_pq는 후보를 원본 임베딩과의 정확한 내적으로 다시 정렬)
+
+    PQ 근사 내적은 순위가 크게 흔들리고 임계값 비교에도 쓸 수 없으므로, k * refine개 후보를 가져와
+    정확한 내적으로 다시 채점한 상위 k개를 돌려줍니다. 다른 인덱스는 점수가 정확하므로 변환만 합니다.
+
+    Args:
+        index: 검색할 인덱스
+        queries: L2 정규화된 쿼리 임베딩 (q, d)
+        k: 쿼리별 결과 수
+        embeddings: 인덱스에 넣은 원본 임베딩 (행 번호 기준)
+        rows_for: 인덱스 ID 배열 -> embeddings 행 번호 배열 (없는 ID는 -1)
+        refine: ivf_pq 후보 배수 (None이면 INDEX_DEFAULTS["pq_refine"])
+        ef_search, nprobe: 요청별 검색 파라미터
+
+    Returns:
+        (유사도 (q, k), 행 번호 (q, k) - 부족하면 -1)
+    """
+    queries = np.ascontiguousarray(queries, dtype='float32')
+    if not approximate_scores(index):
+        scores, ids = search(index, queries, k, ef_search=ef_search, nprobe=nprobe)
+        return scores, rows_for(ids.ravel()).reshape(ids.shape)
+
+    refine = max(1, int(refine or INDEX_DEFAULTS["pq_refine"]))
+    fetch_k = max(k, min(k * refine, index.ntotal))
+    _, ids = search(index, queries, fetch_k, ef_search=ef_search, nprobe=nprobe)
+    rows = rows_for(ids.ravel()).reshape(ids.shape)
+    valid = rows >= 0
+    vectors = np.asarray(embeddings[np.where(valid, rows, 0).ravel()], dtype='float32')
+    scores = np.einsum('qkd,qd->qk', vectors.reshape(len(queries), fetch_k, -1), queries)
+    scores[~valid] = -np.inf
+    order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+
+def recall_at_k(index, embeddings: np.ndarray, ids: np.ndarray, queries: np.ndarray, k: int = 10,
+                ef_search: Optional[int] = None, nprobe: Optional[int] = None, refine: Optional[int] = None) -> Dict:
+    """
+    전수 내적(flat) 결과 대비 근사 인덱스의 recall@k 및 쿼리당 평균 지연 시간
+
+    Args:
+        index: 평가할 인덱스
+        embeddings: 인덱스에 들어 있는 임베딩 (n, d)
+        ids: embeddings 행별 정책 ID
+        queries: L2 정규화된 쿼리 임베딩 (q, d)
+        k: 비교할 상위 결과 수
+        ef_search, nprobe: 요청별 검색 파라미터
+        refine: ivf_pq 후보 배수 (검색과 같은 방식으로 다시 정렬한 결과를 평가)
+
+    Returns:
+        recall, 인덱스/flat 쿼리당 평균 지연 시간(ms) 등
+    """
+    queries = np.ascontiguousarray(queries, dtype='float32')
+    ids = np.asarray(ids, dtype='int64')
+    k = min(k, len(ids))
+
+    # 인덱스 ID -> embeddings 행 번호
+    sorter = np.argsort(ids, kind='stable')
+
+    def rows_for(found_ids):
+        positions = np.minimum(np.searchsorted(ids, found_ids, sorter=sorter), len(ids) - 1)
+        rows = sorter[positions]
+        return np.where(ids[rows] == found_ids, rows, -1)
+
+    start = time.perf_counter()
+    _, found = search_rows(index, queries, k, embeddings, rows_for, refine=refine, ef_search=ef_search, nprobe=nprobe)
+    index_ms = (time.perf_counter() - start) * 1000.0 / len(queries)
+
+    start = time.perf_counter()
+    scores = queries @ np.asarray(embeddings).T
+    exact = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    flat_ms = (time.perf_counter() - start) * 1000.0 / len(queries)
+
+    hits = sum(len(np.intersect1d(found[i][found[i] >= 0], exact[i])) for i in range(len(queries)))
+    return {
+        "index_type": type(base_index(index)).__name__,
+        "k": k,
+        "queries": len(queries),
+        "recall": hits / float(k * len(queries)),
+        "index_ms": index_ms,
+        "flat_ms": flat_ms,
+        "ef_search": ef_search,
+        "nprobe": nprobe,
+    }
@@ -1,6 +1,6 @@
 import requests
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import time
 
 class PolicyChatbotAPI:
@@ -28,8 +28,14 @@ class PolicyChatbotAPI:
                        field_filter: Optional[str] = None,
                        region_weight: float = 0.3,
                        target_weight: float = 0.2,
-                       field_weight: float = 0.2) -> Dict[str, Any]:
-        """정책 검색 (POST 요청)"""
+                       field_weight: float = 0.2,
+                       ef_search: Optional[int] = None,
+                       nprobe: Optional[int] = None,
+                       hybrid: Optional[bool] = None,
+                       rerank: Optional[bool] = None,
+                       fields: Optional[List[str]] = None,
+                       snippet_length: Optional[int] = None) -> Dict[str, Any]:
+        """정책 검색 (POST 요청, fields/snippet_length로 응답 크기 줄이기)"""
         try:
             payload = {
                 "query": query,
@@ -42,6 +48,18 @@ class PolicyChatbotAPI:
                 "target_weight": target_weight,
                 "field_weight": field_weight
             }
+            if ef_search:
+                payload["ef_search"] = ef_search
+            if nprobe:
+                payload["nprobe"] = nprobe
+            if hybrid is not None:
+                payload["hybrid"] = hybrid
+            if rerank is not None:
+                payload["rerank"] = rerank
+            if fields:
+                payload["fields"] = fields
+            if snippet_length:
+                payload["snippet_length"] = snippet_length
             
             response = self.session.post(f"{self.base_url}/search", json=payload)
             response.raise_for_status()
@@ -49,10 +67,22 @@ class PolicyChatbotAPI:
         except requests.exceptions.RequestException as e:
             return {"error": str(e)}
     
+    def search_policies_batch(self, searches: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """배치 정책 검색 (각 항목은 search_policies와 같은 필드의 딕셔너리)"""
+        try:
+            payload = {"searches": searches}
+            response = self.session.post(f"{self.base_url}/search/batch", json=payload)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+    
     def simple_search(self, 
                      query: str,
                      top_k: int = 5,
-                     region: Optional[str] = None) -> Dict[str, Any]:
+                     region: Optional[str] = None,
+                     fields: Optional[List[str]] = None,
+                     snippet_length: Optional[int] = None) -> Dict[str, Any]:
         """간단한 정책 검색 (GET 요청)"""
         try:
             params = {
@@ -61,6 +91,10 @@ class PolicyChatbotAPI:
             }
             if region:
                 params["region"] = region
+            if fields:
+                params["fields"] = ",".join(fields)
+            if snippet_length:
+                params["snippet_length"] = snippet_length
             
             response = self.session.get(f"{self.base_url}/search/simple", params=params)
             response.raise_for_status()
@@ -78,6 +112,62 @@ class PolicyChatbotAPI:
         except requests.exceptions.RequestException as e:
             return {"error": str(e)}
     
+    def upsert_policies(self, policies: List[Dict[str, Any]], admin_token: str) -> Dict[str, Any]:
+        """정책 추가/수정 (관리자)"""
+        try:
+            payload = {"policies": policies}
+            response = self.session.post(f"{self.base_url}/admin/policies/upsert", json=payload,
+                                         headers={"X-Admin-Token": admin_token})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+    
+    def delete_policies(self, policy_ids: List[str], admin_token: str) -> Dict[str, Any]:
+        """정책 삭제 (관리자)"""
+        try:
+            payload = {"policy_ids": policy_ids}
+            response = self.session.post(f"{self.base_url}/admin/policies/delete", json=payload,
+                                         headers={"X-Admin-Token": admin_token})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+    
+    def stream_search(self, query: str, **params) -> Iterator[Dict[str, Any]]:
+        """정책 검색 스트리밍 (/search/stream, 정책 결과를 받는 대로 하나씩 반환)"""
+        payload = {"query": query, **params}
+        for event, data in self._stream_events("/search/stream", payload):
+            if event == "result":
+                yield data
+            elif event == "error":
+                raise RuntimeError(data.get("detail"))
+    
+    def stream_policy_summary(self, query: str) -> Iterator[str]:
+        """정책 요약 스트리밍 (/summary/stream, 요약 텍스트 조각을 받는 대로 반환)"""
+        for event, data in self._stream_events("/summary/stream", {"query": query}):
+            if event == "chunk":
+                yield data["text"]
+            elif event == "error":
+                raise RuntimeError(data.get("detail"))
+    
+    def _stream_events(self, path: str, payload: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """SSE 응답을 (이벤트명, 데이터) 단위로 파싱"""
+        with self.session.post(f"{self.base_url}{path}", json=payload, stream=True) as response:
+            response.raise_for_status()
+            event, data = "message", []
+            for line in response.iter_lines(decode_unicode=True):
+                if line is None:
+                    continue
+                if line == "":
+                    if data:
+                        yield event, json.loads("\n".join(data))
+                    event, data = "message", []
+                elif line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data.append(line[len("data:"):].strip())
+    
     def get_available_regions(self) -> Dict[str, Any]:
         """사용 가능한 지역 목록"""
         try:
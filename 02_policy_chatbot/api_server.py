@@ -1,22 +1,44 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 import uvicorn
+import asyncio
+import orjson
+import os
+import secrets
+import threading
+import time
+import weakref
+import pandas as pd
+from corpus_registry import CorpusRegistry
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY as metrics
 from policy_chatbot import PolicyChatbot
+from search_executor import SearchExecutor, ExecutorSaturatedError, ExecutorTimeoutError
+from query_batcher import QueryBatcher
+from reranker import CrossEncoderReranker
+from result_view import RESULT_FIELDS, project_result, project_results, query_pattern
 import logging
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONResponse(JSONResponse):
+    """orjson으로 직렬화하는 JSON 응답 (표준 json 모듈보다 빠르고 numpy 값도 그대로 직렬화)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="정책 챗봇 API",
     description="정책 검색 및 추천을 위한 AI 챗봇 API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS 설정
@@ -28,9 +50,239 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 전역 챗봇 인스턴스
+# 엔드포인트별 요청 수/오류 수/응답 시간 기록 (스트리밍 응답은 첫 바이트까지의 시간)
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", "unmatched")
+        metrics.observe("api_request_seconds", time.perf_counter() - start, help="API 응답 시간(초)", endpoint=endpoint)
+        metrics.inc("api_requests_total", help="API 요청 수", endpoint=endpoint, method=request.method, status=status)
+        if status >= 500:
+            count_api_error(endpoint)
+
+def count_api_error(endpoint: str):
+    """API 오류 수 (5xx 응답 및 스트리밍 도중 발생한 오류)"""
+    metrics.inc("api_errors_total", help="API 오류 수", endpoint=endpoint)
+
+# 전역 챗봇 인스턴스 (기본 코퍼스)
 chatbot = None
 
+# 코퍼스 레지스트리 (?corpus=로 기본 코퍼스 외 코퍼스 선택, 시작 시 생성)
+corpora: Optional[CorpusRegistry] = None
+
+# 임베딩/검색(CPU 작업)을 이벤트 루프 밖에서 실행할 스레드 풀
+search_executor = SearchExecutor(
+    max_workers=int(os.getenv("POLICY_API_THREADS", "4")),
+    max_queue=int(os.getenv("POLICY_API_MAX_QUEUE", "32")),
+    timeout=float(os.getenv("POLICY_API_TIMEOUT", "30")),
+)
+
+def _search_batch(params_list):
+    return chatbot.search_policies_batch(params_list)
+
+# 동시에 들어온 단일 검색 요청을 모아 한 번의 인코딩/행렬 검색으로 처리 (대기 시간 0이면 사용 안 함)
+query_batcher = QueryBatcher(
+    _search_batch,
+    max_batch_size=int(os.getenv("POLICY_API_BATCH_SIZE", "32")),
+    max_wait_ms=float(os.getenv("POLICY_API_BATCH_WAIT_MS", "5")),
+    runner=search_executor.run,
+)
+
+async def run_search(func, *args, **kwargs):
+    """챗봇 작업을 스레드 풀에서 실행 (대기열 포화 시 503, 타임아웃 시 504)"""
+    return await await_search(search_executor.run(func, *args, **kwargs))
+
+# 기본 코퍼스 외 코퍼스별 요청 병합기 (처음 요청 시 생성)
+corpus_batchers = weakref.WeakKeyDictionary()
+
+def batcher_for(bot: PolicyChatbot) -> QueryBatcher:
+    """챗봇별 요청 병합기 (다른 코퍼스의 요청끼리는 배치로 묶지 않음)"""
+    if bot is chatbot:
+        return query_batcher
+    batcher = corpus_batchers.get(bot)
+    if batcher is None:
+        batcher = corpus_batchers[bot] = QueryBatcher(
+            bot.search_policies_batch,
+            max_batch_size=query_batcher.max_batch_size,
+            max_wait_ms=query_batcher.max_wait * 1000.0,
+            runner=search_executor.run,
+        )
+    return batcher
+
+async def run_single_search(bot: PolicyChatbot, **params):
+    """단일 쿼리 검색 (요청 병합기가 켜져 있으면 다른 동시 요청과 함께 배치로 처리)"""
+    if query_batcher.max_wait > 0:
+        return await await_search(batcher_for(bot).submit(params))
+    return await run_search(bot.search_policies, **params)
+
+def is_default_corpus(corpus: Optional[str]) -> bool:
+    return corpus is None or (corpora is not None and corpus == corpora.default)
+
+async def acquire_chatbot(corpus: Optional[str] = None) -> PolicyChatbot:
+    """
+    요청 코퍼스의 챗봇 (기본 코퍼스는 전역 chatbot, 다른 코퍼스는 처음 요청 시 로드)
+    
+    기본 코퍼스가 아니면 release_chatbot을 호출할 때까지 메모리 예산을 넘어도 해제되지 않습니다.
+    """
+    if is_default_corpus(corpus):
+        if chatbot is None:
+            raise HTTPException(status_code=503, detail="챗봇이 초기화되지 않았습니다.")
+        return chatbot
+    if corpora is None or corpus not in corpora:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 코퍼스입니다: {corpus}")
+    bot = corpora.acquire(corpus, load=False)
+    if bot is None:
+        # 해제되었거나 처음 쓰는 코퍼스: 로드가 오래 걸릴 수 있으므로 검색 스레드 풀/타임아웃과 분리
+        try:
+            bot = await run_admin_task(corpora.acquire, corpus)
+        except Exception as e:
+            logger.error(f"코퍼스 로드 실패 ({corpus}): {e}")
+            raise HTTPException(status_code=503, detail=f"코퍼스를 로드하지 못했습니다: {corpus}")
+    return bot
+
+def release_chatbot(corpus: Optional[str] = None):
+    """acquire_chatbot으로 가져온 코퍼스 사용 종료"""
+    if not is_default_corpus(corpus):
+        corpora.release(corpus)
+
+def mark_corpus_modified(corpus: Optional[str]):
+    """관리자 API로 수정할 코퍼스는 메모리 예산을 넘어도 해제하지 않음 (수정 작업 전에 호출)"""
+    if corpora is not None:
+        corpora.mark_modified(corpus)
+
+def update_corpus_memory(corpus: Optional[str]):
+    """수정 작업 후 코퍼스 메모리 사용량 다시 계산 (/corpora, 메모리 예산에 반영)"""
+    if corpora is not None:
+        corpora.update_memory_usage(corpus)
+
+# 모든 엔드포인트 공통 코퍼스 선택 파라미터
+CORPUS_QUERY = Query(default=None, description="코퍼스 이름 (기본값: 기본 코퍼스, 목록은 /corpora)")
+
+async def await_search(awaitable):
+    """스레드 풀 작업 대기 및 오류 변환"""
+    try:
+        return await awaitable
+    except ExecutorSaturatedError as e:
+        logger.warning(f"검색 요청 거절: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ExecutorTimeoutError as e:
+        logger.warning(f"검색 요청 타임아웃: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
+
+_STREAM_END = object()
+
+class StreamSteps:
+    """
+    작업 스레드에서 한 항목씩 진행하는 동기 생성기
+    
+    타임아웃된 단계는 작업 스레드에서 계속 돌고 있으므로, 닫힌 뒤에는 다시 진행하지 않고
+    진행 중인 단계가 있으면 그 단계가 끝난 뒤 작업 스레드에서 생성기를 닫습니다
+    (같은 생성기를 두 스레드가 동시에 진행하면 "generator already executing" 오류).
+    """
+    
+    def __init__(self, iterator):
+        self._iterator = iterator
+        self._lock = threading.Lock()
+        self._running = False
+        self._closed = False
+    
+    def step(self):
+        """다음 항목 (끝났거나 닫혔으면 _STREAM_END)"""
+        with self._lock:
+            if self._closed:
+                return _STREAM_END
+            self._running = True
+        try:
+            return next(self._iterator, _STREAM_END)
+        finally:
+            with self._lock:
+                self._running = False
+                close_now = self._closed
+            if close_now:
+                self._iterator.close()
+    
+    def close(self):
+        """생성기 닫기 (진행 중인 단계가 있으면 그 단계가 끝날 때 닫힘)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._running:
+                return
+        self._iterator.close()
+
+async def open_stream(iterator):
+    """
+    동기 생성기를 스레드 풀에서 한 항목씩 진행하는 비동기 생성기로 변환
+    
+    첫 항목(인코딩/후보 검색 포함)은 응답을 시작하기 전에 가져오므로, 대기열 포화/타임아웃/검색 오류는
+    스트림이 아니라 일반 HTTP 오류(503/504/500)로 반환됩니다. 타임아웃/오류/연결 종료 후에는
+    생성기를 다시 진행하지 않고 닫습니다.
+    """
+    steps = StreamSteps(iterator)
+    try:
+        first = await run_search(steps.step)
+    except BaseException:
+        steps.close()
+        raise
+    
+    async def stream():
+        try:
+            item = first
+            while item is not _STREAM_END:
+                yield item
+                item = await run_search(steps.step)
+        finally:
+            steps.close()
+    return stream()
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 메시지 형식"""
+    return f"event: {event}\ndata: {orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()}\n\n"
+
+def sse_response(events) -> StreamingResponse:
+    """SSE 스트리밍 응답 (프록시 버퍼링 비활성화)"""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def run_admin_task(func, *args):
+    """정책 갱신 작업 실행 (오래 걸릴 수 있으므로 검색 스레드 풀/타임아웃과 분리)"""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+def check_admin_token(token: Optional[str]):
+    """관리자 토큰 확인 (POLICY_ADMIN_TOKEN이 설정되지 않으면 관리자 API 비활성화)"""
+    admin_token = os.getenv("POLICY_ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="관리자 API가 비활성화되어 있습니다 (POLICY_ADMIN_TOKEN 미설정).")
+    if not token or not secrets.compare_digest(token, admin_token):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+# 검색 결과에서 선택할 수 있는 필드
+ResultField = Literal[RESULT_FIELDS]
+
+# 검색 자체가 아니라 응답 모양만 바꾸는 요청 옵션 (검색 인자/캐시 키에서 제외)
+RESPONSE_OPTIONS = {"fields", "snippet_length"}
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """쉼표로 구분한 필드 목록 파싱 (알 수 없는 필드는 422)"""
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in RESULT_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"알 수 없는 필드: {', '.join(unknown)} (사용 가능: {', '.join(RESULT_FIELDS)})")
+    return fields
+
 # Pydantic 모델들
 class SearchRequest(BaseModel):
     query: str = Field(..., description="검색 쿼리", example="중소기업 기술지원")
@@ -42,19 +294,31 @@ class SearchRequest(BaseModel):
     region_weight: float = Field(default=0.3, ge=0.0, le=1.0, description="지역 가중치")
     target_weight: float = Field(default=0.2, ge=0.0, le=1.0, description="지원대상 가중치")
     field_weight: float = Field(default=0.2, ge=0.0, le=1.0, description="지원분야 가중치")
+    ef_search: Optional[int] = Field(default=None, ge=1, le=4096, description="HNSW 인덱스 탐색 폭 (클수록 정확, 느림)")
+    nprobe: Optional[int] = Field(default=None, ge=1, le=4096, description="IVF 인덱스 탐색 클러스터 수 (클수록 정확, 느림)")
+    hybrid: Optional[bool] = Field(default=None, description="BM25 + dense 하이브리드 검색 여부 (기본값: 서버 설정)")
+    rerank: Optional[bool] = Field(default=None, description="교차 인코더 재순위 여부 (기본값: 서버에 재순위 모델이 설정되어 있으면 사용)")
+    fields: Optional[List[ResultField]] = Field(default=None, description="반환할 결과 필드 (기본값: 전체, similarity_score는 항상 포함)", example=["title", "organization", "period"])
+    snippet_length: Optional[int] = Field(default=None, ge=20, le=2000, description="긴 텍스트 필드(body, application_method, target)를 검색어 주변 스니펫으로 줄일 글자 수 (highlights에 강조 위치 포함)")
+
+    def search_params(self) -> Dict[str, Any]:
+        """PolicyChatbot 검색 인자 (응답 옵션 제외)"""
+        return self.model_dump(exclude=RESPONSE_OPTIONS)
 
 class PolicyResult(BaseModel):
-    title: str = Field(..., description="정책 제목")
-    body: str = Field(..., description="정책 내용")
-    target: str = Field(..., description="지원대상")
-    organization: str = Field(..., description="소관기관")
-    field_major: str = Field(..., description="지원분야(대)")
-    field_minor: str = Field(..., description="지원분야(중)")
-    executing_org: str = Field(..., description="사업수행기관")
-    contact: str = Field(..., description="문의처")
-    period: str = Field(..., description="신청기간")
-    application_method: str = Field(..., description="사업신청방법설명")
+    """검색 결과 항목 (fields를 지정하면 요청한 필드만 포함)"""
+    title: Optional[str] = Field(default=None, description="정책 제목")
+    body: Optional[str] = Field(default=None, description="정책 내용 (스니펫 모드면 검색어 주변 스니펫)")
+    target: Optional[str] = Field(default=None, description="지원대상")
+    organization: Optional[str] = Field(default=None, description="소관기관")
+    field_major: Optional[str] = Field(default=None, description="지원분야(대)")
+    field_minor: Optional[str] = Field(default=None, description="지원분야(중)")
+    executing_org: Optional[str] = Field(default=None, description="사업수행기관")
+    contact: Optional[str] = Field(default=None, description="문의처")
+    period: Optional[str] = Field(default=None, description="신청기간")
+    application_method: Optional[str] = Field(default=None, description="사업신청방법설명")
     similarity_score: float = Field(..., description="유사도 점수")
+    highlights: Optional[Dict[str, List[List[int]]]] = Field(default=None, description="스니펫 모드에서 필드별 검색어 위치 [[시작, 끝), ...]")
 
 class SearchResponse(BaseModel):
     query: str = Field(..., description="검색 쿼리")
@@ -62,6 +326,13 @@ class SearchResponse(BaseModel):
     results: List[PolicyResult] = Field(..., description="검색 결과")
     filters_applied: Dict[str, Any] = Field(..., description="적용된 필터")
 
+class BatchSearchRequest(BaseModel):
+    searches: List[SearchRequest] = Field(..., min_length=1, max_length=100, description="검색 요청 목록 (최대 100개)")
+
+class BatchSearchResponse(BaseModel):
+    total_queries: int = Field(..., description="총 쿼리 수")
+    responses: List[SearchResponse] = Field(..., description="요청 순서대로 정렬된 쿼리별 검색 결과")
+
 class SummaryRequest(BaseModel):
     query: str = Field(..., description="요약할 쿼리", example="중소기업 기술지원")
 
@@ -69,23 +340,113 @@ class SummaryResponse(BaseModel):
     query: str = Field(..., description="요약 쿼리")
     summary: str = Field(..., description="정책 요약")
 
+class PolicyUpsertRequest(BaseModel):
+    policies: List[Dict[str, Any]] = Field(..., min_length=1, description="추가/수정할 정책 목록 (CSV와 같은 컬럼명, 선택적으로 policy_id)")
+
+class PolicyUpsertResponse(BaseModel):
+    inserted: int = Field(..., description="추가된 정책 수")
+    updated: int = Field(..., description="수정된 정책 수")
+    unchanged: int = Field(..., description="변경 없는 정책 수 (재인코딩하지 않음)")
+    total: int = Field(..., description="갱신 후 전체 정책 수")
+
+class PolicyDeleteRequest(BaseModel):
+    policy_ids: List[str] = Field(..., min_length=1, description="삭제할 정책 ID 목록")
+
+class PolicyDeleteResponse(BaseModel):
+    deleted: int = Field(..., description="삭제된 정책 수")
+    not_found: int = Field(..., description="존재하지 않는 정책 ID 수")
+    total: int = Field(..., description="삭제 후 전체 정책 수")
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="서버 상태")
     model_loaded: bool = Field(..., description="모델 로드 상태")
     data_count: int = Field(..., description="데이터 개수")
+    cache: Optional[Dict[str, Any]] = Field(default=None, description="쿼리 임베딩/검색 결과 캐시 통계 (크기, 적중/미적중 횟수)")
+    executor: Optional[Dict[str, Any]] = Field(default=None, description="검색 스레드 풀 상태 (실행/대기 중 작업 수, 거절/타임아웃 횟수)")
+    batcher: Optional[Dict[str, Any]] = Field(default=None, description="요청 병합기 상태 (배치 수, 평균 배치 크기)")
+    corpora: Optional[Dict[str, Any]] = Field(default=None, description="코퍼스별 로드 상태/메모리 사용량 및 메모리 예산")
+    reranker: Optional[Dict[str, Any]] = Field(default=None, description="교차 인코더 재순위 상태 (채점 쌍 수, 시간 예산 초과 횟수, 점수 캐시)")
+
+def build_search_response(request: SearchRequest, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    검색 요청과 결과로 응답 본문 구성
+    
+    결과 항목은 챗봇이 만든 딕셔너리를 (필드 선택/스니펫 적용 후) 그대로 쓰고 Pydantic 검증을 거치지
+    않습니다. 엔드포인트는 이 본문을 ORJSONResponse로 바로 반환합니다 (모양은 SearchResponse와 같음).
+    """
+    # 필터 정보 구성
+    filters_applied = {
+        "region_filter": request.region_filter,
+        "target_filter": request.target_filter,
+        "field_filter": request.field_filter,
+        "similarity_threshold": request.similarity_threshold,
+        "weights": {
+            "region_weight": request.region_weight,
+            "target_weight": request.target_weight,
+            "field_weight": request.field_weight
+        }
+    }
+    
+    return {
+        "query": request.query,
+        "total_results": len(results),
+        "results": project_results(results, request.query, request.fields, request.snippet_length),
+        "filters_applied": filters_applied
+    }
 
 # 앱 시작 시 챗봇 초기화
 @app.on_event("startup")
 async def startup_event():
-    global chatbot
+    global chatbot, corpora
     try:
         logger.info("정책 챗봇 초기화 중...")
-        chatbot = PolicyChatbot()
-        logger.info("정책 챗봇 초기화 완료")
+        # 모든 코퍼스 공통 설정
+        chatbot_kwargs = {}
+        if os.getenv("POLICY_INDEX_TYPE"):
+            chatbot_kwargs["index_type"] = os.getenv("POLICY_INDEX_TYPE")
+        if os.getenv("POLICY_ENCODER_BACKEND"):
+            chatbot_kwargs["encoder_backend"] = os.getenv("POLICY_ENCODER_BACKEND")
+        if os.getenv("POLICY_PASSAGE_SEARCH") == "1":
+            chatbot_kwargs["passage_search"] = True
+        if os.getenv("POLICY_HYBRID_SEARCH") == "1":
+            chatbot_kwargs["hybrid_search"] = True
+        if os.getenv("POLICY_RERANK_MODEL"):
+            # 재순위기는 모든 코퍼스가 공유 (교차 인코더와 점수 캐시를 한 번만 로드)
+            chatbot_kwargs["reranker"] = CrossEncoderReranker(
+                os.getenv("POLICY_RERANK_MODEL"),
+                candidates=int(os.getenv("POLICY_RERANK_CANDIDATES")) if os.getenv("POLICY_RERANK_CANDIDATES") else None,
+                time_budget=float(os.getenv("POLICY_RERANK_BUDGET_MS")) / 1000.0 if os.getenv("POLICY_RERANK_BUDGET_MS") else None,
+            )
+            logger.info(f"교차 인코더 재순위 사용: {os.getenv('POLICY_RERANK_MODEL')}")
+        if os.getenv("POLICY_MEMORY_BUDGET_MB"):
+            chatbot_kwargs["memory_budget"] = int(float(os.getenv("POLICY_MEMORY_BUDGET_MB")) * 1024 * 1024)
+        
+        if os.getenv("POLICY_CORPORA"):
+            # 여러 코퍼스: 설정 파일에 등록된 코퍼스 중 기본 코퍼스만 시작 시 로드
+            logger.info(f"코퍼스 설정 사용: {os.getenv('POLICY_CORPORA')}")
+            corpora = CorpusRegistry.from_config(os.getenv("POLICY_CORPORA"), **chatbot_kwargs)
+        else:
+            corpus_options = {}
+            if os.getenv("POLICY_CSV_PATH"):
+                corpus_options["csv_path"] = os.getenv("POLICY_CSV_PATH")
+            if os.getenv("POLICY_BUNDLE_PATH"):
+                # 공유 인덱스 모드: 부모 프로세스가 만든 번들을 메모리 매핑으로 읽기 전용 공유
+                logger.info(f"공유 인덱스 번들 사용: {os.getenv('POLICY_BUNDLE_PATH')}")
+                corpus_options["bundle_path"] = os.getenv("POLICY_BUNDLE_PATH")
+            corpora = CorpusRegistry(**chatbot_kwargs)
+            corpora.register("default", description="기본 정책 데이터", **corpus_options)
+        
+        # 첫 요청이 데이터/인덱스/모델 로드를 기다리지 않도록 시작 시 미리 로드
+        chatbot = await run_admin_task(corpora.get, corpora.default)
+        logger.info(f"정책 챗봇 초기화 완료 (코퍼스: {', '.join(corpora.names())}, 기본: {corpora.default})")
     except Exception as e:
         logger.error(f"정책 챗봇 초기화 실패: {e}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    search_executor.shutdown()
+
 # 헬스 체크 엔드포인트
 @app.get("/health", response_model=HealthResponse, tags=["시스템"])
 async def health_check():
@@ -101,23 +462,42 @@ async def health_check():
     
     return HealthResponse(
         status="healthy",
-        model_loaded=True,
-        data_count=len(chatbot.data) if chatbot.data is not None else 0
+        model_loaded=chatbot.model_loaded,
+        data_count=len(chatbot.data) if chatbot.is_loaded and chatbot.data is not None else 0,
+        cache=chatbot.cache_stats(),
+        executor=search_executor.stats(),
+        batcher=query_batcher.stats(),
+        corpora=corpora.stats() if corpora is not None else None,
+        reranker=chatbot.reranker.stats() if chatbot.reranker is not None else None
     )
 
+# Prometheus 지표 엔드포인트
+@app.get("/metrics", response_class=PlainTextResponse, tags=["시스템"])
+async def get_metrics():
+    """요청/오류 수, 응답 시간 및 검색 단계별(encode/filter/retrieve/build) 시간 히스토그램, 캐시 적중률, 인덱스 크기"""
+    if chatbot is not None:
+        chatbot.collect_metrics()
+    if corpora is not None:
+        corpora.collect_metrics()
+    executor_stats, batcher_stats = search_executor.stats(), query_batcher.stats()
+    metrics.set("executor_in_flight", executor_stats["in_flight"], help="검색 스레드 풀 실행/대기 중 작업 수")
+    metrics.set("executor_rejected", executor_stats["rejected"], help="대기열 포화로 거절된 검색 수")
+    metrics.set("executor_timed_out", executor_stats["timed_out"], help="타임아웃된 검색 수")
+    metrics.set("batcher_requests", batcher_stats["requests"], help="요청 병합기로 처리한 검색 수")
+    metrics.set("batcher_batches", batcher_stats["batches"], help="요청 병합기 배치 수")
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
 # 정책 검색 엔드포인트
 @app.post("/search", response_model=SearchResponse, tags=["검색"])
-async def search_policies(request: SearchRequest):
+async def search_policies(request: SearchRequest, corpus: Optional[str] = CORPUS_QUERY):
     """정책 검색 API"""
-    global chatbot
-    
-    if chatbot is None:
-        raise HTTPException(status_code=503, detail="챗봇이 초기화되지 않았습니다.")
+    bot = await acquire_chatbot(corpus)
     
     try:
         logger.info(f"검색 요청: {request.query}")
         
-        results = chatbot.search_policies(
+        results = await run_single_search(
+            bot,
             query=request.query,
             top_k=request.top_k,
             similarity_threshold=request.similarity_threshold,
@@ -126,73 +506,163 @@ async def search_policies(request: SearchRequest):
             field_filter=request.field_filter,
             region_weight=request.region_weight,
             target_weight=request.target_weight,
-            field_weight=request.field_weight
+            field_weight=request.field_weight,
+            ef_search=request.ef_search,
+            nprobe=request.nprobe,
+            hybrid=request.hybrid,
+            rerank=request.rerank
         )
         
-        # 필터 정보 구성
-        filters_applied = {
-            "region_filter": request.region_filter,
-            "target_filter": request.target_filter,
-            "field_filter": request.field_filter,
-            "similarity_threshold": request.similarity_threshold,
-            "weights": {
-                "region_weight": request.region_weight,
-                "target_weight": request.target_weight,
-                "field_weight": request.field_weight
-            }
-        }
-        
-        return SearchResponse(
-            query=request.query,
-            total_results=len(results),
-            results=results,
-            filters_applied=filters_applied
-        )
+        return ORJSONResponse(build_search_response(request, results))
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"검색 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"검색 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        release_chatbot(corpus)
+
+# 배치 검색 엔드포인트
+@app.post("/search/batch", response_model=BatchSearchResponse, tags=["검색"])
+async def search_policies_batch(request: BatchSearchRequest, corpus: Optional[str] = CORPUS_QUERY):
+    """여러 쿼리를 한 번의 인코딩/행렬 검색으로 처리하는 배치 검색 API"""
+    bot = await acquire_chatbot(corpus)
+    
+    try:
+        logger.info(f"배치 검색 요청: {len(request.searches)}개 쿼리")
+        
+        all_results = await run_search(bot.search_policies_batch, [search.search_params() for search in request.searches])
+        
+        responses = [
+            build_search_response(search, results)
+            for search, results in zip(request.searches, all_results)
+        ]
+        return ORJSONResponse({
+            "total_queries": len(responses),
+            "responses": responses
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"배치 검색 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"배치 검색 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        release_chatbot(corpus)
 
 # 정책 요약 엔드포인트
 @app.post("/summary", response_model=SummaryResponse, tags=["요약"])
-async def get_policy_summary(request: SummaryRequest):
+async def get_policy_summary(request: SummaryRequest, corpus: Optional[str] = CORPUS_QUERY):
     """정책 요약 API"""
-    global chatbot
-    
-    if chatbot is None:
-        raise HTTPException(status_code=503, detail="챗봇이 초기화되지 않았습니다.")
+    bot = await acquire_chatbot(corpus)
     
     try:
         logger.info(f"요약 요청: {request.query}")
         
-        summary = chatbot.get_policy_summary(request.query)
+        summary = await run_search(bot.get_policy_summary, request.query)
         
         return SummaryResponse(
             query=request.query,
             summary=summary
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"요약 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"요약 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        release_chatbot(corpus)
+
+# 정책 검색 스트리밍 엔드포인트 (SSE)
+@app.post("/search/stream", tags=["검색"])
+async def search_policies_stream(request: SearchRequest, corpus: Optional[str] = CORPUS_QUERY):
+    """정책 검색 스트리밍 API (순위가 정해진 정책부터 result 이벤트로 하나씩 전송)"""
+    bot = await acquire_chatbot(corpus)
+    
+    try:
+        logger.info(f"스트리밍 검색 요청: {request.query}")
+        results = await open_stream(bot.iter_search_policies(**request.search_params()))
+    except HTTPException:
+        release_chatbot(corpus)
+        raise
+    except Exception as e:
+        release_chatbot(corpus)
+        logger.error(f"검색 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"검색 중 오류가 발생했습니다: {str(e)}")
+    
+    pattern = query_pattern(request.query) if request.snippet_length else None
+    
+    async def events():
+        total = 0
+        try:
+            async for result in results:
+                total += 1
+                yield sse_event("result", project_result(result, request.fields, request.snippet_length, pattern))
+            yield sse_event("done", {"query": request.query, "total_results": total})
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"스트리밍 검색 중 오류 발생: {detail}")
+            count_api_error("/search/stream")
+            yield sse_event("error", {"detail": detail})
+        finally:
+            release_chatbot(corpus)
+    
+    return sse_response(events())
+
+# 정책 요약 스트리밍 엔드포인트 (SSE)
+@app.post("/summary/stream", tags=["요약"])
+async def get_policy_summary_stream(request: SummaryRequest, corpus: Optional[str] = CORPUS_QUERY):
+    """정책 요약 스트리밍 API (머리말과 정책 카드를 chunk 이벤트로 하나씩 전송)"""
+    bot = await acquire_chatbot(corpus)
+    
+    try:
+        logger.info(f"스트리밍 요약 요청: {request.query}")
+        chunks = await open_stream(bot.iter_policy_summary(request.query))
+    except HTTPException:
+        release_chatbot(corpus)
+        raise
+    except Exception as e:
+        release_chatbot(corpus)
+        logger.error(f"요약 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"요약 중 오류가 발생했습니다: {str(e)}")
+    
+    async def events():
+        try:
+            async for chunk in chunks:
+                yield sse_event("chunk", {"text": chunk})
+            yield sse_event("done", {"query": request.query})
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"스트리밍 요약 중 오류 발생: {detail}")
+            count_api_error("/summary/stream")
+            yield sse_event("error", {"detail": detail})
+        finally:
+            release_chatbot(corpus)
+    
+    return sse_response(events())
 
 # 간단한 검색 엔드포인트 (GET 요청)
 @app.get("/search/simple", response_model=SearchResponse, tags=["검색"])
 async def simple_search(
     query: str = Query(..., description="검색 쿼리"),
     top_k: int = Query(default=5, ge=1, le=20, description="반환할 결과 수"),
-    region: Optional[str] = Query(default=None, description="지역 필터")
+    region: Optional[str] = Query(default=None, description="지역 필터"),
+    fields: Optional[str] = Query(default=None, description="반환할 결과 필드 (쉼표로 구분, 예: title,organization,period)"),
+    snippet_length: Optional[int] = Query(default=None, ge=20, le=2000, description="긴 텍스트 필드를 검색어 주변 스니펫으로 줄일 글자 수"),
+    corpus: Optional[str] = CORPUS_QUERY
 ):
     """간단한 정책 검색 API (GET 요청)"""
-    global chatbot
+    selected_fields = parse_fields(fields)
     
-    if chatbot is None:
-        raise HTTPException(status_code=503, detail="챗봇이 초기화되지 않았습니다.")
+    bot = await acquire_chatbot(corpus)
     
     try:
         logger.info(f"간단 검색 요청: {query}")
         
-        results = chatbot.search_policies(
+        results = await run_single_search(
+            bot,
             query=query,
             top_k=top_k,
             region_filter=region
@@ -210,36 +680,94 @@ async def simple_search(
             }
         }
         
-        return SearchResponse(
-            query=query,
-            total_results=len(results),
-            results=results,
-            filters_applied=filters_applied
-        )
+        return ORJSONResponse({
+            "query": query,
+            "total_results": len(results),
+            "results": project_results(results, query, selected_fields, snippet_length),
+            "filters_applied": filters_applied
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"간단 검색 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"검색 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        release_chatbot(corpus)
+
+# 정책 추가/수정 엔드포인트 (관리자)
+@app.post("/admin/policies/upsert", response_model=PolicyUpsertResponse, tags=["관리"])
+async def upsert_policies(request: PolicyUpsertRequest, x_admin_token: Optional[str] = Header(default=None),
+                          corpus: Optional[str] = CORPUS_QUERY):
+    """정책 추가/수정 API (변경된 정책만 임베딩하고 인덱스를 무중단 교체)"""
+    check_admin_token(x_admin_token)
+    bot = await acquire_chatbot(corpus)
+    
+    try:
+        logger.info(f"정책 갱신 요청: {len(request.policies)}건")
+        mark_corpus_modified(corpus)
+        stats = await run_admin_task(bot.upsert_policies, pd.DataFrame(request.policies))
+        update_corpus_memory(corpus)
+        return PolicyUpsertResponse(**stats)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"정책 갱신 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"정책 갱신 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        release_chatbot(corpus)
+
+# 정책 삭제 엔드포인트 (관리자)
+@app.post("/admin/policies/delete", response_model=PolicyDeleteResponse, tags=["관리"])
+async def delete_policies(request: PolicyDeleteRequest, x_admin_token: Optional[str] = Header(default=None),
+                          corpus: Optional[str] = CORPUS_QUERY):
+    """정책 삭제 API (인덱스를 무중단 교체)"""
+    check_admin_token(x_admin_token)
+    bot = await acquire_chatbot(corpus)
+    
+    try:
+        logger.info(f"정책 삭제 요청: {len(request.policy_ids)}건")
+        mark_corpus_modified(corpus)
+        stats = await run_admin_task(bot.delete_policies, request.policy_ids)
+        update_corpus_memory(corpus)
+        return PolicyDeleteResponse(**stats)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"정책 삭제 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"정책 삭제 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        release_chatbot(corpus)
 
 # 사용 가능한 지역 목록 엔드포인트
 @app.get("/regions", tags=["메타데이터"])
-async def get_available_regions():
+async def get_available_regions(corpus: Optional[str] = CORPUS_QUERY):
     """사용 가능한 지역 목록 반환"""
-    global chatbot
-    
-    if chatbot is None:
-        raise HTTPException(status_code=503, detail="챗봇이 초기화되지 않았습니다.")
+    bot = await acquire_chatbot(corpus)
     
     try:
-        regions = list(chatbot.region_hierarchy.keys())
+        regions = list(bot.region_hierarchy.keys())
         return {
             "regions": regions,
             "total_count": len(regions),
-            "hierarchy": chatbot.region_hierarchy
+            "hierarchy": bot.region_hierarchy,
+            "codes": bot.region_resolver.codes()
         }
     except Exception as e:
         logger.error(f"지역 목록 조회 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"지역 목록 조회 중 오류가 발생했습니다: {str(e)}")
+    finally:
+        release_chatbot(corpus)
+
+# 코퍼스 목록 엔드포인트
+@app.get("/corpora", tags=["메타데이터"])
+async def get_corpora():
+    """등록된 코퍼스 목록과 코퍼스별 로드 상태/메모리 사용량, 메모리 예산"""
+    if corpora is None:
+        raise HTTPException(status_code=503, detail="챗봇이 초기화되지 않았습니다.")
+    return corpora.stats()
 
 # 루트 엔드포인트
 @app.get("/", tags=["시스템"])
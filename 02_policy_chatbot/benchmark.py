@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+정책 챗봇 부하/성능 벤치마크
+
+PolicyChatbot을 프로세스 안에서 직접 호출하는 모드(inprocess)와 FastAPI 앱을 ASGI 클라이언트로
+호출하는 모드(asgi)를 지정한 동시성으로 실행하고, 엔드포인트별 처리량과 p50/p95/p99 지연 시간,
+검색 단계별(encode/filter/retrieve/rerank/build) 평균 시간을 보고합니다.
+
+기본값은 해시 기반 스텁 인코더와 합성 정책 데이터를 사용하므로 모델 다운로드/네트워크 없이 실행됩니다.
+--rerank를 주면 교차 인코더 재순위 단계를 켜고(스텁은 쌍당 --rerank-cost-ms만큼 지연), 재순위 호출/채점 쌍/
+시간 예산 초과 수를 함께 보고합니다.
+
+사용 예시:
+    python benchmark.py                                   # inprocess + asgi, 동시성 1/4/16
+    python benchmark.py --mode asgi --concurrency 8 --requests 2000
+    python benchmark.py --csv ./data/policies.csv --real-model
+    python benchmark.py --rerank --rerank-budget-ms 50    # 재순위 단계 포함
+    python benchmark.py --output bench.json               # 결과 저장
+    python benchmark.py --baseline bench.json             # 기준 결과와 비교 (회귀 시 종료 코드 1)
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from metrics import MetricsRegistry
+from policy_chatbot import POLICY_TEXT_COLUMNS, SEARCH_STAGE_METRIC, PolicyChatbot
+from reranker import DEFAULT_RERANK_MODEL, CrossEncoderReranker
+
+# 스텁 인코더 사용 시 모델명 (임베딩 캐시/번들이 실제 모델과 섞이지 않도록 구분)
+STUB_MODEL_NAME = "benchmark/hashing-encoder"
+
+# 기본 쿼리 구성 (endpoint: API 경로, weight: 선택 비율, params: 요청 본문 또는 쿼리 파라미터)
+DEFAULT_QUERY_MIX = [
+    {"endpoint": "/search", "weight": 5, "params": {"query": "창업 지원", "top_k": 5}},
+    {"endpoint": "/search", "weight": 3, "params": {"query": "소상공인 경영 자금", "region_filter": "경기도", "top_k": 5}},
+    {"endpoint": "/search", "weight": 2, "params": {"query": "수출 진출", "target_filter": "중소기업", "top_k": 10}},
+    {"endpoint": "/search", "weight": 2, "params": {"query": "포천시 소상공인 지원", "region_filter": "포천시", "top_k": 5}},
+    {"endpoint": "/search/simple", "weight": 2, "params": {"query": "청년 창업", "top_k": 3}},
+    {"endpoint": "/search/batch", "weight": 1, "params": {"searches": [
+        {"query": "AI 기술 개발"}, {"query": "수원시 컨설팅", "region_filter": "수원시"}]}},
+    {"endpoint": "/summary", "weight": 1, "params": {"query": "중소기업 기술지원"}},
+    {"endpoint": "/search/stream", "weight": 1, "params": {"query": "스마트 공장 구축", "top_k": 5}},
+]
+
+# 기준 결과 대비 회귀로 판단할 지표 (지연 시간은 증가, 처리량은 감소가 회귀)
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+class HashingEncoder:
+    """오프라인 벤치마크용 스텁 인코더
+
+    어절과 음절 바이그램을 해시해 고정 차원 벡터를 만듭니다. SentenceTransformer와 같은
+    encode()/get_sentence_embedding_dimension()을 제공하며, encode_cost_ms로 모델 순전파 비용을 흉내낼 수 있습니다.
+    """
+
+    def __init__(self, dimension: int = 256, encode_cost_ms: float = 0.0):
+        self.dimension = dimension
+        self.encode_cost_ms = encode_cost_ms
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        embeddings = np.zeros((len(sentences), self.dimension), dtype='float32')
+        for i, sentence in enumerate(sentences):
+            for token in str(sentence).split():
+                grams = [token] + [token[j:j + 2] for j in range(len(token) - 1)]
+                for gram in grams:
+                    h = zlib.crc32(gram.encode('utf-8'))
+                    embeddings[i, h % self.dimension] += 1.0 if h & 0x80000000 else -1.0
+        if self.encode_cost_ms:
+            # 배치당 고정 비용 + 문장당 비용 (모델 순전파와 비슷한 형태)
+            time.sleep(self.encode_cost_ms * (1 + 0.1 * len(sentences)) / 1000.0)
+        return embeddings[0] if single else embeddings
+
+
+class OverlapCrossEncoder:
+    """오프라인 벤치마크용 스텁 교차 인코더
+
+    쿼리와 문서의 어절 겹침 비율을 점수로 씁니다. CrossEncoder와 같은 predict()를 제공하며,
+    pair_cost_ms로 쌍당 순전파 비용을 흉내낼 수 있습니다.
+    """
+
+    def __init__(self, pair_cost_ms: float = 0.0):
+        self.pair_cost_ms = pair_cost_ms
+
+    def predict(self, pairs, batch_size: int = 32, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        scores = np.zeros(len(pairs), dtype='float32')
+        for i, (query, document) in enumerate(pairs):
+            tokens = set(str(query).split())
+            scores[i] = len(tokens & set(str(document).split())) / max(1, len(tokens))
+        if self.pair_cost_ms:
+            time.sleep(self.pair_cost_ms * len(pairs) / 1000.0)
+        return scores
+
+
+def synthetic_policies(n: int, seed: int = 0) -> pd.DataFrame:
+    """정책 CSV와 같은 컬럼을 가진 합성 정책 데이터"""
+    rng = random.Random(seed)
+    orgs = ['경기도', '전국', '포천시', '가평군', '수원시', '성남시', '중소벤처기업부', '서울특별시', '강남구']
+    targets = ['중소기업', '소상공인', '청년', '중소기업, 소상공인', '창업벤처', '예비창업자']
+    fields = ['기술', '창업', '수출', '금융', '인력', '내수', '경영']
+    words = ('창업 지원 기술 개발 수출 진출 청년 소상공인 AI 바이오 환경 교육 자금 융자 컨설팅 스마트 공장 구축 '
+             '판로 마케팅 디지털 전환 인증 특허 해외 박람회 인력 채용 경영 개선 포천시 가평군 수원시').split()
+    rows = []
+    for i in range(n):
+        org = rng.choice(orgs)
+        body = " ".join(rng.choice(words) for _ in range(rng.randint(20, 60)))
+        rows.append({
+            'title(공고명)': f"{org} {' '.join(rng.sample(words, 3))} 사업 {i}",
+            'body_text(공고내용)': body,
+            '지원대상': rng.choice(targets),
+            '소관기관': org,
+            '지원분야(대)': rng.choice(fields),
+            '지원분야(중)': rng.choice(fields),
+            '사업수행기관': f"{org} 경제진흥원",
+            '문의처': f"031-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            '신청기간': "2025-07-01 ~ 2025-08-31",
+            '사업신청방법설명': "온라인 접수",
+        })
+    return pd.DataFrame(rows, columns=POLICY_TEXT_COLUMNS)
+
+
+def build_chatbot(args) -> PolicyChatbot:
+    """벤치마크용 챗봇 생성 및 워밍업"""
+    csv_path, tmp_dir = args.csv, None
+    if not csv_path:
+        tmp_dir = tempfile.mkdtemp(prefix="policy_benchmark_")
+        csv_path = os.path.join(tmp_dir, "synthetic_policies.csv")
+        synthetic_policies(args.synthetic, seed=args.seed).to_csv(csv_path, index=False)
+
+    cache_size = {} if args.cache else {"query_cache_size": 0, "result_cache_size": 0}
+    kwargs = dict(csv_path=csv_path, index_type=args.index_type, hybrid_search=args.hybrid,
+                  encoder_backend=args.encoder_backend, metrics=MetricsRegistry(), **cache_size)
+    if args.rerank:
+        kwargs["reranker"] = build_reranker(args)
+    if args.real_model:
+        chatbot = PolicyChatbot(**kwargs)
+    else:
+        chatbot = PolicyChatbot(model_name=STUB_MODEL_NAME, use_embedding_cache=False,
+                                sparse_tokenizer="regex", **kwargs)
+        chatbot.model = HashingEncoder(args.dimension, args.encode_cost_ms)
+    try:
+        chatbot.warmup()
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return chatbot
+
+
+def build_reranker(args) -> CrossEncoderReranker:
+    """벤치마크용 교차 인코더 재순위기 (캐시를 끄면 점수 캐시도 끄고 매번 채점)"""
+    options = dict(candidates=args.rerank_candidates, time_budget=args.rerank_budget_ms / 1000.0,
+                   cache_size=1024 if args.cache else 0)
+    if args.real_model:
+        reranker = CrossEncoderReranker(args.rerank_model, **options)
+    else:
+        reranker = CrossEncoderReranker(STUB_MODEL_NAME, model=OverlapCrossEncoder(args.rerank_cost_ms), **options)
+    reranker.warmup()
+    return reranker
+
+
+def reset_reranker(chatbot: PolicyChatbot):
+    """측정 구간별로 재순위 호출/채점/예산 초과 수를 다시 셈"""
+    if chatbot.reranker is not None:
+        reranker = chatbot.reranker
+        reranker.calls = reranker.queries = reranker.pairs_scored = reranker.fallbacks = 0
+
+
+def reranker_stats(chatbot: PolicyChatbot) -> Optional[Dict[str, Any]]:
+    """측정 구간의 재순위 호출/쿼리/채점 쌍/시간 예산 초과 수 (재순위를 쓰지 않으면 None)"""
+    if chatbot.reranker is None:
+        return None
+    stats = chatbot.reranker.stats()
+    return {
+        "calls": stats["calls"],
+        "queries": stats["queries"],
+        "pairs_scored": stats["pairs_scored"],
+        "fallbacks": stats["fallbacks"],
+        "fallback_ratio": stats["fallbacks"] / stats["queries"] if stats["queries"] else 0.0,
+        "pair_ms": stats["pair_seconds"] * 1000.0 if stats["pair_seconds"] is not None else None,
+    }
+
+
+def load_query_mix(path: Optional[str]) -> List[Dict]:
+    """쿼리 구성 로드 (JSON 목록, 없으면 기본 구성)"""
+    if not path:
+        return DEFAULT_QUERY_MIX
+    with open(path, 'r', encoding='utf-8') as f:
+        mix = json.load(f)
+    for entry in mix:
+        if "endpoint" not in entry or "params" not in entry:
+            raise ValueError(f"쿼리 구성 항목에는 endpoint/params가 필요합니다: {entry}")
+    return mix
+
+
+def build_plan(mix: Sequence[Dict], count: int, seed: int) -> List[Tuple[str, Dict]]:
+    """가중치에 따라 요청 순서 생성 (같은 seed면 같은 순서)"""
+    rng = random.Random(seed)
+    weights = [entry.get("weight", 1) for entry in mix]
+    return [(entry["endpoint"], entry["params"]) for entry in rng.choices(mix, weights=weights, k=count)]
+
+
+def call_inprocess(chatbot: PolicyChatbot, endpoint: str, params: Dict):
+    """API 엔드포인트에 해당하는 챗봇 메서드 직접 호출"""
+    if endpoint in ("/search", "/search/simple"):
+        return chatbot.search_policies(**params)
+    if endpoint == "/search/batch":
+        return chatbot.search_policies_batch(params["searches"])
+    if endpoint == "/summary":
+        return chatbot.get_policy_summary(params["query"])
+    if endpoint == "/search/stream":
+        return list(chatbot.iter_search_policies(**params))
+    if endpoint == "/summary/stream":
+        return list(chatbot.iter_policy_summary(params["query"]))
+    raise ValueError(f"지원하지 않는 엔드포인트: {endpoint}")
+
+
+def run_inprocess(chatbot: PolicyChatbot, plan: List[Tuple[str, Dict]], concurrency: int) -> Tuple[List, float]:
+    """스레드 concurrency개로 요청을 연달아 실행 (closed-loop)"""
+    samples = []
+
+    def run(item):
+        endpoint, params = item
+        start = time.perf_counter()
+        try:
+            call_inprocess(chatbot, endpoint, params)
+            ok = True
+        except Exception:
+            ok = False
+        samples.append((endpoint, time.perf_counter() - start, ok))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, plan))
+    return samples, time.perf_counter() - start
+
+
+async def call_asgi(client, endpoint: str, params: Dict) -> int:
+    """ASGI 클라이언트로 엔드포인트 호출 (스트리밍 응답은 끝까지 읽음)"""
+    if endpoint == "/search/simple":
+        response = await client.get(endpoint, params=params)
+        return response.status_code
+    if endpoint.endswith("/stream"):
+        async with client.stream("POST", endpoint, json=params) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("event: error"):
+                    return 500
+            return response.status_code
+    response = await client.post(endpoint, json=params)
+    return response.status_code
+
+
+async def run_asgi(chatbot: PolicyChatbot, plan: List[Tuple[str, Dict]], concurrency: int) -> Tuple[List, float]:
+    """FastAPI 앱을 ASGI 전송으로 호출 (동시 요청 concurrency개, 네트워크 없음)"""
+    import httpx
+    import api_server
+
+    # 시작 이벤트(모델 로드)를 거치지 않고 벤치마크용 챗봇을 주입
+    api_server.chatbot = chatbot
+    # 요청마다 찍히는 접근 로그가 결과 표를 가리지 않도록 조용히
+    for name in ("api_server", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    samples = []
+    pending = iter(plan)
+
+    async def worker(client):
+        for endpoint, params in pending:
+            start = time.perf_counter()
+            try:
+                ok = await call_asgi(client, endpoint, params) < 400
+            except Exception:
+                ok = False
+            samples.append((endpoint, time.perf_counter() - start, ok))
+
+    transport = httpx.ASGITransport(app=api_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60.0) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        return samples, time.perf_counter() - start
+
+
+def latency_stats(seconds: Sequence[float], errors: int, wall: float) -> Dict[str, float]:
+    """처리량 및 지연 시간 분위수(ms)"""
+    ms = np.asarray(seconds, dtype='float64') * 1000.0
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (0.0, 0.0, 0.0)
+    return {
+        "count": int(len(ms)),
+        "errors": int(errors),
+        "throughput_rps": len(ms) / wall if wall else 0.0,
+        "mean_ms": float(ms.mean()) if len(ms) else 0.0,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(ms.max()) if len(ms) else 0.0,
+    }
+
+
+def summarize(samples: List, wall: float, registry: MetricsRegistry) -> Dict[str, Any]:
+    """엔드포인트별/전체 통계와 검색 단계별 평균 시간"""
+    endpoints = {}
+    for endpoint in sorted({sample[0] for sample in samples}):
+        rows = [sample for sample in samples if sample[0] == endpoint]
+        endpoints[endpoint] = latency_stats([row[1] for row in rows], sum(not row[2] for row in rows), wall)
+    endpoints["all"] = latency_stats([row[1] for row in samples], sum(not row[2] for row in samples), wall)
+
+    stages = {}
+    for path in ("single", "batch"):
+        for stage in ("encode", "filter", "retrieve", "rerank", "build"):
+            histogram = registry.histogram(SEARCH_STAGE_METRIC, stage=stage, path=path)
+            if histogram is not None and histogram.count:
+                stages[f"{path}.{stage}"] = {"count": histogram.count, "mean_ms": histogram.sum * 1000.0 / histogram.count}
+    return {"wall_seconds": wall, "endpoints": endpoints, "stages": stages}
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    chatbot = build_chatbot(args)
+    mix = load_query_mix(args.mix)
+    modes = ["inprocess", "asgi"] if args.mode == "both" else [args.mode]
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "policies": len(chatbot.data),
+            "model": chatbot.model_name,
+            "encoder_backend": chatbot.encoder_backend,
+            "index_type": chatbot.index_config["index_type"],
+            "hybrid": chatbot.hybrid_search,
+            "rerank": ({"model": chatbot.reranker.model_name, "candidates": chatbot.reranker.candidates,
+                        "time_budget_ms": chatbot.reranker.time_budget * 1000.0}
+                       if chatbot.reranker is not None else None),
+            "cache": args.cache,
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "runs": {},
+    }
+    for mode in modes:
+        for concurrency in args.concurrency:
+            # 워밍업 요청은 기록하지 않음 (스레드 풀/필터 마스크 캐시 초기화)
+            warmup_plan = build_plan(mix, args.warmup, args.seed + 1)
+            if mode == "inprocess":
+                run_inprocess(chatbot, warmup_plan, concurrency)
+            else:
+                asyncio.run(run_asgi(chatbot, warmup_plan, concurrency))
+
+            chatbot.metrics = MetricsRegistry()
+            chatbot.clear_caches()
+            reset_reranker(chatbot)
+            plan = build_plan(mix, args.requests, args.seed)
+            if mode == "inprocess":
+                samples, wall = run_inprocess(chatbot, plan, concurrency)
+            else:
+                samples, wall = asyncio.run(run_asgi(chatbot, plan, concurrency))
+
+            run = summarize(samples, wall, chatbot.metrics)
+            run.update(mode=mode, concurrency=concurrency, rerank=reranker_stats(chatbot))
+            report["runs"][f"{mode}-c{concurrency}"] = run
+            print_run(f"{mode}-c{concurrency}", run)
+    return report
+
+
+def print_run(name: str, run: Dict[str, Any]):
+    """실행 결과 표 출력"""
+    overall = run["endpoints"]["all"]
+    print(f"\n📊 {name}: {overall['count']}건, {run['wall_seconds']:.2f}초, {overall['throughput_rps']:.1f} req/s")
+    print(f"   {'endpoint':<16} {'count':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} (ms)")
+    for endpoint, stats in run["endpoints"].items():
+        print(f"   {endpoint:<16} {stats['count']:>6} {stats['errors']:>4} {stats['throughput_rps']:>8.1f} "
+              f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+    if run["stages"]:
+        stages = ", ".join(f"{name}={stage['mean_ms']:.2f}" for name, stage in run["stages"].items())
+        print(f"   단계별 평균(ms): {stages}")
+    if run.get("rerank"):
+        rerank = run["rerank"]
+        print(f"   재순위: 쿼리 {rerank['queries']}개 (호출 {rerank['calls']}회), 채점 {rerank['pairs_scored']}쌍, "
+              f"예산 초과 {rerank['fallbacks']}개 ({rerank['fallback_ratio']:.1%})")
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+                        min_delta_ms: float = 0.5) -> List[str]:
+    """
+    기준 결과와 비교해 회귀 목록 반환
+
+    같은 실행(mode-동시성)/엔드포인트끼리 비교하며, 지연 시간 분위수가 (1 + tolerance)배와 min_delta_ms를
+    모두 넘게 늘거나 처리량이 (1 - tolerance)배 아래로 줄면 회귀로 판단합니다.
+    """
+    regressions = []
+    print(f"\n📐 기준 결과 비교 (허용 오차 {tolerance:.0%})")
+    for run_name, run in report["runs"].items():
+        base_run = baseline.get("runs", {}).get(run_name)
+        if base_run is None:
+            print(f"   {run_name}: 기준 결과 없음")
+            continue
+        for endpoint, stats in run["endpoints"].items():
+            base = base_run["endpoints"].get(endpoint)
+            if base is None:
+                continue
+            changes = []
+            for key in LATENCY_KEYS:
+                change = (stats[key] - base[key]) / base[key] if base[key] else 0.0
+                changes.append(f"{key[:-3]} {stats[key]:.2f}ms ({change:+.0%})")
+                if stats[key] > base[key] * (1 + tolerance) and stats[key] - base[key] > min_delta_ms:
+                    regressions.append(f"{run_name} {endpoint} {key}: {base[key]:.2f} -> {stats[key]:.2f}ms")
+            if stats["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+                regressions.append(f"{run_name} {endpoint} throughput: "
+                                   f"{base['throughput_rps']:.1f} -> {stats['throughput_rps']:.1f} req/s")
+            print(f"   {run_name} {endpoint:<16} " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="정책 챗봇 부하/성능 벤치마크")
+    parser.add_argument("--mode", choices=["inprocess", "asgi", "both"], default="both",
+                        help="inprocess: PolicyChatbot 직접 호출, asgi: FastAPI 앱 호출 (기본값: both)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="동시 요청 수 (여러 개 지정 가능)")
+    parser.add_argument("--requests", type=int, default=500, help="실행별 측정 요청 수 (기본값: 500)")
+    parser.add_argument("--warmup", type=int, default=50, help="실행별 워밍업 요청 수 (기록하지 않음)")
+    parser.add_argument("--mix", default=None, help="쿼리 구성 JSON 경로 (기본값: 내장 구성)")
+    parser.add_argument("--save-mix", default=None, help="사용한 쿼리 구성을 JSON으로 저장")
+    parser.add_argument("--csv", default=None, help="정책 CSV 경로 (기본값: 합성 데이터)")
+    parser.add_argument("--synthetic", type=int, default=2000, help="합성 정책 수 (--csv 미지정 시)")
+    parser.add_argument("--real-model", action="store_true", help="스텁 대신 실제 임베딩 모델 사용 (모델 다운로드 필요)")
+    parser.add_argument("--dimension", type=int, default=256, help="스텁 인코더 차원")
+    parser.add_argument("--encode-cost-ms", type=float, default=0.0, help="스텁 인코더 호출당 추가 지연(ms)")
+    parser.add_argument("--encoder-backend", choices=["sentence_transformers", "onnx"], default="sentence_transformers",
+                        help="쿼리 인코더 (--real-model일 때)")
+    parser.add_argument("--index-type", choices=["flat", "hnsw", "ivf_flat", "ivf_pq"], default="flat", help="FAISS 인덱스 종류")
+    parser.add_argument("--hybrid", action="store_true", help="BM25 하이브리드 검색 사용 (기본값: 의미 검색만)")
+    parser.add_argument("--rerank", action="store_true", help="교차 인코더 재순위 단계 포함")
+    parser.add_argument("--rerank-model", default=DEFAULT_RERANK_MODEL, help="교차 인코더 모델 (--real-model일 때)")
+    parser.add_argument("--rerank-candidates", type=int, default=20, help="재순위할 1차 검색 후보 수 (기본값: 20)")
+    parser.add_argument("--rerank-budget-ms", type=float, default=300.0, help="호출당 재순위 시간 예산(ms, 기본값: 300)")
+    parser.add_argument("--rerank-cost-ms", type=float, default=0.5, help="스텁 교차 인코더 쌍당 지연(ms)")
+    parser.add_argument("--cache", action="store_true", help="쿼리 임베딩/검색 결과 캐시 사용 (기본값: 끔, 검색 경로 자체를 측정)")
+    parser.add_argument("--seed", type=int, default=0, help="요청 순서/합성 데이터 시드")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로 (다음 비교의 기준 결과로 사용)")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀 판단 허용 오차 (기본값: 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.save_mix:
+        with open(args.save_mix, 'w', encoding='utf-8') as f:
+            json.dump(load_query_mix(args.mix), f, ensure_ascii=False, indent=2)
+
+    report = run_benchmark(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ 성능 회귀:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("\n✅ 기준 결과 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+기업마당(bizinfo) 지원사업 공고 증분 크롤러
+
+해시태그 조합별로 API를 페이지 단위로 비동기 조회하고(동시 요청 수 제한, 재시도/백오프),
+해시태그 조합별 최고 수위(high-water mark: 마지막으로 본 공고 등록일시/공고 ID)보다 새 공고만 가져옵니다.
+가져온 공고는 중복 제거 인덱스(dedup.py)로 이미 저장한 공고(재수집)를 거르고 중복/근접 중복 공고에는 duplicate_of를 표시해,
+결과는 추가 전용 Parquet 파티션(`<출력 디렉토리>/crawl_date=YYYY-MM-DD/part-<시각>-<id>.parquet`)으로 저장하고,
+PolicyChatbot.ingest_partitions로 아직 반영하지 않은 파티션만 증분 반영합니다.
+
+    python bizinfo_crawler.py --hashtags 소상공인,경기 창업,경기 --output-dir ./data/bizinfo
+"""
+import argparse
+import asyncio
+import html
+import json
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from dedup import DedupIndex
+
+DEFAULT_BASE_URL = "https://www.bizinfo.go.kr"
+API_PATH = "/uss/rss/bizinfoApi.do"
+DEFAULT_API_KEY = os.getenv("BIZINFO_API_KEY", "FFxycB")
+DEFAULT_HASHTAGS = ("소상공인,경기",)
+
+# API 필드 -> 정책 데이터 컬럼 (bizinfo_crawling.py CSV와 같은 컬럼 + 공고 ID/등록일시/URL)
+FIELD_MAP = {
+    "pblancNm": "title(공고명)",
+    "bsnsSumryCn": "body_text(공고내용)",
+    "trgetNm": "지원대상",
+    "jrsdInsttNm": "소관기관",
+    "pldirSportRealmLclasCodeNm": "지원분야(대)",
+    "pldirSportRealmMlsfcCodeNm": "지원분야(중)",
+    "excInsttNm": "사업수행기관",
+    "refrncNm": "문의처",
+    "reqstBeginEndDe": "신청기간",
+    "reqstMthPapersCn": "사업신청방법설명",
+    "pblancId": "pblanc_id",
+    "creatPnttm": "created_at",
+    "pblancUrl": "pblanc_url",
+}
+# HTML 태그를 제거할 필드
+HTML_FIELDS = ("bsnsSumryCn", "refrncNm", "reqstMthPapersCn")
+# 크롤링한 해시태그 조합 컬럼
+HASHTAGS_COLUMN = "crawl_hashtags"
+# 중복/수정 판정에 쓰는 내용 컬럼 (공고 ID/등록일시/URL 제외)
+CONTENT_COLUMNS = [column for column in FIELD_MAP.values() if column not in ("pblanc_id", "created_at", "pblanc_url")]
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# 파이썬 \s와 같은 공백 문자 (RE2의 \s는 ASCII 공백만 포함)
+_WHITESPACE_PATTERN = r"[\s\p{Z}\x{0b}\x{1c}-\x{1f}\x{85}]+"
+PARTITION_GLOB_PREFIX = "crawl_date="
+
+
+class CrawlError(Exception):
+    """재시도 후에도 실패한 API 요청"""
+
+
+def clean_html(texts: pd.Series) -> pd.Series:
+    """
+    HTML 태그 제거 및 공백 정리 (열 전체에 RE2 정규식 적용, 엔티티가 있는 행만 html.unescape)
+
+    bizinfo_crawling.clean_html과 같은 결과: <br>/<p> -> 줄바꿈, 나머지 태그 제거, 공백 정리, 엔티티 복원
+    """
+    array = pa.array(texts.fillna("").astype(str), type=pa.large_string())
+    array = pc.replace_substring_regex(array, r"<br\s*/?>|</?p>", "\n")
+    array = pc.replace_substring_regex(array, r"<[^>]*>", "")
+    array = pc.replace_substring_regex(array, _WHITESPACE_PATTERN, " ")
+    cleaned = pd.Series(array.to_pylist(), index=texts.index, dtype=object)
+    escaped = cleaned.str.contains("&", regex=False)
+    if escaped.any():
+        cleaned[escaped] = cleaned[escaped].map(html.unescape)
+    return cleaned.str.strip()
+
+
+def items_to_frame(items: Sequence[Dict], hashtags: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """API 공고 항목 목록 -> 정책 데이터 DataFrame (HTML 필드 정리)"""
+    raw = pd.DataFrame.from_records(list(items)).reindex(columns=list(FIELD_MAP))
+    for field in HTML_FIELDS:
+        raw[field] = clean_html(raw[field])
+    frame = raw.rename(columns=FIELD_MAP).fillna("").astype(str)
+    if hashtags is not None:
+        frame[HASHTAGS_COLUMN] = list(hashtags)
+    return frame
+
+
+def item_mark(item: Dict) -> Tuple[str, str]:
+    """공고 순서 키 (등록일시, 공고 ID) - 최근 공고일수록 큼"""
+    return str(item.get("creatPnttm") or ""), str(item.get("pblancId") or "")
+
+
+def write_partition(frame: pd.DataFrame, output_dir: str, now: Optional[datetime] = None) -> str:
+    """
+    크롤링 결과를 새 Parquet 파티션 파일로 저장 (기존 파티션은 수정하지 않음)
+
+    Returns:
+        파티션 파일 경로
+    """
+    now = now or datetime.now()
+    directory = os.path.join(output_dir, f"{PARTITION_GLOB_PREFIX}{now:%Y-%m-%d}")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"part-{now:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet")
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def list_partitions(output_dir: str) -> List[str]:
+    """저장된 파티션 파일 경로 (저장 순서)"""
+    if not os.path.isdir(output_dir):
+        return []
+    paths = []
+    for name in os.listdir(output_dir):
+        directory = os.path.join(output_dir, name)
+        if name.startswith(PARTITION_GLOB_PREFIX) and os.path.isdir(directory):
+            paths.extend(os.path.join(directory, file) for file in os.listdir(directory) if file.endswith(".parquet"))
+    return sorted(paths, key=os.path.basename)
+
+
+def read_partitions(paths: Iterable[str]) -> pd.DataFrame:
+    """파티션 파일들을 하나의 DataFrame으로 (같은 공고는 나중 파티션 값 사용)"""
+    frames = [pq.read_table(path).to_pandas() for path in paths]
+    if not frames:
+        return items_to_frame([])
+    data = pd.concat(frames, ignore_index=True)
+    return data.drop_duplicates("pblanc_id", keep="last").reset_index(drop=True)
+
+
+class BizinfoCrawler:
+    """
+    기업마당 공고 증분 크롤러
+
+    해시태그 조합마다 1페이지부터 조회하고, 최고 수위 이하의 공고가 나오면 그 조합은 더 조회하지 않습니다
+    (API는 최근 등록 공고부터 반환). 다음 페이지들은 max_concurrency개씩 동시에 조회합니다.
+    최고 수위는 파티션을 저장한 뒤에 갱신하므로, 저장 전에 중단되면 다음 실행에서 다시 가져옵니다.
+    dedup이면 이미 저장한 공고와 키/내용이 같은 공고(재수집)는 저장하지 않고, 내용이 바뀐 공고는 change=updated로,
+    다른 ID의 같은 공고/공고명·소관기관이 같고 본문이 거의 같은 공고는 change=duplicate/near_duplicate와 원본 공고 ID
+    (duplicate_of)를 붙여 저장합니다 (판정이 틀려도 파티션에서 되살릴 수 있음). 최고 수위는 저장했거나 이미 저장되어
+    있던 공고까지만 올립니다.
+    """
+
+    def __init__(self, output_dir: str, api_key: str = DEFAULT_API_KEY, base_url: str = DEFAULT_BASE_URL,
+                 page_size: int = 100, max_concurrency: int = 4, max_retries: int = 4, backoff: float = 0.5,
+                 timeout: float = 30.0, max_pages: Optional[int] = None, state_path: Optional[str] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None, dedup: bool = True,
+                 dedup_path: Optional[str] = None):
+        """
+        Args:
+            output_dir: 파티션 저장 디렉토리
+            api_key: 기업마당 API 인증키 (기본값: BIZINFO_API_KEY 환경 변수)
+            base_url: API 서버 주소 (테스트 시 로컬 대역 서버 주소)
+            page_size: 페이지당 공고 수
+            max_concurrency: 동시 API 요청 수 (모든 해시태그 조합 공통)
+            max_retries: 연결 오류/타임아웃/429/5xx 응답 재시도 횟수
+            backoff: 재시도 대기 시간 기준(초, 시도마다 2배 + 지터, Retry-After 헤더가 있으면 그 값)
+            timeout: 요청 타임아웃(초)
+            max_pages: 해시태그 조합별 최대 페이지 수 (None이면 전체)
+            state_path: 최고 수위 저장 파일 (기본값: <output_dir>/crawler_state.json)
+            transport: httpx 전송 계층 (테스트용 MockTransport 등)
+            dedup: 재수집한 공고를 거르고 중복/근접 중복 공고에 duplicate_of 표시
+            dedup_path: 중복 제거 인덱스 파일 (기본값: <output_dir>/dedup_index.npz)
+        """
+        self.output_dir = output_dir
+        self.api_key = api_key
+        self.base_url = base_url
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.state_path = state_path or os.path.join(output_dir, "crawler_state.json")
+        self.transport = transport
+        self.dedup = dedup
+        self.dedup_path = dedup_path or os.path.join(output_dir, "dedup_index.npz")
+        self.requests = 0
+        self.retries = 0
+
+    def load_state(self) -> Dict[str, Dict]:
+        """해시태그 조합별 최고 수위 {"소상공인,경기": {"created_at": ..., "pblanc_id": ...}}"""
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("marks", {})
+
+    def save_state(self, marks: Dict[str, Dict]):
+        """임시 파일에 쓴 뒤 원자적으로 교체"""
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"marks": marks, "updated_at": datetime.now().isoformat(timespec="seconds")},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    async def _get_json(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, params: Dict) -> Dict:
+        """API 요청 (동시 요청 수 제한, 재시도 대기 중에는 슬롯을 반납)"""
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with semaphore:
+                    self.requests += 1
+                    response = await client.get(API_PATH, params=params)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error = CrawlError(f"HTTP {response.status_code}")
+                retry_after = response.headers.get("Retry-After")
+            except (httpx.TransportError, json.JSONDecodeError) as e:
+                error = e
+            if attempt == self.max_retries:
+                raise CrawlError(f"API 요청 실패 ({params.get('hashtags')}, {params.get('pageIndex')}페이지): {error}")
+            self.retries += 1
+            delay = self.backoff * (2 ** attempt) * (1 + random.random())
+            if retry_after is not None:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            await asyncio.sleep(delay)
+
+    async def fetch_page(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                         hashtags: str, page: int) -> Tuple[List[Dict], int]:
+        """
+        한 페이지 조회
+
+        Returns:
+            (공고 항목 목록, 전체 공고 수)
+        """
+        params = {
+            "crtfcKey": self.api_key,
+            "dataType": "json",
+            "searchCnt": self.page_size,
+            "pageUnit": self.page_size,
+            "pageIndex": page,
+            "hashtags": hashtags,
+        }
+        data = await self._get_json(client, semaphore, params)
+        items = data.get("jsonArray", [])
+        if isinstance(items, dict):
+            items = items.get("item", [])
+        if isinstance(items, dict):
+            items = [items]
+        total = int(items[0].get("totCnt") or 0) if items else 0
+        return items, total
+
+    async def crawl_hashtags(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                             hashtags: str, mark: Optional[Sequence[str]]) -> List[Dict]:
+        """해시태그 조합 하나의 최고 수위보다 새 공고 목록"""
+        mark = tuple(mark) if mark else None
+        new_items = []
+
+        def collect(items: List[Dict]) -> bool:
+            """새 공고를 모으고, 최고 수위 이하 공고가 나왔으면 False (이후 페이지는 모두 이미 본 공고)"""
+            fresh = [item for item in items if mark is None or item_mark(item) > mark]
+            new_items.extend(fresh)
+            return len(fresh) == len(items) and len(items) >= self.page_size
+
+        items, total = await self.fetch_page(client, semaphore, hashtags, 1)
+        pages = -(-total // self.page_size) if total else 1
+        if self.max_pages is not None:
+            pages = min(pages, self.max_pages)
+        page = 2
+        more = collect(items)
+        while more and page <= pages:
+            window = range(page, min(page + self.max_concurrency, pages + 1))
+            results = await asyncio.gather(*(self.fetch_page(client, semaphore, hashtags, p) for p in window))
+            for items, _ in results:
+                more = collect(items)
+                if not more:
+                    break
+            page = window.stop
+        return new_items
+
+    async def crawl(self, hashtag_sets: Sequence[str] = DEFAULT_HASHTAGS, full: bool = False) -> Dict:
+        """
+        모든 해시태그 조합을 동시에 크롤링하고 새 공고를 파티션으로 저장
+
+        Args:
+            hashtag_sets: 해시태그 조합 목록 (쉼표로 구분한 문자열)
+            full: 최고 수위를 무시하고 전체 조회
+
+        Returns:
+            가져온 공고 수, 새/수정/중복/근접 중복 공고 수, 파티션 경로(저장할 공고가 없으면 None), 요청/재시도 수
+        """
+        marks = {} if full else self.load_state()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.requests = self.retries = 0
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, transport=self.transport) as client:
+            results = await asyncio.gather(*(
+                self.crawl_hashtags(client, semaphore, hashtags, (marks.get(hashtags) or {}).get("mark"))
+                for hashtags in hashtag_sets
+            ))
+
+        # 여러 조합에 걸친 공고는 한 번만 저장
+        items, item_hashtags, seen = [], [], set()
+        for hashtags, new_items in zip(hashtag_sets, results):
+            for item in new_items:
+                key = item.get("pblancId")
+                if key in seen:
+                    continue
+                seen.add(key)
+                items.append(item)
+                item_hashtags.append(hashtags)
+
+        path, index = None, None
+        frame = items_to_frame(items, item_hashtags)
+        dedup_stats = {"inserted": len(frame), "updated": 0, "unchanged": 0, "duplicates": 0, "near_duplicates": 0}
+        # 저장된 공고 ID (이번 파티션 + 재수집으로 판정된, 이전 파티션에 이미 있는 공고)
+        persisted = set()
+        if self.dedup and items:
+            # 파티션을 저장한 뒤에 인덱스를 저장 (중단되면 다음 실행에서 다시 판정)
+            index = DedupIndex.load_or_create(self.dedup_path, "pblanc_id", CONTENT_COLUMNS)
+            result = index.ingest(frame)
+            frame, dedup_stats = result.deltas, result.stats()
+            persisted.update(result.unchanged_keys)
+        persisted.update(frame["pblanc_id"])
+        if len(frame):
+            path = write_partition(frame, self.output_dir)
+        if index is not None:
+            index.save(self.dedup_path)
+        state = self.load_state() if full else marks
+        for hashtags, new_items in zip(hashtag_sets, results):
+            newest = self._persisted_mark(new_items, persisted)
+            if newest is not None:
+                previous = (state.get(hashtags) or {}).get("mark")
+                if not previous or newest > tuple(previous):
+                    state[hashtags] = {"mark": list(newest), "crawled_at": datetime.now().isoformat(timespec="seconds")}
+        self.save_state(state)
+
+        stats = {"fetched": len(items), "new": dedup_stats["inserted"], "updated": dedup_stats["updated"],
+                 "unchanged": dedup_stats["unchanged"], "duplicates": dedup_stats["duplicates"],
+                 "near_duplicates": dedup_stats["near_duplicates"],
+                 "partition": path, "requests": self.requests, "retries": self.retries}
+        print(f"크롤링 완료: {len(items)}건 조회, 새 공고 {stats['new']}건, 수정 {stats['updated']}건, "
+              f"재수집 {stats['unchanged']}건, 중복 {stats['duplicates']}건, 근접 중복 {stats['near_duplicates']}건, "
+              f"요청 {self.requests}회 (재시도 {self.retries}회)")
+        return stats
+
+    @staticmethod
+    def _persisted_mark(items: Sequence[Dict], persisted: set) -> Optional[Tuple[str, str]]:
+        """저장된 공고만으로 올릴 수 있는 최고 수위 (저장되지 않은 공고가 있으면 그 공고보다 앞까지, 없으면 None)"""
+        marks = [item_mark(item) for item in items]
+        missing = [mark for mark in marks if mark[1] not in persisted]
+        limit = min(missing) if missing else None
+        marks = [mark for mark in marks if mark[1] in persisted and (limit is None or mark < limit)]
+        return max(marks) if marks else None
+
+    def run(self, hashtag_sets: Sequence[str] = DEFAULT_HASHTAGS, full: bool = False) -> Dict:
+        """crawl의 동기 버전"""
+        return asyncio.run(self.crawl(hashtag_sets, full))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기업마당 공고 증분 크롤러 (Parquet 파티션 저장)")
+    parser.add_argument("--hashtags", nargs="+", default=list(DEFAULT_HASHTAGS),
+                        help="해시태그 조합 (쉼표로 구분, 여러 개 지정 가능, 기본값: 소상공인,경기)")
+    parser.add_argument("--output-dir", default="./data/bizinfo", help="파티션 저장 디렉토리 (기본값: ./data/bizinfo)")
+    parser.add_argument("--base-url", default=os.getenv("BIZINFO_BASE_URL", DEFAULT_BASE_URL), help="API 서버 주소")
+    parser.add_argument("--page-size", type=int, default=100, help="페이지당 공고 수 (기본값: 100)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 API 요청 수 (기본값: 4)")
+    parser.add_argument("--max-pages", type=int, default=None, help="해시태그 조합별 최대 페이지 수 (기본값: 전체)")
+    parser.add_argument("--full", action="store_true", help="최고 수위를 무시하고 전체 조회")
+    parser.add_argument("--no-dedup", action="store_true", help="재수집한 공고도 그대로 저장하고 중복 판정 생략")
+    parser.add_argument("--csv", default=None, help="저장된 전체 파티션을 합쳐 CSV로도 내보낼 경로")
+    args = parser.parse_args()
+
+    crawler = BizinfoCrawler(args.output_dir, base_url=args.base_url, page_size=args.page_size,
+                             max_concurrency=args.concurrency, max_pages=args.max_pages, dedup=not args.no_dedup)
+    try:
+        stats = crawler.run(args.hashtags, full=args.full)
+    except CrawlError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if stats["partition"]:
+        print(f"✔ 파티션 저장 완료: {stats['partition']}")
+    if args.csv:
+        data = read_partitions(list_partitions(args.output_dir))
+        data.to_csv(args.csv, index=False, encoding="utf-8-sig")
+        print(f"✔ CSV 저장 완료: {args.csv} ({len(data)}건)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+pytest 공용 픽스처 (해시 기반 스텁 인코더 + 합성 정책 데이터, 모델 다운로드/네트워크 없이 실행)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import STUB_MODEL_NAME, HashingEncoder, synthetic_policies
+
+# 테스트용 스텁 인코더 차원
+STUB_DIMENSION = 256
+
+
+@pytest.fixture
+def csv_path(tmp_path, request):
+    """
+    합성 정책 CSV 경로
+
+    기본값은 300건(시드 0)이고, indirect 파라미터로 (정책 수, 시드)를 바꿀 수 있습니다:
+    @pytest.mark.parametrize("csv_path", [(50, 1)], indirect=True)
+    """
+    count, seed = getattr(request, "param", (300, 0))
+    path = str(tmp_path / "policies.csv")
+    synthetic_policies(count, seed=seed).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def stub_encoder(monkeypatch):
+    """PolicyChatbot이 임베딩 모델을 내려받지 않고 HashingEncoder를 쓰게 함"""
+    from policy_chatbot import PolicyChatbot
+    monkeypatch.setattr(PolicyChatbot, "_initialize_model",
+                        lambda self: setattr(self, "model", HashingEncoder(STUB_DIMENSION)))
+
+
+@pytest.fixture
+def make_chatbot(stub_encoder):
+    """
+    스텁 인코더를 쓰는 PolicyChatbot 생성 함수
+
+    임베딩 캐시는 끄고 BM25는 regex 토크나이저를 씁니다. 키워드 인자는 PolicyChatbot 생성자 인자입니다.
+    """
+    from policy_chatbot import PolicyChatbot
+
+    def make(csv_path=None, **kwargs):
+        options = dict(model_name=STUB_MODEL_NAME, use_embedding_cache=False, sparse_tokenizer="regex")
+        options.update(kwargs)
+        return PolicyChatbot(csv_path=csv_path, **options)
+
+    return make
@@ -0,0 +1,310 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from metrics import REGISTRY, MetricsRegistry
+from policy_chatbot import PolicyChatbot
+from query_cache import TTLCache
+from region_resolver import RegionResolver
+
+# 코퍼스별로 다르게 줄 수 있는 PolicyChatbot 인자 (나머지는 모든 코퍼스 공통)
+CORPUS_OPTIONS = ("csv_path", "bundle_path", "index_type", "index_options", "hybrid_search", "embedding_cache_dir",
+                  "passage_search", "passage_options")
+
+
+class UnknownCorpusError(KeyError):
+    """등록되지 않은 코퍼스"""
+
+
+class Corpus:
+    """등록된 코퍼스 (설정, 챗봇, 사용 기록)"""
+
+    def __init__(self, name: str, options: Dict[str, Any], description: str = "", pinned: bool = False):
+        self.name = name
+        self.options = options
+        self.description = description
+        self.pinned = pinned
+        self.modified = False  # 관리자 API로 수정됨 (해제하면 변경 사항이 사라지므로 해제하지 않음)
+        self.in_use = 0  # acquire 후 release하지 않은 요청 수 (사용 중에는 해제하지 않음)
+        self.chatbot: Optional[PolicyChatbot] = None
+        self.nbytes = 0
+        self.loads = 0
+        self.last_used = None
+        self.lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.chatbot is not None and self.chatbot.is_loaded
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "description": self.description,
+            "loaded": self.is_loaded,
+            "memory_bytes": self.nbytes,
+            "data_count": len(self.chatbot.data) if self.is_loaded else 0,
+            "loads": self.loads,
+            "last_used": self.last_used,
+            "pinned": self.pinned,
+            "modified": self.modified,
+            "in_use": self.in_use,
+        }
+
+
+class CorpusRegistry:
+    """
+    이름 붙은 여러 정책 코퍼스를 한 서버에서 제공하는 레지스트리
+
+    코퍼스마다 PolicyChatbot(데이터/임베딩/인덱스/필터/BM25)을 따로 두고, 임베딩 모델/쿼리 인코더,
+    쿼리 임베딩 캐시, 지역 코드표는 모든 코퍼스가 공유합니다. 코퍼스는 처음 요청될 때 로드하고,
+    로드된 코퍼스의 메모리 합계가 memory_budget을 넘으면 가장 오래 쓰지 않은 코퍼스부터 해제합니다 (LRU).
+    기본 코퍼스, pinned 코퍼스, 관리자 API로 수정한 코퍼스, 요청이 사용 중인(acquire) 코퍼스는 해제하지 않습니다.
+    해제된 챗봇을 직접 들고 있던 코드가 검색하면 챗봇이 스스로 다시 로드하지 않고 get을 거쳐 로드합니다.
+    """
+
+    def __init__(self, default: str = None, memory_budget: int = None, metrics: MetricsRegistry = None,
+                 query_cache_size: int = 1024, query_cache_ttl: float = 3600.0,
+                 region_resolver: RegionResolver = None, **chatbot_kwargs):
+        """
+        Args:
+            default: 기본 코퍼스 이름 (None이면 처음 등록한 코퍼스)
+            memory_budget: 로드된 코퍼스 메모리 합계 상한(바이트, None이면 해제하지 않음)
+            metrics: 지표 레지스트리 (기본값: 프로세스 공용 REGISTRY)
+            query_cache_size, query_cache_ttl: 코퍼스 공용 쿼리 임베딩 캐시 설정 (키에 코퍼스 이름이 들어가 코퍼스별로 초기화)
+            region_resolver: 코퍼스 공용 지역 코드표 (기본값: region_codes.json)
+            **chatbot_kwargs: 모든 코퍼스에 공통으로 줄 PolicyChatbot 인자 (model_name, encoder_backend 등)
+        """
+        self.default = default
+        self.memory_budget = memory_budget
+        self.metrics = metrics if metrics is not None else REGISTRY
+        self.query_cache = TTLCache(query_cache_size, query_cache_ttl)
+        self.region_resolver = region_resolver if region_resolver is not None else RegionResolver.load()
+        chatbot_kwargs.pop("lazy_load", None)
+        self.chatbot_kwargs = chatbot_kwargs
+        self.evictions = 0
+        self._corpora: "OrderedDict[str, Corpus]" = OrderedDict()  # 최근 사용 순 (끝이 가장 최근)
+        self._lock = threading.Lock()
+        self._encoders = (None, None)  # 먼저 로드한 코퍼스의 (임베딩 모델, 쿼리 인코더)
+
+    @classmethod
+    def from_config(cls, path: str, **kwargs) -> "CorpusRegistry":
+        """
+        JSON 설정 파일로 생성
+
+        {"default": "gyeonggi", "memory_budget_mb": 2048,
+         "corpora": {"gyeonggi": {"csv_path": "...", "description": "..."}, "busan": {"bundle_path": "...", "pinned": true}}}
+
+        상대 경로는 설정 파일 위치 기준입니다. kwargs는 설정 파일 값보다 우선합니다.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        base_dir = os.path.dirname(os.path.abspath(path))
+        if config.get("memory_budget_mb") is not None:
+            kwargs.setdefault("memory_budget", int(float(config["memory_budget_mb"]) * 1024 * 1024))
+        kwargs.setdefault("default", config.get("default"))
+        registry = cls(**kwargs)
+        for name, options in config.get("corpora", {}).items():
+            options = dict(options)
+            for key in ("csv_path", "bundle_path", "embedding_cache_dir"):
+                if options.get(key):
+                    options[key] = os.path.join(base_dir, options[key])
+            registry.register(name, **options)
+        if not len(registry):
+            raise ValueError(f"코퍼스가 하나도 없습니다: {path}")
+        return registry
+
+    def register(self, name: str, description: str = "", pinned: bool = False, **options):
+        """
+        코퍼스 등록 (데이터/인덱스는 처음 get할 때 로드)
+
+        Args:
+            name: 코퍼스 이름 (요청의 ?corpus= 값)
+            description: 설명
+            pinned: 메모리 예산을 넘어도 해제하지 않음
+            **options: CORPUS_OPTIONS 중 코퍼스별 PolicyChatbot 인자 (csv_path 또는 bundle_path 등)
+        """
+        unknown = set(options) - set(CORPUS_OPTIONS)
+        if unknown:
+            raise ValueError(f"지원하지 않는 코퍼스 옵션: {', '.join(sorted(unknown))}")
+        with self._lock:
+            if name in self._corpora:
+                raise ValueError(f"이미 등록된 코퍼스: {name}")
+            self._corpora[name] = Corpus(name, options, description, pinned)
+            if self.default is None:
+                self.default = name
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._corpora
+
+    def __len__(self) -> int:
+        return len(self._corpora)
+
+    def names(self) -> List[str]:
+        return list(self._corpora)
+
+    def _corpus(self, name: Optional[str]) -> Corpus:
+        name = self.default if name is None else name
+        corpus = self._corpora.get(name)
+        if corpus is None:
+            raise UnknownCorpusError(name)
+        return corpus
+
+    def _touch(self, corpus: Corpus):
+        with self._lock:
+            self._corpora.move_to_end(corpus.name)
+            corpus.last_used = time.time()
+
+    def get(self, name: str = None) -> PolicyChatbot:
+        """
+        코퍼스의 챗봇 (처음이거나 해제된 코퍼스면 데이터/인덱스를 로드하고 메모리 예산에 맞게 다른 코퍼스 해제)
+
+        Raises:
+            UnknownCorpusError: 등록되지 않은 코퍼스
+        """
+        corpus = self._corpus(name)
+        self._touch(corpus)
+        with corpus.lock:
+            if corpus.chatbot is None:
+                corpus.chatbot = self._create_chatbot(corpus)
+            if not corpus.chatbot.is_loaded:
+                self._load(corpus)
+        return corpus.chatbot
+
+    def acquire(self, name: str = None, load: bool = True) -> Optional[PolicyChatbot]:
+        """
+        사용 중 표시 후 코퍼스의 챗봇 반환 (release할 때까지 메모리 예산을 넘어도 해제하지 않음)
+
+        Args:
+            load: False면 로드되지 않은 코퍼스는 사용 중 표시 없이 None 반환
+
+        Raises:
+            UnknownCorpusError: 등록되지 않은 코퍼스
+        """
+        corpus = self._corpus(name)
+        with self._lock:
+            # 로드 전에 표시해야 로드와 사용 사이에 다른 코퍼스 로드가 이 코퍼스를 해제하지 않음
+            if not load and not corpus.is_loaded:
+                return None
+            corpus.in_use += 1
+        try:
+            return self.get(corpus.name)
+        except BaseException:
+            self.release(corpus.name)
+            raise
+
+    def release(self, name: str = None):
+        """acquire한 코퍼스 사용 종료"""
+        corpus = self._corpus(name)
+        with self._lock:
+            corpus.in_use = max(0, corpus.in_use - 1)
+
+    @contextmanager
+    def using(self, name: str = None) -> Iterator[PolicyChatbot]:
+        """acquire/release를 묶은 with 블록"""
+        chatbot = self.acquire(name)
+        try:
+            yield chatbot
+        finally:
+            self.release(name)
+
+    def loaded(self, name: str = None) -> Optional[PolicyChatbot]:
+        """이미 로드된 코퍼스의 챗봇 (로드되지 않았으면 None, 로드는 get으로)"""
+        corpus = self._corpus(name)
+        if not corpus.is_loaded:
+            return None
+        self._touch(corpus)
+        return corpus.chatbot
+
+    def _create_chatbot(self, corpus: Corpus) -> PolicyChatbot:
+        kwargs = dict(self.chatbot_kwargs, **corpus.options)
+        chatbot = PolicyChatbot(metrics=self.metrics, region_resolver=self.region_resolver, **kwargs)
+        chatbot.query_cache = self.query_cache
+        chatbot.query_cache_namespace = corpus.name
+        # 해제 후 다시 로드할 때도 get을 거쳐 로드 시간/메모리를 기록하고 예산을 확인
+        chatbot.loader = lambda: self.get(corpus.name)
+        return chatbot
+
+    def _load(self, corpus: Corpus):
+        """공유 인코더를 넘겨 코퍼스 로드 후 메모리 사용량 기록 및 예산 초과분 해제"""
+        chatbot = corpus.chatbot
+        chatbot.set_encoder(*self._encoders)
+        start = time.perf_counter()
+        chatbot.warmup()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            # 이 코퍼스가 처음 로드한 모델은 다음 코퍼스부터 공유
+            shared_model, shared_query_model = self._encoders
+            model, query_model = chatbot.loaded_encoders()
+            self._encoders = (shared_model if shared_model is not None else model,
+                              shared_query_model if shared_query_model is not None else query_model)
+            corpus.nbytes = chatbot.memory_usage()
+            corpus.loads += 1
+            self.metrics.observe("corpus_load_seconds", elapsed, help="코퍼스 로드 시간(초)", corpus=corpus.name)
+            print(f"코퍼스 로드 완료: {corpus.name} ({corpus.nbytes / 1024 / 1024:.1f}MB, {elapsed:.2f}초)")
+            self._evict(keep=corpus.name)
+
+    def _evict(self, keep: str):
+        """메모리 예산을 넘으면 가장 오래 쓰지 않은 코퍼스부터 해제 (self._lock 안에서 호출)"""
+        if self.memory_budget is None:
+            return
+        loaded = [corpus for corpus in self._corpora.values() if corpus.is_loaded]
+        total = sum(corpus.nbytes for corpus in loaded)
+        for corpus in loaded:
+            if total <= self.memory_budget:
+                break
+            if corpus.name in (keep, self.default) or corpus.pinned or corpus.modified or corpus.in_use:
+                continue
+            corpus.chatbot.unload()
+            total -= corpus.nbytes
+            corpus.nbytes = 0
+            self.evictions += 1
+            self.metrics.inc("corpus_evictions_total", help="메모리 예산 초과로 해제된 코퍼스 수", corpus=corpus.name)
+            print(f"코퍼스 해제: {corpus.name} (메모리 예산 {self.memory_budget / 1024 / 1024:.0f}MB 초과)")
+        if total > self.memory_budget:
+            print(f"⚠️ 해제할 수 있는 코퍼스가 없어 메모리 예산을 넘었습니다: {total / 1024 / 1024:.1f}MB")
+
+    def unload(self, name: str):
+        """코퍼스 해제 (다음 요청 시 다시 로드)"""
+        corpus = self._corpus(name)
+        with corpus.lock:
+            if corpus.chatbot is not None:
+                corpus.chatbot.unload()
+            corpus.nbytes = 0
+
+    def mark_modified(self, name: str = None):
+        """관리자 API로 수정할 코퍼스 표시 (수정 작업 전에 호출해 해제 대상에서 제외)"""
+        self._corpus(name).modified = True
+
+    def update_memory_usage(self, name: str = None):
+        """수정 작업이 끝난 코퍼스의 메모리 사용량을 다시 계산하고 예산 초과분 해제"""
+        corpus = self._corpus(name)
+        with self._lock:
+            if corpus.is_loaded:
+                corpus.nbytes = corpus.chatbot.memory_usage()
+                self._evict(keep=corpus.name)
+
+    def memory_usage(self) -> int:
+        """로드된 코퍼스 메모리 합계(바이트)"""
+        return sum(corpus.nbytes for corpus in self._corpora.values() if corpus.is_loaded)
+
+    def stats(self) -> Dict[str, Any]:
+        """코퍼스별 로드 상태/메모리 사용량 및 예산"""
+        return {
+            "default": self.default,
+            "memory_budget_bytes": self.memory_budget,
+            "memory_bytes": self.memory_usage(),
+            "evictions": self.evictions,
+            "corpora": {name: corpus.stats() for name, corpus in self._corpora.items()},
+        }
+
+    def collect_metrics(self):
+        """코퍼스별 로드 여부/메모리 사용량 게이지 기록 (/metrics 조회 시 호출)"""
+        for name, corpus in self._corpora.items():
+            self.metrics.set("corpus_loaded", int(corpus.is_loaded), help="코퍼스 로드 여부", corpus=name)
+            self.metrics.set("corpus_memory_bytes", corpus.nbytes, help="코퍼스 메모리 사용량 추정(바이트)", corpus=name)
+        if self.memory_budget is not None:
+            self.metrics.set("corpus_memory_budget_bytes", self.memory_budget, help="코퍼스 메모리 예산(바이트)")
@@ -0,0 +1,399 @@
+import hashlib
+import itertools
+import os
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from text_preprocess import NON_WORD_PATTERN, combine_columns
+
+# 근접 중복 비교에 쓰는 본문 컬럼
+BODY_COLUMN = 'body_text(공고내용)'
+# 근접 중복은 이 컬럼들(정규화 후)이 같은 공고끼리만 판정 (지역만 다른 같은 양식의 공고를 중복으로 보지 않도록)
+MATCH_COLUMNS = ('title(공고명)', '소관기관')
+# 변경 종류 컬럼 (ingest 결과 deltas: inserted/updated/duplicate/near_duplicate)
+CHANGE_COLUMN = 'change'
+# 중복/근접 중복 공고가 가리키는 기존 공고 키 컬럼 (그 외 공고는 빈 문자열)
+DUPLICATE_OF_COLUMN = 'duplicate_of'
+
+# SimHash: 본문(특수문자/공백 제거, 소문자)의 글자 3-gram 64비트 SimHash
+SIMHASH_BITS = 64
+# 근접 중복 검색 표: 64비트를 blocks개 블록으로 나누고 블록 key_blocks개 조합마다 정렬된 표를 둠
+# 해밍 거리 max_distance 이하인 두 SimHash는 바뀐 비트가 최대 max_distance개 블록에 있으므로,
+# max_distance <= blocks - key_blocks이면 바뀌지 않은 블록 key_blocks개가 반드시 남아 어느 한 표에서 같은 키를 가짐
+# (8블록 중 2블록 조합 = 28개 표, 16비트 키, 공고 200~300자에서 일부 문구 수정은 대부분 6비트 이내)
+# 표 키의 상위 비트에는 MATCH_COLUMNS 해시를 넣어, 같은 키 구간에는 공고명/소관기관이 같은 공고만 모이게 함
+DEFAULT_BLOCKS = 8
+DEFAULT_KEY_BLOCKS = 2
+DEFAULT_MAX_DISTANCE = 6
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 최종화 함수 (uint64 배열, 프로세스와 무관하게 같은 해시)"""
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def normalize_bodies(texts: pd.Series) -> List[str]:
+    """SimHash용 본문 정규화 (특수문자/공백 제거, 소문자) - 띄어쓰기나 문장부호만 다른 공고를 같게 봄"""
+    array = pa.array(texts.fillna("").astype(str), type=pa.large_string())
+    return pc.utf8_lower(pc.replace_substring_regex(array, NON_WORD_PATTERN, "")).to_pylist()
+
+
+def identity_hashes(data: pd.DataFrame, columns: Sequence[str]) -> List[int]:
+    """근접 중복 판정 대상을 묶는 컬럼 값(정규화 후)의 blake2b 64비트 해시 (없는 컬럼은 빈 문자열)"""
+    parts = [normalize_bodies(data[column]) if column in data.columns else [""] * len(data) for column in columns]
+    return [int.from_bytes(hashlib.blake2b("\x1f".join(values).encode('utf-8'), digest_size=8).digest(), 'little')
+            for values in zip(*parts)] if parts else [0] * len(data)
+
+
+# 바이트 값 -> 8비트 (해시 바이트별 히스토그램으로 문서별 비트 1의 개수를 셈)
+_BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder='little').astype(np.float32)
+
+
+def simhashes(texts: Sequence[str], shingle_size: int = 3, chunk_size: int = 1 << 21) -> np.ndarray:
+    """
+    글자 shingle_size-gram 64비트 SimHash (문서 여러 개를 한 번에 numpy로 계산)
+
+    유니코드 코드 포인트(21비트) shingle_size개(최대 3)를 한 정수로 묶어 해시하고, 비트별 다수결로 SimHash를 만듭니다.
+    비트별 개수는 shingle 해시 8바이트 각각의 문서별 히스토그램(bincount)에 바이트 -> 비트 표를 곱해 구합니다.
+    shingle_size보다 짧은 문서는 0입니다.
+    """
+    if not 1 <= shingle_size <= 3:
+        raise ValueError("shingle_size는 1~3이어야 합니다")
+    texts = [str(text) for text in texts]
+    lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    points = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype='<u4').astype(np.uint64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    counts = np.maximum(lengths - shingle_size + 1, 0)
+    result = np.zeros(len(texts), dtype=np.uint64)
+    start = 0
+    while start < len(texts):
+        # 글자 수 chunk_size 이내로 문서를 묶어 처리 (히스토그램 메모리 제한)
+        end = int(np.searchsorted(offsets, offsets[start] + chunk_size, side='right')) - 1
+        end = min(max(end, start + 1), len(texts))
+        n_docs = end - start
+        chunk = points[offsets[start]:offsets[end]]
+        if counts[start:end].sum():
+            # 연속 위치마다 shingle을 만들고, 문서 경계를 넘는 shingle은 버리는 칸(n_docs)으로 보냄
+            n = len(chunk) - shingle_size + 1
+            packed = chunk[:n].copy()
+            for i in range(1, shingle_size):
+                packed |= chunk[i:n + i] << np.uint64(21 * i)
+            hashes = _mix64(packed).view(np.uint8).reshape(-1, 8)
+            bins = np.repeat(np.arange(n_docs, dtype=np.int64), lengths[start:end])[:n]
+            if shingle_size > 1:
+                tails = offsets[start + 1:end + 1] - offsets[start]
+                for i in range(1, shingle_size):
+                    invalid = tails - i
+                    bins[invalid[(invalid >= 0) & (invalid < n)]] = n_docs
+            bins *= 256
+            ones = np.empty((n_docs + 1, 64), dtype=np.float32)
+            for lane in range(8):
+                histogram = np.bincount(bins + hashes[:, lane], minlength=(n_docs + 1) * 256).reshape(n_docs + 1, 256)
+                ones[:, lane * 8:(lane + 1) * 8] = histogram.astype(np.float32) @ _BYTE_BITS
+            chunk_counts = counts[start:end]
+            votes = (2 * ones[:n_docs] > chunk_counts[:, None]).astype(np.uint8)
+            hashed = np.packbits(votes, axis=1, bitorder='little').view('<u8').ravel()
+            result[start:end] = np.where(chunk_counts > 0, hashed, 0)
+        start = end
+    return result
+
+
+def content_hashes(data: pd.DataFrame, columns: Sequence[str]) -> List[str]:
+    """공고 내용 전체(columns 결합)의 blake2b 해시 (16진수 32자)"""
+    texts = combine_columns(data, columns).to_pylist()
+    return [hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest() for text in texts]
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class DedupResult(NamedTuple):
+    """ingest 결과"""
+    deltas: pd.DataFrame  # 처음 보는 키와 수정된 공고 (change/duplicate_of 컬럼)
+    inserted: int
+    updated: int
+    duplicates: int  # 다른 키로 들어온, 기존 공고와 내용이 완전히 같은 공고
+    near_duplicates: int  # 공고명/소관기관이 같고 본문 SimHash가 가까운 다른 키의 공고
+    duplicate_of: Dict[str, str]  # 중복/근접 중복 공고 키 -> 기존 공고 키
+    unchanged_keys: Tuple[str, ...] = ()  # 이미 기록한 키와 내용이 같은 공고 (재수집, deltas에 없음)
+
+    @property
+    def unchanged(self) -> int:
+        return len(self.unchanged_keys)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'inserted': self.inserted, 'updated': self.updated, 'unchanged': self.unchanged,
+            'duplicates': self.duplicates, 'near_duplicates': self.near_duplicates,
+        }
+
+    def new_rows(self) -> pd.DataFrame:
+        """검색 데이터에 반영할 공고 (새 공고/수정된 공고, change/duplicate_of 컬럼 제외)"""
+        rows = self.deltas[self.deltas[CHANGE_COLUMN].isin(['inserted', 'updated'])]
+        return rows.drop(columns=[CHANGE_COLUMN, DUPLICATE_OF_COLUMN]).reset_index(drop=True)
+
+
+class DedupIndex:
+    """
+    크롤링한 공고 중복 제거/변경 감지 인덱스
+
+    공고마다 (키, 내용 해시, 본문 SimHash, 공고명/소관기관 해시)를 기록하고 새 공고 묶음을 한 행씩 판정합니다.
+    - 키가 같고 내용도 마지막 기록과 같으면 재수집 (내보내지 않음)
+    - 키가 같고 내용이 다르면 수정된 공고 (이전 버전으로 되돌아간 공고 포함)
+    - 키가 처음이고 내용 해시가 이미 있으면 중복
+    - 키가 처음이고 공고명/소관기관이 같은 기존 공고와 본문 SimHash가 max_distance 비트 이내면 근접 중복
+      (예: 다른 ID로 다시 올린 공고, 지역만 다르고 본문 양식이 같은 공고는 공고명/소관기관이 달라 근접 중복이 아님)
+    - 나머지는 새 공고
+    중복/근접 중복도 버리지 않고 duplicate_of와 함께 deltas로 내보내므로, 호출한 쪽이 저장해 두고 나중에 판정을
+    되돌릴 수 있습니다 (검색 데이터에 반영할 공고는 DedupResult.new_rows).
+    내용 해시/키는 딕셔너리, SimHash는 블록 조합별 정렬 표의 이진 탐색(묶음 단위로 한 번에)으로 찾으므로
+    공고 하나 판정 비용은 보관한 공고 수에 대해 로그 수준입니다. 마지막 표 재구성 이후 추가/수정된 공고는
+    딕셔너리 버킷에 두고, 그 수가 전체의 1/16을 넘으면 ingest가 끝날 때 표를 다시 만듭니다.
+    """
+
+    def __init__(self, key_column: str, columns: Sequence[str], body_column: str = BODY_COLUMN,
+                 match_columns: Sequence[str] = MATCH_COLUMNS, blocks: int = DEFAULT_BLOCKS, key_blocks: int = DEFAULT_KEY_BLOCKS,
+                 max_distance: int = DEFAULT_MAX_DISTANCE, min_body_length: int = 30, max_bucket: int = 64):
+        """
+        Args:
+            key_column: 공고 식별자 컬럼 (크롤러는 pblanc_id, 챗봇은 policy_id)
+            columns: 내용 해시에 쓰는 컬럼 (이 중 하나라도 바뀌면 수정된 공고)
+            body_column: SimHash를 계산할 본문 컬럼
+            match_columns: 근접 중복으로 보려면 값이 같아야 하는 컬럼 (정규화 후 비교)
+            blocks, key_blocks: 근접 중복 검색 표 구성 (max_distance <= blocks - key_blocks)
+            max_distance: 근접 중복으로 볼 SimHash 해밍 거리
+            min_body_length: 정규화한 본문이 이보다 짧으면 근접 중복 판정 생략 (빈 본문끼리 묶이지 않도록)
+            max_bucket: 표마다 같은 키에서 비교할 공고 수 상한 (흔한 본문 양식으로 키가 몰려도 비교 횟수 제한)
+        """
+        if max_distance > blocks - key_blocks:
+            raise ValueError(f"max_distance({max_distance})는 blocks - key_blocks({blocks - key_blocks}) 이하여야 합니다")
+        self.key_column = key_column
+        self.columns = list(columns)
+        self.body_column = body_column
+        self.match_columns = list(match_columns)
+        self.max_distance = max_distance
+        self.min_body_length = min_body_length
+        self.max_bucket = max_bucket
+        # 블록별 (시작 비트, 비트 수) 및 표별 블록 조합
+        edges = np.linspace(0, SIMHASH_BITS, blocks + 1).astype(int)
+        self._blocks = [(int(edges[i]), int(edges[i + 1] - edges[i])) for i in range(blocks)]
+        self._tables = list(itertools.combinations(range(blocks), key_blocks))
+        # 표 키 = (공고명/소관기관 해시 상위 비트 << 블록 키 비트 수) | 블록 키
+        self._block_key_bits = max(sum(self._blocks[block][1] for block in combination) for combination in self._tables)
+        self._identity_mask = (1 << (SIMHASH_BITS - self._block_key_bits)) - 1
+        self._keys: List[str] = []
+        self._simhashes: List[int] = []
+        self._identities: List[int] = []
+        self._contents: List[str] = []  # 키별 마지막 내용 해시
+        self._rows_by_key: Dict[str, int] = {}
+        self._rows_by_content: Dict[str, int] = {}
+        # 정렬된 표 (표 수, 공고 수): 키와 행 번호, 재구성 이후 추가/수정된 행
+        self._table_keys = np.empty((len(self._tables), 0), dtype=np.uint64)
+        self._table_rows = np.empty((len(self._tables), 0), dtype=np.int64)
+        self._pending = 0
+        self._pending_buckets: List[Dict[int, List[int]]] = [{} for _ in self._tables]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _table_key_values(self, simhashes: np.ndarray, identities: np.ndarray) -> np.ndarray:
+        """SimHash/공고명·소관기관 해시 배열 -> (표 수, 공고 수) 표 키"""
+        parts = [(simhashes >> np.uint64(start)) & np.uint64((1 << size) - 1) for start, size in self._blocks]
+        prefix = (identities & np.uint64(self._identity_mask)) << np.uint64(self._block_key_bits)
+        keys = np.empty((len(self._tables), len(simhashes)), dtype=np.uint64)
+        for t, combination in enumerate(self._tables):
+            key = np.zeros(len(simhashes), dtype=np.uint64)
+            for block in combination:
+                key = (key << np.uint64(self._blocks[block][1])) | parts[block]
+            keys[t] = prefix | key
+        return keys
+
+    def _table_keys_of(self, simhash: int, identity: int) -> List[int]:
+        """SimHash 하나의 표별 키 (_table_key_values와 같은 값, 파이썬 정수 연산)"""
+        parts = [(simhash >> start) & ((1 << size) - 1) for start, size in self._blocks]
+        prefix = (identity & self._identity_mask) << self._block_key_bits
+        keys = []
+        for combination in self._tables:
+            key = 0
+            for block in combination:
+                key = (key << self._blocks[block][1]) | parts[block]
+            keys.append(prefix | key)
+        return keys
+
+    def _rebuild_tables(self):
+        simhashes = np.array(self._simhashes, dtype=np.uint64)
+        rows = np.flatnonzero(simhashes)
+        keys = self._table_key_values(simhashes[rows], np.array(self._identities, dtype=np.uint64)[rows])
+        order = np.argsort(keys, axis=1, kind='stable')
+        self._table_keys = np.take_along_axis(keys, order, axis=1)
+        self._table_rows = rows[order]
+        self._pending = 0
+        self._pending_buckets = [{} for _ in self._tables]
+
+    def _lookup(self, simhashes: Sequence[int], identities: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """정렬 표에서 SimHash 여러 개의 표별 같은 키 구간 [lo, hi) - (표 수, 개수) 배열 두 개"""
+        keys = self._table_key_values(np.array(simhashes, dtype=np.uint64), np.array(identities, dtype=np.uint64))
+        lo, hi = np.empty(keys.shape, dtype=np.int64), np.empty(keys.shape, dtype=np.int64)
+        for t in range(len(self._tables)):
+            lo[t] = np.searchsorted(self._table_keys[t], keys[t], side='left')
+            hi[t] = np.searchsorted(self._table_keys[t], keys[t], side='right')
+        return lo, hi
+
+    def _nearest(self, simhash: int, identity: int, lo: Sequence[int], hi: Sequence[int]) -> Optional[int]:
+        """공고명/소관기관이 같고 해밍 거리 max_distance 이내인 가장 가까운 기존 공고 행 (lo/hi: _lookup 결과 중 이 공고의 열)"""
+        candidates = set()
+        for t, key in enumerate(self._table_keys_of(simhash, identity)):
+            candidates.update(self._pending_buckets[t].get(key, ()))
+            if hi[t] > lo[t]:
+                candidates.update(self._table_rows[t, lo[t]:min(hi[t], lo[t] + self.max_bucket)].tolist())
+        best, best_distance = None, self.max_distance + 1
+        for row in candidates:
+            # 수정된 공고는 정렬 표에 이전 SimHash로 남아 있으므로 현재 값으로 비교
+            current = self._simhashes[row]
+            if current and self._identities[row] == identity:
+                distance = hamming(simhash, current)
+                if distance < best_distance:
+                    best, best_distance = row, distance
+        return best
+
+    def _fingerprints(self, data: pd.DataFrame) -> Tuple[List[str], List[str], List[int], List[int]]:
+        keys = data[self.key_column].astype(str).tolist()
+        contents = content_hashes(data, self.columns)
+        bodies = normalize_bodies(data[self.body_column]) if self.body_column in data.columns else [""] * len(data)
+        hashes = simhashes(bodies).tolist()
+        hashes = [simhash if len(body) >= self.min_body_length else 0 for simhash, body in zip(hashes, bodies)]
+        return keys, contents, hashes, identity_hashes(data, self.match_columns)
+
+    def _record(self, key: str, content: str, simhash: int, identity: int, bucket: bool = True):
+        row = self._rows_by_key.get(key)
+        if row is None:
+            row = len(self._keys)
+            self._keys.append(key)
+            self._simhashes.append(simhash)
+            self._identities.append(identity)
+            self._contents.append(content)
+            self._rows_by_key[key] = row
+        else:
+            self._simhashes[row] = simhash
+            self._identities[row] = identity
+            self._contents[row] = content
+        # 같은 내용의 공고가 여럿이면 처음 기록한 공고를 중복 원본으로 유지
+        self._rows_by_content.setdefault(content, row)
+        if simhash and bucket:
+            for t, table_key in enumerate(self._table_keys_of(simhash, identity)):
+                self._pending_buckets[t].setdefault(table_key, []).append(row)
+            self._pending += 1
+
+    def add(self, data: pd.DataFrame):
+        """판정 없이 공고 기록 (이미 반영된 데이터로 인덱스를 채울 때, 같은 키는 나중 값 사용)"""
+        for key, content, simhash, identity in zip(*self._fingerprints(data)):
+            self._record(key, content, simhash, identity, bucket=False)
+        self._rebuild_tables()
+
+    def ingest(self, data: pd.DataFrame) -> DedupResult:
+        """
+        새 공고 묶음을 판정해 처음 보는 키(새 공고/중복/근접 중복)와 수정된 공고를 반환하고 인덱스에 기록
+
+        재수집한 공고(키와 내용이 마지막 기록과 같음)만 빠지므로, 반환한 deltas를 저장하면 처음 보는 공고는
+        모두 남습니다. 같은 묶음 안의 중복도 앞 행 기준으로 판정합니다.
+        """
+        data = data.reset_index(drop=True)
+        changes = np.full(len(data), "", dtype=object)
+        originals = np.full(len(data), "", dtype=object)
+        unchanged = []
+        keys, contents, hashes, identities = self._fingerprints(data)
+        lo, hi = self._lookup(hashes, identities)
+        for i, (key, content, simhash, identity) in enumerate(zip(keys, contents, hashes, identities)):
+            row = self._rows_by_key.get(key)
+            if row is not None:
+                if self._contents[row] == content:
+                    unchanged.append(key)
+                    continue
+                changes[i] = 'updated'
+            elif content in self._rows_by_content:
+                changes[i] = 'duplicate'
+                originals[i] = self._keys[self._rows_by_content[content]]
+            else:
+                nearest = self._nearest(simhash, identity, lo[:, i], hi[:, i]) if simhash else None
+                if nearest is not None:
+                    changes[i] = 'near_duplicate'
+                    originals[i] = self._keys[nearest]
+                else:
+                    changes[i] = 'inserted'
+            # 중복/근접 중복은 다른 공고의 근접 중복 원본이 되지 않도록 SimHash 없이 기록
+            self._record(key, content, 0 if originals[i] else simhash, identity)
+        if self._pending > max(256, len(self._keys) // 16):
+            self._rebuild_tables()
+
+        # 같은 묶음에서 처음 들어온 뒤 다시 수정된 공고는 처음 판정으로 한 번만 내보냄 (마지막 값)
+        delta_rows = np.flatnonzero(changes != "")
+        deltas = data.iloc[delta_rows].assign(**{CHANGE_COLUMN: changes[delta_rows], DUPLICATE_OF_COLUMN: originals[delta_rows]})
+        keys = deltas[self.key_column].astype(str)
+        for column in (CHANGE_COLUMN, DUPLICATE_OF_COLUMN):
+            deltas[column] = deltas.groupby(keys, sort=False)[column].transform('first')
+        deltas = deltas[~keys.duplicated(keep='last')].reset_index(drop=True)
+        counts = deltas[CHANGE_COLUMN].value_counts()
+        duplicate_of = dict(zip(deltas.loc[deltas[DUPLICATE_OF_COLUMN] != "", self.key_column].astype(str),
+                                deltas.loc[deltas[DUPLICATE_OF_COLUMN] != "", DUPLICATE_OF_COLUMN]))
+        return DedupResult(deltas, int(counts.get('inserted', 0)), int(counts.get('updated', 0)),
+                           int(counts.get('duplicate', 0)), int(counts.get('near_duplicate', 0)), duplicate_of, tuple(unchanged))
+
+    def save(self, path: str):
+        """npz 파일로 저장 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+        contents = list(self._rows_by_content.items())
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, keys=np.array(self._keys, dtype=str), simhashes=np.array(self._simhashes, dtype=np.uint64),
+                         identities=np.array(self._identities, dtype=np.uint64),
+                         row_contents=np.array(self._contents, dtype='S32'),
+                         contents=np.array([content for content, _ in contents], dtype='S32'),
+                         content_rows=np.array([row for _, row in contents], dtype=np.int64),
+                         config=np.array([self.key_column, self.body_column] + self.columns, dtype=str),
+                         match_columns=np.array(self.match_columns, dtype=str))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "DedupIndex":
+        """npz 파일에서 로드 (kwargs: max_distance 등)"""
+        with np.load(path, allow_pickle=False) as f:
+            config = f['config'].tolist()
+            index = cls(config[0], config[2:], body_column=config[1], match_columns=f['match_columns'].tolist(), **kwargs)
+            index._keys = f['keys'].tolist()
+            index._simhashes = f['simhashes'].tolist()
+            index._identities = f['identities'].tolist()
+            index._contents = [content.decode('ascii') for content in f['row_contents']]
+            index._rows_by_key = {key: row for row, key in enumerate(index._keys)}
+            index._rows_by_content = dict(zip((content.decode('ascii') for content in f['contents']),
+                                              f['content_rows'].tolist()))
+        index._rebuild_tables()
+        return index
+
+    @classmethod
+    def load_or_create(cls, path: str, key_column: str, columns: Sequence[str],
+                       match_columns: Sequence[str] = MATCH_COLUMNS, **kwargs) -> "DedupIndex":
+        """저장된 인덱스가 같은 키/컬럼 설정이면 로드, 없거나 다르면(이전 형식 포함) 빈 인덱스"""
+        if os.path.exists(path):
+            try:
+                index = cls.load(path, **kwargs)
+                if (index.key_column == key_column and index.columns == list(columns)
+                        and index.match_columns == list(match_columns)):
+                    return index
+                print(f"중복 제거 인덱스 설정이 달라 새로 만듭니다: {path}")
+            except (ValueError, OSError, KeyError) as e:
+                print(f"중복 제거 인덱스 로드 실패, 새로 만듭니다: {e}")
+        return cls(key_column, columns, match_columns=match_columns, **kwargs)
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import Callable, List, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """모델명 + 행별 텍스트 해시를 키로 하는 디스크 임베딩 캐시
+
+    `<CSV 이름>.<모델명>.embcache.npy` 파일 하나에 (키, 벡터) 레코드를 저장합니다.
+    파일은 메모리 매핑으로 읽고, 새로 추가되거나 바뀐 행만 인코딩한 뒤 임시 파일 교체
+    방식으로 저장하므로 여러 프로세스가 같은 캐시를 공유해도 반쯤 쓰인 파일을 읽지 않습니다.
+    """
+
+    # blake2b 16바이트 다이제스트의 16진수 문자열 (NUL 바이트가 잘리지 않도록 16진수로 저장)
+    key_size = 32
+
+    def __init__(self, cache_dir: str, model_name: str, prefix: str = "policies"):
+        """
+        Args:
+            cache_dir: 캐시 파일을 저장할 디렉토리 (보통 CSV와 같은 위치)
+            model_name: 임베딩 모델명 (모델이 바뀌면 다른 캐시 파일 사용)
+            prefix: 캐시 파일명 앞부분 (보통 CSV 파일명)
+        """
+        self.cache_dir = cache_dir
+        self.model_name = model_name
+        model_slug = re.sub(r'[^\w.-]+', '_', model_name)
+        self.path = os.path.join(cache_dir, f"{prefix}.{model_slug}.embcache.npy")
+
+    @classmethod
+    def for_csv(cls, csv_path: str, model_name: str, cache_dir: Optional[str] = None,
+                kind: Optional[str] = None) -> "EmbeddingCache":
+        """CSV 파일 옆(또는 cache_dir)에 위치하는 캐시 생성 (kind: 정책 임베딩과 따로 두는 캐시 이름, 예: passages)"""
+        prefix = os.path.splitext(os.path.basename(csv_path))[0]
+        if kind:
+            prefix = f"{prefix}.{kind}"
+        return cls(cache_dir or os.path.dirname(os.path.abspath(csv_path)), model_name, prefix)
+
+    @classmethod
+    def text_key(cls, text: str) -> bytes:
+        """텍스트 내용 해시 키"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=cls.key_size // 2).hexdigest().encode('ascii')
+
+    def load(self) -> Optional[np.ndarray]:
+        """캐시 레코드 배열을 메모리 매핑으로 로드 (없거나 손상되면 None)"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            return np.load(self.path, mmap_mode='r')
+        except (ValueError, OSError) as e:
+            print(f"임베딩 캐시 로드 실패, 다시 생성합니다: {e}")
+            return None
+
+    def save(self, keys: List[bytes], embeddings: np.ndarray):
+        """(키, 벡터) 레코드를 임시 파일에 쓴 뒤 원자적으로 교체"""
+        records = np.empty(len(keys), dtype=self._dtype(embeddings.shape[1]))
+        records['key'] = keys
+        records['embedding'] = embeddings
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, records)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_or_encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        캐시에 있는 텍스트는 그대로 쓰고, 없는 텍스트만 encode_fn으로 인코딩
+
+        Args:
+            texts: 임베딩할 텍스트 목록
+            encode_fn: 텍스트 목록 -> float32 임베딩 배열 함수
+
+        Returns:
+            texts 순서대로 정렬된 임베딩 배열
+        """
+        keys = [self.text_key(text) for text in texts]
+        records = self.load()
+
+        positions = np.full(len(keys), -1, dtype='int64')
+        if records is not None and len(records):
+            lookup = {key: i for i, key in enumerate(records['key'].tolist())}
+            positions = np.fromiter((lookup.get(key, -1) for key in keys), dtype='int64', count=len(keys))
+
+        missing = np.flatnonzero(positions < 0)
+        if len(missing) == 0:
+            print(f"임베딩 캐시 사용: {len(keys)}개 전체 재사용")
+            return np.ascontiguousarray(records['embedding'][positions], dtype='float32')
+
+        print(f"임베딩 캐시: {len(keys) - len(missing)}개 재사용, {len(missing)}개 새로 인코딩")
+        new_embeddings = np.asarray(encode_fn([texts[i] for i in missing]), dtype='float32')
+        embeddings = np.empty((len(keys), new_embeddings.shape[1]), dtype='float32')
+        embeddings[missing] = new_embeddings
+        hit = np.flatnonzero(positions >= 0)
+        if len(hit):
+            embeddings[hit] = records['embedding'][positions[hit]]
+
+        # 현재 데이터의 행만 남겨서 저장 (삭제된 행은 캐시에서도 제거)
+        self.save(keys, embeddings)
+        return embeddings
+
+    def _dtype(self, dimension: int) -> np.dtype:
+        return np.dtype([('key', f'S{self.key_size}'), ('embedding', 'float32', (dimension,))])
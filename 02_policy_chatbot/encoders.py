@@ -0,0 +1,323 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+# 인코더 백엔드
+#   sentence_transformers - SentenceTransformer(PyTorch fp32, 기본값)
+#   onnx                  - SentenceTransformer의 트랜스포머를 ONNX로 내보내 동적 int8 양자화 후 onnxruntime(CPU)으로 실행
+ENCODER_BACKENDS = ("sentence_transformers", "onnx")
+
+# ONNX 내보내기 디렉토리 구성
+#   encoder_config.json - 모델명, 풀링 방식, 최대 토큰 길이, 차원
+#   model.onnx          - fp32 트랜스포머 (입력: input_ids/attention_mask[/token_type_ids], 출력: last_hidden_state)
+#   model.int8.onnx     - 가중치 동적 int8 양자화 모델
+#   tokenizer 파일들    - AutoTokenizer.save_pretrained 결과
+ONNX_CONFIG_FILE = "encoder_config.json"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_FILE = "model.int8.onnx"
+ONNX_FORMAT_VERSION = 1
+
+_ONNX_INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def default_onnx_dir(model_name: str) -> str:
+    """모델별 ONNX 내보내기 디렉토리 (POLICY_ONNX_DIR 또는 ~/.cache/policy_chatbot/onnx 아래)"""
+    root = os.getenv("POLICY_ONNX_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "policy_chatbot", "onnx")
+    return os.path.join(root, re.sub(r'[^\w.-]+', '_', model_name))
+
+
+def read_onnx_config(model_dir: str) -> Optional[Dict]:
+    """내보낸 ONNX 모델 설정 (없거나 포맷이 다르면 None)"""
+    try:
+        with open(os.path.join(model_dir, ONNX_CONFIG_FILE), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return config if config.get("format_version") == ONNX_FORMAT_VERSION else None
+
+
+def export_onnx(model_name: str, model_dir: str, quantize: bool = True, opset: int = 14) -> Dict:
+    """
+    SentenceTransformer 모델을 ONNX로 내보내고 동적 int8 양자화
+
+    트랜스포머 본체만 ONNX로 내보내고 풀링(mean/cls/max)과 정규화는 numpy로 처리합니다.
+    임시 디렉토리에 쓴 뒤 이름을 바꾸므로 여러 워커가 동시에 내보내도 반쯤 쓰인 모델을 읽지 않습니다.
+
+    Args:
+        model_name: SentenceTransformer 모델명
+        model_dir: 내보낼 디렉토리
+        quantize: int8 양자화 모델도 만들지 여부
+        opset: ONNX opset 버전
+
+    Returns:
+        저장된 encoder_config
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device='cpu')
+    modules = [type(module).__name__ for module in model]
+    if modules[:2] != ["Transformer", "Pooling"] or any(name not in ("Normalize",) for name in modules[2:]):
+        raise ValueError(f"ONNX로 내보낼 수 없는 모듈 구성입니다: {modules}")
+    pooling_mode = model[1].get_pooling_mode_str()
+    if pooling_mode not in ("mean", "cls", "max"):
+        raise ValueError(f"지원하지 않는 풀링 방식: {pooling_mode}")
+
+    tokenizer = model.tokenizer
+    transformer = model[0].auto_model.eval()
+    sample = tokenizer(["소상공인 정책 검색 예시 문장"], return_tensors='pt')
+    input_names = [name for name in _ONNX_INPUT_NAMES if name in sample]
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs)))[0]
+
+    model_dir = os.path.abspath(model_dir)
+    parent = os.path.dirname(model_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=os.path.basename(model_dir) + ".tmp-")
+    try:
+        print(f"ONNX 내보내기 중: {model_name}")
+        onnx_path = os.path.join(tmp_dir, ONNX_MODEL_FILE)
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names + ['last_hidden_state']}
+        with torch.no_grad():
+            torch.onnx.export(_LastHiddenState(), tuple(sample[name] for name in input_names), onnx_path,
+                              input_names=input_names, output_names=['last_hidden_state'],
+                              dynamic_axes=dynamic_axes, opset_version=opset, do_constant_folding=True)
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            quantize_dynamic(onnx_path, os.path.join(tmp_dir, ONNX_QUANTIZED_FILE), weight_type=QuantType.QInt8)
+        tokenizer.save_pretrained(tmp_dir)
+
+        config = {
+            "format_version": ONNX_FORMAT_VERSION,
+            "model_name": model_name,
+            "dimension": int(model.get_sentence_embedding_dimension()),
+            "max_seq_length": int(model.max_seq_length),
+            "pooling": pooling_mode,
+            "normalize": "Normalize" in modules,
+            "quantized": quantize,
+        }
+        with open(os.path.join(tmp_dir, ONNX_CONFIG_FILE), 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+
+        if os.path.exists(model_dir):
+            shutil.rmtree(model_dir, ignore_errors=True)
+        try:
+            os.rename(tmp_dir, model_dir)
+        except OSError:
+            # 다른 워커가 먼저 내보낸 경우 그 결과를 사용
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        print(f"ONNX 내보내기 완료: {model_dir}")
+        return config
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def ensure_onnx_model(model_name: str, model_dir: Optional[str] = None, quantize: bool = True) -> str:
+    """model_dir에 같은 모델의 ONNX 내보내기가 없으면 생성하고 디렉토리 반환"""
+    model_dir = model_dir or default_onnx_dir(model_name)
+    config = read_onnx_config(model_dir)
+    if (config is None or config.get("model_name") != model_name
+            or (quantize and not os.path.exists(os.path.join(model_dir, ONNX_QUANTIZED_FILE)))):
+        export_onnx(model_name, model_dir, quantize=quantize)
+    return model_dir
+
+
+def pool_embeddings(hidden: np.ndarray, attention_mask: np.ndarray, mode: str = "mean") -> np.ndarray:
+    """토큰 임베딩 (batch, seq, d) -> 문장 임베딩 (batch, d), 패딩 토큰 제외"""
+    if mode == "cls":
+        return hidden[:, 0]
+    mask = attention_mask[..., None].astype(hidden.dtype)
+    if mode == "max":
+        return np.where(mask > 0, hidden, np.finfo(hidden.dtype).min).max(axis=1)
+    return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+class OnnxEncoder:
+    """onnxruntime(CPU)으로 실행하는 SentenceTransformer 호환 인코더
+
+    encode()/get_sentence_embedding_dimension()이 SentenceTransformer와 같으므로
+    PolicyChatbot에서 모델 대신 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = True, num_threads: Optional[int] = None):
+        """
+        Args:
+            model_dir: export_onnx로 내보낸 디렉토리
+            quantized: int8 양자화 모델 사용 여부 (False면 fp32 ONNX)
+            num_threads: onnxruntime 연산 스레드 수 (None이면 onnxruntime 기본값)
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.config = read_onnx_config(model_dir)
+        if self.config is None:
+            raise ValueError(f"ONNX 인코더 설정이 없습니다: {model_dir}")
+        self.model_name = self.config["model_name"]
+        self.max_seq_length = self.config["max_seq_length"]
+        self.quantized = quantized
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        model_file = ONNX_QUANTIZED_FILE if quantized else ONNX_MODEL_FILE
+        self.session = ort.InferenceSession(os.path.join(model_dir, model_file), options,
+                                            providers=['CPUExecutionProvider'])
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        # fast 토크나이저는 여러 스레드가 동시에 padding/truncation을 쓰면 충돌하므로 직렬화
+        self._tokenizer_lock = threading.Lock()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dimension"]
+
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """
+        문장 임베딩 생성 (SentenceTransformer.encode와 같은 인자/반환 형태)
+
+        길이가 비슷한 문장끼리 배치로 묶어 패딩을 줄입니다.
+        """
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else [str(sentence) for sentence in sentences]
+        embeddings = np.zeros((len(sentences), self.get_sentence_embedding_dimension()), dtype='float32')
+
+        order = np.argsort([-len(sentence) for sentence in sentences], kind='stable')
+        for start in range(0, len(sentences), batch_size):
+            batch = order[start:start + batch_size]
+            with self._tokenizer_lock:
+                encoded = self.tokenizer([sentences[i] for i in batch], padding=True, truncation=True,
+                                         max_length=self.max_seq_length, return_tensors='np')
+            feeds = {}
+            for name in self.input_names:
+                if name in encoded:
+                    feeds[name] = np.asarray(encoded[name], dtype='int64')
+                else:
+                    feeds[name] = np.zeros_like(encoded['input_ids'], dtype='int64')
+            hidden = self.session.run(None, feeds)[0]
+            embeddings[batch] = pool_embeddings(hidden, encoded['attention_mask'], self.config["pooling"])
+
+        if normalize_embeddings or self.config.get("normalize"):
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings[0] if single else embeddings
+
+
+def load_encoder(model_name: str, backend: str = "sentence_transformers", onnx_dir: Optional[str] = None,
+                 quantize: bool = True, num_threads: Optional[int] = None):
+    """
+    인코더 생성
+
+    Args:
+        model_name: SentenceTransformer 모델명
+        backend: "sentence_transformers" 또는 "onnx" (onnxruntime/torch가 없으면 sentence_transformers로 대체)
+        onnx_dir: ONNX 내보내기 디렉토리 (기본값: default_onnx_dir)
+        quantize: onnx 백엔드에서 int8 양자화 모델 사용 여부
+        num_threads: onnxruntime 연산 스레드 수
+
+    Returns:
+        encode()/get_sentence_embedding_dimension()을 제공하는 인코더
+    """
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"지원하지 않는 인코더 백엔드: {backend} (가능: {', '.join(ENCODER_BACKENDS)})")
+    if backend == "onnx":
+        try:
+            model_dir = ensure_onnx_model(model_name, onnx_dir, quantize=quantize)
+            return OnnxEncoder(model_dir, quantized=quantize, num_threads=num_threads)
+        except ImportError as e:
+            print(f"ONNX 인코더를 사용할 수 없어 sentence-transformers 인코더를 사용합니다: {e}")
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def _encode_each_ms(encoder, queries: List[str]) -> float:
+    """쿼리를 한 건씩 인코딩할 때 평균 지연 시간(ms) (검색 요청과 같은 조건)"""
+    start = time.perf_counter()
+    for query in queries:
+        encoder.encode([query])
+    return (time.perf_counter() - start) * 1000.0 / len(queries)
+
+
+def compare_encoders(reference, candidate, doc_embeddings: np.ndarray, queries: List[str], k: int = 10) -> Dict:
+    """
+    후보 인코더(예: int8 ONNX)의 쿼리 임베딩이 기준 인코더(fp32)와 같은 순위를 내는지 비교
+
+    문서 임베딩은 기준 모델로 만든 것을 그대로 쓰고(임베딩 캐시/번들), 쿼리만 두 인코더로 인코딩해
+    코사인 유사도 상위 k개 문서의 겹침(recall@k)과 1위 일치율, 쿼리 임베딩 코사인, 지연 시간을 잽니다.
+
+    Args:
+        reference: 기준 인코더 (SentenceTransformer fp32)
+        candidate: 비교할 인코더
+        doc_embeddings: L2 정규화된 문서 임베딩 (n, d)
+        queries: 검색어 목록
+        k: 비교할 상위 문서 수
+
+    Returns:
+        recall@k, top1 일치율, 쿼리 임베딩 코사인(평균/최소), 쿼리당 평균 인코딩 시간(ms)과 속도 비율
+    """
+    def normalized(embeddings):
+        embeddings = np.asarray(embeddings, dtype='float32').reshape(len(queries), -1)
+        return embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+    ref_embs = normalized(reference.encode(queries))
+    cand_embs = normalized(candidate.encode(queries))
+    doc_embeddings = np.asarray(doc_embeddings, dtype='float32')
+    k = min(k, len(doc_embeddings))
+
+    ref_top = np.argsort(-(ref_embs @ doc_embeddings.T), axis=1, kind='stable')[:, :k]
+    cand_top = np.argsort(-(cand_embs @ doc_embeddings.T), axis=1, kind='stable')[:, :k]
+    overlap = [len(np.intersect1d(ref_row, cand_row)) / float(k) for ref_row, cand_row in zip(ref_top, cand_top)]
+    query_cosine = (ref_embs * cand_embs).sum(axis=1)
+
+    reference_ms = _encode_each_ms(reference, queries)
+    candidate_ms = _encode_each_ms(candidate, queries)
+    return {
+        "queries": len(queries),
+        "k": k,
+        "recall": float(np.mean(overlap)),
+        "top1_agreement": float(np.mean(ref_top[:, 0] == cand_top[:, 0])),
+        "query_cosine_mean": float(query_cosine.mean()),
+        "query_cosine_min": float(query_cosine.min()),
+        "reference_ms": reference_ms,
+        "candidate_ms": candidate_ms,
+        "speedup": reference_ms / candidate_ms if candidate_ms else None,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from policy_chatbot import DEFAULT_CSV_PATH, DEFAULT_MODEL_NAME, PolicyChatbot
+
+    parser = argparse.ArgumentParser(description="int8 ONNX 쿼리 인코더 정확도/속도 비교 (fp32 SentenceTransformer 기준)")
+    parser.add_argument("--csv", default=DEFAULT_CSV_PATH, help="정책 데이터 CSV 경로")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME, help="임베딩 모델명")
+    parser.add_argument("--onnx-dir", default=None, help="ONNX 내보내기 디렉토리")
+    parser.add_argument("--no-quantize", action="store_true", help="양자화하지 않은 fp32 ONNX 모델과 비교")
+    parser.add_argument("--threads", type=int, default=None, help="onnxruntime 연산 스레드 수")
+    parser.add_argument("--sample", type=int, default=200, help="검색어로 쓸 정책 공고명 수")
+    parser.add_argument("--k", type=int, default=10, help="비교할 상위 문서 수")
+    args = parser.parse_args()
+
+    chatbot = PolicyChatbot(csv_path=args.csv, model_name=args.model, hybrid_search=False)
+    titles = chatbot.data['title(공고명)'].astype(str)
+    queries = titles.sample(min(args.sample, len(titles)), random_state=0).tolist()
+    candidate = load_encoder(chatbot.model_name, "onnx", onnx_dir=args.onnx_dir,
+                             quantize=not args.no_quantize, num_threads=args.threads)
+
+    report = compare_encoders(chatbot.model, candidate, chatbot.embeddings, queries, k=args.k)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
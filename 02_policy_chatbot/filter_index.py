@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+from region_resolver import RegionResolver
+
+
+class PolicyFilterIndex:
+    """지역/지원대상/지원분야 필터용 사전 계산 마스크 인덱스
+
+    로드 시점에 필터 대상 컬럼을 배열/정수 코드로 변환하고 정책별 지역 코드를 계산해 두어,
+    검색 시에는 행 단위 pandas 접근 없이 불리언 마스크 연산만으로 필터링합니다.
+    """
+
+    def __init__(self, data: pd.DataFrame, region_resolver: RegionResolver, max_cached_masks: int = 256):
+        """
+        Args:
+            data: 정책 데이터프레임
+            region_resolver: 지역명 <-> 행정구역 코드 변환기
+            max_cached_masks: 지원대상/지원분야 필터 값별로 보관할 마스크 최대 개수
+        """
+        self.size = len(data)
+        self.region_resolver = region_resolver
+        self.max_cached_masks = max_cached_masks
+
+        self._org = data['소관기관'].astype(str).to_numpy()
+
+        # 지원대상/지원분야(대)는 고유값이 적으므로 고유값 -> 행 코드 역색인으로 보관
+        self._target_codes, self._target_values = pd.factorize(data['지원대상'].astype(str))
+        self._field_codes, self._field_values = pd.factorize(data['지원분야(대)'].astype(str))
+        self._target_masks = {}
+        self._field_masks = {}
+
+        # 정책별 지역 코드 (적재 시 한 번만 계산, 지역 코드 -> 행 번호 역색인)
+        # 1. 소관기관이 해당 지역(포천시)이면 포함
+        # 2. 소관기관이 상위 지역(경기도, 전국)이면 정책명/본문에 언급된 하위 지역(포천시)도 포함
+        # 3. 그 외(다른 시/군)는 제외
+        rows, codes = [], []
+        for row, (org, title, body) in enumerate(zip(self._org, data['title(공고명)'].astype(str), data['body_text(공고내용)'].astype(str))):
+            for code in region_resolver.policy_codes(org, title, body):
+                rows.append(row)
+                codes.append(code)
+        self._region_rows = np.asarray(rows, dtype='int64')
+        self._region_codes = np.asarray(codes, dtype='int64')
+        order = np.argsort(self._region_codes, kind='stable')
+        unique_codes, starts = np.unique(self._region_codes[order], return_index=True)
+        self._rows_by_code = dict(zip(unique_codes.tolist(), np.split(self._region_rows[order], starts[1:])))
+        self._region_masks = {}
+
+    def _build_region_mask(self, region: str) -> np.ndarray:
+        """지역 필터 마스크 생성 (지역 코드 역색인 조회, 코드표에 없는 지역은 소관기관 이름 일치)"""
+        code = self.region_resolver.code(region)
+        if code is None:
+            return self._org == region
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self._rows_by_code.get(code, [])] = True
+        return mask
+
+    def _value_mask(self, cache: Dict[str, np.ndarray], codes: np.ndarray, values: pd.Index, needle: str) -> np.ndarray:
+        """고유값 중 needle을 포함하는 값들의 행 마스크 (부분 문자열 일치)"""
+        mask = cache.get(needle)
+        if mask is None:
+            hits = [code for code, value in enumerate(values) if needle in value]
+            mask = np.isin(codes, hits)
+            if len(cache) >= self.max_cached_masks:
+                cache.clear()
+            cache[needle] = mask
+        return mask
+
+    def region_mask(self, region: str) -> np.ndarray:
+        """지역 필터 마스크"""
+        mask = self._region_masks.get(region)
+        if mask is None:
+            mask = self._build_region_mask(region)
+            if len(self._region_masks) >= self.max_cached_masks:
+                self._region_masks.clear()
+            self._region_masks[region] = mask
+        return mask
+
+    def target_mask(self, target: str) -> np.ndarray:
+        """지원대상 필터 마스크"""
+        return self._value_mask(self._target_masks, self._target_codes, self._target_values, target)
+
+    def field_mask(self, field: str) -> np.ndarray:
+        """지원분야(대) 필터 마스크"""
+        return self._value_mask(self._field_masks, self._field_codes, self._field_values, field)
+
+    def mask(self, region_filter: Optional[str] = None, target_filter: Optional[str] = None,
+             field_filter: Optional[str] = None) -> Optional[np.ndarray]:
+        """모든 필터를 AND로 결합한 마스크 (필터가 없으면 None)"""
+        masks = []
+        if region_filter:
+            masks.append(self.region_mask(region_filter))
+        if target_filter:
+            masks.append(self.target_mask(target_filter))
+        if field_filter:
+            masks.append(self.field_mask(field_filter))
+        if not masks:
+            return None
+        combined = masks[0].copy()
+        for mask in masks[1:]:
+            combined &= mask
+        return combined
@@ -10,27 +10,26 @@ def initialize_chatbot():
     global chatbot
     if chatbot is None:
         chatbot = PolicyChatbot()
+        chatbot.warmup()
     return "✅ 챗봇이 준비되었습니다!"
 
 def search_policies(query, top_k=5, similarity_threshold=0.0):
-    """정책 검색"""
+    """정책 검색 (순위가 정해진 정책부터 화면에 바로 표시)"""
     global chatbot
     if chatbot is None:
-        return "❌ 챗봇이 초기화되지 않았습니다. 먼저 초기화해주세요."
+        yield "❌ 챗봇이 초기화되지 않았습니다. 먼저 초기화해주세요."
+        return
     
     if not query.strip():
-        return "❌ 검색어를 입력해주세요."
+        yield "❌ 검색어를 입력해주세요."
+        return
     
     try:
-        results = chatbot.search_policies(query, top_k=int(top_k), similarity_threshold=float(similarity_threshold))
-        
-        if not results:
-            return f"😔 '{query}'에 대한 관련 정책을 찾을 수 없습니다."
-        
-        # 결과 포맷팅
-        output = f"🔍 '{query}'에 대한 {len(results)}개의 정책을 찾았습니다!\n\n"
-        
-        for i, result in enumerate(results, 1):
+        output = ""
+        count = 0
+        for i, result in enumerate(chatbot.iter_search_policies(query, top_k=int(top_k), similarity_threshold=float(similarity_threshold)), 1):
+            count = i
+            # 결과 포맷팅
             output += f"**{i}. {result['title']}**\n"
             output += f"🎯 지원대상: {result['target']}\n"
             output += f"🏢 소관기관: {result['organization']}\n"
@@ -39,19 +38,27 @@ def search_policies(query, top_k=5, similarity_threshold=0.0):
             output += f"📊 유사도: {result['similarity_score']:.3f}\n"
             output += f"📝 신청방법: {result['application_method'][:100]}...\n"
             output += "-" * 50 + "\n\n"
+            yield f"🔍 '{query}' 검색 중... ({i}개)\n\n" + output
         
-        return output
+        if count == 0:
+            yield f"😔 '{query}'에 대한 관련 정책을 찾을 수 없습니다."
+        else:
+            yield f"🔍 '{query}'에 대한 {count}개의 정책을 찾았습니다!\n\n" + output
         
     except Exception as e:
-        return f"❌ 검색 중 오류가 발생했습니다: {str(e)}"
+        yield f"❌ 검색 중 오류가 발생했습니다: {str(e)}"
 
 def get_policy_summary(query):
-    """정책 요약"""
+    """정책 요약 (정책 카드가 만들어지는 대로 이어 붙여 표시)"""
     global chatbot
     if chatbot is None:
-        return "❌ 챗봇이 초기화되지 않았습니다."
+        yield "❌ 챗봇이 초기화되지 않았습니다."
+        return
     
-    return chatbot.get_policy_summary(query)
+    summary = ""
+    for chunk in chatbot.iter_policy_summary(query):
+        summary += chunk
+        yield summary
 
 def get_statistics():
     """통계 정보"""
@@ -200,6 +207,8 @@ with gr.Blocks(title="🏛️ 정책 챗봇", theme=gr.themes.Soft()) as demo:
 
 # 실행
 if __name__ == "__main__":
+    # 생성기 함수의 중간 결과를 화면에 스트리밍하려면 큐 필요
+    demo.queue()
     demo.launch(
         server_name="0.0.0.0",
         server_port=7860,
@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import faiss
+import numpy as np
+import pandas as pd
+
+import ann_index
+from passage_index import PASSAGES_FILE, PassageIndex
+from sparse_index import BM25Index, KoreanTokenizer
+
+# 번들 디렉토리 구성
+#   manifest.json     - 포맷 버전, 모델명, 차원, 행 수
+#   index.faiss       - faiss.write_index로 저장한 검색 인덱스 (정책 ID를 붙인 IndexIDMap2, IVF 계열은 역리스트에 ID 저장)
+#   embeddings.npy    - 정규화된 float32 임베딩 (메모리 매핑으로 로드)
+#   metadata.parquet  - 정책 데이터 (processed_text, policy_id 포함)
+#   sparse_index.npz  - processed_text BM25 역색인 (하이브리드 검색 사용 시)
+#   passages.npz, passage_embeddings.npy, passage_index.faiss
+#                     - 구간 인덱스 (구간 검색 사용 시, FAISS 인덱스는 근사 인덱스 설정일 때만)
+BUNDLE_FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.faiss"
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.parquet"
+SPARSE_INDEX_FILE = "sparse_index.npz"
+
+
+def write_bundle(path: str, data: pd.DataFrame, embeddings: np.ndarray, index, model_name: str,
+                 source: Optional[Dict] = None, index_config: Optional[Dict] = None,
+                 sparse_index: Optional[BM25Index] = None, passage_index: Optional[PassageIndex] = None) -> Dict:
+    """
+    인덱스 번들 저장
+
+    임시 디렉토리에 모든 파일을 쓴 뒤 이름을 바꾸므로, 같은 경로를 읽는 프로세스가
+    일부만 쓰인 번들을 보지 않습니다.
+
+    Args:
+        source: 원본 데이터 정보 (예: CSV 경로/크기/수정 시각, 번들 최신 여부 판단용)
+        index_config: 인덱스 종류/옵션 (증분 갱신 시 같은 설정으로 재구축)
+        sparse_index: BM25 역색인 (하이브리드 검색용)
+        passage_index: 구간 인덱스 (구간 검색용)
+
+    Returns:
+        저장된 manifest
+    """
+    if len(data) != len(embeddings) or len(embeddings) != index.ntotal:
+        raise ValueError(f"행 수 불일치: data={len(data)}, embeddings={len(embeddings)}, index={index.ntotal}")
+
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=os.path.basename(path) + ".tmp-")
+    try:
+        faiss.write_index(index, os.path.join(tmp_dir, INDEX_FILE))
+        np.save(os.path.join(tmp_dir, EMBEDDINGS_FILE), np.ascontiguousarray(embeddings, dtype='float32'))
+
+        # fillna("")로 생긴 혼합 타입 컬럼은 문자열로 통일해 Parquet에 저장
+        metadata = data.copy()
+        object_columns = metadata.select_dtypes(include=['object', 'string']).columns
+        metadata[object_columns] = metadata[object_columns].astype(str)
+        metadata.to_parquet(os.path.join(tmp_dir, METADATA_FILE), index=False)
+        if sparse_index is not None:
+            sparse_index.save(os.path.join(tmp_dir, SPARSE_INDEX_FILE))
+        if passage_index is not None:
+            passage_index.save(tmp_dir)
+
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "model_name": model_name,
+            "dimension": int(embeddings.shape[1]),
+            "row_count": int(len(data)),
+            "index_type": type(index).__name__,
+            "index_config": index_config,
+            "sparse_tokenizer": sparse_index.tokenizer.name if sparse_index is not None else None,
+            "passages": passage_index.config if passage_index is not None else None,
+            "created_at": datetime.now().isoformat(timespec='seconds'),
+            "source": source,
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        # 기존 번들은 옆으로 옮긴 뒤 교체
+        if os.path.exists(path):
+            old_dir = tempfile.mkdtemp(dir=parent, prefix=os.path.basename(path) + ".old-")
+            os.rename(path, os.path.join(old_dir, "bundle"))
+            os.rename(tmp_dir, path)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.rename(tmp_dir, path)
+        return manifest
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def read_manifest(path: str) -> Dict:
+    """번들 manifest 로드 및 포맷 버전 확인"""
+    with open(os.path.join(path, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 번들 포맷 버전: {manifest.get('format_version')}")
+    return manifest
+
+
+def csv_fingerprint(csv_path: str) -> Optional[Dict]:
+    """CSV 파일 경로/크기/수정 시각 (파일이 없으면 None)"""
+    if not csv_path or not os.path.exists(csv_path):
+        return None
+    stat = os.stat(csv_path)
+    return {"csv_path": os.path.abspath(csv_path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def bundle_is_fresh(path: str, csv_path: str, model_name: Optional[str] = None,
+                    index_type: Optional[str] = None, passages: bool = False) -> bool:
+    """번들이 존재하고 현재 CSV(및 모델, 인덱스 종류)로 만든 것인지 확인 (passages: 구간 인덱스도 있어야 함)"""
+    try:
+        manifest = read_manifest(path)
+    except (OSError, ValueError):
+        return False
+    if model_name and manifest.get("model_name") != model_name:
+        return False
+    if index_type and (manifest.get("index_config") or {}).get("index_type", "flat") != index_type:
+        return False
+    if passages and not manifest.get("passages"):
+        return False
+    source = csv_fingerprint(csv_path)
+    return source is not None and manifest.get("source") == source
+
+
+def read_bundle(path: str, mmap: bool = True) -> Tuple[Dict, pd.DataFrame, np.ndarray, object]:
+    """
+    인덱스 번들 로드
+
+    Args:
+        path: 번들 디렉토리
+        mmap: 임베딩/인덱스를 메모리 매핑으로 읽을지 여부 (같은 호스트의 워커들이 페이지 공유)
+
+    Returns:
+        (manifest, 정책 데이터, 임베딩, FAISS 인덱스)
+    """
+    manifest = read_manifest(path)
+    data = pd.read_parquet(os.path.join(path, METADATA_FILE))
+    embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode='r' if mmap else None)
+    index = ann_index.read_index(os.path.join(path, INDEX_FILE), mmap)
+
+    row_count = manifest["row_count"]
+    if len(data) != row_count or len(embeddings) != row_count or index.ntotal != row_count:
+        raise ValueError(f"번들 행 수 불일치: manifest={row_count}, data={len(data)}, "
+                         f"embeddings={len(embeddings)}, index={index.ntotal}")
+    if embeddings.shape[1] != manifest["dimension"] or index.d != manifest["dimension"]:
+        raise ValueError(f"번들 차원 불일치: manifest={manifest['dimension']}, embeddings={embeddings.shape[1]}")
+    return manifest, data, embeddings, index
+
+
+def read_sparse_index(path: str, tokenizer: Optional[KoreanTokenizer] = None) -> Optional[BM25Index]:
+    """번들의 BM25 역색인 로드 (없거나 현재 토크나이저와 다르면 None)"""
+    sparse_path = os.path.join(path, SPARSE_INDEX_FILE)
+    if not os.path.exists(sparse_path):
+        return None
+    try:
+        sparse_index, _ = BM25Index.load(sparse_path, tokenizer)
+        return sparse_index
+    except (ValueError, OSError, KeyError) as e:
+        print(f"BM25 역색인 로드 실패: {e}")
+        return None
+
+
+def read_passage_index(path: str, index_config: Optional[Dict] = None, mmap: bool = True) -> Optional[PassageIndex]:
+    """번들의 구간 인덱스 로드 (없으면 None)"""
+    if not os.path.exists(os.path.join(path, PASSAGES_FILE)):
+        return None
+    try:
+        return PassageIndex.load(path, index_config, mmap=mmap)
+    except (ValueError, OSError, KeyError) as e:
+        print(f"구간 인덱스 로드 실패: {e}")
+        return None
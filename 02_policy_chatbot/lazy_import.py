@@ -0,0 +1,54 @@
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    첫 속성 접근 시점에 실제로 import하는 모듈 대리 객체
+
+    torch/sentence_transformers/faiss/pandas처럼 import 비용이 큰 모듈을 모듈 상단에서
+    `np = lazy_import("numpy")` 형태로 선언해 두면, 지역 목록 조회나 메타데이터만 쓰는
+    CLI/테스트에서는 해당 모듈을 불러오지 않습니다.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+        self._lazy_module = None
+
+    def _load(self) -> types.ModuleType:
+        module = self._lazy_module
+        if module is None:
+            with self._lazy_lock:
+                module = self._lazy_module
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    # 이후 속성 접근은 __getattr__을 거치지 않도록 실제 모듈 속성을 복사
+                    self.__dict__.update(module.__dict__)
+                    self._lazy_module = module
+        return module
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """모듈을 지연 import (이미 import된 모듈이면 그대로 반환)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(module: types.ModuleType) -> bool:
+    """지연 import 모듈이 실제로 로드되었는지 여부"""
+    return not isinstance(module, LazyModule) or module._lazy_module is not None
@@ -0,0 +1,164 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Prometheus 텍스트 노출 형식 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 지연 시간 히스토그램 구간(초): 쿼리 캐시 적중(수십 μs)부터 모델 인코딩/대기열 지연(수 초)까지
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram과 같은 le 구간/합계/개수)"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(le, 누적 개수) 목록"""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """구간 경계 기준 근사 분위수 (관측값이 없으면 None)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, total in self.cumulative():
+            if total >= target:
+                return bound
+        return float('inf')
+
+
+class MetricsRegistry:
+    """
+    카운터/게이지/히스토그램 모음 (스레드 안전)
+
+    prometheus_client 없이 /metrics 엔드포인트에 필요한 만큼만 구현합니다. 값은 프로세스별이므로
+    여러 워커(--workers)로 실행하면 워커마다 따로 집계됩니다.
+    """
+
+    def __init__(self, prefix: str = "policy"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._types: Dict[str, str] = {}
+        self._help: Dict[str, str] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def _register(self, name: str, kind: str, help_text: str) -> str:
+        name = f"{self.prefix}_{name}" if self.prefix else name
+        registered = self._types.setdefault(name, kind)
+        if registered != kind:
+            raise ValueError(f"메트릭 종류 불일치: {name} ({registered} != {kind})")
+        if help_text:
+            self._help.setdefault(name, help_text)
+        return name
+
+    def inc(self, name: str, value: float = 1, help: str = "", **labels):
+        """카운터 증가"""
+        with self._lock:
+            name = self._register(name, "counter", help)
+            series = self._counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, help: str = "", **labels):
+        """게이지 값 설정"""
+        with self._lock:
+            name = self._register(name, "gauge", help)
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, help: str = "", buckets: Sequence[float] = LATENCY_BUCKETS, **labels):
+        """히스토그램에 관측값 추가"""
+        with self._lock:
+            name = self._register(name, "histogram", help)
+            series = self._histograms.setdefault(name, {})
+            key = _label_key(labels)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, help: str = "", **labels) -> Iterator[None]:
+        """with 블록 실행 시간(초)을 히스토그램에 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, help=help, **labels)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        """히스토그램 조회 (벤치마크/테스트용)"""
+        name = f"{self.prefix}_{name}" if self.prefix else name
+        with self._lock:
+            return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def reset(self):
+        with self._lock:
+            self._types.clear()
+            self._help.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        with self._lock:
+            for name in sorted(self._types):
+                kind = self._types[name]
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "histogram":
+                    for key, histogram in sorted(self._histograms.get(name, {}).items()):
+                        for bound, total in histogram.cumulative():
+                            lines.append(f"{name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {total}")
+                        lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                        lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+                else:
+                    series = self._counters if kind == "counter" else self._gauges
+                    for key, value in sorted(series.get(name, {}).items()):
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 기본 레지스트리 (PolicyChatbot/API 서버가 공유)
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import ann_index
+from lazy_import import lazy_import
+
+# faiss/numpy는 구간 인덱스를 만들거나 읽을 때 로드 (passage_config만 쓰는 챗봇 생성은 가볍게 유지)
+faiss = lazy_import("faiss")
+np = lazy_import("numpy")
+
+# 구간 나누기 기본 설정 (글자 수 기준)
+#   passage_chars - 구간 최대 길이 (기본 모델 xlm-r base의 max_seq_length 128토큰에 한국어 약 200자가 들어감)
+#   overlap       - 이웃 구간과 겹치는 길이 (구간 경계에 걸린 문장도 한 구간 안에 온전히 들어가도록)
+#   max_passages  - 정책 하나의 최대 구간 수 (아주 긴 공고가 인덱스를 차지하지 않도록, 넘는 뒷부분은 버림)
+PASSAGE_DEFAULTS = {
+    "passage_chars": 200,
+    "overlap": 50,
+    "max_passages": 16,
+}
+
+# 근사 인덱스에서 정책 top_k를 채울 때 먼저 가져올 구간 수 배수 (정책마다 구간이 여러 개이므로)
+PASSAGE_FETCH_FACTOR = 4
+
+# 번들에 저장하는 파일
+PASSAGES_FILE = "passages.npz"
+PASSAGE_EMBEDDINGS_FILE = "passage_embeddings.npy"
+PASSAGE_INDEX_FILE = "passage_index.faiss"
+
+
+def passage_config(**options) -> Dict:
+    """구간 나누기 옵션을 기본값과 합친 설정"""
+    unknown = set(options) - set(PASSAGE_DEFAULTS)
+    if unknown:
+        raise ValueError(f"알 수 없는 구간 옵션: {', '.join(sorted(unknown))}")
+    config = dict(PASSAGE_DEFAULTS, **{k: v for k, v in options.items() if v is not None})
+    if not 0 <= config["overlap"] < config["passage_chars"] // 2:
+        raise ValueError(f"overlap({config['overlap']})은 passage_chars의 절반보다 작아야 합니다")
+    return config
+
+
+def _windows(text: str, first_chars: int, chars: int, overlap: int, limit: int) -> List[str]:
+    """text를 겹치는 구간으로 나눔 (구간 끝은 가능하면 공백에서 자름)"""
+    windows, start, width = [], 0, first_chars
+    while True:
+        end = min(len(text), start + width)
+        if end < len(text):
+            cut = text.rfind(" ", start + width // 2, end)
+            if cut > 0:
+                end = cut
+        windows.append(text[start:end].strip())
+        if end >= len(text) or len(windows) >= limit:
+            return windows
+        # 다음 구간은 overlap만큼 앞에서, 단어 중간이면 다음 단어부터 시작
+        next_start = max(end - overlap, start + 1)
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space >= 0 else next_start
+        width = chars
+
+
+def split_passages(texts: Sequence[str], titles: Optional[Sequence[str]] = None,
+                   config: Optional[Dict] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    정책 텍스트를 겹치는 구간으로 나눔
+
+    passage_chars 이하인 텍스트는 구간 하나(텍스트 전체)이고, 긴 텍스트는 둘째 구간부터 공고명을 앞에 붙여
+    본문 뒷부분 구간도 어느 공고인지 알 수 있게 합니다. 빈 텍스트도 구간 하나를 만들어 모든 정책이 구간을 가집니다.
+
+    Args:
+        texts: 정책별 검색 텍스트 (processed_text)
+        titles: 정책별 공고명 (processed_text와 같은 방식으로 정리한 값)
+        config: passage_config() 결과
+
+    Returns:
+        (구간 텍스트 목록, 구간별 정책 행 번호 int32 - 정책 행 순서대로 연속)
+    """
+    config = config or passage_config()
+    chars, overlap, limit = config["passage_chars"], config["overlap"], config["max_passages"]
+    passages, counts = [], np.empty(len(texts), dtype="int64")
+    for row, text in enumerate(texts):
+        text = str(text)
+        if len(text) <= chars:
+            passages.append(text)
+            counts[row] = 1
+            continue
+        prefix = str(titles[row])[:chars // 4] if titles is not None else ""
+        windows = _windows(text, chars, chars - len(prefix) - 1 if prefix else chars, overlap, limit)
+        passages.append(windows[0])
+        passages.extend(f"{prefix} {window}" if prefix else window for window in windows[1:])
+        counts[row] = len(windows)
+    owners = np.repeat(np.arange(len(texts), dtype="int32"), counts)
+    return passages, owners
+
+
+class PassageIndex:
+    """
+    정책별 겹치는 구간(passage) 임베딩 인덱스
+
+    임베딩 모델은 max_seq_length를 넘는 텍스트를 잘라내므로, 정책 텍스트 하나를 통째로 임베딩하면 긴 공고는
+    공고명과 첫 문단만 반영됩니다. 구간마다 임베딩하고 정책 점수는 구간 점수의 최댓값(max-pooling)으로 계산합니다.
+
+    구간은 정책 행 순서대로 연속 저장하며, 정책과의 관계는 배열 세 개로만 둡니다.
+    - owners: 구간 -> 정책 행 (int32)
+    - offsets: 정책 행 -> 첫 구간 위치 (int64, 정책 수 + 1개)
+    - ids: 구간 ID (int64, 오름차순, FAISS 인덱스 ID - 위치는 이진 탐색으로 찾음)
+    flat 설정이면 FAISS 인덱스 없이 구간 임베딩 행렬을 직접 내적하고(같은 벡터를 두 벌 두지 않음),
+    근사 인덱스 설정이면 구간 ID를 붙인 FAISS 인덱스를 만듭니다.
+    """
+
+    def __init__(self, embeddings: np.ndarray, owners: np.ndarray, ids: np.ndarray, policy_count: int,
+                 config: Optional[Dict] = None, index_config: Optional[Dict] = None, index=None):
+        """
+        Args:
+            embeddings: L2 정규화된 float32 구간 임베딩 (구간 수, d)
+            owners: 구간별 정책 행 번호 (오름차순, 모든 정책이 구간 1개 이상)
+            ids: 구간 ID (오름차순)
+            policy_count: 정책 수
+            config: 구간 나누기 설정 (passage_config() 결과)
+            index_config: FAISS 인덱스 설정 (ann_index.index_config() 결과, flat이면 인덱스를 만들지 않음)
+            index: 이미 만든 FAISS 인덱스 (None이면 index_config로 생성)
+        """
+        self.embeddings = embeddings
+        self.owners = np.asarray(owners, dtype="int32")
+        self.ids = np.asarray(ids, dtype="int64")
+        self.config = config or passage_config()
+        self.index_config = index_config or ann_index.index_config()
+        counts = np.bincount(self.owners, minlength=policy_count)
+        if len(counts) != policy_count or (policy_count and counts.min() == 0):
+            raise ValueError(f"구간이 없는 정책이 있거나 정책 수({policy_count})와 맞지 않습니다")
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype("int64")
+        if index is None and self.index_config["index_type"] != "flat" and len(self.ids):
+            index = ann_index.build_index(embeddings, self.ids, self.index_config)
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def policy_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """구간 임베딩 + 구간/정책 매핑 배열 + FAISS 인덱스 크기(바이트)"""
+        nbytes = self.embeddings.nbytes + self.owners.nbytes + self.ids.nbytes + self.offsets.nbytes
+        if self.index is not None:
+            nbytes += ann_index.index_nbytes(self.index)
+        return int(nbytes)
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, owners: np.ndarray, policy_count: int, config: Optional[Dict] = None,
+              index_config: Optional[Dict] = None) -> "PassageIndex":
+        """split_passages 결과 구간의 임베딩으로 생성 (구간 ID는 0부터)"""
+        return cls(embeddings, owners, np.arange(len(owners), dtype="int64"), policy_count, config, index_config)
+
+    def updated(self, keep: np.ndarray, new_embeddings: Optional[np.ndarray] = None,
+                new_owners: Optional[np.ndarray] = None, new_policy_count: int = 0) -> "PassageIndex":
+        """
+        keep이 False인 정책의 구간을 빼고 새 정책의 구간을 뒤에 붙인 새 인덱스 (기존 구간은 다시 인코딩하지 않음)
+
+        Args:
+            keep: 기존 정책별 유지 여부 (유지된 정책은 순서대로 0부터 다시 번호를 매김)
+            new_embeddings: 새 정책 구간 임베딩
+            new_owners: 새 구간별 새 정책 번호 (0부터, 새 정책은 유지된 정책 뒤에 붙음)
+            new_policy_count: 새 정책 수
+        """
+        keep = np.asarray(keep, dtype=bool)
+        alive = keep[self.owners]
+        kept = int(keep.sum())
+        new_rows = np.cumsum(keep) - 1
+        if new_embeddings is None:
+            new_embeddings = np.empty((0, self.embeddings.shape[1]), dtype="float32")
+            new_owners = np.empty(0, dtype="int32")
+        next_id = int(self.ids[-1]) + 1 if len(self.ids) else 0
+        new_ids = np.arange(next_id, next_id + len(new_embeddings), dtype="int64")
+
+        embeddings = np.vstack([self.embeddings[alive], new_embeddings]).astype("float32", copy=False)
+        owners = np.concatenate([new_rows[self.owners[alive]], kept + np.asarray(new_owners, dtype="int64")])
+        ids = np.concatenate([self.ids[alive], new_ids])
+
+        index = None
+        removed = self.ids[~alive]
+        if self.index is not None and (not len(removed) or ann_index.supports_remove(self.index)):
+            # 정책 인덱스와 같이 사본에서 삭제/추가 (삭제를 지원하지 않는 HNSW는 생성자에서 재구축)
+            index = faiss.deserialize_index(faiss.serialize_index(self.index))
+            if len(removed):
+                index.remove_ids(removed)
+            if len(new_ids):
+                index.add_with_ids(np.ascontiguousarray(new_embeddings, dtype="float32"), new_ids)
+        return PassageIndex(embeddings, owners, ids, kept + new_policy_count, self.config, self.index_config, index)
+
+    def _passage_positions(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """정책 행들의 구간 위치 (연속) 및 정책별 첫 구간의 결과 내 위치"""
+        starts = self.offsets[rows]
+        counts = self.offsets[rows + 1] - starts
+        firsts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype("int64")
+        positions = np.arange(int(counts.sum()), dtype="int64") + np.repeat(starts - firsts, counts)
+        return positions, firsts
+
+    def scores(self, query_emb: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """정책 행별 점수 (구간 코사인 유사도의 최댓값)"""
+        rows = np.asarray(rows, dtype="int64")
+        if not len(rows):
+            return np.empty(0, dtype="float32")
+        positions, firsts = self._passage_positions(rows)
+        passage_scores = np.asarray(self.embeddings[positions]) @ np.asarray(query_emb, dtype="float32").ravel()
+        return np.maximum.reduceat(passage_scores, firsts)
+
+    def all_scores(self, query_emb: np.ndarray) -> np.ndarray:
+        """전체 정책 점수 (모든 구간 내적 후 정책별 최댓값)"""
+        if not self.policy_count:
+            return np.empty(0, dtype="float32")
+        passage_scores = np.asarray(self.embeddings) @ np.asarray(query_emb, dtype="float32").ravel()
+        return np.maximum.reduceat(passage_scores, self.offsets[:-1])
+
+    def search(self, query_embs: np.ndarray, k: int, ef_search: Optional[int] = None,
+               nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        쿼리별 상위 k개 정책 (ann_index.search와 같은 모양, ID 대신 정책 행 번호)
+
+        Returns:
+            (유사도 (쿼리 수, k), 정책 행 번호 (쿼리 수, k) - 부족하면 -1)
+        """
+        query_embs = np.ascontiguousarray(query_embs, dtype="float32").reshape(-1, self.embeddings.shape[1])
+        k = min(k, self.policy_count)
+        scores = np.full((len(query_embs), k), -np.inf, dtype="float32")
+        rows = np.full((len(query_embs), k), -1, dtype="int64")
+        if not k:
+            return scores, rows
+        for i, query_emb in enumerate(query_embs):
+            if self.index is None:
+                policy_scores = self.all_scores(query_emb)
+                top = np.argpartition(-policy_scores, k - 1)[:k] if self.policy_count > k else np.arange(self.policy_count)
+                top = top[np.argsort(-policy_scores[top], kind="stable")]
+                found_scores, found_rows = policy_scores[top], top
+            else:
+                found_scores, found_rows = self._search_index(query_emb, k, ef_search, nprobe)
+            scores[i, :len(found_rows)] = found_scores
+            rows[i, :len(found_rows)] = found_rows
+        return scores, rows
+
+    def _search_index(self, query_emb: np.ndarray, k: int, ef_search: Optional[int],
+                      nprobe: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """근사 인덱스에서 구간을 가져와 정책별 최댓값(처음 나온 구간)으로 합침 (정책이 k개가 될 때까지 늘려 조회)"""
+        fetch_k = min(len(self.ids), k * PASSAGE_FETCH_FACTOR)
+        while True:
+            passage_scores, positions = ann_index.search_rows(self.index, query_emb[None, :], fetch_k, self.embeddings,
+                                                              self._positions, refine=self.index_config.get("pq_refine"),
+                                                              ef_search=ef_search, nprobe=nprobe)
+            found = positions[0] >= 0
+            passage_scores = passage_scores[0][found]
+            owners = self.owners[positions[0][found]].astype("int64")
+            # 결과는 유사도 내림차순이므로 정책별 첫 구간이 최댓값
+            _, first = np.unique(owners, return_index=True)
+            if len(first) >= k or fetch_k >= len(self.ids):
+                order = np.sort(first)[:k]
+                return passage_scores[order], owners[order]
+            fetch_k = min(len(self.ids), fetch_k * PASSAGE_FETCH_FACTOR)
+
+    def _positions(self, ids: np.ndarray) -> np.ndarray:
+        """구간 ID -> 구간 위치 (없는 ID는 -1)"""
+        positions = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return np.where(self.ids[positions] == ids, positions, -1)
+
+    def save(self, path: str):
+        """번들 디렉토리에 저장 (구간 임베딩은 메모리 매핑용 .npy)"""
+        np.save(os.path.join(path, PASSAGE_EMBEDDINGS_FILE), np.ascontiguousarray(self.embeddings, dtype="float32"))
+        np.savez(os.path.join(path, PASSAGES_FILE), owners=self.owners, ids=self.ids,
+                 policy_count=np.array(self.policy_count), config=np.array(sorted(self.config.items()), dtype=str))
+        if self.index is not None:
+            faiss.write_index(self.index, os.path.join(path, PASSAGE_INDEX_FILE))
+
+    @classmethod
+    def load(cls, path: str, index_config: Optional[Dict] = None, mmap: bool = True) -> "PassageIndex":
+        """번들 디렉토리에서 로드 (FAISS 인덱스 파일이 없으면 index_config로 생성)"""
+        with np.load(os.path.join(path, PASSAGES_FILE), allow_pickle=False) as f:
+            owners, ids, policy_count = f["owners"], f["ids"], int(f["policy_count"])
+            config = {key: int(value) for key, value in f["config"].tolist()}
+        embeddings = np.load(os.path.join(path, PASSAGE_EMBEDDINGS_FILE), mmap_mode="r" if mmap else None)
+        index_path = os.path.join(path, PASSAGE_INDEX_FILE)
+        index = ann_index.read_index(index_path, mmap) if os.path.exists(index_path) else None
+        return cls(embeddings, owners, ids, policy_count, config, index_config, index)
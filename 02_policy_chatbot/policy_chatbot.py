@@ -1,303 +1,1238 @@
-import pandas as pd
-import numpy as np
-from sentence_transformers import SentenceTransformer
-import faiss
-import pickle
+from __future__ import annotations
+
 import os
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, NamedTuple, Optional, Iterator, Callable, TYPE_CHECKING
 import re
-from numpy.linalg import norm
+import hashlib
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from lazy_import import lazy_import
+from metrics import REGISTRY, MetricsRegistry
+from query_cache import TTLCache
+from region_resolver import RegionResolver
+
+# import 비용이 큰 모듈(torch/sentence_transformers, faiss, pandas 등)은 처음 사용할 때 로드
+# (지역 목록/메타데이터만 쓰는 CLI·테스트에서 `import policy_chatbot`을 가볍게 유지)
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+faiss = lazy_import("faiss")
+ann_index = lazy_import("ann_index")
+encoders = lazy_import("encoders")
+embedding_cache = lazy_import("embedding_cache")
+filters = lazy_import("filter_index")
+index_bundle = lazy_import("index_bundle")
+sparse = lazy_import("sparse_index")
+text_preprocess = lazy_import("text_preprocess")
+crawler = lazy_import("bizinfo_crawler")
+dedup = lazy_import("dedup")
+passages = lazy_import("passage_index")
+
+if TYPE_CHECKING:
+    from embedding_cache import EmbeddingCache
+    from filter_index import PolicyFilterIndex
+    from passage_index import PassageIndex
+    from reranker import CrossEncoderReranker
+    from sparse_index import BM25Index, KoreanTokenizer
+
+# 기본 정책 데이터 경로 및 임베딩 모델
+DEFAULT_CSV_PATH = "./data/gyeonggi_smallbiz_policies_2000_소상공인,경기_20250705.csv"
+DEFAULT_MODEL_NAME = "sentence-transformers/xlm-r-100langs-bert-base-nli-stsb-mean-tokens"
+
+# search_policies 인자 기본값 (배치 검색/결과 캐시 키에서 공통 사용)
+SEARCH_DEFAULTS = {
+    'top_k': 5,
+    'similarity_threshold': 0.0,
+    'region_filter': None,
+    'target_filter': None,
+    'field_filter': None,
+    'region_weight': 0.3,
+    'target_weight': 0.2,
+    'field_weight': 0.2,
+    'ef_search': None,
+    'nprobe': None,
+    'hybrid': None,
+    'rerank': None,
+}
+
+# 검색 단계별 소요 시간 히스토그램 (stage: encode/filter/retrieve/rerank/build, path: single/batch)
+SEARCH_STAGE_METRIC = 'search_stage_seconds'
+SEARCH_STAGE_HELP = '검색 단계별 소요 시간(초)'
+
+# 정책 식별자: policy_id 컬럼이 있으면 그대로 쓰고, 없으면 공고명 + 소관기관으로 생성
+POLICY_ID_COLUMN = 'policy_id'
+POLICY_KEY_COLUMNS = ['title(공고명)', '소관기관']
+
+# 검색용 텍스트를 만드는 컬럼 (증분 추가 시 누락된 컬럼은 빈 문자열로 채움)
+POLICY_TEXT_COLUMNS = [
+    'title(공고명)', 'body_text(공고내용)', '지원대상', '소관기관', '지원분야(대)',
+    '지원분야(중)', '사업수행기관', '문의처', '신청기간', '사업신청방법설명',
+]
+
+# 교차 인코더 재순위에 넘길 문서 텍스트 컬럼 (앞부분이 doc_chars 안에 들어가도록 짧은 필드 먼저)
+RERANK_TEXT_COLUMNS = ['title(공고명)', '지원대상', 'body_text(공고내용)']
+
+
+class PolicyIndexState(NamedTuple):
+    """검색에 쓰는 데이터/임베딩/인덱스 묶음
+
+    갱신할 때는 새 묶음을 만들어 한 번에 교체하므로, 검색 중인 요청은 항상
+    같은 시점의 데이터/인덱스/필터를 봅니다.
+    """
+    data: Optional[pd.DataFrame] = None
+    embeddings: Optional[np.ndarray] = None
+    index: object = None
+    filter_index: Optional[PolicyFilterIndex] = None
+    id_index: Optional[pd.Index] = None  # FAISS ID(int64) -> 데이터 행 번호
+    sparse_index: Optional[BM25Index] = None  # processed_text BM25 역색인 (하이브리드 검색용)
+    passage_index: Optional[PassageIndex] = None  # 구간 임베딩 인덱스 (구간 검색 사용 시 dense 점수를 대신함)
+    version: int = 0
+
+    def rows_for(self, ids: np.ndarray) -> np.ndarray:
+        """FAISS 검색 결과 ID를 데이터 행 번호로 변환 (없는 ID는 -1)"""
+        return self.id_index.get_indexer(ids)
+
+
+def policy_keys(data: pd.DataFrame) -> pd.Series:
+    """정책 식별자 문자열 (policy_id가 비어 있는 행은 공고명+소관기관, 중복된 공고명+소관기관은 순번을 붙여 구분)"""
+    if POLICY_ID_COLUMN in data.columns:
+        ids = data[POLICY_ID_COLUMN].fillna('').astype(str).str.strip()
+        blank = ids == ''
+        if blank.any():
+            ids = ids.copy()
+            ids[blank] = _fallback_keys(data[blank])
+        return ids
+    return _fallback_keys(data)
+
+
+def _fallback_keys(data: pd.DataFrame) -> pd.Series:
+    keys = data[POLICY_KEY_COLUMNS[0]].astype(str)
+    for column in POLICY_KEY_COLUMNS[1:]:
+        keys = keys.str.cat(data[column].astype(str), sep='|')
+    occurrence = keys.groupby(keys).cumcount()
+    return keys.where(occurrence == 0, keys + '#' + occurrence.astype(str))
+
+
+def policy_int_ids(keys) -> np.ndarray:
+    """정책 식별자 문자열 -> FAISS ID (blake2b 64비트 해시, 음수 제외)"""
+    return np.array([
+        int.from_bytes(hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest(), 'little') & 0x7FFFFFFFFFFFFFFF
+        for key in keys
+    ], dtype='int64')
+
 
 class PolicyChatbot:
-    def __init__(self, csv_path: str = "./data/gyeonggi_smallbiz_policies_2000_소상공인,경기_20250705.csv", model_name: str = "sentence-transformers/xlm-r-100langs-bert-base-nli-stsb-mean-tokens"):
+    # 검색 후보 과다 조회(over-fetch) 설정: top_k의 몇 배를 먼저 가져오고, 필터로 부족하면 몇 배씩 늘릴지
+    initial_fetch_factor = 4
+    fetch_growth_factor = 4
+    # 필터 통과 행 수가 이 값 이하이면 FAISS 재조회 대신 해당 행만 직접 내적
+    exact_scan_limit = 50000
+    # 하이브리드 검색: dense/BM25 각각 이 개수만큼 후보를 뽑아 RRF(1 / (rrf_k + 순위))로 합침
+    hybrid_candidates = 50
+    rrf_k = 60
+
+    def __init__(self, csv_path: str = DEFAULT_CSV_PATH, model_name: str = DEFAULT_MODEL_NAME,
+                 use_embedding_cache: bool = True, embedding_cache_dir: str = None, bundle_path: str = None,
+                 query_cache_size: int = 1024, query_cache_ttl: float = 3600.0,
+                 result_cache_size: int = 512, result_cache_ttl: float = 300.0,
+                 index_type: str = "flat", index_options: Dict = None,
+                 hybrid_search: bool = False, sparse_tokenizer: str = "auto", lazy_load: bool = True,
+                 encoder_backend: str = "sentence_transformers", encoder_options: Dict = None,
+                 metrics: MetricsRegistry = None, region_resolver: RegionResolver = None,
+                 preprocess_workers: int = None, passage_search: bool = False, passage_options: Dict = None,
+                 reranker: CrossEncoderReranker = None):
         """
         정책 챗봇 초기화
         
         Args:
             csv_path: 정책 데이터 CSV 파일 경로
             model_name: 임베딩 모델명
+            use_embedding_cache: 디스크 임베딩 캐시 사용 여부 (변경된 행만 재인코딩)
+            embedding_cache_dir: 임베딩 캐시 디렉토리 (기본값: CSV 파일과 같은 디렉토리)
+            bundle_path: save_model로 저장한 인덱스 번들 경로 (지정 시 CSV 대신 번들에서 로드)
+            query_cache_size: 쿼리 임베딩 LRU 캐시 크기 (0이면 사용 안 함)
+            query_cache_ttl: 쿼리 임베딩 캐시 유효 시간(초)
+            result_cache_size: 검색 결과 LRU 캐시 크기 (0이면 사용 안 함)
+            result_cache_ttl: 검색 결과 캐시 유효 시간(초)
+            index_type: FAISS 인덱스 종류 ("flat", "hnsw", "ivf_flat", "ivf_pq", 번들 로드 시 번들 설정 사용)
+            index_options: 인덱스 옵션 (hnsw_m, ef_construction, ef_search, nlist, nprobe, pq_m, pq_nbits, pq_refine)
+            hybrid_search: BM25 역색인을 만들고 dense 검색 결과와 RRF로 합칠지 여부 (기본값: 의미 검색만,
+                True면 요청별 hybrid=False로 끌 수 있음, False면 역색인이 없어 요청별 hybrid=True도 의미 검색)
+            sparse_tokenizer: BM25 토크나이저 ("auto", "okt", "regex")
+            lazy_load: 데이터/인덱스는 첫 검색 시, 임베딩 모델은 첫 인코딩 시 로드 (False면 생성 시 warmup()으로 모두 로드)
+            encoder_backend: 쿼리 인코더 ("sentence_transformers", "onnx": int8 양자화 ONNX, 문서 임베딩은 항상 원본 모델)
+            encoder_options: onnx 인코더 옵션 (onnx_dir, quantize, num_threads)
+            metrics: 검색 단계별 시간/캐시/인덱스 지표를 기록할 레지스트리 (기본값: 프로세스 공용 REGISTRY)
+            region_resolver: 지역명 <-> 행정구역 코드 변환기 (기본값: region_codes.json 코드표)
+            preprocess_workers: 텍스트 전처리 병렬 청크 수 (기본값: 5만 행 이상이면 CPU 수)
+            passage_search: 정책 텍스트를 겹치는 구간으로 나눠 구간마다 임베딩하고, 구간 유사도 최댓값으로 검색
+                            (모델 max_seq_length에서 잘리는 긴 공고의 뒷부분도 검색, 구간 수만큼 임베딩 메모리 증가)
+            passage_options: 구간 옵션 (passage_chars, overlap, max_passages)
+            reranker: 1차 검색 상위 후보를 다시 채점할 교차 인코더 재순위기 (reranker.CrossEncoderReranker,
+                      요청별 rerank가 None이면 사용, 여러 챗봇이 같은 인스턴스를 공유 가능)
         """
         self.csv_path = csv_path
         self.model_name = model_name
-        self.data = None
-        self.embeddings = None
-        self.index = None
-        self.model = None
-        
-        # 데이터 로드 및 모델 초기화
-        self._load_data()
-        self._initialize_model()
-        self._create_embeddings()
-        
-        # 지역 계층 구조 정의
-        self.region_hierarchy = {
-            # 전국, 서울, 경기만
-            # 경기도 하위 지역들
-            "포천시": ["포천시", "경기도", "전국"],
-            "가평군": ["가평군", "경기도", "전국"],
-            "양평군": ["양평군", "경기도", "전국"],
-            "여주시": ["여주시", "경기도", "전국"],
-            "이천시": ["이천시", "경기도", "전국"],
-            "용인시": ["용인시", "경기도", "전국"],
-            "안성시": ["안성시", "경기도", "전국"],
-            "평택시": ["평택시", "경기도", "전국"],
-            "오산시": ["오산시", "경기도", "전국"],
-            "안산시": ["안산시", "경기도", "전국"],
-            "시흥시": ["시흥시", "경기도", "전국"],
-            "군포시": ["군포시", "경기도", "전국"],
-            "의왕시": ["의왕시", "경기도", "전국"],
-            "안양시": ["안양시", "경기도", "전국"],
-            "과천시": ["과천시", "경기도", "전국"],
-            "광명시": ["광명시", "경기도", "전국"],
-            "부천시": ["부천시", "경기도", "전국"],
-            "김포시": ["김포시", "경기도", "전국"],
-            "고양시": ["고양시", "경기도", "전국"],
-            "파주시": ["파주시", "경기도", "전국"],
-            "연천군": ["연천군", "경기도", "전국"],
-            "동두천시": ["동두천시", "경기도", "전국"],
-            "의정부시": ["의정부시", "경기도", "전국"],
-            "남양주시": ["남양주시", "경기도", "전국"],
-            "구리시": ["구리시", "경기도", "전국"],
-            "하남시": ["하남시", "경기도", "전국"],
-            "성남시": ["성남시", "경기도", "전국"],
-            "수원시": ["수원시", "경기도", "전국"],
-            # 서울특별시 하위 지역들
-            "강남구": ["강남구", "서울특별시", "전국"],
-            "강동구": ["강동구", "서울특별시", "전국"],
-            "강북구": ["강북구", "서울특별시", "전국"],
-            "강서구": ["강서구", "서울특별시", "전국"],
-            "관악구": ["관악구", "서울특별시", "전국"],
-            "광진구": ["광진구", "서울특별시", "전국"],
-            "구로구": ["구로구", "서울특별시", "전국"],
-            "금천구": ["금천구", "서울특별시", "전국"],
-            "노원구": ["노원구", "서울특별시", "전국"],
-            "도봉구": ["도봉구", "서울특별시", "전국"],
-            "동대문구": ["동대문구", "서울특별시", "전국"],
-            "동작구": ["동작구", "서울특별시", "전국"],
-            "마포구": ["마포구", "서울특별시", "전국"],
-            "서대문구": ["서대문구", "서울특별시", "전국"],
-            "서초구": ["서초구", "서울특별시", "전국"],
-            "성동구": ["성동구", "서울특별시", "전국"],
-            "성북구": ["성북구", "서울특별시", "전국"],
-            "송파구": ["송파구", "서울특별시", "전국"],
-            "양천구": ["양천구", "서울특별시", "전국"],
-            "영등포구": ["영등포구", "서울특별시", "전국"],
-            "용산구": ["용산구", "서울특별시", "전국"],
-            "은평구": ["은평구", "서울특별시", "전국"],
-            "종로구": ["종로구", "서울특별시", "전국"],
-            "중구": ["중구", "서울특별시", "전국"],
-            "중랑구": ["중랑구", "서울특별시", "전국"],
-            # 상위 지역들
-            "경기도": ["경기도", "전국"],
-            "서울특별시": ["서울특별시", "전국"],
-            "부산광역시": ["부산광역시", "전국"],
-            "인천광역시": ["인천광역시", "전국"],
-            "대구광역시": ["대구광역시", "전국"],
-            "광주광역시": ["광주광역시", "전국"],
-            "대전광역시": ["대전광역시", "전국"],
-            "울산광역시": ["울산광역시", "전국"],
-            "세종특별자치시": ["세종특별자치시", "전국"],
-            "강원도": ["강원도", "전국"],
-            "충청북도": ["충청북도", "전국"],
-            "충청남도": ["충청남도", "전국"],
-            "전라북도": ["전라북도", "전국"],
-            "전라남도": ["전라남도", "전국"],
-            "경상북도": ["경상북도", "전국"],
-            "경상남도": ["경상남도", "전국"],
-            "제주특별자치도": ["제주특별자치도", "전국"],
-            # 최상위 지역
-            "전국": ["전국"]
-        }
+        self.use_embedding_cache = use_embedding_cache
+        self.embedding_cache_dir = embedding_cache_dir
+        self.index_config = ann_index.index_config(index_type, **(index_options or {}))
+        self.hybrid_search = hybrid_search
+        self.sparse_tokenizer = sparse_tokenizer
+        if encoder_backend not in ("sentence_transformers", "onnx"):
+            raise ValueError(f"지원하지 않는 인코더 백엔드: {encoder_backend}")
+        self.encoder_backend = encoder_backend
+        self.encoder_options = encoder_options or {}
+        self.preprocess_workers = preprocess_workers
+        self.passage_search = passage_search
+        self.passage_config = passages.passage_config(**(passage_options or {}))
+        self.reranker = reranker
+        self.bundle_path = bundle_path
+        self.tokenizer = None
+        self.source_info = None
+        
+        # 임베딩 모델은 처음 인코딩할 때 로드 (번들 로드 시 번들 차원과 일치하는지 확인)
+        # onnx 백엔드는 쿼리 인코딩에만 쓰므로, 문서 임베딩이 모두 캐시/번들에 있으면 원본 모델은 로드하지 않음
+        self._model = None
+        self._query_model = None
+        self._model_lock = threading.Lock()
+        self._model_dimension = None
+        
+        # 데이터/임베딩/인덱스/필터는 한 묶음으로 교체 (upsert_policies/delete_policies)
+        # 처음 self._state에 접근할 때 CSV 또는 번들에서 로드
+        self._state = PolicyIndexState()
+        self._loaded = False
+        self._loading = False
+        self._load_lock = threading.RLock()
+        # 지연 로드를 대신할 함수 (CorpusRegistry가 설정 - 해제된 코퍼스를 다시 로드할 때 메모리 예산 확인)
+        self.loader: Optional[Callable[[], object]] = None
+        self._write_lock = threading.Lock()
+        self._ingested_partitions = set()  # ingest_partitions로 반영한 크롤러 파티션 파일
+        self._dedup_index = None  # ingest_partitions 중복 제거 인덱스 (현재 데이터로 채움)
+        self._dedup_version = None  # 중복 제거 인덱스가 반영한 검색 묶음 버전
+        
+        # 쿼리 임베딩 / 검색 결과 캐시 (인덱스 재구축 시 초기화)
+        # 쿼리 임베딩 캐시 키는 (query_cache_namespace, 쿼리) - 여러 코퍼스가 캐시 하나를 나눠 쓰면 코퍼스 이름으로 구분
+        self.query_cache = TTLCache(query_cache_size, query_cache_ttl)
+        self.query_cache_namespace = None
+        self.result_cache = TTLCache(result_cache_size, result_cache_ttl)
+        self.metrics = metrics if metrics is not None else REGISTRY
+        
+        # 지역 계층 구조 (행정구역 코드표, 데이터/모델 로드 없이 조회 가능)
+        self.region_resolver = region_resolver if region_resolver is not None else RegionResolver.load()
+        self.region_hierarchy = self.region_resolver.hierarchy()
+        
+        if not lazy_load:
+            self.warmup()
+    
+    @property
+    def _state(self) -> PolicyIndexState:
+        if not self._loaded:
+            if self.loader is not None and not self._loading:
+                self.loader()
+            else:
+                self._ensure_loaded()
+        return self._current_state
+    
+    @_state.setter
+    def _state(self, value: PolicyIndexState):
+        self._current_state = value
+    
+    @contextmanager
+    def _loading_state(self):
+        """로드 중 표시 (로드 코드 안의 self._state 접근이 지연 로드를 다시 시작하지 않음)"""
+        with self._load_lock:
+            loading, self._loading = self._loading, True
+            try:
+                yield
+                self._loaded = True
+            finally:
+                self._loading = loading
+    
+    def _ensure_loaded(self):
+        """데이터/임베딩/인덱스 지연 로드 (처음 접근한 스레드가 로드하고 나머지 스레드는 완료까지 대기)"""
+        with self._load_lock:
+            if self._loaded or self._loading:
+                return
+            with self._loading_state():
+                if self.bundle_path:
+                    self.load_model(self.bundle_path)
+                else:
+                    self._load_data()
+                    self._build_filter_index()
+                    self._create_embeddings()
+                    self._build_passage_index()
+                    self._build_sparse_index()
+    
+    @property
+    def is_loaded(self) -> bool:
+        """데이터/인덱스 로드 여부"""
+        return self._loaded
+    
+    @property
+    def model(self):
+        """임베딩 모델 (처음 인코딩할 때 로드)"""
+        if self._model is None:
+            self._initialize_model()
+        return self._model
+    
+    @model.setter
+    def model(self, value):
+        self._model = value
+    
+    @property
+    def query_model(self):
+        """쿼리 인코더 (sentence_transformers 백엔드면 self.model과 같음)"""
+        if self.encoder_backend == "sentence_transformers":
+            return self.model
+        if self._query_model is None:
+            self._initialize_query_model()
+        return self._query_model
+    
+    @property
+    def model_loaded(self) -> bool:
+        """쿼리 인코더 로드 여부"""
+        if self.encoder_backend == "sentence_transformers":
+            return self._model is not None
+        return self._query_model is not None
+    
+    def warmup(self) -> Dict[str, float]:
+        """
+        데이터/인덱스와 임베딩 모델(재순위기가 있으면 교차 인코더도)을 미리 로드하고 쿼리 인코딩을 한 번 실행
+        
+        서버 시작 시 호출하면 첫 요청이 로드 시간을 기다리지 않습니다.
+        
+        Returns:
+            단계별 소요 시간(초)
+        """
+        timings = {}
+        start = time.perf_counter()
+        self._ensure_loaded()
+        timings['index'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.query_model.encode(["워밍업"])
+        timings['model'] = time.perf_counter() - start
+        if self.reranker is not None:
+            start = time.perf_counter()
+            self.reranker.warmup()
+            timings['rerank'] = time.perf_counter() - start
+        print(f"워밍업 완료: 데이터/인덱스 {timings['index']:.2f}초, 모델 {timings['model']:.2f}초"
+              + (f", 재순위 {timings['rerank']:.2f}초" if 'rerank' in timings else ""))
+        return timings
+    
+    def unload(self):
+        """
+        데이터/임베딩/인덱스 해제 (임베딩 모델은 유지, 다음 검색 시 CSV/번들에서 다시 로드)
+        
+        이미 검색 묶음을 읽은 요청은 해제 전 묶음으로 끝까지 진행합니다. upsert_policies/delete_policies로
+        반영한 변경 사항은 CSV/번들에 저장되어 있지 않으면 사라집니다.
+        """
+        with self._write_lock, self._load_lock:
+            self._state = PolicyIndexState(version=self._current_state.version + 1)
+            self._loaded = False
+            self._ingested_partitions.clear()
+            self._dedup_index = self._dedup_version = None
+            self.result_cache.clear()
+    
+    def memory_usage(self) -> int:
+        """로드된 데이터/임베딩/인덱스/BM25 역색인의 대략적인 메모리 사용량(바이트, 로드 전이면 0)"""
+        if not self.is_loaded:
+            return 0
+        state = self._state
+        nbytes = int(state.data.memory_usage(deep=True).sum()) + state.embeddings.nbytes + ann_index.index_nbytes(state.index)
+        if state.sparse_index is not None:
+            nbytes += state.sparse_index.nbytes
+        if state.passage_index is not None:
+            nbytes += state.passage_index.nbytes
+        return int(nbytes)
+    
+    def loaded_encoders(self) -> Tuple[object, object]:
+        """이미 로드된 (임베딩 모델, 쿼리 인코더) (로드 전이면 None)"""
+        return self._model, self._query_model
+    
+    def set_encoder(self, model=None, query_model=None):
+        """
+        다른 챗봇이 로드한 임베딩 모델/쿼리 인코더를 같이 사용 (None이면 그대로)
+        
+        여러 코퍼스가 같은 모델을 쓸 때 코퍼스마다 모델을 따로 로드하지 않도록 합니다.
+        """
+        with self._model_lock:
+            for encoder in (model, query_model):
+                if encoder is not None:
+                    self._check_model_dimension(encoder)
+            if model is not None:
+                self._model = model
+            if query_model is not None:
+                self._query_model = query_model
+    
+    # 검색 중에는 self._state를 한 번만 읽어 같은 시점의 묶음을 사용하고,
+    # 아래 속성은 초기화/로드 코드와 외부 호출용으로 둠
+    @property
+    def data(self) -> pd.DataFrame:
+        return self._state.data
+    
+    @data.setter
+    def data(self, value: pd.DataFrame):
+        self._state = self._state._replace(data=value)
+    
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self._state.embeddings
+    
+    @embeddings.setter
+    def embeddings(self, value: np.ndarray):
+        self._state = self._state._replace(embeddings=value)
+    
+    @property
+    def index(self):
+        return self._state.index
+    
+    @index.setter
+    def index(self, value):
+        self._state = self._state._replace(index=value)
+    
+    @property
+    def filter_index(self) -> PolicyFilterIndex:
+        return self._state.filter_index
+    
+    @filter_index.setter
+    def filter_index(self, value: PolicyFilterIndex):
+        self._state = self._state._replace(filter_index=value)
         
     def _load_data(self):
         """CSV 데이터 로드 및 전처리"""
         try:
+            self.source_info = index_bundle.csv_fingerprint(self.csv_path)
             self.data = pd.read_csv(self.csv_path)
             print(f"데이터 로드 완료: {len(self.data)}개 정책")
             
             # 결측값 처리
             self.data = self.data.fillna("")
             
-            # 텍스트 전처리
-            self.data['processed_text'] = self.data.apply(self._preprocess_text, axis=1)
+            # 텍스트 전처리 (디스크 캐시 사용 시 CSV가 그대로면 저장된 결과 재사용)
+            self.data['processed_text'] = self._preprocess_texts(self.data, self.source_info)
+            self.data[POLICY_ID_COLUMN] = policy_keys(self.data)
             
         except Exception as e:
             print(f"데이터 로드 실패: {e}")
             raise
     
-    def _preprocess_text(self, row: pd.Series) -> str:
-        """텍스트 전처리"""
-        # 주요 필드들을 결합하여 검색용 텍스트 생성
-        fields = [
-            str(row['title(공고명)']),
-            str(row['body_text(공고내용)']),
-            str(row['지원대상']),
-            str(row['소관기관']),
-            str(row['지원분야(대)']),
-            str(row['지원분야(중)']),
-            str(row['사업수행기관']),
-            str(row['문의처']),
-            str(row['신청기간']),
-            str(row['사업신청방법설명'])
-        ]
-        
-        # 텍스트 결합 및 정리
-        combined_text = " ".join(fields)
-        
-        # 특수문자 제거 및 공백 정리
-        combined_text = re.sub(r'[^\w\s가-힣]', ' ', combined_text)
-        combined_text = re.sub(r'\s+', ' ', combined_text).strip()
-        
-        return combined_text
+    def _build_filter_index(self):
+        """지역/지원대상/지원분야 필터 마스크 인덱스 구축"""
+        self.filter_index = filters.PolicyFilterIndex(self.data, self.region_resolver)
+    
+    def _preprocess_texts(self, data: pd.DataFrame, source: Dict = None) -> pd.Series:
+        """검색용 텍스트 생성 (주요 필드 결합 후 특수문자 제거/공백 정리, 컬럼 단위로 처리)"""
+        if self.use_embedding_cache and source is not None:
+            cache = text_preprocess.ProcessedTextCache.for_csv(self.csv_path, self.embedding_cache_dir)
+            return cache.get_or_preprocess(source, data, POLICY_TEXT_COLUMNS, self.preprocess_workers)
+        return text_preprocess.preprocess_texts(data, POLICY_TEXT_COLUMNS, self.preprocess_workers)
     
     def _initialize_model(self):
-        """임베딩 모델 초기화"""
-        try:
-            print("임베딩 모델 로딩 중...")
-            self.model = SentenceTransformer(self.model_name)
-            print("모델 로딩 완료")
-        except Exception as e:
-            print(f"모델 로딩 실패: {e}")
-            # 한국어에 특화된 모델로 대체
-            self.model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
+        """임베딩 모델 초기화 (여러 스레드가 동시에 요청해도 한 번만 로드)"""
+        with self._model_lock:
+            if self._model is not None:
+                return
+            from sentence_transformers import SentenceTransformer
+            try:
+                print("임베딩 모델 로딩 중...")
+                model = SentenceTransformer(self.model_name)
+                print("모델 로딩 완료")
+            except Exception as e:
+                print(f"모델 로딩 실패: {e}")
+                # 한국어에 특화된 모델로 대체 (임베딩 캐시 키도 실제 사용 모델 기준)
+                self.model_name = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+                model = SentenceTransformer(self.model_name)
+            self._check_model_dimension(model)
+            self._model = model
+    
+    def _initialize_query_model(self):
+        """onnx 쿼리 인코더 초기화 (처음 사용 시 ONNX 내보내기 및 int8 양자화)"""
+        with self._model_lock:
+            if self._query_model is not None:
+                return
+            print(f"쿼리 인코더 로딩 중 ({self.encoder_backend})...")
+            model = encoders.load_encoder(self.model_name, self.encoder_backend, **self.encoder_options)
+            self._check_model_dimension(model)
+            if self._model is None and not isinstance(model, encoders.OnnxEncoder):
+                # ONNX를 쓸 수 없어 원본 모델로 대체된 경우 문서 인코딩도 같은 모델 사용
+                self._model = model
+            self._query_model = model
+            print("쿼리 인코더 로딩 완료")
+    
+    def _check_model_dimension(self, model):
+        """모델 임베딩 차원이 로드한 번들 차원과 같은지 확인"""
+        dimension = model.get_sentence_embedding_dimension()
+        if self._model_dimension is not None and dimension != self._model_dimension:
+            raise ValueError(f"모델 차원({dimension})이 번들 차원({self._model_dimension})과 다릅니다: {self.model_name}")
     
     def _create_embeddings(self):
         """텍스트 임베딩 생성 및 FAISS 인덱스 구축"""
         try:
             print("임베딩 생성 중...")
             
-            # 텍스트 임베딩 생성
+            # 텍스트 임베딩 생성 (캐시에 없는 새 행/변경된 행만 인코딩)
             texts = self.data['processed_text'].tolist()
-            self.embeddings = self.model.encode(texts, show_progress_bar=True)
-            
-            # FAISS 인덱스 구축
-            dimension = self.embeddings.shape[1]
-            self.index = faiss.IndexFlatIP(dimension)  # Inner Product (cosine similarity)
+            if self.use_embedding_cache:
+                self.embeddings = self._embedding_cache().get_or_encode(texts, self._encode_texts)
+            else:
+                self.embeddings = self._encode_texts(texts)
             
-            # 정규화 (cosine similarity를 위해)
-            faiss.normalize_L2(self.embeddings)
-            self.index.add(self.embeddings.astype('float32'))
+            # FAISS 인덱스 구축 (정책 ID로 추가해 증분 갱신 시 행 번호가 바뀌어도 유지)
+            ids = policy_int_ids(self.data[POLICY_ID_COLUMN])
+            self.index = self._build_index(self.embeddings, ids)
+            self._state = self._state._replace(id_index=pd.Index(ids), version=self._state.version + 1)
             
+            self.clear_caches()
             print(f"임베딩 생성 완료: {len(self.embeddings)}개 벡터")
             
         except Exception as e:
             print(f"임베딩 생성 실패: {e}")
             raise
     
-    def search_policies(self, query, top_k=5, similarity_threshold=0.0, region_filter=None, target_filter=None, field_filter=None, region_weight=0.3, target_weight=0.2, field_weight=0.2):
-        query_emb = self.model.encode(query)
-        query_emb = np.array(query_emb).reshape(1, -1)
-        # FAISS에서 모든 벡터 가져오기
-        all_embs = self.index.reconstruct_n(0, self.data.shape[0])
-        # 코사인 유사도 계산 (0~1)
-        def cosine_similarity(a, b):
-            return np.dot(a, b) / (norm(a) * norm(b) + 1e-8)
-        sim_scores = np.array([cosine_similarity(query_emb[0], emb) for emb in all_embs])
-        # 내림차순 정렬 인덱스
-        sorted_idx = np.argsort(sim_scores)[::-1]
+    def _embedding_cache(self, kind: str = None) -> EmbeddingCache:
+        """CSV 옆 임베딩 캐시 (모델을 먼저 로드해 대체 모델로 바뀐 경우에도 실제 인코딩 모델 이름을 캐시 키로 사용)"""
+        if self._model is None:
+            self._initialize_model()
+        return embedding_cache.EmbeddingCache.for_csv(self.csv_path, self.model_name, self.embedding_cache_dir, kind=kind)
+    
+    def _get_tokenizer(self) -> KoreanTokenizer:
+        if self.tokenizer is None:
+            self.tokenizer = sparse.KoreanTokenizer(self.sparse_tokenizer)
+        return self.tokenizer
+    
+    def _build_sparse_index(self):
+        """processed_text BM25 역색인 구축 (디스크 캐시 사용 시 CSV 옆에 저장하고 텍스트가 같으면 재사용)"""
+        if not self.hybrid_search:
+            return
+        texts = self.data['processed_text'].tolist()
+        tokenizer = self._get_tokenizer()
+        if self.use_embedding_cache:
+            prefix = os.path.splitext(os.path.basename(self.csv_path))[0]
+            cache_dir = self.embedding_cache_dir or os.path.dirname(os.path.abspath(self.csv_path))
+            path = os.path.join(cache_dir, f"{prefix}.{tokenizer.name}.bm25.npz")
+            sparse_index = sparse.BM25Index.load_or_build(path, texts, tokenizer)
+        else:
+            sparse_index = sparse.BM25Index.build(texts, tokenizer)
+        self._state = self._state._replace(sparse_index=sparse_index)
+        self.clear_caches()
+    
+    def _build_passage_index(self):
+        """구간 임베딩 인덱스 구축 (구간 임베딩도 디스크 캐시에서 바뀐 구간만 인코딩)"""
+        if not self.passage_search:
+            return
+        embeddings, owners = self._encode_passages(self.data, use_cache=self.use_embedding_cache)
+        passage_index = passages.PassageIndex.build(embeddings, owners, len(self.data), self.passage_config, self.index_config)
+        self._state = self._state._replace(passage_index=passage_index)
+        self.clear_caches()
+        print(f"구간 인덱스 구축 완료: {len(self.data)}개 정책, {len(passage_index)}개 구간")
+    
+    def _encode_passages(self, data: pd.DataFrame, use_cache: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """정책들을 구간으로 나눠 임베딩 (구간 임베딩, 구간별 data 행 번호)"""
+        titles = text_preprocess.preprocess_texts(data, POLICY_TEXT_COLUMNS[:1], self.preprocess_workers)
+        texts, owners = passages.split_passages(data['processed_text'].tolist(), titles.tolist(), self.passage_config)
+        if use_cache:
+            return self._embedding_cache(kind="passages").get_or_encode(texts, self._encode_texts), owners
+        return self._encode_texts(texts), owners
+    
+    def _updated_passages(self, state: PolicyIndexState, keep: np.ndarray, policies: pd.DataFrame = None) -> Optional[PassageIndex]:
+        """keep이 False인 정책을 빼고 policies(새 행)의 구간을 인코딩해 붙인 구간 인덱스 (구간 검색을 쓰지 않으면 None)"""
+        if state.passage_index is None:
+            return None
+        if policies is None or not len(policies):
+            return state.passage_index.updated(keep)
+        embeddings, owners = self._encode_passages(policies)
+        return state.passage_index.updated(keep, embeddings, owners, len(policies))
+    
+    def _build_index(self, embeddings: np.ndarray, ids: np.ndarray):
+        """정책 ID를 붙인 FAISS 인덱스 생성 (index_config의 종류, IVF 계열은 코퍼스로 학습)"""
+        return ann_index.build_index(embeddings, ids, self.index_config)
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """문서 텍스트 임베딩 생성 (정규화된 float32, cosine similarity를 위해)"""
+        embeddings = np.asarray(self.model.encode(texts, show_progress_bar=True), dtype='float32')
+        faiss.normalize_L2(embeddings)
+        return embeddings
+    
+    def search_policies(self, query, top_k=5, similarity_threshold=0.0, region_filter=None, target_filter=None, field_filter=None, region_weight=0.3, target_weight=0.2, field_weight=0.2, ef_search=None, nprobe=None, hybrid=None, rerank=None):
+        return list(self.iter_search_policies(
+            query, top_k=top_k, similarity_threshold=similarity_threshold,
+            region_filter=region_filter, target_filter=target_filter, field_filter=field_filter,
+            region_weight=region_weight, target_weight=target_weight, field_weight=field_weight,
+            ef_search=ef_search, nprobe=nprobe, hybrid=hybrid, rerank=rerank))
+
+    def iter_search_policies(self, query, top_k=5, similarity_threshold=0.0, region_filter=None, target_filter=None, field_filter=None, region_weight=0.3, target_weight=0.2, field_weight=0.2, ef_search=None, nprobe=None, hybrid=None, rerank=None) -> Iterator[Dict]:
+        """
+        search_policies와 같은 검색을 하되, 순위가 정해진 결과를 하나씩 생성
+        
+        인코딩과 후보 검색이 끝나면 결과 항목을 만드는 대로 바로 내보내므로 스트리밍 응답의
+        첫 바이트가 인코딩 시간 수준으로 줄어듭니다. 끝까지 소비한 경우에만 결과 캐시에 저장합니다.
+        재순위가 시간 예산을 넘겨 1차 검색 순서로 돌아간 결과는 캐시에 저장하지 않습니다.
+        """
+        state = self._state
+        hybrid = self._use_hybrid(state, hybrid)
+        rerank = self._use_rerank(rerank)
+        cache_key = self._result_cache_key(state, dict(
+            query=query, top_k=top_k, similarity_threshold=similarity_threshold,
+            region_filter=region_filter, target_filter=target_filter, field_filter=field_filter,
+            region_weight=region_weight, target_weight=target_weight, field_weight=field_weight,
+            ef_search=ef_search, nprobe=nprobe, hybrid=hybrid, rerank=rerank))
+        cached = self.result_cache.get(cache_key)
+        self._count_queries('single', hit=cached is not None)
+        if cached is not None:
+            for result in cached:
+                yield dict(result)
+            return
+
+        with self._stage('encode', 'single'):
+            query_emb = self._encode_query(query)
+
+        # 필터는 사전 계산된 마스크로 랭킹 전에 적용
+        with self._stage('filter', 'single'):
+            filter_score = self._filter_score(target_filter, field_filter, target_weight, field_weight)
+            mask = state.filter_index.mask(region_filter, target_filter, field_filter)
+        # 재순위를 쓰면 1차 검색에서 재순위 후보 수만큼 가져옴
+        first_k = max(top_k, self.reranker.candidates) if rerank else top_k
+        with self._stage('retrieve', 'single'):
+            if hybrid:
+                # dense 후보와 BM25 후보를 RRF로 합침 (사업명/기관명처럼 정확한 용어 검색 보완)
+                _, dense_rows = self._search_candidates(state, query_emb, max(first_k, self.hybrid_candidates), mask,
+                                                        ef_search=ef_search, nprobe=nprobe)
+                sim_scores, rows = self._fuse_sparse(state, query, query_emb, dense_rows, first_k, mask)
+            else:
+                sim_scores, rows = self._search_candidates(state, query_emb, first_k, mask, min_score=similarity_threshold - filter_score,
+                                                           ef_search=ef_search, nprobe=nprobe)
+        cacheable = True
+        if rerank:
+            with self._stage('rerank', 'single'):
+                [(sim_scores, rows, cacheable)] = self._rerank(state, [query], [(sim_scores, rows)], 'single')
+        sim_scores, rows = sim_scores[:top_k], rows[:top_k]
+        
+        # 결과 생성 시간은 소비자(스트리밍 응답)가 기다리는 시간을 빼고 항목별로 합산
         results = []
-        for idx in sorted_idx:
-            row = self.data.iloc[idx]
-            # 하드 필터 적용 (지역: 정책명/본문에 지역명 명시 여부까지 반영)
-            if region_filter:
-                org = str(row.get('소관기관', ''))
-                title = str(row.get('title(공고명)', ''))
-                body = str(row.get('body_text(공고내용)', ''))
-                # 1. 소관기관이 region_filter(포천시)면 무조건 포함
-                if org == region_filter:
-                    pass
-                # 2. 소관기관이 region_filter의 상위(경기도) 또는 전국이면, title/body에 region_filter가 명시되어야 포함
-                elif region_filter in self.region_hierarchy and org in self.region_hierarchy[region_filter][1:]:
-                    if region_filter not in title and region_filter not in body:
-                        continue
-                # 3. 그 외(다른 시/군)는 제외
+        build_seconds = 0.0
+        iterator = self._iter_results(state, sim_scores, rows, filter_score, similarity_threshold)
+        try:
+            while True:
+                start = time.perf_counter()
+                result = next(iterator, None)
+                build_seconds += time.perf_counter() - start
+                if result is None:
+                    break
+                results.append(dict(result))
+                yield result
+        finally:
+            self.metrics.observe(SEARCH_STAGE_METRIC, build_seconds, help=SEARCH_STAGE_HELP, stage='build', path='single')
+        if cacheable:
+            self.result_cache.set(cache_key, results)
+
+    def search_policies_batch(self, queries: List, **defaults) -> List[List[Dict]]:
+        """
+        여러 쿼리를 한 번에 검색
+        
+        쿼리 임베딩을 한 번의 model.encode 호출로 만들고, 인덱스 검색도 한 번의 행렬 검색으로
+        수행한 뒤 쿼리별로 필터를 적용합니다.
+        
+        Args:
+            queries: 검색어 문자열 또는 search_policies 인자 딕셔너리(query 필수)의 목록
+            **defaults: 모든 쿼리에 공통으로 적용할 search_policies 인자
+            
+        Returns:
+            요청 순서대로 정렬된 쿼리별 검색 결과 목록
+        """
+        if not queries:
+            return []
+        state = self._state
+        # 쿼리별 인자가 공통 인자보다 우선
+        all_params = [{**SEARCH_DEFAULTS, **defaults, **(q if isinstance(q, dict) else {'query': q})} for q in queries]
+        for p in all_params:
+            p['hybrid'] = self._use_hybrid(state, p['hybrid'])
+            p['rerank'] = self._use_rerank(p['rerank'])
+
+        # 결과 캐시에 있는 쿼리는 제외하고 나머지만 배치로 검색
+        all_results = [None] * len(all_params)
+        cache_keys = [self._result_cache_key(state, p) for p in all_params]
+        for i, cache_key in enumerate(cache_keys):
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                all_results[i] = [dict(result) for result in cached]
+        pending = [i for i, results in enumerate(all_results) if results is None]
+        self._count_queries('batch', hit=True, count=len(all_params) - len(pending))
+        self._count_queries('batch', hit=False, count=len(pending))
+        if not pending:
+            return all_results
+
+        params = [all_params[i] for i in pending]
+        with self._stage('encode', 'batch'):
+            query_embs = self._encode_queries([p['query'] for p in params])
+
+        # 재순위 쿼리는 재순위 후보 수만큼, 하이브리드 쿼리는 RRF에 쓸 dense 후보를 hybrid_candidates개까지 가져옴
+        first_ks, top_ks, masks, filter_scores, thresholds = [], [], [], [], []
+        with self._stage('filter', 'batch'):
+            for p in params:
+                first_ks.append(max(p['top_k'], self.reranker.candidates) if p['rerank'] else p['top_k'])
+                top_ks.append(max(first_ks[-1], self.hybrid_candidates) if p['hybrid'] else first_ks[-1])
+                thresholds.append(p['similarity_threshold'])
+                filter_scores.append(self._filter_score(p['target_filter'], p['field_filter'], p['target_weight'], p['field_weight']))
+                masks.append(state.filter_index.mask(p['region_filter'], p['target_filter'], p['field_filter']))
+
+        # 모든 쿼리를 한 번의 행렬 검색으로 조회 (필터가 있으면 후보를 넉넉히)
+        retrieve_start = time.perf_counter()
+        total = len(state.id_index)
+        fetch_k = max(top_ks)
+        if any(mask is not None for mask in masks):
+            fetch_k *= self.initial_fetch_factor
+        fetch_k = min(total, fetch_k)
+        # 근사 인덱스 파라미터는 요청 중 가장 정확한 값(최대 efSearch/nprobe)으로 공유 검색
+        ef_search = max((p['ef_search'] for p in params if p['ef_search']), default=None)
+        nprobe = max((p['nprobe'] for p in params if p['nprobe']), default=None)
+        batch_scores, batch_rows = self._dense_search(state, query_embs, fetch_k, ef_search=ef_search, nprobe=nprobe)
+        candidates = []
+        for i, p in enumerate(params):
+            top_k, mask = top_ks[i], masks[i]
+            min_score = thresholds[i] - filter_scores[i]
+            rows = batch_rows[i]
+            valid = rows >= 0
+            sim_scores, rows = batch_scores[i][valid], rows[valid]
+            if p['hybrid']:
+                min_score = None
+            if mask is not None:
+                keep = mask[rows]
+                exhausted = fetch_k >= total or (min_score is not None and len(sim_scores) and sim_scores[-1] < min_score)
+                if keep.sum() >= top_k or exhausted:
+                    sim_scores, rows = sim_scores[keep], rows[keep]
                 else:
-                    continue
-            if target_filter and target_filter not in str(row.get('지원대상', '')):
+                    # 공유 후보로 부족한 쿼리만 개별 검색
+                    sim_scores, rows = self._search_candidates(state, query_embs[i:i + 1], top_k, mask, min_score=min_score,
+                                                               ef_search=p['ef_search'], nprobe=p['nprobe'])
+            if p['hybrid']:
+                sim_scores, rows = self._fuse_sparse(state, p['query'], query_embs[i:i + 1], rows[:top_k], first_ks[i], mask)
+            candidates.append((sim_scores[:first_ks[i]], rows[:first_ks[i]], True))
+        self.metrics.observe(SEARCH_STAGE_METRIC, time.perf_counter() - retrieve_start, help=SEARCH_STAGE_HELP,
+                             stage='retrieve', path='batch')
+
+        # 재순위 쿼리의 (쿼리, 후보) 쌍을 모아 한 번에 채점
+        reranked = [i for i, p in enumerate(params) if p['rerank']]
+        if reranked:
+            with self._stage('rerank', 'batch'):
+                outputs = self._rerank(state, [params[i]['query'] for i in reranked],
+                                       [candidates[i][:2] for i in reranked], 'batch')
+            for i, output in zip(reranked, outputs):
+                candidates[i] = output
+
+        with self._stage('build', 'batch'):
+            for i, p in enumerate(params):
+                sim_scores, rows, cacheable = candidates[i]
+                top_k = p['top_k']
+                results = self._collect_results(state, sim_scores[:top_k], rows[:top_k], filter_scores[i], thresholds[i])
+                if cacheable:
+                    self.result_cache.set(cache_keys[pending[i]], [dict(result) for result in results])
+                all_results[pending[i]] = results
+        return all_results
+
+    def _use_hybrid(self, state: PolicyIndexState, hybrid: Optional[bool]) -> bool:
+        """요청별 hybrid 값(None이면 hybrid_search 기본값)과 BM25 역색인 유무로 하이브리드 검색 여부 결정"""
+        if hybrid is None:
+            hybrid = self.hybrid_search
+        return bool(hybrid) and state.sparse_index is not None
+    
+    def _use_rerank(self, rerank: Optional[bool]) -> bool:
+        """요청별 rerank 값(None이면 사용)과 재순위기 유무로 교차 인코더 재순위 여부 결정"""
+        return self.reranker is not None and (rerank is None or bool(rerank))
+
+    def _rerank(self, state: PolicyIndexState, queries: List[str], candidates: List[Tuple[np.ndarray, np.ndarray]],
+                path: str) -> List[Tuple[np.ndarray, np.ndarray, bool]]:
+        """
+        쿼리별 1차 후보 (유사도, 행 번호)를 교차 인코더 점수 내림차순으로 재정렬
+
+        결과 점수와 임계값은 1차 검색과 같이 코사인 유사도 기준이고 순서만 바뀝니다.
+
+        Returns:
+            쿼리별 (유사도, 행 번호, 재순위 완료 여부) (시간 예산을 넘긴 쿼리는 1차 검색 순서 그대로, 완료 여부 False)
+        """
+        columns = [column for column in RERANK_TEXT_COLUMNS if column in state.data.columns]
+        documents = []
+        for _, rows in candidates:
+            texts = state.data[columns].iloc[rows].fillna('').astype(str)
+            documents.append(texts.agg(' '.join, axis=1).tolist() if len(rows) else [])
+        all_scores = self.reranker.rerank([self._normalize_query(query) for query in queries], documents)
+        outputs = []
+        for (sim_scores, rows), scores in zip(candidates, all_scores):
+            if scores is None:
+                outputs.append((sim_scores, rows, False))
                 continue
-            if field_filter and field_filter not in str(row.get('지원분야(대)', '')):
+            order = np.argsort(-scores, kind='stable')
+            outputs.append((sim_scores[order], rows[order], True))
+        fallbacks = sum(not reranked for _, _, reranked in outputs)
+        if fallbacks:
+            self.metrics.inc('rerank_fallbacks_total', fallbacks, help='시간 예산 초과로 1차 검색 순서를 쓴 쿼리 수', path=path)
+        return outputs
+
+    def _fuse_sparse(self, state: PolicyIndexState, query: str, query_emb: np.ndarray, dense_rows: np.ndarray,
+                     top_k: int, mask: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """dense 후보 순위와 BM25 후보 순위를 RRF로 합친 상위 top_k의 (코사인 유사도, 행 번호)"""
+        sparse_rows, _ = state.sparse_index.search(query, max(top_k, self.hybrid_candidates), mask)
+        rows, _ = sparse.reciprocal_rank_fusion([dense_rows, sparse_rows], k=self.rrf_k)
+        rows = rows[:top_k]
+        # 결과 점수와 임계값은 기존과 같이 코사인 유사도 기준 (BM25로만 찾은 문서도 직접 내적)
+        return self._dense_scores(state, query_emb, rows), rows
+    
+    def _normalize_query(self, query: str) -> str:
+        """캐시 키용 쿼리 정규화 (유니코드 NFC, 공백 정리)"""
+        return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', str(query))).strip()
+
+    def _result_cache_key(self, state: PolicyIndexState, params: Dict) -> Tuple:
+        """검색 결과 캐시 키 (인덱스 버전, 정규화된 쿼리, 필터, 가중치, top_k)
+
+        인덱스 버전을 키에 넣어, 갱신 직전 묶음으로 검색한 결과가 갱신 후 캐시에 들어가도 다시 쓰이지 않게 함
+        """
+        params = dict(SEARCH_DEFAULTS, **params)
+        return (state.version, self._normalize_query(params['query'])) + tuple(params[name] for name in SEARCH_DEFAULTS)
+
+    def clear_caches(self):
+        """쿼리 임베딩(이 챗봇 항목만)/검색 결과 캐시 초기화 (인덱스가 바뀌면 호출)"""
+        self.query_cache.clear_namespace(self.query_cache_namespace)
+        self.result_cache.clear()
+
+    def _stage(self, stage: str, path: str):
+        """검색 단계 소요 시간을 기록하는 with 블록"""
+        return self.metrics.timer(SEARCH_STAGE_METRIC, help=SEARCH_STAGE_HELP, stage=stage, path=path)
+
+    def _count_queries(self, path: str, hit: bool, count: int = 1):
+        """검색 쿼리 수 (결과 캐시 적중 여부별)"""
+        if count:
+            self.metrics.inc('search_queries_total', count, help='검색 쿼리 수 (결과 캐시 적중 여부별)',
+                             path=path, cache='hit' if hit else 'miss')
+
+    def collect_metrics(self):
+        """캐시 적중률/크기와 인덱스 크기를 게이지로 기록 (/metrics 조회 시 호출)"""
+        for name, stats in self.cache_stats().items():
+            self.metrics.set('cache_hit_ratio', stats['hit_ratio'], help='캐시 적중률', cache=name)
+            self.metrics.set('cache_entries', stats['size'], help='캐시 항목 수', cache=name)
+            self.metrics.set('cache_hits', stats['hits'], help='캐시 적중 수', cache=name)
+            self.metrics.set('cache_misses', stats['misses'], help='캐시 미적중 수', cache=name)
+        self.metrics.set('model_loaded', int(self.model_loaded), help='쿼리 인코더 로드 여부')
+        self.metrics.set('index_loaded', int(self.is_loaded), help='데이터/인덱스 로드 여부')
+        if not self.is_loaded:
+            return
+        state = self._state
+        self.metrics.set('index_vectors', state.index.ntotal, help='검색 인덱스 벡터 수')
+        self.metrics.set('index_embeddings_bytes', state.embeddings.nbytes, help='임베딩 배열 크기(바이트)')
+        self.metrics.set('index_version', state.version, help='검색 묶음 버전 (증분 갱신마다 증가)')
+        if state.sparse_index is not None:
+            self.metrics.set('sparse_index_documents', len(state.sparse_index), help='BM25 역색인 문서 수')
+        if state.passage_index is not None:
+            self.metrics.set('passage_index_passages', len(state.passage_index), help='구간 인덱스 구간 수')
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        """쿼리 임베딩/검색 결과 (재순위기가 있으면 재순위 점수) 캐시 통계"""
+        stats = {
+            'query_embedding': self.query_cache.stats(),
+            'search_results': self.result_cache.stats(),
+        }
+        if self.reranker is not None:
+            stats['rerank_scores'] = self.reranker.cache.stats()
+        return stats
+
+    def _filter_score(self, target_filter=None, field_filter=None, target_weight=0.2, field_weight=0.2) -> float:
+        """필터 가중치 점수"""
+        filter_score = 0.0
+        # 지역명 가중치 제거 (region_weight 관련 코드 삭제)
+        if target_filter:
+            filter_score += target_weight
+        if field_filter:
+            filter_score += field_weight
+        return filter_score
+
+    def _collect_results(self, state: PolicyIndexState, sim_scores: np.ndarray, rows: np.ndarray, filter_score: float, similarity_threshold: float) -> List[Dict]:
+        """상위 후보 중 임계값 이상인 항목을 결과 딕셔너리로 변환 (후보 순서 유지)"""
+        return list(self._iter_results(state, sim_scores, rows, filter_score, similarity_threshold))
+
+    def _iter_results(self, state: PolicyIndexState, sim_scores: np.ndarray, rows: np.ndarray, filter_score: float, similarity_threshold: float) -> Iterator[Dict]:
+        for sim, idx in zip(sim_scores, rows):
+            final_score = float(sim) + filter_score
+            # 하이브리드 검색은 RRF 순서라 유사도가 내림차순이 아니므로 항목별로 확인
+            if final_score < similarity_threshold:
                 continue
-            filter_score = 0.0
-            # 지역명 가중치 제거 (region_weight 관련 코드 삭제)
-            if target_filter:
-                filter_score += target_weight
-            if field_filter:
-                filter_score += field_weight
-            final_score = sim_scores[idx] + filter_score
-            if final_score >= similarity_threshold:
-                results.append({
-                    'title': row.get('title(공고명)', ''),
-                    'body': row.get('body_text(공고내용)', ''),
-                    'target': row.get('지원대상', ''),
-                    'organization': row.get('소관기관', ''),
-                    'field_major': row.get('지원분야(대)', ''),
-                    'field_minor': row.get('지원분야(중)', ''),
-                    'executing_org': row.get('사업수행기관', ''),
-                    'contact': row.get('문의처', ''),
-                    'period': row.get('신청기간', ''),
-                    'application_method': row.get('사업신청방법설명', ''),
-                    'similarity_score': final_score
-                })
-            if len(results) >= top_k:
-                break
-        return results
+            yield self._build_result(state.data.iloc[idx], final_score)
+
+    def _search_candidates(self, state: PolicyIndexState, query_emb: np.ndarray, top_k: int, mask: np.ndarray = None, min_score: float = None,
+                           ef_search: int = None, nprobe: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """필터 마스크를 통과한 상위 top_k 후보의 (유사도, 행 번호)를 유사도 내림차순으로 반환"""
+        total = len(state.id_index)
+        if mask is None:
+            sim_scores, rows = self._dense_search(state, query_emb, min(top_k, total), ef_search=ef_search, nprobe=nprobe)
+            valid = rows[0] >= 0
+            return sim_scores[0][valid], rows[0][valid]
+
+        allowed = np.flatnonzero(mask)
+        if len(allowed) == 0:
+            return np.empty(0, dtype='float32'), np.empty(0, dtype='int64')
+
+        # 필터 통과 행이 충분히 적으면 해당 행만 직접 내적 (전체 인덱스 재조회보다 저렴)
+        if len(allowed) <= self.exact_scan_limit:
+            sim_scores = self._dense_scores(state, query_emb, allowed)
+            if len(allowed) > top_k:
+                part = np.argpartition(-sim_scores, top_k - 1)[:top_k]
+            else:
+                part = np.arange(len(allowed))
+            order = part[np.argsort(-sim_scores[part], kind='stable')]
+            return sim_scores[order], allowed[order]
+
+        # 정규화된 IndexFlatIP에서 상위 후보만 가져오고, 필터로 부족하면 후보 수를 늘려 다시 조회
+        fetch_k = min(total, top_k * self.initial_fetch_factor)
+        while True:
+            sim_scores, rows = self._dense_search(state, query_emb, fetch_k, ef_search=ef_search, nprobe=nprobe)
+            valid = rows[0] >= 0
+            sim_scores, rows = sim_scores[0][valid], rows[0][valid]
+            keep = mask[rows]
+            exhausted = fetch_k >= total or (min_score is not None and len(sim_scores) and sim_scores[-1] < min_score)
+            if keep.sum() >= top_k or exhausted:
+                return sim_scores[keep][:top_k], rows[keep][:top_k]
+            fetch_k = min(total, fetch_k * self.fetch_growth_factor)
+
+    def _dense_search(self, state: PolicyIndexState, query_embs: np.ndarray, k: int, ef_search: int = None,
+                      nprobe: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """쿼리별 dense 상위 k개 (유사도, 행 번호) 2차원 배열 (없는 행은 -1, 구간 검색이면 구간 최댓값 기준, 유사도는 정확한 내적)"""
+        if state.passage_index is not None:
+            return state.passage_index.search(query_embs, k, ef_search=ef_search, nprobe=nprobe)
+        return ann_index.search_rows(state.index, query_embs, k, state.embeddings, state.rows_for,
+                                     refine=self.index_config.get('pq_refine'), ef_search=ef_search, nprobe=nprobe)
+
+    def _dense_scores(self, state: PolicyIndexState, query_emb: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """지정한 행들의 dense 유사도 (구간 검색이면 구간 유사도 최댓값)"""
+        if state.passage_index is not None:
+            return state.passage_index.scores(query_emb[0], rows)
+        return np.asarray(state.embeddings[rows]) @ query_emb[0]
+
+    def _encode_query(self, query: str) -> np.ndarray:
+        """쿼리 임베딩 생성 (코사인 유사도를 위해 L2 정규화)"""
+        return self._encode_queries([query])
+
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """여러 쿼리 임베딩 생성 (L2 정규화된 (n, d) 배열, 캐시에 없는 쿼리만 한 번의 encode 호출로 인코딩)"""
+        keys = [self._normalize_query(query) for query in queries]
+        query_embs = [self.query_cache.get((self.query_cache_namespace, key)) for key in keys]
+        missing = [i for i, query_emb in enumerate(query_embs) if query_emb is None]
+        if missing:
+            new_embs = np.asarray(self.query_model.encode([keys[i] for i in missing]), dtype='float32').reshape(len(missing), -1)
+            faiss.normalize_L2(new_embs)
+            for i, query_emb in zip(missing, new_embs):
+                query_embs[i] = query_emb
+                self.query_cache.set((self.query_cache_namespace, keys[i]), query_emb)
+        return np.vstack(query_embs)
+
+    def _build_result(self, row: pd.Series, score: float) -> Dict:
+        """검색 결과 항목 생성"""
+        return {
+            'title': row.get('title(공고명)', ''),
+            'body': row.get('body_text(공고내용)', ''),
+            'target': row.get('지원대상', ''),
+            'organization': row.get('소관기관', ''),
+            'field_major': row.get('지원분야(대)', ''),
+            'field_minor': row.get('지원분야(중)', ''),
+            'executing_org': row.get('사업수행기관', ''),
+            'contact': row.get('문의처', ''),
+            'period': row.get('신청기간', ''),
+            'application_method': row.get('사업신청방법설명', ''),
+            'similarity_score': score
+        }
+    
+    def evaluate_index(self, queries: List[str] = None, k: int = 10, sample_size: int = 200,
+                       ef_search: int = None, nprobe: int = None) -> Dict:
+        """
+        현재 인덱스의 recall@k를 전수 내적(flat) 결과와 비교
+        
+        Args:
+            queries: 평가용 검색어 목록 (None이면 정책 임베딩 sample_size개를 쿼리로 사용)
+            k: 비교할 상위 결과 수
+            sample_size: queries가 없을 때 샘플링할 정책 수
+            ef_search, nprobe: 평가할 요청별 검색 파라미터
+            
+        Returns:
+            recall, 쿼리당 평균 지연 시간(ms, 인덱스/flat) 등
+        """
+        state = self._state
+        if queries:
+            query_embs = self._encode_queries(queries)
+        else:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(state.embeddings), size=min(sample_size, len(state.embeddings)), replace=False)
+            query_embs = np.asarray(state.embeddings[np.sort(sample)])
+        report = ann_index.recall_at_k(state.index, state.embeddings, state.id_index.to_numpy(), query_embs,
+                                       k=k, ef_search=ef_search, nprobe=nprobe,
+                                       refine=self.index_config.get('pq_refine'))
+        report['config'] = dict(self.index_config)
+        return report
     
     def get_policy_summary(self, query: str) -> str:
         """정책 요약 정보 생성"""
-        results = self.search_policies(query, top_k=3)
+        return "".join(self.iter_policy_summary(query))
+    
+    def iter_policy_summary(self, query: str) -> Iterator[str]:
+        """정책 요약을 머리말, 정책 카드 순으로 하나씩 생성 (스트리밍용)"""
+        found = False
+        for result in self.iter_search_policies(query, top_k=3):
+            if not found:
+                found = True
+                yield f"'{query}'와 관련된 정책을 찾았습니다:\n\n"
+            yield self._format_summary_card(result)
         
-        if not results:
-            return "관련 정책을 찾을 수 없습니다."
+        if not found:
+            yield "관련 정책을 찾을 수 없습니다."
+    
+    def _format_summary_card(self, result: Dict) -> str:
+        """요약용 정책 카드 텍스트"""
+        summary = f"📋 {result['title']}\n"
+        summary += f"🎯 지원대상: {result['target']}\n"
+        summary += f"🏢 소관기관: {result['organization']}\n"
+        summary += f"📅 신청기간: {result['period']}\n"
+        summary += f"📞 문의처: {result['contact']}\n"
+        summary += f"📝 신청방법: {result['application_method'][:100]}...\n"
+        summary += f"📊 유사도 점수: {result['similarity_score']:.3f}\n"
+        summary += "-" * 50 + "\n"
+        return summary
+    
+    def upsert_policies(self, policies: pd.DataFrame) -> Dict[str, int]:
+        """
+        정책 추가/수정 (전체 재임베딩 없이 증분 반영)
         
-        summary = f"'{query}'와 관련된 정책을 찾았습니다:\n\n"
+        policy_id(없으면 공고명+소관기관)가 같은 기존 정책은 교체하고 새 정책은 추가합니다.
+        검색 텍스트가 바뀐 행만 인코딩하며, 인덱스 복사본과 필터 인덱스를 새로 만든 뒤
+        한 번에 교체하므로 검색 중인 요청은 갱신 전 또는 갱신 후 상태만 봅니다.
         
-        for result in results:
-            summary += f"📋 {result['title']}\n"
-            summary += f"🎯 지원대상: {result['target']}\n"
-            summary += f"🏢 소관기관: {result['organization']}\n"
-            summary += f"📅 신청기간: {result['period']}\n"
-            summary += f"📞 문의처: {result['contact']}\n"
-            summary += f"📝 신청방법: {result['application_method'][:100]}...\n"
-            summary += f"📊 유사도 점수: {result['similarity_score']:.3f}\n"
-            summary += "-" * 50 + "\n"
+        Args:
+            policies: 정책 데이터 (CSV와 같은 컬럼, 누락된 컬럼은 빈 문자열)
+            
+        Returns:
+            추가/수정/변경 없음 건수와 전체 정책 수
+        """
+        policies = pd.DataFrame(policies).reset_index(drop=True)
+        for column in POLICY_TEXT_COLUMNS:
+            if column not in policies.columns:
+                policies[column] = ""
+        policies = policies.fillna("")
+        policies['processed_text'] = self._preprocess_texts(policies)
+        policies[POLICY_ID_COLUMN] = policy_keys(policies)
+        policies = policies.drop_duplicates(POLICY_ID_COLUMN, keep='last').reset_index(drop=True)
         
-        return summary
-    
-    def save_model(self, path: str = "policy_chatbot_model.pkl"):
-        """모델 저장"""
-        try:
-            model_data = {
-                'data': self.data,
-                'embeddings': self.embeddings,
-                'index': self.index,
-                'model_name': self.model_name
+        with self._write_lock:
+            state = self._state
+            ids = policy_int_ids(policies[POLICY_ID_COLUMN])
+            rows = state.rows_for(ids)
+            exists = rows >= 0
+            
+            # 검색 텍스트가 같은 기존 정책은 건너뜀
+            changed = ~exists
+            old_text = state.data['processed_text'].to_numpy()[rows[exists]]
+            changed[exists] = old_text != policies['processed_text'].to_numpy()[exists]
+            stats = {
+                'inserted': int((~exists).sum()),
+                'updated': int((changed & exists).sum()),
+                'unchanged': int((~changed).sum()),
             }
+            if changed.any():
+                policies, ids = policies[changed].reset_index(drop=True), ids[changed]
+                new_embeddings = self._encode_texts(policies['processed_text'].tolist())
+                replaced = rows[changed & exists]
+                
+                keep = np.ones(len(state.data), dtype=bool)
+                keep[replaced] = False
+                data = pd.concat([state.data[keep], policies], ignore_index=True).fillna("")
+                embeddings = np.vstack([state.embeddings[keep], new_embeddings])
+                
+                index = self._updated_index(state, state.id_index.to_numpy()[replaced], new_embeddings, ids, data, embeddings)
+                sparse_index = state.sparse_index.updated(keep, policies['processed_text'].tolist()) if state.sparse_index else None
+                passage_index = self._updated_passages(state, keep, policies)
+                self._swap_state(data, embeddings, index, sparse_index, passage_index)
+            stats['total'] = len(self._state.data)
+        
+        print(f"정책 갱신 완료: 추가 {stats['inserted']}건, 수정 {stats['updated']}건, 변경 없음 {stats['unchanged']}건")
+        return stats
+    
+    def delete_policies(self, policy_ids: List[str]) -> Dict[str, int]:
+        """
+        정책 삭제 (인덱스 복사본에서 제거한 뒤 한 번에 교체)
+        
+        Args:
+            policy_ids: 삭제할 정책 ID 목록 (data의 policy_id 컬럼 값)
             
-            with open(path, 'wb') as f:
-                pickle.dump(model_data, f)
+        Returns:
+            삭제/미존재 건수와 전체 정책 수
+        """
+        policy_ids = list(dict.fromkeys(str(policy_id) for policy_id in policy_ids))
+        with self._write_lock:
+            state = self._state
+            ids = policy_int_ids(policy_ids)
+            rows = state.rows_for(ids)
+            found = rows >= 0
+            stats = {'deleted': int(found.sum()), 'not_found': int((~found).sum())}
+            if found.any():
+                keep = np.ones(len(state.data), dtype=bool)
+                keep[rows[found]] = False
+                data, embeddings = state.data[keep].reset_index(drop=True), np.ascontiguousarray(state.embeddings[keep])
+                index = self._updated_index(state, ids[found], None, None, data, embeddings)
+                sparse_index = state.sparse_index.updated(keep) if state.sparse_index else None
+                passage_index = self._updated_passages(state, keep)
+                self._swap_state(data, embeddings, index, sparse_index, passage_index)
+            stats['total'] = len(self._state.data)
+        
+        print(f"정책 삭제 완료: {stats['deleted']}건 (미존재 {stats['not_found']}건)")
+        return stats
+    
+    def ingest_partitions(self, directory: str) -> Dict[str, int]:
+        """
+        크롤러(bizinfo_crawler)가 저장한 Parquet 파티션 중 아직 반영하지 않은 파티션만 upsert_policies로 반영
+        
+        현재 데이터와 내용이 같은 공고, 공고명/소관기관이 같고 본문이 거의 같은 다른 공고(dedup.DedupIndex)는 걸러내고
+        새 공고와 수정된 공고만 반영합니다 (걸러낸 공고는 파티션에 duplicate_of와 함께 남아 있음). 중복 제거 인덱스는 처음 호출할 때 현재 데이터로 채우고,
+        관리자 API 등으로 데이터가 바뀌면 다음 호출 때 다시 채웁니다.
+        
+        Args:
+            directory: 크롤러 출력 디렉토리
+            
+        Returns:
+            반영한 파티션 수, 중복/근접 중복 건수와 upsert_policies 결과
+        """
+        paths = [path for path in crawler.list_partitions(directory) if path not in self._ingested_partitions]
+        if not paths:
+            return {'partitions': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': 0,
+                    'near_duplicates': 0, 'total': len(self.data)}
+        policies = crawler.read_partitions(paths).drop(columns=[dedup.CHANGE_COLUMN, dedup.DUPLICATE_OF_COLUMN], errors='ignore')
+        for column in POLICY_TEXT_COLUMNS:
+            if column not in policies.columns:
+                policies[column] = ""
+        policies = policies.fillna("")
+        policies[POLICY_ID_COLUMN] = policy_keys(policies)
+        
+        state = self._state
+        if self._dedup_index is None or self._dedup_version != state.version:
+            self._dedup_index = dedup.DedupIndex(POLICY_ID_COLUMN, POLICY_TEXT_COLUMNS)
+            self._dedup_index.add(state.data)
+        result = self._dedup_index.ingest(policies)
+        deltas = result.new_rows()
+        if len(deltas):
+            stats = self.upsert_policies(deltas)
+        else:
+            stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'total': len(self.data)}
+        # 그 사이 다른 갱신이 없었을 때만 인덱스가 현재 데이터와 같음 (아니면 다음 호출 때 다시 채움)
+        expected = state.version + (1 if stats['inserted'] or stats['updated'] else 0)
+        self._dedup_version = expected if self._state.version == expected else None
+        self._ingested_partitions.update(paths)
+        print(f"파티션 반영: 중복 {result.duplicates}건, 근접 중복 {result.near_duplicates}건 제외")
+        return dict(stats, unchanged=stats['unchanged'] + result.unchanged, partitions=len(paths),
+                    duplicates=result.duplicates, near_duplicates=result.near_duplicates)
+    
+    def _updated_index(self, state: PolicyIndexState, remove_ids: np.ndarray, add_embeddings: np.ndarray, add_ids: np.ndarray,
+                       data: pd.DataFrame, embeddings: np.ndarray):
+        """현재 인덱스 사본에 삭제/추가를 반영한 새 인덱스 (삭제를 지원하지 않는 HNSW는 새 데이터로 재구축)"""
+        if len(remove_ids) and not ann_index.supports_remove(state.index):
+            return self._build_index(embeddings, policy_int_ids(data[POLICY_ID_COLUMN]))
+        index = self._copy_index(state.index)
+        if len(remove_ids):
+            index.remove_ids(remove_ids)
+        if add_embeddings is not None and len(add_embeddings):
+            index.add_with_ids(add_embeddings, add_ids)
+        return index
+    
+    def _copy_index(self, index):
+        """갱신용 인덱스 복사본 (메모리 매핑으로 읽은 읽기 전용 인덱스도 수정 가능한 사본으로)"""
+        return faiss.deserialize_index(faiss.serialize_index(index))
+    
+    def _swap_state(self, data: pd.DataFrame, embeddings: np.ndarray, index, sparse_index: Optional[BM25Index] = None,
+                    passage_index: Optional[PassageIndex] = None):
+        """새 데이터로 필터 인덱스를 만든 뒤 검색 상태를 한 번에 교체"""
+        ids = policy_int_ids(data[POLICY_ID_COLUMN])
+        self._state = PolicyIndexState(
+            data=data,
+            embeddings=embeddings,
+            index=index,
+            filter_index=filters.PolicyFilterIndex(data, self.region_resolver),
+            id_index=pd.Index(ids),
+            sparse_index=sparse_index,
+            passage_index=passage_index,
+            version=self._state.version + 1,
+        )
+        # 결과 캐시 키에 인덱스 버전이 들어가므로, 이전 결과는 더 이상 쓰이지 않음
+        self.result_cache.clear()
+    
+    def save_model(self, path: str = "policy_chatbot_bundle"):
+        """
+        인덱스 번들 저장
+        
+        FAISS 인덱스, 메모리 매핑용 임베딩(.npy), 정책 데이터(Parquet), manifest를
+        디렉토리 하나에 저장합니다.
+        """
+        try:
+            state = self._state
+            index_bundle.write_bundle(path, state.data, state.embeddings, state.index, self.model_name, source=self.source_info,
+                         index_config=self.index_config, sparse_index=state.sparse_index,
+                         passage_index=state.passage_index)
             print(f"모델 저장 완료: {path}")
             
         except Exception as e:
             print(f"모델 저장 실패: {e}")
     
-    def load_model(self, path: str = "policy_chatbot_model.pkl"):
-        """모델 로드"""
+    def load_model(self, path: str = "policy_chatbot_bundle", mmap: bool = True):
+        """
+        인덱스 번들 로드
+        
+        임베딩과 인덱스는 메모리 매핑으로 읽으므로 같은 호스트의 여러 워커가 페이지를 공유하며,
+        저장된 processed_text를 그대로 사용해 텍스트 전처리를 다시 하지 않습니다.
+        
+        Args:
+            path: 번들 디렉토리
+            mmap: 메모리 매핑 사용 여부
+        """
         try:
-            with open(path, 'rb') as f:
-                model_data = pickle.load(f)
-            
-            self.data = model_data['data']
-            self.embeddings = model_data['embeddings']
-            self.index = model_data['index']
-            self.model_name = model_data['model_name']
-            
-            # 모델 재초기화
-            self._initialize_model()
-            
-            print(f"모델 로드 완료: {path}")
-            
+            with self._loading_state():
+                self._load_bundle(path, mmap)
         except Exception as e:
             print(f"모델 로드 실패: {e}")
+            raise
+    
+    def _load_bundle(self, path: str, mmap: bool):
+        """번들의 데이터/임베딩/인덱스/BM25 역색인으로 검색 묶음 교체 (모델은 지연 로드)"""
+        manifest, data, embeddings, index = index_bundle.read_bundle(path, mmap=mmap)
+        
+        self._state = PolicyIndexState(data=data, embeddings=embeddings, index=index,
+                                       id_index=pd.Index(policy_int_ids(data[POLICY_ID_COLUMN])),
+                                       version=self._current_state.version + 1)
+        self.source_info = manifest.get('source')
+        # 이전 번들 manifest에 없는 옵션은 기본값으로 채움
+        self.index_config = ann_index.index_config(**(manifest.get('index_config') or {}))
+        
+        # 번들 모델과 다른 모델이 로드되어 있으면 다음 인코딩 시 다시 로드, 같으면 차원만 확인
+        self._model_dimension = manifest['dimension']
+        if manifest['model_name'] != self.model_name:
+            self._model = None
+            self._query_model = None
+        self.model_name = manifest['model_name']
+        for model in (self._model, self._query_model):
+            if model is not None:
+                self._check_model_dimension(model)
+        
+        self._build_filter_index()
+        if self.hybrid_search:
+            # 번들에 저장된 BM25 역색인 사용 (없거나 토크나이저가 다르면 다시 생성)
+            sparse_index = index_bundle.read_sparse_index(path, self._get_tokenizer())
+            if sparse_index is None or len(sparse_index) != len(data):
+                sparse_index = sparse.BM25Index.build(data['processed_text'].tolist(), self._get_tokenizer())
+            self._state = self._state._replace(sparse_index=sparse_index)
+        if self.passage_search:
+            # 번들에 같은 구간 설정으로 저장된 구간 인덱스 사용 (없거나 다르면 구간을 인코딩해 생성)
+            passage_index = None
+            if manifest.get('passages') == self.passage_config:
+                passage_index = index_bundle.read_passage_index(path, self.index_config, mmap=mmap)
+            if passage_index is None or passage_index.policy_count != len(data):
+                passage_embeddings, owners = self._encode_passages(data)
+                passage_index = passages.PassageIndex.build(passage_embeddings, owners, len(data), self.passage_config,
+                                                            self.index_config)
+            self._state = self._state._replace(passage_index=passage_index)
+        self.clear_caches()
+        
+        print(f"모델 로드 완료: {path} ({manifest['row_count']}개 정책)")
 
 # 사용 예시
 if __name__ == "__main__":
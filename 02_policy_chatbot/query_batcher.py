@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class QueryBatcher:
+    """짧은 시간 안에 동시에 들어온 검색 요청을 모아 한 번의 배치 검색으로 처리하는 요청 병합기
+
+    첫 요청이 들어오면 max_wait_ms 동안 (또는 max_batch_size개가 찰 때까지) 요청을 모은 뒤,
+    batch_fn(검색 인자 목록)을 한 번 호출해 인코딩과 행렬 검색을 한꺼번에 수행하고
+    결과를 각 요청에 순서대로 돌려줍니다.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Dict]], List[Any]], max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, runner: Optional[Callable[..., Awaitable]] = None):
+        """
+        Args:
+            batch_fn: 검색 인자 딕셔너리 목록 -> 요청 순서대로 정렬된 결과 목록 (동기 함수)
+            max_batch_size: 한 배치에 모을 최대 요청 수
+            max_wait_ms: 첫 요청 이후 배치를 모으는 최대 대기 시간(밀리초)
+            runner: batch_fn을 실행할 비동기 실행기 (예: SearchExecutor.run, 기본값: 기본 스레드 풀)
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.runner = runner
+        self.batches = 0
+        self.requests = 0
+        self._pending = []
+        self._timer = None
+        self._tasks = set()  # 실행 중인 배치 태스크 (이벤트 루프는 약한 참조만 두므로 끝날 때까지 보관)
+
+    async def submit(self, params: Dict) -> Any:
+        """검색 요청을 현재 배치에 추가하고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((params, future))
+        self.requests += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        """대기 중인 요청을 최대 max_batch_size개씩 배치로 실행"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            # 응답을 기다리지 않는(연결이 끊긴) 요청은 제외
+            batch = [(params, future) for params, future in batch if not future.done()]
+            if batch:
+                self.batches += 1
+                task = asyncio.ensure_future(self._run_batch(batch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List):
+        params_list = [params for params, _ in batch]
+        try:
+            if self.runner is not None:
+                results = await self.runner(self.batch_fn, params_list)
+            else:
+                results = await asyncio.get_running_loop().run_in_executor(None, self.batch_fn, params_list)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """배치 수 및 평균 배치 크기"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class TTLCache:
+    """크기 제한 LRU + TTL 캐시 (스레드 안전)
+
+    최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고,
+    저장 후 ttl초가 지난 항목은 조회 시 만료 처리합니다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        """
+        Args:
+            maxsize: 최대 항목 수 (0이면 캐시 사용 안 함)
+            ttl: 항목 유효 시간(초, 0 이하이면 만료 없음)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """항목 조회 (없거나 만료되면 default)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._items[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        """항목 저장 (최대 개수를 넘으면 LRU 항목 제거)"""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """모든 항목 제거 (적중/미적중 카운터는 유지)"""
+        with self._lock:
+            self._items.clear()
+
+    def clear_namespace(self, namespace: Hashable):
+        """(namespace, ...) 튜플 키 항목만 제거 (여러 사용자가 캐시 하나를 나눠 쓸 때 자기 항목만 초기화)"""
+        with self._lock:
+            for key in [key for key in self._items if isinstance(key, tuple) and key and key[0] == namespace]:
+                del self._items[key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 및 적중률 통계"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,288 @@
+import argparse
+import json
+import os
+import re
+import struct
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 미리 컴파일한 행정구역 코드표 (python region_resolver.py로 경계 shapefile에서 다시 생성)
+DEFAULT_TABLE_PATH = os.path.join(MODULE_DIR, "region_codes.json")
+# 시군구 경계 shapefile의 .dbf (행정구역 코드/이름 속성만 사용, 도형은 읽지 않음)
+DEFAULT_DBF_PATHS = [
+    os.path.join(MODULE_DIR, "..", "01_data_analysis", "LARD_ADM_SECT_SGG_경기", "LARD_ADM_SECT_SGG_41_202505.dbf"),
+]
+
+NATIONWIDE = "전국"
+NATIONWIDE_CODE = 0
+
+# 시도 행정표준코드 (앞 2자리, 시군구 코드와 같은 5자리로 맞추기 위해 1000을 곱해 사용)
+PROVINCE_CODES = {
+    "서울특별시": 11, "부산광역시": 26, "대구광역시": 27, "인천광역시": 28, "광주광역시": 29,
+    "대전광역시": 30, "울산광역시": 31, "세종특별자치시": 36, "경기도": 41, "충청북도": 43,
+    "충청남도": 44, "전라남도": 46, "경상북도": 47, "경상남도": 48, "제주특별자치도": 50,
+    "강원특별자치도": 51, "전북특별자치도": 52,
+}
+# 개편 전 시도 이름 (공고/소관기관에 아직 쓰이므로 같은 코드로 조회)
+PROVINCE_ALIASES = {
+    "강원도": "강원특별자치도", "전라북도": "전북특별자치도", "제주도": "제주특별자치도",
+}
+
+# 경계 shapefile이 없는 서울특별시 자치구 (행정표준코드)
+SEOUL_DISTRICT_CODES = {
+    "종로구": 11110, "중구": 11140, "용산구": 11170, "성동구": 11200, "광진구": 11215,
+    "동대문구": 11230, "중랑구": 11260, "성북구": 11290, "강북구": 11305, "도봉구": 11320,
+    "노원구": 11350, "은평구": 11380, "서대문구": 11410, "마포구": 11440, "양천구": 11470,
+    "강서구": 11500, "구로구": 11530, "금천구": 11545, "영등포구": 11560, "동작구": 11590,
+    "관악구": 11620, "서초구": 11650, "강남구": 11680, "송파구": 11710, "강동구": 11740,
+}
+
+# 줄임말 별칭("포천", "경기")을 만들 때 떼어내는 행정구역 접미사 (긴 것부터)
+_SUFFIX_PATTERN = re.compile(r'(특별자치시|특별자치도|특별시|광역시|도|시|군|구)$')
+# .cpg 파일의 코드 페이지 표기 -> 파이썬 인코딩
+_CODE_PAGES = {"949": "cp949", "cp949": "cp949", "euc-kr": "cp949", "utf-8": "utf-8", "utf8": "utf-8"}
+
+
+def _dbf_encoding(path: str, default: str = "cp949") -> str:
+    """같은 이름의 .cpg 파일에 적힌 인코딩 (없으면 default, 국가 공간정보 shapefile은 대부분 CP949)"""
+    cpg_path = os.path.splitext(path)[0] + ".cpg"
+    if os.path.exists(cpg_path):
+        with open(cpg_path, "r", encoding="ascii", errors="ignore") as f:
+            return _CODE_PAGES.get(f.read().strip().lower(), default)
+    return default
+
+
+def read_dbf(path: str, encoding: str = None) -> Iterator[Dict[str, object]]:
+    """
+    dBASE III(.dbf) 레코드를 딕셔너리로 하나씩 읽기 (삭제 표시된 레코드 제외)
+
+    shapefile 속성 테이블만 필요하므로 geopandas/pyshp 없이 헤더와 고정 길이 레코드를 직접 해석합니다.
+    숫자 필드가 자릿수를 넘어 '*'로 채워져 있으면 None으로 읽습니다.
+    """
+    encoding = encoding or _dbf_encoding(path)
+    with open(path, "rb") as f:
+        header = f.read(32)
+        n_records, header_length, record_length = struct.unpack("<IHH", header[4:12])
+
+        fields = []
+        while True:
+            descriptor = f.read(32)
+            if not descriptor or descriptor[0] == 0x0D:
+                break
+            name = descriptor[:11].split(b"\0", 1)[0].decode("ascii")
+            fields.append((name, chr(descriptor[11]), descriptor[16], descriptor[17]))
+
+        f.seek(header_length)
+        for _ in range(n_records):
+            record = f.read(record_length)
+            if len(record) < record_length:
+                break
+            if record[:1] == b"*":
+                continue
+            row, offset = {}, 1
+            for name, field_type, length, decimals in fields:
+                raw = record[offset:offset + length]
+                offset += length
+                row[name] = _parse_dbf_value(raw, field_type, decimals, encoding)
+            yield row
+
+
+def _parse_dbf_value(raw: bytes, field_type: str, decimals: int, encoding: str):
+    if field_type in ("N", "F"):
+        text = raw.strip().decode("ascii", errors="ignore")
+        if not text or text.startswith("*"):
+            return None
+        return float(text) if decimals or field_type == "F" else int(text)
+    if field_type == "L":
+        return raw[:1] in (b"Y", b"y", b"T", b"t")
+    return raw.decode(encoding, errors="replace").strip()
+
+
+def build_region_table(dbf_paths: Sequence[str] = None) -> List[Dict]:
+    """
+    전국/시도/서울 자치구와 시군구 경계 .dbf의 시군구(및 일반구)로 행정구역 코드표 생성
+
+    LARD_ADM_SECT_SGG .dbf의 ADM_SECT_C는 시군구(구가 있는 시는 일반구) 코드, COL_ADM_SE는 상위 시 코드,
+    SGG_NM은 "경기도 수원시 장안구" 형태의 전체 이름입니다.
+
+    Returns:
+        코드 순으로 정렬한 {"code", "name", "full_name", "parent"} 목록 (개편 전 이름이 있는 시도는 "aliases" 포함)
+    """
+    regions = {NATIONWIDE_CODE: {"code": NATIONWIDE_CODE, "name": NATIONWIDE, "full_name": NATIONWIDE, "parent": None}}
+    for name, prefix in PROVINCE_CODES.items():
+        code = prefix * 1000
+        regions[code] = {"code": code, "name": name, "full_name": name, "parent": NATIONWIDE_CODE}
+        aliases = [alias for alias, current in PROVINCE_ALIASES.items() if current == name]
+        if aliases:
+            regions[code]["aliases"] = aliases
+    for name, code in SEOUL_DISTRICT_CODES.items():
+        regions[code] = {"code": code, "name": name, "full_name": f"서울특별시 {name}", "parent": 11000}
+
+    for path in (DEFAULT_DBF_PATHS if dbf_paths is None else dbf_paths):
+        for row in read_dbf(path):
+            code, city_code = int(row["ADM_SECT_C"]), int(row["COL_ADM_SE"] or row["ADM_SECT_C"])
+            names = str(row["SGG_NM"]).split()
+            province_code = PROVINCE_CODES[PROVINCE_ALIASES.get(names[0], names[0])] * 1000
+            regions.setdefault(city_code, {
+                "code": city_code, "name": names[1], "full_name": " ".join(names[:2]), "parent": province_code,
+            })
+            if code != city_code:
+                # 구가 있는 시(수원시 장안구 등)의 일반구
+                regions[code] = {"code": code, "name": names[-1], "full_name": " ".join(names), "parent": city_code}
+    return [regions[code] for code in sorted(regions)]
+
+
+class RegionResolver:
+    """
+    지역명 <-> 정수 행정구역 코드 변환과 상위 지역 조회
+
+    상위 지역(자기 자신 제외, 가까운 순)과 지역명 언급 검색용 정규식을 생성 시점에 모두 계산해 두므로,
+    정책 데이터 적재 시 행별 지역 코드 계산과 검색 시 필터 조회는 딕셔너리/정수 비교만 합니다.
+    """
+
+    def __init__(self, regions: Sequence[Dict]):
+        """
+        Args:
+            regions: build_region_table 형식의 {"code", "name", "full_name", "parent"(, "aliases")} 목록
+        """
+        self._names: Dict[int, str] = {}
+        self._parents: Dict[int, Optional[int]] = {}
+        self._codes: Dict[str, int] = {}
+        aliases: Set[str] = set()
+        for region in regions:
+            code = int(region["code"])
+            self._names[code] = region["name"]
+            self._parents[code] = None if region["parent"] is None else int(region["parent"])
+            aliases.update(region.get("aliases", ()))
+            for name in (region["name"], region.get("full_name"), *region.get("aliases", ())):
+                if name:
+                    self._codes.setdefault(name, code)
+
+        # 상위 지역은 미리 계산 (코드 -> 가까운 순서의 상위 코드 튜플)
+        self._ancestors: Dict[int, Tuple[int, ...]] = {}
+        for code in self._names:
+            chain, parent = [], self._parents[code]
+            while parent is not None and parent not in chain:
+                chain.append(parent)
+                parent = self._parents.get(parent)
+            self._ancestors[code] = tuple(chain)
+        self._has_children: Set[int] = {parent for parent in self._parents.values() if parent is not None}
+
+        # 줄임말 별칭 ("포천" -> 포천시), 두 지역 이상이 겹치면("광주") 쓰지 않음
+        short_names: Dict[str, Set[int]] = {}
+        for code, name in self._names.items():
+            short = _SUFFIX_PATTERN.sub("", name)
+            if len(short) >= 2 and short != name:
+                short_names.setdefault(short, set()).add(code)
+        for short, codes in short_names.items():
+            if len(codes) == 1 and short not in self._codes:
+                self._codes[short] = next(iter(codes))
+
+        # 정책명/본문의 지역명 언급 검색: 긴 이름 우선이라 "남양주시"가 "양주시"로 잡히지 않음
+        names = {name for code, name in self._names.items() if code != NATIONWIDE_CODE} | aliases
+        names = sorted(names, key=len, reverse=True)
+        self._mention_pattern = re.compile("|".join(re.escape(name) for name in names)) if names else None
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TABLE_PATH) -> "RegionResolver":
+        """미리 컴파일한 코드표(JSON)에서 생성 (없으면 경계 shapefile에서 바로 생성)"""
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f)["regions"])
+        return cls.from_shapefiles()
+
+    @classmethod
+    def from_shapefiles(cls, dbf_paths: Sequence[str] = None) -> "RegionResolver":
+        """시군구 경계 .dbf에서 생성 (파일이 없으면 전국/시도/서울 자치구만)"""
+        paths = DEFAULT_DBF_PATHS if dbf_paths is None else dbf_paths
+        return cls(build_region_table([path for path in paths if os.path.exists(path)]))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.code(name) is not None
+
+    def code(self, name: str) -> Optional[int]:
+        """지역명(이름, 전체 이름, 개편 전 이름, 고유한 줄임말)의 코드 (모르는 지역이면 None)"""
+        if name is None:
+            return None
+        name = " ".join(str(name).split())
+        return self._codes.get(name)
+
+    def name(self, code: int) -> Optional[str]:
+        return self._names.get(code)
+
+    def ancestors(self, code: int) -> Tuple[int, ...]:
+        """상위 지역 코드 (가까운 순, 자기 자신 제외)"""
+        return self._ancestors.get(code, ())
+
+    def lineage(self, name: str) -> List[str]:
+        """[자기 자신, 상위 지역들...] 이름 목록 (모르는 지역이면 [name])"""
+        code = self.code(name)
+        if code is None:
+            return [name]
+        return [self._names[code]] + [self._names[ancestor] for ancestor in self._ancestors[code]]
+
+    def hierarchy(self) -> Dict[str, List[str]]:
+        """지역명 -> [자기 자신, 상위 지역들...] (기존 region_hierarchy 형식)"""
+        return {name: self.lineage(name) for code, name in sorted(self._names.items())}
+
+    def codes(self) -> Dict[str, int]:
+        """지역명 -> 코드"""
+        return {name: code for code, name in sorted(self._names.items())}
+
+    def mentioned(self, text: str) -> Set[int]:
+        """텍스트에 언급된 지역 코드"""
+        if self._mention_pattern is None or not text:
+            return set()
+        return {self._codes[match.group()] for match in self._mention_pattern.finditer(str(text))}
+
+    def policy_codes(self, organization: str, *texts: str) -> List[int]:
+        """
+        정책 한 건의 지역 코드 목록 (지역 필터 포함 여부 판단용)
+
+        소관기관 지역이 들어가고, 소관기관이 상위 지역(경기도, 전국)이면 정책명/본문에 언급된 하위 지역도
+        들어갑니다. 예: 소관기관 "경기도" + 본문에 "포천시" -> [경기도, 포천시]. 다른 시도의 지역이 언급된
+        경우는 넣지 않습니다. 소관기관이 지역이 아니면(중앙부처 등) 빈 목록입니다.
+        """
+        code = self.code(organization)
+        if code is None:
+            return []
+        codes = [code]
+        if code in self._has_children:
+            for mention in sorted(self.mentioned(" ".join(str(text) for text in texts))):
+                if code in self._ancestors[mention]:
+                    codes.append(mention)
+        return codes
+
+
+def save_region_table(regions: List[Dict], path: str = DEFAULT_TABLE_PATH, sources: Sequence[str] = ()):
+    """코드표를 JSON으로 저장"""
+    # 지역 하나를 한 줄로 저장 (코드표 변경 시 diff를 보기 쉽게)
+    lines = [json.dumps(region, ensure_ascii=False) for region in regions]
+    sources = json.dumps([os.path.basename(source) for source in sources], ensure_ascii=False)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n "sources": ' + sources + ',\n "regions": [\n  ' + ",\n  ".join(lines) + "\n ]\n}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시군구 경계 shapefile(.dbf)에서 지역 코드표(region_codes.json) 생성")
+    parser.add_argument("--dbf", nargs="+", default=DEFAULT_DBF_PATHS, help="LARD_ADM_SECT_SGG .dbf 경로 (여러 개 지정 가능)")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH, help="저장할 JSON 경로")
+    args = parser.parse_args()
+
+    missing = [path for path in args.dbf if not os.path.exists(path)]
+    if missing:
+        parser.error(f".dbf 파일을 찾을 수 없습니다: {', '.join(missing)}")
+    regions = build_region_table(args.dbf)
+    save_region_table(regions, args.output, args.dbf)
+    resolver = RegionResolver(regions)
+    print(f"✅ 지역 코드표 저장: {args.output} ({len(resolver)}개 지역)")
+    for name in ("포천시", "장안구", "강남구", "강원도"):
+        print(f"   {name}: {resolver.code(name)} -> {' > '.join(resolver.lineage(name))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from query_cache import TTLCache
+
+# 다국어(한국어 포함) 교차 인코더 (MiniLM 12층, CPU에서도 후보 수십 개를 수백 ms 안에 채점)
+DEFAULT_RERANK_MODEL = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+# 교차 인코더 재순위 기본값
+#   candidates  - 1차 검색(dense/하이브리드) 상위 몇 개를 다시 채점할지
+#   batch_size  - 한 번의 predict 호출에 넣을 (쿼리, 문서) 쌍 수
+#   time_budget - 호출당 채점 시간 상한(초, 0 이하이면 제한 없음)
+#   max_length  - 교차 인코더 최대 토큰 길이
+#   doc_chars   - 문서 텍스트를 이 글자 수까지만 사용
+RERANK_DEFAULTS = {
+    "candidates": 20,
+    "batch_size": 16,
+    "time_budget": 0.3,
+    "max_length": 256,
+    "doc_chars": 512,
+}
+
+
+class CrossEncoderReranker:
+    """
+    1차 검색 상위 후보를 교차 인코더로 다시 채점하는 2단계 재순위기
+
+    (쿼리, 문서) 쌍을 배치로 나눠 CPU에서 채점하고, 점수는 (쿼리, 문서 텍스트 해시)를 키로 TTLCache에
+    저장합니다. 이전 배치들로 잰 쌍당 시간으로 다음 배치가 time_budget을 넘길 것 같으면 채점을 멈추고,
+    끝까지 채점하지 못한 쿼리는 None을 돌려줘 호출한 쪽이 1차 검색 순서를 그대로 쓰게 합니다.
+    멈추기 전까지 채점한 점수는 캐시에 남으므로 같은 쿼리를 다시 검색하면 재순위가 적용됩니다.
+
+    모델은 처음 채점할 때 로드하며, 한 인스턴스를 여러 챗봇(코퍼스)이 같이 쓸 수 있습니다.
+    """
+    # 예산 때문에 배치를 건너뛸 때 쌍당 시간 추정값에 곱하는 값 (한 번 느렸던 측정값 때문에 재순위가 영영 꺼지지 않도록)
+    skip_decay = 0.5
+
+    def __init__(self, model_name: str = DEFAULT_RERANK_MODEL, candidates: int = None, batch_size: int = None,
+                 time_budget: float = None, max_length: int = None, doc_chars: int = None,
+                 cache_size: int = 8192, cache_ttl: float = 3600.0, model=None):
+        """
+        Args:
+            model_name: sentence_transformers CrossEncoder 모델명
+            candidates, batch_size, time_budget, max_length, doc_chars: RERANK_DEFAULTS 참고 (None이면 기본값)
+            cache_size: (쿼리, 문서) 점수 캐시 크기 (0이면 사용 안 함)
+            cache_ttl: 점수 캐시 유효 시간(초)
+            model: 이미 로드한 CrossEncoder (predict(pairs, batch_size=...)를 제공하는 객체)
+        """
+        options = dict(RERANK_DEFAULTS)
+        for name, value in (("candidates", candidates), ("batch_size", batch_size), ("time_budget", time_budget),
+                            ("max_length", max_length), ("doc_chars", doc_chars)):
+            if value is not None:
+                options[name] = value
+        if options["candidates"] < 1 or options["batch_size"] < 1:
+            raise ValueError(f"candidates/batch_size는 1 이상이어야 합니다: {options}")
+        self.model_name = model_name
+        self.candidates = int(options["candidates"])
+        self.batch_size = int(options["batch_size"])
+        self.time_budget = float(options["time_budget"])
+        self.max_length = int(options["max_length"])
+        self.doc_chars = int(options["doc_chars"])
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self.calls = 0
+        self.queries = 0
+        self.pairs_scored = 0
+        self.fallbacks = 0
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._pair_seconds = None  # 쌍당 채점 시간 이동 평균 (다음 배치가 예산 안에 끝날지 추정)
+
+    @property
+    def model(self):
+        """교차 인코더 (처음 채점할 때 로드)"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+                    print(f"교차 인코더 로딩 중: {self.model_name}")
+                    self._model = CrossEncoder(self.model_name, max_length=self.max_length, device='cpu')
+        return self._model
+
+    @property
+    def model_loaded(self) -> bool:
+        return self._model is not None
+
+    def warmup(self):
+        """모델을 미리 로드하고 한 쌍을 채점 (첫 호출의 초기화 비용은 쌍당 시간 추정값에 넣지 않음)"""
+        self._predict([("워밍업", "워밍업")], measure=False)
+
+    def _doc_key(self, document: str) -> bytes:
+        return hashlib.blake2b(document.encode('utf-8'), digest_size=8).digest()
+
+    def _predict(self, pairs: List[tuple], measure: bool = True) -> np.ndarray:
+        # 모델 로드는 채점 시간에서 제외
+        model = self.model
+        start = time.perf_counter()
+        scores = np.asarray(model.predict(pairs, batch_size=len(pairs), show_progress_bar=False),
+                            dtype='float32').reshape(len(pairs))
+        if not measure:
+            return scores
+        pair_seconds = (time.perf_counter() - start) / len(pairs)
+        previous = self._pair_seconds
+        self._pair_seconds = pair_seconds if previous is None else 0.7 * previous + 0.3 * pair_seconds
+        return scores
+
+    def rerank(self, queries: Sequence[str], documents: Sequence[Sequence[str]]) -> List[Optional[np.ndarray]]:
+        """
+        쿼리별 후보 문서들의 교차 인코더 점수
+
+        캐시에 없는 쌍만 쿼리 순서대로 batch_size씩 채점하므로, 예산을 넘기면 앞쪽 쿼리부터 완료됩니다.
+
+        Args:
+            queries: 정규화된 쿼리 목록
+            documents: 쿼리별 후보 문서 텍스트 목록 (1차 검색 순서)
+
+        Returns:
+            쿼리별 점수 배열 (documents[i]와 같은 순서, 시간 예산 안에 모두 채점하지 못했으면 None)
+        """
+        deadline = time.perf_counter() + self.time_budget if self.time_budget > 0 else None
+        self.calls += 1
+        self.queries += len(queries)
+        all_scores = []
+        pending = []  # (쿼리 번호, 문서 번호, 캐시 키, 쿼리, 문서)
+        for i, (query, docs) in enumerate(zip(queries, documents)):
+            scores = np.full(len(docs), np.nan, dtype='float32')
+            for j, doc in enumerate(docs):
+                doc = doc[:self.doc_chars]
+                key = (query, self._doc_key(doc))
+                cached = self.cache.get(key)
+                if cached is None:
+                    pending.append((i, j, key, query, doc))
+                else:
+                    scores[j] = cached
+            all_scores.append(scores)
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            if deadline is not None:
+                now = time.perf_counter()
+                if now >= deadline or (self._pair_seconds is not None and now + self._pair_seconds * len(batch) > deadline):
+                    if self._pair_seconds is not None:
+                        self._pair_seconds *= self.skip_decay
+                    break
+            scores = self._predict([(query, doc) for _, _, _, query, doc in batch])
+            self.pairs_scored += len(batch)
+            for (i, j, key, _, _), score in zip(batch, scores):
+                all_scores[i][j] = score
+                self.cache.set(key, float(score))
+
+        results = [scores if not np.isnan(scores).any() else None for scores in all_scores]
+        self.fallbacks += sum(scores is None for scores in results)
+        return results
+
+    def stats(self) -> Dict:
+        """호출/쿼리/채점/예산 초과 수와 점수 캐시 통계"""
+        return {
+            "model_name": self.model_name,
+            "model_loaded": self.model_loaded,
+            "candidates": self.candidates,
+            "time_budget": self.time_budget,
+            "calls": self.calls,
+            "queries": self.queries,
+            "pairs_scored": self.pairs_scored,
+            "fallbacks": self.fallbacks,
+            "pair_seconds": self._pair_seconds,
+            "cache": self.cache.stats(),
+        }
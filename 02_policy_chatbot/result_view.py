@@ -0,0 +1,145 @@
+import bisect
+import re
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+# 검색 결과 항목 필드 (PolicyChatbot._build_result와 같은 순서)
+RESULT_FIELDS = (
+    'title', 'body', 'target', 'organization', 'field_major', 'field_minor',
+    'executing_org', 'contact', 'period', 'application_method', 'similarity_score',
+)
+# 스니펫 모드에서 검색어 주변만 잘라 보내는 긴 텍스트 필드
+SNIPPET_FIELDS = ('body', 'application_method', 'target')
+# 자르지 않고 강조 위치만 표시하는 필드
+HIGHLIGHT_FIELDS = ('title',)
+# 스니펫 앞뒤가 잘렸음을 나타내는 문자 (강조 위치 계산에 포함)
+ELLIPSIS = '…'
+
+_TERM_PATTERN = re.compile(r'[가-힣]+|[a-zA-Z]+|[0-9]+')
+# 스니펫 경계를 단어 경계로 맞출 때 앞뒤로 찾아보는 최대 글자 수
+_BOUNDARY_SLACK = 10
+
+
+def query_pattern(query: str) -> Optional[Pattern]:
+    """
+    검색어 강조용 정규식 (긴 용어 우선)
+
+    BM25 regex 토크나이저와 같이 어절과 한글 음절 바이그램을 용어로 쓰므로, "기술지원"으로 검색해도
+    본문의 "기술 지원"이 강조됩니다. 한 글자 용어는 강조하지 않습니다.
+    """
+    terms = set()
+    for word in _TERM_PATTERN.findall(str(query)):
+        word = word.lower()
+        if len(word) >= 2:
+            terms.add(word)
+        if len(word) > 2 and '가' <= word[0] <= '힣':
+            terms.update(word[i:i + 2] for i in range(len(word) - 1))
+    if not terms:
+        return None
+    return re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+
+
+def find_highlights(text: str, pattern: Optional[Pattern]) -> List[List[int]]:
+    """검색어가 나타나는 [시작, 끝) 위치 목록 (겹치거나 붙어 있는 구간은 합침)"""
+    if pattern is None or not text:
+        return []
+    spans = []
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], end)
+        else:
+            spans.append([start, end])
+    return spans
+
+
+def _snippet_window(text: str, spans: Sequence[Sequence[int]], length: int) -> Tuple[int, int]:
+    """강조 구간이 가장 많이 들어가는 length 글자 창의 [시작, 끝) (강조 구간이 없으면 앞부분)"""
+    start = 0
+    if spans:
+        starts = [span[0] for span in spans]
+        ends = [span[1] for span in spans]
+        lead = length // 4  # 첫 강조 구간 앞에 남길 문맥
+        best = -1
+        for span_start in starts:
+            window_start = max(0, min(span_start - lead, len(text) - length))
+            count = bisect.bisect_right(ends, window_start + length) - bisect.bisect_left(starts, window_start)
+            if count > best:
+                best, start = count, window_start
+    end = min(len(text), start + length)
+
+    # 단어 중간에서 끊기지 않도록 가까운 공백으로 경계 조정
+    if start > 0:
+        space = text.find(' ', start, start + _BOUNDARY_SLACK)
+        if space != -1:
+            start = space + 1
+    if end < len(text):
+        space = text.rfind(' ', end - _BOUNDARY_SLACK, end)
+        if space > start:
+            end = space
+    return start, end
+
+
+def make_snippet(text: str, pattern: Optional[Pattern], length: int) -> Tuple[str, List[List[int]]]:
+    """
+    검색어 주변 length 글자 내외의 스니펫과 스니펫 기준 강조 위치
+
+    Returns:
+        (스니펫, [[시작, 끝), ...]) - 잘린 쪽에는 ELLIPSIS가 붙고, 강조 위치는 ELLIPSIS를 포함한 스니펫 기준
+    """
+    text = str(text)
+    spans = find_highlights(text, pattern)
+    if len(text) <= length:
+        return text, spans
+
+    start, end = _snippet_window(text, spans, length)
+    prefix = ELLIPSIS if start > 0 else ''
+    snippet = prefix + text[start:end] + (ELLIPSIS if end < len(text) else '')
+    offset = len(prefix) - start
+    highlights = [
+        [max(span_start, start) + offset, min(span_end, end) + offset]
+        for span_start, span_end in spans
+        if span_end > start and span_start < end
+    ]
+    return snippet, highlights
+
+
+def project_result(result: Dict, fields: Optional[Sequence[str]] = None, snippet_length: Optional[int] = None,
+                   pattern: Optional[Pattern] = None) -> Dict:
+    """
+    검색 결과 항목을 요청한 필드만 남기고, 스니펫 모드면 긴 텍스트를 스니펫으로 줄임
+
+    Args:
+        result: PolicyChatbot 검색 결과 항목
+        fields: 반환할 필드 (None이면 전체, similarity_score는 항상 포함)
+        snippet_length: 스니펫 글자 수 (None이면 원문 그대로)
+        pattern: query_pattern으로 만든 강조용 정규식
+
+    Returns:
+        새 딕셔너리 (스니펫 모드면 필드별 강조 위치 'highlights' 포함)
+    """
+    names = RESULT_FIELDS if not fields else [name for name in RESULT_FIELDS if name in fields or name == 'similarity_score']
+    projected = {name: result[name] for name in names if name in result}
+    if snippet_length:
+        highlights = {}
+        for name in names:
+            if name not in projected:
+                continue
+            if name in SNIPPET_FIELDS:
+                projected[name], spans = make_snippet(projected[name], pattern, snippet_length)
+            elif name in HIGHLIGHT_FIELDS:
+                spans = find_highlights(str(projected[name]), pattern)
+            else:
+                continue
+            if spans:
+                highlights[name] = spans
+        projected['highlights'] = highlights
+    return projected
+
+
+def project_results(results: List[Dict], query: str, fields: Optional[Sequence[str]] = None,
+                    snippet_length: Optional[int] = None) -> List[Dict]:
+    """검색 결과 목록에 project_result 적용 (필드/스니펫 지정이 없으면 그대로 반환)"""
+    if not fields and not snippet_length:
+        return results
+    pattern = query_pattern(query) if snippet_length else None
+    return [project_result(result, fields, snippet_length, pattern) for result in results]
@@ -9,6 +9,44 @@ import argparse
 import uvicorn
 from pathlib import Path
 
+def prepare_shared_bundle(csv_path, bundle_path, rebuild=False, index_type="flat", passage_search=False, hybrid_search=False):
+    """
+    워커들이 공유할 인덱스 번들 준비
+    
+    번들이 없거나 CSV가 바뀌었으면 부모 프로세스에서 한 번만 임베딩/인덱스를 만들어 저장합니다.
+    (디스크 임베딩 캐시를 쓰므로 바뀐 행만 다시 인코딩) 부모는 번들 저장 후 챗봇을 해제하고,
+    워커들은 번들의 임베딩과 FAISS 인덱스를 메모리 매핑으로 읽어 같은 페이지를 공유합니다.
+    IVF 계열은 역리스트가 매핑되지 않아 워커마다 복사본을 가지므로 경고만 출력합니다.
+    """
+    from ann_index import shares_mmap_pages
+    from index_bundle import bundle_is_fresh
+    from policy_chatbot import DEFAULT_CSV_PATH, PolicyChatbot
+    
+    if not shares_mmap_pages(index_type):
+        print(f"⚠️ {index_type} 인덱스는 워커마다 역리스트를 메모리에 읽으므로 임베딩만 공유됩니다 (flat/hnsw 권장)")
+    
+    csv_path = csv_path or DEFAULT_CSV_PATH
+    if not rebuild and bundle_is_fresh(bundle_path, csv_path, index_type=index_type, passages=passage_search):
+        print(f"📦 공유 인덱스 번들 재사용: {bundle_path}")
+        return
+    
+    print(f"📦 공유 인덱스 번들 생성 중: {bundle_path}")
+    chatbot = PolicyChatbot(csv_path=csv_path, index_type=index_type, passage_search=passage_search,
+                            hybrid_search=hybrid_search)
+    chatbot.save_model(bundle_path)
+    del chatbot
+    if not bundle_is_fresh(bundle_path, csv_path, index_type=index_type, passages=passage_search):
+        raise RuntimeError(f"공유 인덱스 번들 생성 실패: {bundle_path}")
+
+def prepare_onnx_encoder(bundle_path=None):
+    """워커 시작 전에 쿼리 인코더를 ONNX로 내보내고 int8 양자화 (공유 번들이 있으면 번들의 모델 기준)"""
+    from encoders import ensure_onnx_model
+    from index_bundle import read_manifest
+    from policy_chatbot import DEFAULT_MODEL_NAME
+    
+    model_name = read_manifest(bundle_path)["model_name"] if bundle_path else DEFAULT_MODEL_NAME
+    print(f"🧠 ONNX 쿼리 인코더 준비: {ensure_onnx_model(model_name)}")
+
 def main():
     parser = argparse.ArgumentParser(description="정책 챗봇 API 서버 실행")
     parser.add_argument(
@@ -33,6 +71,108 @@ def main():
         default=1, 
         help="워커 프로세스 수 (기본값: 1)"
     )
+    parser.add_argument(
+        "--threads", 
+        type=int, 
+        default=int(os.getenv("POLICY_API_THREADS", "4")), 
+        help="워커당 검색 스레드 수 (기본값: 4)"
+    )
+    parser.add_argument(
+        "--max-queue", 
+        type=int, 
+        default=int(os.getenv("POLICY_API_MAX_QUEUE", "32")), 
+        help="스레드가 모두 바쁠 때 대기시킬 최대 요청 수, 초과 시 503 응답 (기본값: 32)"
+    )
+    parser.add_argument(
+        "--timeout", 
+        type=float, 
+        default=float(os.getenv("POLICY_API_TIMEOUT", "30")), 
+        help="검색 요청별 타임아웃(초), 초과 시 504 응답 (기본값: 30)"
+    )
+    parser.add_argument(
+        "--batch-size", 
+        type=int, 
+        default=int(os.getenv("POLICY_API_BATCH_SIZE", "32")), 
+        help="동시 검색 요청을 모을 최대 배치 크기 (기본값: 32)"
+    )
+    parser.add_argument(
+        "--batch-wait-ms", 
+        type=float, 
+        default=float(os.getenv("POLICY_API_BATCH_WAIT_MS", "5")), 
+        help="배치를 모으는 최대 대기 시간(밀리초), 0이면 요청 병합 사용 안 함 (기본값: 5)"
+    )
+    parser.add_argument(
+        "--csv", 
+        default=os.getenv("POLICY_CSV_PATH"), 
+        help="정책 데이터 CSV 경로 (기본값: PolicyChatbot 기본 경로)"
+    )
+    parser.add_argument(
+        "--corpora", 
+        default=os.getenv("POLICY_CORPORA"), 
+        help="여러 코퍼스 설정 JSON 경로 (지정하면 --csv 대신 사용, 요청의 ?corpus=로 코퍼스 선택)"
+    )
+    parser.add_argument(
+        "--memory-budget-mb", 
+        type=float, 
+        default=float(os.getenv("POLICY_MEMORY_BUDGET_MB")) if os.getenv("POLICY_MEMORY_BUDGET_MB") else None, 
+        help="로드된 코퍼스 메모리 합계 상한(MB), 넘으면 가장 오래 쓰지 않은 코퍼스부터 해제 (기본값: 제한 없음)"
+    )
+    parser.add_argument(
+        "--index-type", 
+        default=os.getenv("POLICY_INDEX_TYPE", "flat"), 
+        choices=["flat", "hnsw", "ivf_flat", "ivf_pq"],
+        help="FAISS 인덱스 종류 (기본값: flat, 대용량 데이터는 hnsw/ivf_flat/ivf_pq)"
+    )
+    parser.add_argument(
+        "--passage-search", 
+        action="store_true", 
+        default=os.getenv("POLICY_PASSAGE_SEARCH") == "1", 
+        help="긴 공고를 겹치는 구간으로 나눠 구간마다 임베딩하고 구간 유사도 최댓값으로 검색"
+    )
+    parser.add_argument(
+        "--hybrid-search", 
+        action="store_true", 
+        default=os.getenv("POLICY_HYBRID_SEARCH") == "1", 
+        help="BM25 역색인을 만들고 의미 검색 결과와 RRF로 합쳐 순위 결정 (기본값: 의미 검색만, 요청별 hybrid로 끌 수 있음)"
+    )
+    parser.add_argument(
+        "--rerank-model", 
+        default=os.getenv("POLICY_RERANK_MODEL"), 
+        help="상위 후보를 다시 채점할 교차 인코더 모델 (예: cross-encoder/mmarco-mMiniLMv2-L12-H384-v1, 기본값: 재순위 안 함)"
+    )
+    parser.add_argument(
+        "--rerank-candidates", 
+        type=int, 
+        default=int(os.getenv("POLICY_RERANK_CANDIDATES", "20")), 
+        help="교차 인코더로 다시 채점할 1차 검색 후보 수 (기본값: 20)"
+    )
+    parser.add_argument(
+        "--rerank-budget-ms", 
+        type=float, 
+        default=float(os.getenv("POLICY_RERANK_BUDGET_MS", "300")), 
+        help="재순위 채점 시간 예산(ms), 넘으면 1차 검색 순서로 응답 (기본값: 300, 0이면 제한 없음)"
+    )
+    parser.add_argument(
+        "--encoder-backend", 
+        default=os.getenv("POLICY_ENCODER_BACKEND", "sentence_transformers"), 
+        choices=["sentence_transformers", "onnx"],
+        help="쿼리 인코더 (기본값: sentence_transformers, onnx는 int8 양자화 ONNX를 onnxruntime CPU로 실행)"
+    )
+    parser.add_argument(
+        "--shared-index", 
+        action="store_true", 
+        help="부모 프로세스에서 인덱스 번들을 한 번만 만들고 워커들이 메모리 매핑으로 공유"
+    )
+    parser.add_argument(
+        "--bundle-path", 
+        default="./data/policy_chatbot_bundle", 
+        help="공유 인덱스 번들 경로 (기본값: ./data/policy_chatbot_bundle)"
+    )
+    parser.add_argument(
+        "--rebuild-index", 
+        action="store_true", 
+        help="공유 인덱스 번들이 최신이어도 다시 생성"
+    )
     parser.add_argument(
         "--log-level", 
         default="info", 
@@ -46,11 +186,60 @@ def main():
     project_root = Path(__file__).parent
     os.chdir(project_root)
     
+    # 워커 프로세스에서 api_server가 읽을 스레드 풀 설정
+    os.environ["POLICY_API_THREADS"] = str(args.threads)
+    os.environ["POLICY_API_MAX_QUEUE"] = str(args.max_queue)
+    os.environ["POLICY_API_TIMEOUT"] = str(args.timeout)
+    os.environ["POLICY_API_BATCH_SIZE"] = str(args.batch_size)
+    os.environ["POLICY_API_BATCH_WAIT_MS"] = str(args.batch_wait_ms)
+    os.environ["POLICY_INDEX_TYPE"] = args.index_type
+    os.environ["POLICY_ENCODER_BACKEND"] = args.encoder_backend
+    os.environ["POLICY_PASSAGE_SEARCH"] = "1" if args.passage_search else "0"
+    os.environ["POLICY_HYBRID_SEARCH"] = "1" if args.hybrid_search else "0"
+    if args.rerank_model:
+        os.environ["POLICY_RERANK_MODEL"] = args.rerank_model
+        os.environ["POLICY_RERANK_CANDIDATES"] = str(args.rerank_candidates)
+        os.environ["POLICY_RERANK_BUDGET_MS"] = str(args.rerank_budget_ms)
+    if args.csv:
+        os.environ["POLICY_CSV_PATH"] = args.csv
+    if args.corpora:
+        os.environ["POLICY_CORPORA"] = os.path.abspath(args.corpora)
+    if args.memory_budget_mb is not None:
+        os.environ["POLICY_MEMORY_BUDGET_MB"] = str(args.memory_budget_mb)
+    
+    # 공유 인덱스 모드: 번들을 한 번만 만들고 워커들은 번들을 메모리 매핑으로 로드
+    if args.shared_index:
+        bundle_path = os.path.abspath(args.bundle_path)
+        try:
+            prepare_shared_bundle(args.csv, bundle_path, rebuild=args.rebuild_index, index_type=args.index_type,
+                                  passage_search=args.passage_search, hybrid_search=args.hybrid_search)
+        except Exception as e:
+            print(f"❌ 공유 인덱스 준비 중 오류 발생: {e}")
+            sys.exit(1)
+        os.environ["POLICY_BUNDLE_PATH"] = bundle_path
+    
+    # ONNX 내보내기/양자화는 부모 프로세스에서 한 번만 (워커들은 내보낸 모델을 로드)
+    if args.encoder_backend == "onnx" and args.workers > 1:
+        try:
+            prepare_onnx_encoder(bundle_path if args.shared_index else None)
+        except Exception as e:
+            print(f"⚠️ ONNX 인코더 준비 실패, 워커에서 다시 시도합니다: {e}")
+    
     print("🚀 정책 챗봇 API 서버 시작")
     print(f"📍 호스트: {args.host}")
     print(f"🔌 포트: {args.port}")
     print(f"🔄 자동 재시작: {'활성화' if args.reload else '비활성화'}")
     print(f"👥 워커 수: {args.workers}")
+    print(f"🧭 인덱스 종류: {args.index_type}")
+    print(f"🧠 쿼리 인코더: {args.encoder_backend}")
+    print(f"🧩 구간 검색: {'활성화' if args.passage_search else '비활성화'}")
+    print(f"🔀 하이브리드 검색: {'활성화' if args.hybrid_search else '비활성화'}")
+    print(f"🎯 재순위: {args.rerank_model + ' (후보 ' + str(args.rerank_candidates) + '개, 예산 ' + str(args.rerank_budget_ms) + 'ms)' if args.rerank_model else '비활성화'}")
+    if args.corpora:
+        print(f"📚 코퍼스 설정: {args.corpora} (메모리 예산: {str(args.memory_budget_mb) + 'MB' if args.memory_budget_mb is not None else '제한 없음'})")
+    print(f"🗂️ 공유 인덱스: {'활성화 (' + args.bundle_path + ')' if args.shared_index else '비활성화'}")
+    print(f"🧵 검색 스레드: {args.threads} (대기열 {args.max_queue}, 타임아웃 {args.timeout}초)")
+    print(f"📦 요청 병합: {'최대 ' + str(args.batch_size) + '개 / ' + str(args.batch_wait_ms) + 'ms' if args.batch_wait_ms > 0 else '비활성화'}")
     print(f"📝 로그 레벨: {args.log_level}")
     print("=" * 50)
     
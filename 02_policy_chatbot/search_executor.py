@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class ExecutorSaturatedError(Exception):
+    """실행 중 + 대기 중 작업 수가 한도에 도달함"""
+
+
+class ExecutorTimeoutError(Exception):
+    """작업이 요청 타임아웃 안에 끝나지 않음"""
+
+
+class SearchExecutor:
+    """이벤트 루프 밖에서 CPU 작업(임베딩, 검색)을 실행하는 제한된 스레드 풀
+
+    실행 중인 작업과 대기 중인 작업의 합이 max_workers + max_queue를 넘으면 즉시 거절하고,
+    요청별 타임아웃을 넘긴 작업은 호출자에게 실패로 돌려줍니다. 작업 슬롯은 실제 작업이
+    끝날 때 반환되므로, 타임아웃된 작업이 계속 돌고 있는 동안에는 새 작업이 그만큼 덜 들어옵니다.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 32, timeout: float = 30.0):
+        """
+        Args:
+            max_workers: 작업 스레드 수
+            max_queue: 스레드가 모두 바쁠 때 대기시킬 최대 작업 수
+            timeout: 요청별 타임아웃(초, 0 이하이면 제한 없음)
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.rejected = 0
+        self.timed_out = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="policy-search")
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        func(*args, **kwargs)를 스레드 풀에서 실행하고 결과를 기다림
+
+        Raises:
+            ExecutorSaturatedError: 대기열이 가득 찬 경우
+            ExecutorTimeoutError: 타임아웃을 넘긴 경우
+        """
+        if not self._acquire():
+            raise ExecutorSaturatedError(f"검색 작업 대기열이 가득 찼습니다 ({self.capacity}개)")
+        try:
+            future = self._pool.submit(func, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            if self.timeout and self.timeout > 0:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            return await asyncio.wrap_future(future)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            raise ExecutorTimeoutError(f"검색 작업이 {self.timeout}초 안에 끝나지 않았습니다")
+
+    def stats(self) -> Dict[str, Any]:
+        """실행/대기 중 작업 수 및 거절/타임아웃 횟수"""
+        return {
+            "in_flight": self._in_flight,
+            "capacity": self.capacity,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "timeout": self.timeout,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,271 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 조사/어미/문장부호 등 검색에 도움이 되지 않는 Okt 품사
+_OKT_SKIP_TAGS = {'Josa', 'Eomi', 'PreEomi', 'Punctuation', 'Suffix', 'Conjunction', 'KoreanParticle'}
+_TOKEN_PATTERN = re.compile(r'[가-힣]+|[a-zA-Z]+|[0-9]+')
+
+
+class KoreanTokenizer:
+    """BM25용 한국어 토크나이저
+
+    konlpy의 Okt 형태소 분석기를 쓸 수 있으면 형태소 단위로, 없으면(또는 JVM이 없으면)
+    한글 어절 + 음절 바이그램 단위로 자릅니다. 바이그램은 "소상공인을", "스마트물류기술사업화"처럼
+    조사가 붙거나 띄어쓰지 않은 사업명도 부분 일치로 찾게 해 줍니다.
+    """
+
+    def __init__(self, backend: str = "auto"):
+        """
+        Args:
+            backend: "okt", "regex", "auto"(Okt를 쓸 수 있으면 Okt, 아니면 regex)
+        """
+        if backend not in ("auto", "okt", "regex"):
+            raise ValueError(f"지원하지 않는 토크나이저: {backend}")
+        self._okt = None
+        self._lock = threading.Lock()
+        if backend in ("auto", "okt"):
+            try:
+                from konlpy.tag import Okt
+                self._okt = Okt()
+            except Exception as e:
+                if backend == "okt":
+                    raise
+                print(f"Okt 형태소 분석기를 사용할 수 없어 regex 토크나이저를 사용합니다: {e}")
+        self.name = "okt" if self._okt is not None else "regex"
+
+    def __call__(self, text: str) -> List[str]:
+        text = str(text)
+        if self._okt is not None:
+            # Okt(JPype)는 스레드 안전하지 않으므로 직렬화
+            with self._lock:
+                pos = self._okt.pos(text, norm=True, stem=True)
+            return [token.lower() for token, tag in pos if tag not in _OKT_SKIP_TAGS and token.strip()]
+
+        tokens = []
+        for token in _TOKEN_PATTERN.findall(text):
+            token = token.lower()
+            tokens.append(token)
+            if len(token) > 2 and '가' <= token[0] <= '힣':
+                tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        return tokens
+
+
+def texts_fingerprint(texts: Sequence[str], tokenizer_name: str) -> str:
+    """문서 텍스트 전체 + 토크나이저 해시 (저장된 인덱스 재사용 여부 판단용)"""
+    digest = hashlib.blake2b(tokenizer_name.encode('utf-8'), digest_size=16)
+    for text in texts:
+        digest.update(str(text).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """BM25 역색인 (CSR 형태의 numpy 배열)
+
+    용어별 포스팅(문서 행 번호, 용어 빈도)을 indptr로 구간을 나눠 저장하므로, 검색 비용은
+    전체 문서 수가 아니라 쿼리 용어가 등장하는 포스팅 수에 비례합니다.
+    """
+
+    k1 = 1.5
+    b = 0.75
+
+    def __init__(self, terms: List[str], indptr: np.ndarray, doc_ids: np.ndarray, tfs: np.ndarray,
+                 doc_lens: np.ndarray, tokenizer: KoreanTokenizer):
+        """
+        Args:
+            terms: 용어 목록 (용어 ID 순서)
+            indptr: 용어 ID별 포스팅 구간 (길이 = 용어 수 + 1)
+            doc_ids: 포스팅별 문서 행 번호 (용어 ID 순으로 정렬)
+            tfs: 포스팅별 용어 빈도
+            doc_lens: 문서별 토큰 수
+            tokenizer: 문서와 같은 토크나이저 (쿼리 토큰화용)
+        """
+        self.terms = list(terms)
+        self.vocab = {term: i for i, term in enumerate(self.terms)}
+        self.indptr = np.asarray(indptr, dtype='int64')
+        self.doc_ids = np.asarray(doc_ids, dtype='int32')
+        self.tfs = np.asarray(tfs, dtype='float32')
+        self.doc_lens = np.asarray(doc_lens, dtype='float32')
+        self.tokenizer = tokenizer
+        self.avg_doc_len = float(self.doc_lens.mean()) if len(self.doc_lens) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_lens)
+
+    @property
+    def nbytes(self) -> int:
+        """포스팅 배열 크기(바이트, 용어 사전 제외)"""
+        return int(self.indptr.nbytes + self.doc_ids.nbytes + self.tfs.nbytes + self.doc_lens.nbytes)
+
+    @classmethod
+    def build(cls, texts: Sequence[str], tokenizer: KoreanTokenizer) -> "BM25Index":
+        """문서 텍스트로 역색인 생성"""
+        return cls._from_postings([], np.empty(0, 'int64'), np.empty(0, 'int64'), np.empty(0, 'float32'),
+                                  np.empty(0, 'float32'), texts, tokenizer)
+
+    @classmethod
+    def _from_postings(cls, terms: List[str], term_ids: np.ndarray, doc_ids: np.ndarray, tfs: np.ndarray,
+                       doc_lens: np.ndarray, new_texts: Sequence[str], tokenizer: KoreanTokenizer) -> "BM25Index":
+        """기존 포스팅에 새 문서(행 번호는 기존 문서 뒤)를 토큰화해 붙인 역색인"""
+        terms = list(terms)
+        vocab = {term: i for i, term in enumerate(terms)}
+        new_terms, new_docs, new_tfs, new_lens = [], [], [], []
+        offset = len(doc_lens)
+        for row, text in enumerate(new_texts):
+            tokens = tokenizer(text)
+            new_lens.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                term_id = vocab.get(term)
+                if term_id is None:
+                    term_id = vocab[term] = len(terms)
+                    terms.append(term)
+                new_terms.append(term_id)
+                new_docs.append(offset + row)
+                new_tfs.append(tf)
+
+        term_ids = np.concatenate([term_ids, np.asarray(new_terms, dtype='int64')])
+        doc_ids = np.concatenate([doc_ids, np.asarray(new_docs, dtype='int64')])
+        tfs = np.concatenate([tfs, np.asarray(new_tfs, dtype='float32')])
+        order = np.argsort(term_ids, kind='stable')
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(terms)))])
+        doc_lens = np.concatenate([doc_lens, np.asarray(new_lens, dtype='float32')])
+        return cls(terms, indptr, doc_ids[order], tfs[order], doc_lens, tokenizer)
+
+    def updated(self, keep: np.ndarray, new_texts: Sequence[str] = ()) -> "BM25Index":
+        """
+        keep이 False인 문서를 빼고 새 문서를 뒤에 붙인 새 역색인 (기존 문서는 다시 토큰화하지 않음)
+
+        Args:
+            keep: 기존 문서별 유지 여부 (유지된 문서는 순서대로 0부터 다시 번호를 매김)
+            new_texts: 추가할 문서 텍스트
+        """
+        keep = np.asarray(keep, dtype=bool)
+        term_ids = np.repeat(np.arange(len(self.terms), dtype='int64'), np.diff(self.indptr))
+        alive = keep[self.doc_ids]
+        new_rows = np.cumsum(keep) - 1
+        return self._from_postings(self.terms, term_ids[alive], new_rows[self.doc_ids[alive]].astype('int64'),
+                                   self.tfs[alive], self.doc_lens[keep], new_texts, self.tokenizer)
+
+    def scores(self, query: str, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        쿼리 용어가 하나라도 있는 문서의 BM25 점수
+
+        Args:
+            query: 검색어
+            mask: 문서별 허용 여부 (필터 마스크)
+
+        Returns:
+            (문서 행 번호, BM25 점수)
+        """
+        n = len(self.doc_lens)
+        query_terms = Counter(term for term in self.tokenizer(query) if term in self.vocab)
+        all_rows, all_scores = [], []
+        for term, qtf in query_terms.items():
+            term_id = self.vocab[term]
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            if start == end:
+                continue
+            rows, tfs = self.doc_ids[start:end], self.tfs[start:end]
+            if mask is not None:
+                allowed = mask[rows]
+                rows, tfs = rows[allowed], tfs[allowed]
+            df = end - start
+            idf = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self.doc_lens[rows] / self.avg_doc_len)
+            all_rows.append(rows)
+            all_scores.append(qtf * idf * tfs * (self.k1 + 1.0) / (tfs + norm))
+        if not all_rows:
+            return np.empty(0, dtype='int64'), np.empty(0, dtype='float32')
+
+        # 포스팅 단위 점수를 문서별로 합산 (전체 문서 크기 배열을 만들지 않음)
+        rows, inverse = np.unique(np.concatenate(all_rows), return_inverse=True)
+        return rows.astype('int64'), np.bincount(inverse, weights=np.concatenate(all_scores)).astype('float32')
+
+    def search(self, query: str, top_k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """BM25 상위 top_k 문서 (행 번호, 점수)를 점수 내림차순으로 반환"""
+        rows, scores = self.scores(query, mask)
+        if len(rows) > top_k:
+            part = np.argpartition(-scores, top_k - 1)[:top_k]
+            rows, scores = rows[part], scores[part]
+        order = np.argsort(-scores, kind='stable')
+        return rows[order], scores[order]
+
+    def save(self, path: str, fingerprint: Optional[str] = None):
+        """npz 파일로 저장 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, terms=np.array(self.terms, dtype=str), indptr=self.indptr, doc_ids=self.doc_ids,
+                         tfs=self.tfs, doc_lens=self.doc_lens, tokenizer=np.array(self.tokenizer.name),
+                         fingerprint=np.array(fingerprint or ""))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, tokenizer: Optional[KoreanTokenizer] = None) -> Tuple["BM25Index", str]:
+        """
+        npz 파일에서 로드
+
+        Returns:
+            (역색인, 저장 시 fingerprint)
+
+        Raises:
+            ValueError: 저장된 토크나이저를 현재 환경에서 쓸 수 없는 경우
+        """
+        with np.load(path, allow_pickle=False) as f:
+            tokenizer_name = str(f['tokenizer'])
+            tokenizer = tokenizer or KoreanTokenizer(tokenizer_name)
+            if tokenizer.name != tokenizer_name:
+                raise ValueError(f"저장된 토크나이저({tokenizer_name})와 현재 토크나이저({tokenizer.name})가 다릅니다")
+            index = cls(f['terms'].tolist(), f['indptr'], f['doc_ids'], f['tfs'], f['doc_lens'], tokenizer)
+            return index, str(f['fingerprint'])
+
+    @classmethod
+    def load_or_build(cls, path: str, texts: Sequence[str], tokenizer: KoreanTokenizer) -> "BM25Index":
+        """저장된 역색인이 같은 텍스트/토크나이저로 만든 것이면 재사용, 아니면 새로 만들어 저장"""
+        fingerprint = texts_fingerprint(texts, tokenizer.name)
+        if os.path.exists(path):
+            try:
+                index, saved = cls.load(path, tokenizer)
+                if saved == fingerprint:
+                    print(f"BM25 역색인 재사용: {len(index)}개 문서")
+                    return index
+            except (ValueError, OSError, KeyError) as e:
+                print(f"BM25 역색인 로드 실패, 다시 생성합니다: {e}")
+        index = cls.build(texts, tokenizer)
+        try:
+            index.save(path, fingerprint)
+        except OSError as e:
+            print(f"BM25 역색인 저장 실패: {e}")
+        print(f"BM25 역색인 생성 완료: {len(index)}개 문서, {len(index.terms)}개 용어")
+        return index
+
+
+def reciprocal_rank_fusion(rankings: Sequence[np.ndarray], k: int = 60) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 순위 목록을 RRF(1 / (k + 순위))로 합친 (행 번호, 융합 점수)를 점수 내림차순으로 반환
+
+    동점이면 먼저 전달한 순위 목록(보통 dense)의 순서를 따릅니다.
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking):
+            fused[int(row)] = fused.get(int(row), 0.0) + 1.0 / (k + rank + 1)
+    if not fused:
+        return np.empty(0, dtype='int64'), np.empty(0, dtype='float32')
+    rows = np.fromiter(fused.keys(), dtype='int64', count=len(fused))
+    scores = np.fromiter(fused.values(), dtype='float64', count=len(fused))
+    order = np.argsort(-scores, kind='stable')
+    return rows[order], scores[order].astype('float32')
@@ -51,11 +51,55 @@ def load_chatbot():
     """챗봇 로드 (캐싱)"""
     try:
         chatbot = PolicyChatbot()
+        chatbot.warmup()
         return chatbot
     except Exception as e:
         st.error(f"챗봇 로드 실패: {e}")
         return None
 
+def render_policy_card(i, result):
+    """검색 결과 정책 카드 표시"""
+    with st.expander(f"📋 {result['title']}", expanded=i==0):
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            st.markdown(f"**🎯 지원대상:** {result['target']}")
+            st.markdown(f"**🏢 소관기관:** {result['organization']}")
+            st.markdown(f"**📅 신청기간:** {result['period']}")
+            st.markdown(f"**📞 문의처:** {result['contact']}")
+
+            # 공고내용
+            if result['body']:
+                st.markdown("**📝 공고내용:**")
+                st.text_area(
+                    "내용",
+                    value=result['body'][:500] + "..." if len(result['body']) > 500 else result['body'],
+                    height=100,
+                    key=f"body_{i}",
+                    disabled=True
+                )
+
+            # 신청방법
+            if result['application_method']:
+                st.markdown("**📋 신청방법:**")
+                st.text_area(
+                    "방법",
+                    value=result['application_method'],
+                    height=80,
+                    key=f"method_{i}",
+                    disabled=True
+                )
+
+        with col2:
+            st.markdown(f"<div class='similarity-score'>유사도: {result['similarity_score']:.3f}</div>", 
+                       unsafe_allow_html=True)
+            st.markdown(f"**🏷️ 분야:** {result['field_major']} > {result['field_minor']}")
+            st.markdown(f"**🏛️ 수행기관:** {result['executing_org']}")
+
+            # 상세 정보 버튼
+            if st.button("📊 상세정보", key=f"detail_{i}"):
+                st.json(result)
+
 def main():
     # 헤더
     st.markdown('<h1 class="main-header">🏛️ 정책 챗봇</h1>', unsafe_allow_html=True)
@@ -153,65 +197,28 @@ def main():
                 current_time = time.strftime("%H:%M")
                 st.session_state.search_history.append((search_query, current_time))
                 
-                # 검색 실행
-                with st.spinner("정책을 검색 중입니다..."):
-                    results = st.session_state.chatbot.search_policies(
-                        search_query,
-                        top_k=top_k,
-                        similarity_threshold=similarity_threshold,
-                        region_filter=region_filter if region_filter != "(전체)" else None,
-                        target_filter=target_filter if target_filter != "(전체)" else None,
-                        field_filter=field_filter if field_filter != "(전체)" else None,
-                        target_weight=target_weight,
-                        field_weight=field_weight
-                    )
+                # 검색 실행 (순위가 정해진 정책부터 바로 표시)
+                status = st.empty()
+                status.info("정책을 검색 중입니다...")
+                results = []
+                for i, result in enumerate(st.session_state.chatbot.iter_search_policies(
+                    search_query,
+                    top_k=top_k,
+                    similarity_threshold=similarity_threshold,
+                    region_filter=region_filter if region_filter != "(전체)" else None,
+                    target_filter=target_filter if target_filter != "(전체)" else None,
+                    field_filter=field_filter if field_filter != "(전체)" else None,
+                    target_weight=target_weight,
+                    field_weight=field_weight
+                )):
+                    results.append(result)
+                    render_policy_card(i, result)
                 
                 # 결과 표시
                 if results:
-                    st.success(f"✅ '{search_query}'에 대한 {len(results)}개의 정책을 찾았습니다!")
-                    
-                    for i, result in enumerate(results):
-                        with st.expander(f"📋 {result['title']}", expanded=i==0):
-                            col1, col2 = st.columns([3, 1])
-                            
-                            with col1:
-                                st.markdown(f"**🎯 지원대상:** {result['target']}")
-                                st.markdown(f"**🏢 소관기관:** {result['organization']}")
-                                st.markdown(f"**📅 신청기간:** {result['period']}")
-                                st.markdown(f"**📞 문의처:** {result['contact']}")
-                                
-                                # 공고내용
-                                if result['body']:
-                                    st.markdown("**📝 공고내용:**")
-                                    st.text_area(
-                                        "내용",
-                                        value=result['body'][:500] + "..." if len(result['body']) > 500 else result['body'],
-                                        height=100,
-                                        key=f"body_{i}",
-                                        disabled=True
-                                    )
-                                
-                                # 신청방법
-                                if result['application_method']:
-                                    st.markdown("**📋 신청방법:**")
-                                    st.text_area(
-                                        "방법",
-                                        value=result['application_method'],
-                                        height=80,
-                                        key=f"method_{i}",
-                                        disabled=True
-                                    )
-                            
-                            with col2:
-                                st.markdown(f"<div class='similarity-score'>유사도: {result['similarity_score']:.3f}</div>", 
-                                           unsafe_allow_html=True)
-                                st.markdown(f"**🏷️ 분야:** {result['field_major']} > {result['field_minor']}")
-                                st.markdown(f"**🏛️ 수행기관:** {result['executing_org']}")
-                                
-                                # 상세 정보 버튼
-                                if st.button("📊 상세정보", key=f"detail_{i}"):
-                                    st.json(result)
+                    status.success(f"✅ '{search_query}'에 대한 {len(results)}개의 정책을 찾았습니다!")
                 else:
+                    status.empty()
                     st.warning("😔 관련 정책을 찾을 수 없습니다. 다른 키워드로 검색해보세요.")
                     
                     # 추천 검색어
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+API 서버 스트리밍 테스트 (모델/데이터 없이 실행)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import HTTPException
+
+import api_server
+from search_executor import SearchExecutor
+
+
+class SlowStream:
+    """두 번째 항목에서 오래 멈추는 동기 생성기 (진행/종료 기록)"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.steps = 0
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        try:
+            for i in range(4):
+                self.steps += 1
+                if i == 1:
+                    time.sleep(self.delay)
+                yield i
+        finally:
+            self.closed.set()
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = SearchExecutor(max_workers=2, max_queue=2, timeout=0.1)
+    monkeypatch.setattr(api_server, "search_executor", executor)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_stream_timeout_closes_generator_after_running_step(executor):
+    source = SlowStream(delay=0.4)
+
+    async def consume():
+        results = await api_server.open_stream(iter(source))
+        items = []
+        with pytest.raises(HTTPException) as error:
+            async for item in results:
+                items.append(item)
+        return items, error.value.status_code
+
+    items, status = asyncio.run(consume())
+    assert items == [0]
+    assert status == 504
+    # 타임아웃 시점에는 작업 스레드가 아직 두 번째 항목을 진행 중 - 끝난 뒤 작업 스레드에서 닫힘
+    assert source.closed.wait(2.0)
+    assert source.steps == 2
+    assert executor.stats()["timed_out"] == 1
+
+
+def test_stream_disconnect_does_not_resume_generator(executor):
+    executor.timeout = 0
+    source = SlowStream(delay=0.2)
+
+    async def consume():
+        results = await api_server.open_stream(iter(source))
+        first = await results.__anext__()
+        # 두 번째 항목을 진행하는 중에 클라이언트 연결이 끊김
+        pending = asyncio.ensure_future(results.__anext__())
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        await results.aclose()
+        return first
+
+    assert asyncio.run(consume()) == 0
+    assert source.closed.wait(2.0)
+    assert source.steps == 2
+
+
+def test_stream_steps_after_close_returns_end():
+    steps = api_server.StreamSteps(item for item in [1, 2, 3])
+    assert steps.step() == 1
+    steps.close()
+    assert steps.step() is api_server._STREAM_END
+    steps.close()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+기업마당 증분 크롤러 테스트 (httpx.MockTransport 대역 API, 네트워크 없이 실행)
+"""
+
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bizinfo_crawler import API_PATH, BizinfoCrawler, CrawlError, list_partitions, read_partitions
+
+
+def make_item(n, hashtags="소상공인,경기"):
+    return {
+        "pblancId": f"PBLN_{n:06d}",
+        "pblancNm": f"지원사업 {n}호 공고",
+        "bsnsSumryCn": f"<p>{n}번 사업 안내</p>",
+        "jrsdInsttNm": "경기도",
+        "creatPnttm": f"2026-03-01 {n // 3600:02d}:{n // 60 % 60:02d}:{n % 60:02d}",
+        "hashTags": hashtags,
+    }
+
+
+class FakeApi:
+    """해시태그 조합별 공고를 최근 등록 순으로 페이지 단위로 돌려주는 대역 API"""
+
+    def __init__(self, items_by_hashtags):
+        self.items = items_by_hashtags
+        self.calls = []
+        self.failures = {}
+
+    def add(self, hashtags, items):
+        self.items[hashtags] = items + self.items.get(hashtags, [])
+
+    def fail(self, page, statuses):
+        """page 요청의 처음 몇 번을 statuses 응답으로 실패시킴"""
+        self.failures[page] = list(statuses)
+
+    def __call__(self, request):
+        assert request.url.path == API_PATH
+        params = request.url.params
+        page, size = int(params["pageIndex"]), int(params["pageUnit"])
+        self.calls.append((params["hashtags"], page))
+        if self.failures.get(page):
+            return httpx.Response(self.failures[page].pop(0), headers={"Retry-After": "0"})
+        items = self.items.get(params["hashtags"], [])
+        page_items = [dict(item, totCnt=len(items)) for item in items[(page - 1) * size:page * size]]
+        return httpx.Response(200, json={"jsonArray": page_items})
+
+    def pages(self):
+        return sorted(page for _, page in self.calls)
+
+
+def make_crawler(output_dir, api, **kwargs):
+    options = dict(page_size=100, max_concurrency=2, backoff=0.0, transport=httpx.MockTransport(api))
+    options.update(kwargs)
+    return BizinfoCrawler(str(output_dir), **options)
+
+
+def newest_first(start, stop):
+    return [make_item(n) for n in reversed(range(start, stop))]
+
+
+def stored_ids(output_dir):
+    return set(read_partitions(list_partitions(str(output_dir)))["pblanc_id"])
+
+
+def test_fetches_every_page(tmp_path):
+    api = FakeApi({"소상공인,경기": newest_first(0, 250)})
+
+    stats = make_crawler(tmp_path, api).run(["소상공인,경기"])
+
+    assert api.pages() == [1, 2, 3]
+    assert stats["fetched"] == stats["new"] == 250
+    assert stats["requests"] == 3 and stats["retries"] == 0
+    assert len(stored_ids(tmp_path)) == 250
+    data = read_partitions(list_partitions(str(tmp_path)))
+    assert data.loc[data["pblanc_id"] == "PBLN_000007", "body_text(공고내용)"].tolist() == ["7번 사업 안내"]
+
+
+def test_max_pages_limits_requests(tmp_path):
+    api = FakeApi({"소상공인,경기": newest_first(0, 250)})
+
+    stats = make_crawler(tmp_path, api, max_pages=2).run(["소상공인,경기"])
+
+    assert api.pages() == [1, 2]
+    assert stats["fetched"] == 200
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_transient_errors(tmp_path, status):
+    api = FakeApi({"소상공인,경기": newest_first(0, 150)})
+    api.fail(2, [status, status])
+
+    stats = make_crawler(tmp_path, api).run(["소상공인,경기"])
+
+    assert stats["fetched"] == 150
+    assert stats["retries"] == 2
+    assert api.pages() == [1, 2, 2, 2]
+
+
+def test_gives_up_after_max_retries_without_moving_mark(tmp_path):
+    api = FakeApi({"소상공인,경기": newest_first(0, 150)})
+    api.fail(2, [503] * 3)
+    crawler = make_crawler(tmp_path, api, max_retries=2)
+
+    with pytest.raises(CrawlError):
+        crawler.run(["소상공인,경기"])
+
+    assert crawler.load_state() == {}
+    assert list_partitions(str(tmp_path)) == []
+
+
+def test_client_error_is_not_retried(tmp_path):
+    api = FakeApi({"소상공인,경기": newest_first(0, 10)})
+    api.fail(1, [404])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        make_crawler(tmp_path, api).run(["소상공인,경기"])
+    assert api.pages() == [1]
+
+
+def test_high_water_mark_fetches_only_new_items(tmp_path):
+    api = FakeApi({"소상공인,경기": newest_first(0, 250)})
+    crawler = make_crawler(tmp_path, api)
+    crawler.run(["소상공인,경기"])
+    with open(crawler.state_path, encoding="utf-8") as f:
+        mark = json.load(f)["marks"]["소상공인,경기"]["mark"]
+    assert mark == ["2026-03-01 00:04:09", "PBLN_000249"]
+
+    api.add("소상공인,경기", newest_first(250, 255))
+    api.calls.clear()
+    stats = crawler.run(["소상공인,경기"])
+
+    # 첫 페이지에서 최고 수위 이하 공고가 나오므로 다음 페이지는 조회하지 않음
+    assert api.pages() == [1]
+    assert stats["fetched"] == stats["new"] == 5
+    assert crawler.load_state()["소상공인,경기"]["mark"][1] == "PBLN_000254"
+    assert len(list_partitions(str(tmp_path))) == 2
+    assert len(stored_ids(tmp_path)) == 255
+
+    api.calls.clear()
+    stats = crawler.run(["소상공인,경기"])
+    assert stats["fetched"] == 0 and stats["partition"] is None
+
+
+def test_full_recrawl_skips_already_stored_items(tmp_path):
+    api = FakeApi({"소상공인,경기": newest_first(0, 120)})
+    crawler = make_crawler(tmp_path, api)
+    crawler.run(["소상공인,경기"])
+
+    stats = crawler.run(["소상공인,경기"], full=True)
+
+    assert stats["fetched"] == 120
+    assert stats["unchanged"] == 120 and stats["new"] == 0
+    assert stats["partition"] is None
+    assert len(list_partitions(str(tmp_path))) == 1
+
+
+def test_item_in_several_hashtag_sets_is_stored_once(tmp_path):
+    shared = make_item(500)
+    api = FakeApi({
+        "소상공인,경기": [shared] + newest_first(0, 3),
+        "창업,경기": [shared] + newest_first(10, 12),
+    })
+    crawler = make_crawler(tmp_path, api)
+
+    stats = crawler.run(["소상공인,경기", "창업,경기"])
+
+    assert stats["fetched"] == 6
+    data = read_partitions(list_partitions(str(tmp_path)))
+    assert data["pblanc_id"].tolist().count("PBLN_000500") == 1
+    state = crawler.load_state()
+    assert state["소상공인,경기"]["mark"][1] == state["창업,경기"]["mark"][1] == "PBLN_000500"
+
+
+def test_persisted_mark_stops_before_unsaved_item():
+    items = newest_first(0, 5)
+    ids = {item["pblancId"] for item in items}
+
+    assert BizinfoCrawler._persisted_mark(items, ids) == ("2026-03-01 00:00:04", "PBLN_000004")
+    # 3번 공고가 저장되지 않았으면 그보다 앞(0~2번)까지만 올림
+    assert BizinfoCrawler._persisted_mark(items, ids - {"PBLN_000003"}) == ("2026-03-01 00:00:02", "PBLN_000002")
+    assert BizinfoCrawler._persisted_mark(items, set()) is None
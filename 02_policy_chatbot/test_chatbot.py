@@ -71,7 +71,7 @@ def test_chatbot():
         print("-" * 30)
         
         start_time = time.time()
-        chatbot.save_model("test_model.pkl")
+        chatbot.save_model("test_model_bundle")
         save_time = time.time() - start_time
         print(f"✅ 모델 저장 완료 (소요시간: {save_time:.3f}초)")
         
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+다중 코퍼스 레지스트리(CorpusRegistry) 지연 로드/LRU 해제/메모리 예산 테스트 (스텁 인코더, 모델 다운로드 없이 실행)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import STUB_MODEL_NAME, synthetic_policies
+from corpus_registry import CorpusRegistry, UnknownCorpusError
+
+
+@pytest.fixture
+def make_registry(stub_encoder, tmp_path):
+    """코퍼스마다 합성 정책 100건(시드는 등록 순서)을 등록한 레지스트리 생성 함수"""
+
+    def make(names, pinned=(), **kwargs):
+        registry = CorpusRegistry(model_name=STUB_MODEL_NAME, use_embedding_cache=False, sparse_tokenizer="regex",
+                                  **kwargs)
+        for seed, name in enumerate(names):
+            path = str(tmp_path / f"{name}.csv")
+            synthetic_policies(100, seed=seed).to_csv(path, index=False)
+            registry.register(name, csv_path=path, pinned=name in pinned)
+        return registry
+
+    return make
+
+
+def loaded_names(registry):
+    return [name for name, corpus in registry.stats()["corpora"].items() if corpus["loaded"]]
+
+
+def set_budget(registry, corpora):
+    """로드된 기본 코퍼스 크기 기준으로 코퍼스 corpora개 분량의 예산 설정"""
+    registry.memory_budget = int(registry.stats()["corpora"][registry.default]["memory_bytes"] * corpora)
+
+
+def test_loads_on_first_get_and_shares_encoder(make_registry):
+    registry = make_registry(["a", "b"])
+    assert loaded_names(registry) == []
+    assert registry.loaded("a") is None
+
+    a = registry.get()
+    b = registry.get("b")
+
+    assert registry.default == "a" and registry.loaded("a") is a
+    assert b.model is a.model
+    stats = registry.stats()
+    assert [corpus["loads"] for corpus in stats["corpora"].values()] == [1, 1]
+    assert stats["corpora"]["b"]["memory_bytes"] == b.memory_usage() > 0
+    assert stats["memory_bytes"] == a.memory_usage() + b.memory_usage()
+    # 로드된 코퍼스는 다시 로드하지 않음
+    assert registry.get("b") is b and registry.stats()["corpora"]["b"]["loads"] == 1
+
+
+def test_evicts_least_recently_used_over_budget(make_registry):
+    registry = make_registry(["a", "b", "c"])
+    registry.get("a")
+    set_budget(registry, 2.5)
+
+    registry.get("b")
+    registry.get("c")
+
+    # 기본 코퍼스(a)는 가장 오래 쓰지 않았어도 해제하지 않음
+    assert loaded_names(registry) == ["a", "c"]
+    assert registry.evictions == 1
+    assert registry.stats()["corpora"]["b"]["memory_bytes"] == 0
+    assert registry.memory_usage() <= registry.memory_budget
+
+    # 해제된 코퍼스는 다음 요청 때 다시 로드하고, 이번에는 c가 가장 오래 쓰지 않은 코퍼스
+    registry.get("b")
+    assert loaded_names(registry) == ["a", "b"]
+    assert registry.stats()["corpora"]["b"]["loads"] == 2
+    assert registry.evictions == 2
+
+
+def test_recently_used_corpus_is_kept(make_registry):
+    registry = make_registry(["a", "b", "c", "d"])
+    registry.get("a")
+    set_budget(registry, 3.5)
+    registry.get("b")
+    registry.get("c")
+
+    registry.loaded("b")
+    registry.get("d")
+
+    assert loaded_names(registry) == ["a", "b", "d"]
+
+
+def test_pinned_and_modified_corpora_are_not_evicted(make_registry, capsys):
+    registry = make_registry(["a", "b", "c", "d"], pinned=["b"])
+    registry.get("a")
+    set_budget(registry, 1.5)
+    registry.get("b")
+    registry.get("c")
+    registry.mark_modified("c")
+
+    registry.get("d")
+
+    assert loaded_names(registry) == ["a", "b", "c", "d"]
+    assert registry.evictions == 0
+    assert registry.memory_usage() > registry.memory_budget
+    assert "메모리 예산을 넘었습니다" in capsys.readouterr().out
+
+
+def test_mark_modified_updates_memory_usage(make_registry):
+    registry = make_registry(["a"])
+    chatbot = registry.get("a")
+    before = registry.memory_usage()
+
+    policies = synthetic_policies(50, seed=9)
+    policies['title(공고명)'] += " 신규"
+    registry.mark_modified("a")
+    chatbot.upsert_policies(policies)
+    assert registry.memory_usage() == before
+    registry.update_memory_usage("a")
+
+    assert registry.stats()["corpora"]["a"]["modified"]
+    assert registry.memory_usage() == chatbot.memory_usage() > before
+
+
+def test_update_memory_usage_enforces_budget(make_registry):
+    registry = make_registry(["a", "b", "c"])
+    registry.get("a")
+    set_budget(registry, 3.2)
+    registry.get("b")
+    chatbot = registry.get("c")
+
+    registry.mark_modified("c")
+    policies = synthetic_policies(50, seed=9)
+    policies['title(공고명)'] += " 신규"
+    chatbot.upsert_policies(policies)
+    registry.update_memory_usage("c")
+
+    assert loaded_names(registry) == ["a", "c"]
+
+
+def test_acquired_corpus_is_not_evicted_until_released(make_registry):
+    registry = make_registry(["a", "b", "c", "d"])
+    registry.get("a")
+    set_budget(registry, 2.5)
+    assert registry.acquire("b", load=False) is None
+    assert registry.stats()["corpora"]["b"]["in_use"] == 0
+
+    with registry.using("b") as b:
+        registry.get("c")
+        assert loaded_names(registry) == ["a", "b", "c"]
+        assert registry.stats()["corpora"]["b"]["in_use"] == 1
+        assert b.is_loaded
+
+    # 사용이 끝나면 다음 로드 때 LRU 순서대로 해제
+    registry.get("d")
+    assert loaded_names(registry) == ["a", "d"]
+    assert registry.stats()["corpora"]["b"]["in_use"] == 0
+
+
+def test_evicted_chatbot_reloads_through_registry(make_registry):
+    registry = make_registry(["a", "b", "c"])
+    registry.get("a")
+    set_budget(registry, 2.5)
+    b = registry.get("b")
+    registry.get("c")
+    assert not b.is_loaded
+
+    # 해제 전에 챗봇을 받아 둔 코드가 검색해도 레지스트리를 거쳐 로드하고 예산을 맞춤
+    assert b.search_policies("창업 지원", top_k=3)
+    assert loaded_names(registry) == ["a", "b"]
+    assert registry.stats()["corpora"]["b"]["loads"] == 2
+    assert registry.stats()["corpora"]["b"]["memory_bytes"] == b.memory_usage() > 0
+
+
+def test_unload_releases_memory_until_next_get(make_registry):
+    registry = make_registry(["a", "b"])
+    registry.get("b")
+
+    registry.unload("b")
+
+    assert loaded_names(registry) == []
+    assert registry.memory_usage() == 0
+    assert len(registry.get("b").data) == 100
+
+
+def test_rejects_unknown_and_duplicate_corpora(make_registry):
+    registry = make_registry(["a"])
+
+    with pytest.raises(UnknownCorpusError):
+        registry.get("missing")
+    with pytest.raises(ValueError):
+        registry.register("a", csv_path="other.csv")
+    with pytest.raises(ValueError):
+        registry.register("b", model_name="other-model")
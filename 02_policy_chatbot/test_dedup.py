@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+공고 중복 제거/변경 감지 인덱스(DedupIndex) 테스트
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dedup import CHANGE_COLUMN, DUPLICATE_OF_COLUMN, DedupIndex, hamming, normalize_bodies, simhashes
+
+COLUMNS = ['title(공고명)', 'body_text(공고내용)', '소관기관']
+
+BODY = ("관내 소상공인의 경영 안정을 위해 점포 환경 개선 비용을 지원합니다. 지원 대상은 공고일 현재 사업자 등록 후 "
+        "6개월 이상 영업 중인 소상공인이며, 간판 교체, 내부 인테리어, 노후 설비 교체 비용의 80%를 업체당 최대 "
+        "300만원까지 지원합니다. 신청은 읍면동 행정복지센터 방문 또는 온라인으로 접수하며 예산 소진 시 조기 마감됩니다.")
+
+
+def notice(key, title="소상공인 점포 환경개선 지원사업", body=BODY, org="포천시"):
+    return {'pblanc_id': key, 'title(공고명)': title, 'body_text(공고내용)': body, '소관기관': org}
+
+
+def frame(*rows):
+    return pd.DataFrame(list(rows))
+
+
+def filler(n):
+    """서로 다른 공고명/본문의 공고 n건"""
+    return frame(*(notice(f"F{i}", title=f"기타 지원사업 {i}", body=f"{i}번 사업 {BODY[i % 50:]}") for i in range(n)))
+
+
+@pytest.fixture
+def index():
+    return DedupIndex('pblanc_id', COLUMNS)
+
+
+def test_new_and_recrawled_notices(index):
+    first = index.ingest(frame(notice("A1")))
+    assert first.stats() == {'inserted': 1, 'updated': 0, 'unchanged': 0, 'duplicates': 0, 'near_duplicates': 0}
+    assert first.deltas[CHANGE_COLUMN].tolist() == ['inserted']
+
+    again = index.ingest(frame(notice("A1")))
+    assert again.unchanged_keys == ("A1",)
+    assert len(again.deltas) == 0 and len(again.new_rows()) == 0
+
+
+def test_updated_notice(index):
+    index.ingest(frame(notice("A1")))
+
+    result = index.ingest(frame(notice("A1", body=BODY.replace("300만원", "500만원"))))
+
+    assert result.updated == 1
+    assert result.new_rows()['body_text(공고내용)'].str.contains("500만원").all()
+    # 이전 내용으로 되돌아가도 수정으로 봄
+    assert index.ingest(frame(notice("A1"))).updated == 1
+    assert len(index) == 1
+
+
+def test_exact_duplicate_under_new_key(index):
+    index.ingest(frame(notice("A1")))
+
+    result = index.ingest(frame(notice("A2")))
+
+    assert result.duplicates == 1
+    assert result.duplicate_of == {"A2": "A1"}
+    assert result.deltas[DUPLICATE_OF_COLUMN].tolist() == ["A1"]
+    # 중복도 deltas로 내보내지만 검색 데이터에는 반영하지 않음
+    assert len(result.new_rows()) == 0
+
+
+def test_near_duplicate_requires_same_title_and_org(index):
+    edited = BODY.replace("읍면동", "동")
+    assert hamming(*simhashes(normalize_bodies(pd.Series([BODY, edited]))).tolist()) <= index.max_distance
+    index.ingest(frame(notice("A1")))
+
+    result = index.ingest(frame(notice("A2", body=edited)))
+
+    assert result.near_duplicates == 1
+    assert result.duplicate_of == {"A2": "A1"}
+    # 공고명이 다르면 본문이 거의 같아도 새 공고
+    assert index.ingest(frame(notice("A3", title="소상공인 경영환경 개선사업", body=edited + " "))).inserted == 1
+
+
+def test_templated_body_for_other_cities_is_inserted(index):
+    # 같은 양식에 지역명만 다른 시군 공고는 소관기관이 달라 모두 새 공고
+    cities = ["포천시", "가평군", "연천군", "양평군"]
+    rows = [notice(f"C{i}", body=BODY.replace("관내", city), org=city) for i, city in enumerate(cities)]
+
+    result = index.ingest(frame(*rows))
+
+    assert result.inserted == len(cities)
+    assert result.near_duplicates == 0 and result.duplicate_of == {}
+
+
+def test_duplicates_within_one_batch(index):
+    result = index.ingest(frame(notice("A1"), notice("A2"), notice("A1", body=BODY + " 추가 안내")))
+
+    assert result.deltas['pblanc_id'].tolist() == ["A2", "A1"]
+    # 같은 묶음에서 처음 들어온 뒤 수정된 공고는 처음 판정(inserted)과 마지막 값으로 한 번만
+    row = result.deltas[result.deltas['pblanc_id'] == "A1"].iloc[0]
+    assert row[CHANGE_COLUMN] == 'inserted'
+    assert row['body_text(공고내용)'].endswith("추가 안내")
+    assert result.duplicate_of == {"A2": "A1"}
+
+
+def test_short_bodies_are_not_near_duplicates(index):
+    index.ingest(frame(notice("S1", body="별도 공지")))
+    assert index.ingest(frame(notice("S2", body="별도 공지 참조"))).inserted == 1
+
+
+def test_near_duplicate_found_after_table_rebuild(index):
+    index.add(filler(400))
+    index.ingest(frame(notice("A1")))
+    index.add(filler(5))
+
+    result = index.ingest(frame(notice("A2", body=BODY.replace("조기 마감", "마감"))))
+
+    assert result.duplicate_of == {"A2": "A1"}
+
+
+def test_save_load_round_trip(tmp_path, index):
+    index.add(filler(50))
+    index.ingest(frame(notice("A1")))
+    path = str(tmp_path / "dedup.npz")
+    index.save(path)
+
+    loaded = DedupIndex.load_or_create(path, 'pblanc_id', COLUMNS)
+
+    assert len(loaded) == len(index)
+    assert loaded.ingest(frame(notice("A1"))).unchanged == 1
+    assert loaded.ingest(frame(notice("A2"))).duplicate_of == {"A2": "A1"}
+    assert loaded.ingest(frame(notice("A3", body=BODY.replace("80%", "70%")))).near_duplicates == 1
+    # 설정이 다르면 빈 인덱스
+    assert len(DedupIndex.load_or_create(path, 'policy_id', COLUMNS)) == 0
+
+
+def test_rejects_unreachable_max_distance():
+    with pytest.raises(ValueError):
+        DedupIndex('pblanc_id', COLUMNS, blocks=8, key_blocks=2, max_distance=7)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+검색 필터 마스크 인덱스(PolicyFilterIndex) 테스트
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from filter_index import PolicyFilterIndex
+from region_resolver import RegionResolver
+
+POLICIES = pd.DataFrame([
+    ("포천시 소상공인 점포 개선", "관내 점포 환경 개선", "소상공인", "포천시", "경영"),
+    ("경기도 청년 창업 지원", "포천시, 가평군 창업자 우대", "청년, 예비창업자", "경기도", "창업"),
+    ("경기도 수출 바우처", "도내 수출 중소기업 지원", "중소기업", "경기도", "수출"),
+    ("가평군 소상공인 자금", "가평군 소재 소상공인 융자", "소상공인", "가평군", "금융"),
+    ("전국 스마트공장 구축", "포천시 포함 전국 제조기업 대상", "중소기업", "전국", "기술"),
+    ("중소벤처기업부 기술 개발", "기술 개발 자금 지원", "중소기업, 소상공인", "중소벤처기업부", "기술"),
+], columns=['title(공고명)', 'body_text(공고내용)', '지원대상', '소관기관', '지원분야(대)'])
+
+
+@pytest.fixture
+def filter_index():
+    return PolicyFilterIndex(POLICIES, RegionResolver.load())
+
+
+def rows(mask):
+    return np.flatnonzero(mask).tolist()
+
+
+def test_region_mask_includes_own_and_mentioning_parent_policies(filter_index):
+    # 포천시 소관 + 정책명/본문에 포천시를 언급한 경기도/전국 정책 (다른 시군 소관은 제외)
+    assert rows(filter_index.region_mask('포천시')) == [0, 1, 4]
+    assert rows(filter_index.region_mask('가평군')) == [1, 3]
+
+
+def test_unknown_region_matches_organization_name(filter_index):
+    assert rows(filter_index.region_mask('중소벤처기업부')) == [5]
+    assert rows(filter_index.region_mask('없는기관')) == []
+
+
+def test_target_and_field_masks_match_substrings(filter_index):
+    assert rows(filter_index.target_mask('소상공인')) == [0, 3, 5]
+    assert rows(filter_index.target_mask('창업')) == [1]
+    assert rows(filter_index.field_mask('기술')) == [4, 5]
+    assert rows(filter_index.field_mask('없는분야')) == []
+
+
+def test_masks_are_memoised(filter_index):
+    assert filter_index.target_mask('중소기업') is filter_index.target_mask('중소기업')
+    assert filter_index.region_mask('포천시') is filter_index.region_mask('포천시')
+
+
+def test_mask_combines_filters_with_and(filter_index):
+    assert filter_index.mask() is None
+    assert rows(filter_index.mask(region_filter='포천시', target_filter='중소기업')) == [4]
+    assert rows(filter_index.mask(target_filter='소상공인', field_filter='기술')) == [5]
+
+    # 결합 결과를 고쳐도 캐시된 마스크는 바뀌지 않음
+    combined = filter_index.mask(region_filter='포천시', target_filter='소상공인')
+    combined[:] = False
+    assert rows(filter_index.region_mask('포천시')) == [0, 1, 4]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+인덱스 번들 저장/로드 테스트 (스텁 인코더 + 합성 정책, 모델/네트워크 없이 실행)
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import index_bundle
+
+QUERIES = ["창업 지원", "포천시 소상공인 자금", "수출 진출 박람회"]
+
+
+def ranked(chatbot, query):
+    return [(result['title'], round(result['similarity_score'], 5)) for result in chatbot.search_policies(query, top_k=5)]
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf_flat", "ivf_pq"])
+def test_round_trip_keeps_search_results(tmp_path, make_chatbot, csv_path, index_type):
+    source = make_chatbot(csv_path, index_type=index_type, hybrid_search=True)
+    expected = {query: ranked(source, query) for query in QUERIES}
+    bundle = str(tmp_path / "bundle")
+    source.save_model(bundle)
+
+    loaded = make_chatbot(bundle_path=bundle, hybrid_search=True)
+    assert len(loaded.data) == len(source.data)
+    assert loaded.index_config["index_type"] == index_type
+    assert loaded._state.sparse_index is not None
+    assert isinstance(loaded.embeddings, np.memmap)
+    # 저장된 processed_text를 그대로 사용
+    assert loaded.data['processed_text'].tolist() == source.data['processed_text'].tolist()
+    for query in QUERIES:
+        assert ranked(loaded, query) == expected[query]
+
+
+def test_loaded_bundle_accepts_updates(tmp_path, make_chatbot, csv_path):
+    source = make_chatbot(csv_path, index_type="ivf_flat")
+    bundle = str(tmp_path / "bundle")
+    source.save_model(bundle)
+
+    loaded = make_chatbot(bundle_path=bundle)
+    removed = loaded.data['policy_id'].iloc[0]
+    title = loaded.data['title(공고명)'].iloc[0]
+    assert loaded.delete_policies([removed])['deleted'] == 1
+    assert title not in [result['title'] for result in loaded.search_policies(title, top_k=10)]
+    # 번들 파일은 메모리 매핑으로 읽었어도 그대로 유지
+    assert index_bundle.read_manifest(bundle)['row_count'] == len(source.data)
+
+
+@pytest.mark.parametrize("index_type", ["hnsw", "ivf_flat"])
+def test_passage_index_is_memory_mapped_and_accepts_updates(tmp_path, make_chatbot, csv_path, index_type):
+    source = make_chatbot(csv_path, index_type=index_type, passage_search=True)
+    bundle = str(tmp_path / "bundle")
+    source.save_model(bundle)
+
+    loaded = make_chatbot(bundle_path=bundle, passage_search=True)
+    assert ranked(loaded, QUERIES[0]) == ranked(source, QUERIES[0])
+    assert isinstance(loaded._state.passage_index.embeddings, np.memmap)
+    # 읽기 전용으로 매핑한 구간 인덱스는 고치지 않고 복사본을 갱신
+    title = loaded.data['title(공고명)'].iloc[0]
+    assert loaded.delete_policies([loaded.data['policy_id'].iloc[0]])['deleted'] == 1
+    assert title not in [result['title'] for result in loaded.search_policies(title, top_k=10)]
+
+
+def test_bundle_freshness(tmp_path, make_chatbot, csv_path):
+    bundle = str(tmp_path / "bundle")
+    chatbot = make_chatbot(csv_path)
+    chatbot.save_model(bundle)
+
+    assert index_bundle.bundle_is_fresh(bundle, csv_path, model_name=chatbot.model_name, index_type="flat")
+    assert not index_bundle.bundle_is_fresh(bundle, csv_path, index_type="hnsw")
+    assert not index_bundle.bundle_is_fresh(bundle, csv_path, model_name="other/model")
+    assert not index_bundle.bundle_is_fresh(str(tmp_path / "missing"), csv_path)
+
+    chatbot.data.iloc[:-1].to_csv(csv_path, index=False)
+    assert not index_bundle.bundle_is_fresh(bundle, csv_path)
+
+
+def test_old_manifest_gets_default_index_options(tmp_path, make_chatbot, csv_path):
+    bundle = str(tmp_path / "bundle")
+    make_chatbot(csv_path, index_type="ivf_pq").save_model(bundle)
+    manifest_path = os.path.join(bundle, index_bundle.MANIFEST_FILE)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    del manifest["index_config"]["pq_refine"]
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    loaded = make_chatbot(bundle_path=bundle)
+    assert loaded.search_policies("창업 지원", top_k=3)
+    assert loaded.index_config["index_type"] == "ivf_pq"
+    assert loaded.index_config["pq_refine"] == 4
+
+
+def test_unsupported_format_version(tmp_path, make_chatbot, csv_path):
+    bundle = str(tmp_path / "bundle")
+    make_chatbot(csv_path).save_model(bundle)
+    manifest_path = os.path.join(bundle, index_bundle.MANIFEST_FILE)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["format_version"] = -1
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError):
+        index_bundle.read_bundle(bundle)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+지연 import 테스트 - `import policy_chatbot`이나 챗봇 생성만으로는 faiss/numpy/pandas/모델 모듈을 불러오지 않는지
+(다른 테스트가 이미 불러온 모듈의 영향을 받지 않도록 새 인터프리터에서 확인)
+"""
+
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(HERE)
+
+from lazy_import import is_loaded, lazy_import
+
+HEAVY_MODULES = ("faiss", "numpy", "pandas", "torch", "sentence_transformers")
+
+
+def loaded_after(code):
+    script = f"import sys\n{code}\nprint(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], cwd=HERE, capture_output=True, text=True, check=True)
+    return output.stdout.split()
+
+
+def test_importing_policy_chatbot_does_not_import_heavy_modules():
+    assert loaded_after("import policy_chatbot") == []
+
+
+def test_constructing_chatbot_does_not_import_heavy_modules():
+    code = ("from policy_chatbot import PolicyChatbot\n"
+            "PolicyChatbot(csv_path='없는파일.csv', index_type='hnsw', passage_search=True, hybrid_search=True)")
+
+    assert loaded_after(code) == []
+
+
+def test_lazy_module_loads_on_first_attribute(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    module = lazy_import("colorsys")
+    assert not is_loaded(module)
+
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert is_loaded(module)
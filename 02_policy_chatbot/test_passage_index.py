@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+구간(passage) 임베딩 인덱스 테스트 - 구간 나누기, 구간 최댓값 점수, 증분 갱신, 챗봇 구간 검색
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import ann_index
+from benchmark import synthetic_policies
+from passage_index import PassageIndex, passage_config, split_passages
+
+CONFIG = passage_config(passage_chars=40, overlap=10, max_passages=4)
+
+
+def long_text(words):
+    return " ".join(f"단어{i}" for i in range(words))
+
+
+def random_passages(policy_count, seed=0, dimension=16):
+    rng = np.random.default_rng(seed)
+    owners = np.repeat(np.arange(policy_count, dtype="int32"), rng.integers(1, 4, policy_count))
+    embeddings = rng.standard_normal((len(owners), dimension)).astype("float32")
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings, owners
+
+
+def test_short_and_empty_texts_are_one_passage():
+    passages, owners = split_passages(["짧은 공고", ""], config=CONFIG)
+
+    assert passages == ["짧은 공고", ""]
+    assert owners.tolist() == [0, 1]
+
+
+def test_long_text_is_split_into_overlapping_windows_with_title():
+    text = long_text(30)
+
+    passages, owners = split_passages([text, "짧은 공고"], ["공고명"], config=CONFIG)
+
+    assert owners.tolist() == [0, 0, 0, 0, 1]
+    assert passages[0] == text[:len(passages[0])]
+    for previous, passage in zip(passages, passages[1:4]):
+        assert passage.startswith("공고명 ") and len(passage) <= CONFIG["passage_chars"]
+        # 이웃 구간과 겹침 (앞 구간의 마지막 단어가 다음 구간에 다시 나옴)
+        assert previous.split()[-1] in passage.split()
+    # max_passages를 넘는 뒷부분은 버림
+    assert "단어29" not in " ".join(passages)
+
+
+def test_rejects_invalid_options():
+    with pytest.raises(ValueError):
+        passage_config(passage_chars=100, overlap=50)
+    with pytest.raises(ValueError):
+        passage_config(window=10)
+
+
+def test_policy_score_is_best_passage():
+    embeddings, owners = random_passages(20)
+    index = PassageIndex.build(embeddings, owners, 20, CONFIG)
+    query = embeddings[5]
+
+    expected = np.array([(embeddings[owners == row] @ query).max() for row in range(20)], dtype="float32")
+
+    np.testing.assert_allclose(index.all_scores(query), expected, rtol=1e-5)
+    np.testing.assert_allclose(index.scores(query, np.array([7, 2, 19])), expected[[7, 2, 19]], rtol=1e-5)
+    scores, rows = index.search(query[None, :], 5)
+    assert rows[0].tolist() == np.argsort(-expected, kind="stable")[:5].tolist()
+    np.testing.assert_allclose(scores[0], np.sort(expected)[::-1][:5], rtol=1e-5)
+
+
+def test_hnsw_search_matches_flat():
+    embeddings, owners = random_passages(200, seed=1)
+    flat = PassageIndex.build(embeddings, owners, 200, CONFIG)
+    hnsw = PassageIndex.build(embeddings, owners, 200, CONFIG, ann_index.index_config("hnsw"))
+    queries = embeddings[:10]
+
+    _, expected = flat.search(queries, 5)
+    _, rows = hnsw.search(queries, 5, ef_search=256)
+
+    assert hnsw.index is not None and flat.index is None
+    assert rows.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf_flat"])
+def test_updated_matches_fresh_build(index_type):
+    embeddings, owners = random_passages(100, seed=2)
+    config = ann_index.index_config(index_type, nlist=4, nprobe=4)
+    index = PassageIndex.build(embeddings, owners, 100, CONFIG, config)
+    keep = np.ones(100, dtype=bool)
+    keep[[3, 50, 99]] = False
+    new_embeddings, new_owners = random_passages(5, seed=3)
+
+    updated = index.updated(keep, new_embeddings, new_owners, 5)
+
+    alive = keep[owners]
+    fresh = PassageIndex.build(np.vstack([embeddings[alive], new_embeddings]),
+                               np.concatenate([np.cumsum(keep)[owners[alive]] - 1, 97 + new_owners]), 102, CONFIG,
+                               config)
+    assert updated.policy_count == 102 and len(updated) == len(fresh)
+    queries = np.vstack([embeddings[:5], new_embeddings[:2]])
+    np.testing.assert_array_equal(updated.search(queries, 5)[1], fresh.search(queries, 5)[1])
+
+
+def test_save_load_round_trip(tmp_path):
+    embeddings, owners = random_passages(30, seed=4)
+    index = PassageIndex.build(embeddings, owners, 30, CONFIG, ann_index.index_config("hnsw"))
+    index.save(str(tmp_path))
+
+    loaded = PassageIndex.load(str(tmp_path), ann_index.index_config("hnsw"))
+
+    assert loaded.config == CONFIG and loaded.policy_count == 30
+    assert isinstance(loaded.embeddings, np.memmap)
+    np.testing.assert_array_equal(loaded.search(embeddings[:3], 5)[1], index.search(embeddings[:3], 5)[1])
+
+
+def test_chatbot_finds_term_at_end_of_long_body(make_chatbot, tmp_path):
+    data = synthetic_policies(100, seed=5)
+    data.loc[42, 'body_text(공고내용)'] = " ".join(["일반 안내 문구"] * 100) + " 해양드론 실증 특구 지원 해양드론 실증 특구"
+    path = str(tmp_path / "policies.csv")
+    data.to_csv(path, index=False)
+
+    chatbot = make_chatbot(path, passage_search=True, passage_options={"passage_chars": 120, "overlap": 20})
+    results = chatbot.search_policies("해양드론 실증 특구", top_k=1)
+
+    assert results[0]['title'] == data.loc[42, 'title(공고명)']
+    assert len(chatbot._state.passage_index) > len(data)
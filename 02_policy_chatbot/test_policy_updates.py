@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+정책 증분 추가/수정/삭제(upsert_policies/delete_policies) 테스트 (스텁 인코더 + 합성 정책)
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from policy_chatbot import POLICY_TEXT_COLUMNS, policy_keys
+
+
+def policy(title, body, org="경기도", **columns):
+    row = {column: "" for column in POLICY_TEXT_COLUMNS}
+    row.update({'title(공고명)': title, 'body_text(공고내용)': body, '소관기관': org}, **columns)
+    return row
+
+
+def titles(chatbot, query, top_k=5):
+    return [result['title'] for result in chatbot.search_policies(query, top_k=top_k)]
+
+
+def test_upsert_inserts_updates_and_skips_unchanged(make_chatbot, csv_path):
+    chatbot = make_chatbot(csv_path, hybrid_search=True)
+    total = len(chatbot.data)
+    new = pd.DataFrame([policy("해양 드론 실증 지원", "해양 드론 실증 테스트베드 제공")])
+
+    assert chatbot.upsert_policies(new) == {'inserted': 1, 'updated': 0, 'unchanged': 0, 'total': total + 1}
+    assert titles(chatbot, "해양 드론 실증", top_k=1) == ["해양 드론 실증 지원"]
+    assert chatbot.upsert_policies(new)['unchanged'] == 1
+
+    edited = pd.DataFrame([policy("해양 드론 실증 지원", "수중 로봇 시험 인증 비용 지원")])
+    assert chatbot.upsert_policies(edited)['updated'] == 1
+    assert len(chatbot.data) == total + 1
+    row = chatbot.data[chatbot.data['title(공고명)'] == "해양 드론 실증 지원"]
+    assert row['body_text(공고내용)'].tolist() == ["수중 로봇 시험 인증 비용 지원"]
+    # BM25 역색인도 같은 행을 가리킴
+    assert "해양 드론 실증 지원" in titles(chatbot, "수중 로봇 시험 인증", top_k=3)
+
+
+def test_delete_removes_policy_from_results(make_chatbot, csv_path):
+    chatbot = make_chatbot(csv_path)
+    target = chatbot.data.iloc[5]
+    total = len(chatbot.data)
+
+    stats = chatbot.delete_policies([target['policy_id'], "없는 정책"])
+
+    assert stats == {'deleted': 1, 'not_found': 1, 'total': total - 1}
+    assert target['title(공고명)'] not in titles(chatbot, target['title(공고명)'], top_k=10)
+    assert chatbot.delete_policies([target['policy_id']])['not_found'] == 1
+
+
+def test_policy_keys_fall_back_per_row_for_blank_ids():
+    data = pd.DataFrame([
+        {'policy_id': "P1", 'title(공고명)': "가", '소관기관': "경기도"},
+        {'policy_id': "", 'title(공고명)': "나", '소관기관': "경기도"},
+        {'policy_id': None, 'title(공고명)': "나", '소관기관': "경기도"},
+        {'policy_id': "  ", 'title(공고명)': "다", '소관기관': "포천시"},
+    ])
+
+    keys = policy_keys(data).tolist()
+
+    assert keys[0] == "P1"
+    assert len(set(keys)) == 4
+    assert keys[1].startswith("나|경기도") and keys[2].startswith("나|경기도")
+
+
+def test_upsert_mixed_blank_ids(make_chatbot, csv_path):
+    chatbot = make_chatbot(csv_path)
+    total = len(chatbot.data)
+    rows = pd.DataFrame([
+        policy("빈 ID 정책", "빈 문자열 ID", policy_id=""),
+        policy("없는 ID 정책", "결측 ID", policy_id=None),
+        policy("ID 있는 정책", "명시 ID", policy_id="X1"),
+    ])
+
+    assert chatbot.upsert_policies(rows)['inserted'] == 3
+    assert chatbot.upsert_policies(rows)['unchanged'] == 3
+    assert len(chatbot.data) == total + 3
+    assert "X1" in chatbot.data['policy_id'].tolist()
+    assert titles(chatbot, "빈 ID 정책", top_k=1) == ["빈 ID 정책"]
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf_flat", "ivf_pq"])
+def test_index_ids_stay_consistent_after_updates(make_chatbot, csv_path, index_type):
+    chatbot = make_chatbot(csv_path, index_type=index_type)
+    before = chatbot.evaluate_index(k=10, sample_size=50)['recall']
+
+    edited = chatbot.data.iloc[:20].drop(columns=['processed_text']).copy()
+    edited['body_text(공고내용)'] = edited['body_text(공고내용)'] + " 추가 공지"
+    chatbot.upsert_policies(edited)
+    chatbot.delete_policies(chatbot.data['policy_id'].iloc[50:70].tolist())
+    after = chatbot.evaluate_index(k=10, sample_size=50)['recall']
+
+    # 삭제 후에도 인덱스 ID가 같은 정책을 가리켜야 recall이 유지됨
+    assert after >= before - 0.1
+    state = chatbot._state
+    assert state.index.ntotal == len(state.data)
+    for _, row in chatbot.data.sample(10, random_state=0).iterrows():
+        assert row['title(공고명)'] in titles(chatbot, row['processed_text'], top_k=3)
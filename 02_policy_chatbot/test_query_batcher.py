@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+요청 병합기(QueryBatcher) 배치 구성/결과 순서 테스트
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from query_batcher import QueryBatcher
+
+
+class RecordingBatch:
+    """배치별 요청을 기록하고 각 요청의 query를 뒤집어 돌려주는 batch_fn"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, params_list):
+        self.batches.append([params["query"] for params in params_list])
+        return [params["query"][::-1] for params in params_list]
+
+
+async def submit_all(batcher, queries, jitter=0.0):
+    rng = random.Random(0)
+
+    async def submit(query):
+        if jitter:
+            await asyncio.sleep(rng.random() * jitter)
+        return await batcher.submit({"query": query})
+
+    return await asyncio.gather(*(submit(query) for query in queries))
+
+
+def test_results_follow_request_order():
+    batch_fn = RecordingBatch()
+    batcher = QueryBatcher(batch_fn, max_batch_size=4, max_wait_ms=20)
+    queries = [f"쿼리{i}" for i in range(10)]
+
+    results = asyncio.run(submit_all(batcher, queries, jitter=0.01))
+
+    assert results == [query[::-1] for query in queries]
+    assert sorted(query for batch in batch_fn.batches for query in batch) == sorted(queries)
+    assert all(len(batch) <= 4 for batch in batch_fn.batches)
+    assert batcher.stats()["requests"] == 10
+
+
+def test_full_batch_flushes_without_waiting():
+    batch_fn = RecordingBatch()
+    batcher = QueryBatcher(batch_fn, max_batch_size=3, max_wait_ms=10_000)
+
+    async def scenario():
+        return await asyncio.wait_for(submit_all(batcher, ["a", "b", "c"]), 1.0)
+
+    assert asyncio.run(scenario()) == ["a", "b", "c"]
+    assert batch_fn.batches == [["a", "b", "c"]]
+
+
+def test_wait_window_merges_concurrent_requests():
+    batch_fn = RecordingBatch()
+    batcher = QueryBatcher(batch_fn, max_batch_size=32, max_wait_ms=50)
+
+    asyncio.run(submit_all(batcher, ["a", "b", "c", "d", "e"]))
+
+    assert batch_fn.batches == [["a", "b", "c", "d", "e"]]
+    assert batcher.stats()["avg_batch_size"] == 5
+
+
+def test_batch_error_fails_every_request_in_batch():
+    def fail(params_list):
+        raise RuntimeError("배치 실패")
+
+    batcher = QueryBatcher(fail, max_batch_size=8, max_wait_ms=5)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit({"query": query}) for query in "abc"), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_request_is_skipped():
+    batch_fn = RecordingBatch()
+    batcher = QueryBatcher(batch_fn, max_batch_size=8, max_wait_ms=30)
+
+    async def scenario():
+        cancelled = asyncio.ensure_future(batcher.submit({"query": "끊김"}))
+        kept = asyncio.ensure_future(batcher.submit({"query": "유지"}))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await kept
+
+    assert asyncio.run(scenario()) == "지유"
+    assert batch_fn.batches == [["유지"]]
+
+
+def test_running_batches_are_referenced_until_done():
+    release = None
+
+    async def runner(func, params_list):
+        await release.wait()
+        return func(params_list)
+
+    batcher = QueryBatcher(RecordingBatch(), max_batch_size=2, max_wait_ms=10_000, runner=runner)
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        pending = asyncio.ensure_future(submit_all(batcher, ["a", "b", "c", "d"]))
+        await asyncio.sleep(0.01)
+        running = len(batcher._tasks)
+        release.set()
+        results = await asyncio.wait_for(pending, 1.0)
+        await asyncio.sleep(0)
+        return running, results
+
+    running, results = asyncio.run(scenario())
+    assert running == 2
+    assert results == ["a", "b", "c", "d"]
+    assert not batcher._tasks
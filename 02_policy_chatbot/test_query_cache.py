@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+LRU/TTL 캐시(TTLCache) 및 검색 결과 캐시 테스트
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from query_cache import TTLCache
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(maxsize=10, ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    time.sleep(0.06)
+
+    assert cache.get("a", "만료") == "만료"
+    assert len(cache) == 0
+
+
+def test_zero_maxsize_disables_cache():
+    cache = TTLCache(maxsize=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+
+    stats = cache.stats()
+
+    assert stats["size"] == 0
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert abs(stats["hit_ratio"] - 2 / 3) < 1e-9
+
+
+def test_chatbot_caches_results_until_data_changes(make_chatbot, csv_path):
+    chatbot = make_chatbot(csv_path)
+    first = chatbot.search_policies("창업 지원", top_k=5)
+
+    assert chatbot.search_policies("창업 지원", top_k=5) == first
+    assert chatbot.result_cache.stats()["hits"] == 1
+    # 반환한 결과를 고쳐도 캐시된 결과는 바뀌지 않음
+    first[0]['title'] = "변경"
+    assert chatbot.search_policies("창업 지원", top_k=5)[0]['title'] != "변경"
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+지역 코드 변환기(RegionResolver) 테스트 (개편 전 시도명, 줄임말, 언급 검색, .dbf 코드표 생성)
+"""
+
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from region_resolver import NATIONWIDE_CODE, RegionResolver, build_region_table, read_dbf
+
+GYEONGGI, POCHEON, NAMYANGJU, YANGJU = 41000, 41650, 41360, 41630
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return RegionResolver.load()
+
+
+def write_dbf(path, fields, rows, encoding="cp949"):
+    """문자(C) 필드만 있는 최소 dBASE III 파일 쓰기"""
+    record_length = 1 + sum(length for _, length in fields)
+    header_length = 32 + 32 * len(fields) + 1
+    with open(path, "wb") as f:
+        f.write(struct.pack("<B3BIHH20x", 3, 124, 1, 1, len(rows), header_length, record_length))
+        for name, length in fields:
+            f.write(struct.pack("<11sc4xBB14x", name.encode("ascii"), b"C", length, 0))
+        f.write(b"\x0D")
+        for deleted, values in rows:
+            f.write(b"*" if deleted else b" ")
+            for (_, length), value in zip(fields, values):
+                f.write(value.encode(encoding).ljust(length, b" ")[:length])
+        f.write(b"\x1A")
+
+
+def test_code_accepts_names_full_names_and_short_names(resolver):
+    assert resolver.code("포천시") == POCHEON
+    assert resolver.code("경기도 포천시") == POCHEON
+    assert resolver.code(" 경기도  포천시 ") == POCHEON
+    assert resolver.code("포천") == POCHEON
+    assert resolver.name(POCHEON) == "포천시"
+    assert resolver.code("없는 지역") is None
+    assert resolver.code(None) is None
+
+
+def test_ambiguous_short_name_is_not_registered(resolver):
+    # 광주광역시와 경기도 광주시가 겹치므로 "광주"는 어느 쪽으로도 해석하지 않음
+    assert resolver.code("광주") is None
+    assert resolver.code("광주시") is not None
+    assert resolver.code("광주광역시") is not None
+
+
+@pytest.mark.parametrize("legacy, current", [
+    ("강원도", "강원특별자치도"),
+    ("전라북도", "전북특별자치도"),
+    ("제주도", "제주특별자치도"),
+])
+def test_legacy_province_names(resolver, legacy, current):
+    assert legacy in resolver
+    assert resolver.code(legacy) == resolver.code(current)
+    assert resolver.lineage(legacy) == [current, "전국"]
+    assert resolver.mentioned(f"{legacy} 청년 창업 공고") == {resolver.code(current)}
+
+
+def test_lineage_and_ancestors(resolver):
+    assert resolver.lineage("포천시") == ["포천시", "경기도", "전국"]
+    assert resolver.ancestors(POCHEON) == (GYEONGGI, NATIONWIDE_CODE)
+    assert resolver.lineage("중소벤처기업부") == ["중소벤처기업부"]
+    assert resolver.hierarchy()["종로구"] == ["종로구", "서울특별시", "전국"]
+
+
+def test_mentioned_prefers_longest_name(resolver):
+    assert resolver.mentioned("남양주시 소상공인 지원") == {NAMYANGJU}
+    assert resolver.mentioned("양주시와 포천시 공동 사업") == {YANGJU, POCHEON}
+    assert resolver.mentioned("전라북도 및 강원특별자치도 공고") == {resolver.code("전북특별자치도"),
+                                                                   resolver.code("강원도")}
+    assert resolver.mentioned("") == set()
+
+
+def test_policy_codes(resolver):
+    # 상위 지역 소관기관은 본문에 언급된 하위 지역을 포함 (다른 시도는 제외)
+    assert resolver.policy_codes("경기도", "포천시 소상공인", "서울특별시 종로구") == [GYEONGGI, POCHEON]
+    assert resolver.policy_codes("전국", "포천시") == [NATIONWIDE_CODE, POCHEON]
+    # 하위 지역이 없는 소관기관은 자기 자신만
+    assert resolver.policy_codes("포천시", "가평군 협력 사업") == [POCHEON]
+    # 지역이 아닌 소관기관
+    assert resolver.policy_codes("중소벤처기업부", "포천시") == []
+
+
+def test_without_shapefiles_keeps_provinces_and_aliases():
+    resolver = RegionResolver.from_shapefiles([])
+
+    assert resolver.code("전라북도") == resolver.code("전북특별자치도")
+    assert resolver.code("종로구") is not None
+    assert resolver.code("포천시") is None
+
+
+def test_build_region_table_from_dbf(tmp_path):
+    path = str(tmp_path / "sgg.dbf")
+    fields = [("ADM_SECT_C", 5), ("SGG_NM", 40), ("COL_ADM_SE", 5)]
+    write_dbf(path, fields, [
+        (False, ("41650", "경기도 포천시", "41650")),
+        (False, ("41111", "경기도 수원시 장안구", "41110")),
+        (False, ("51150", "강원도 강릉시", "")),
+        (False, ("52111", "전라북도 전주시 완산구", "52110")),
+        (True, ("41999", "경기도 삭제시", "41999")),
+    ])
+
+    assert [row["SGG_NM"] for row in read_dbf(path)][:2] == ["경기도 포천시", "경기도 수원시 장안구"]
+
+    resolver = RegionResolver(build_region_table([path]))
+    assert resolver.lineage("장안구") == ["장안구", "수원시", "경기도", "전국"]
+    # 개편 전 시도명으로 적힌 시군구도 현재 시도 아래에 들어감
+    assert resolver.lineage("강릉시") == ["강릉시", "강원특별자치도", "전국"]
+    assert resolver.lineage("완산구") == ["완산구", "전주시", "전북특별자치도", "전국"]
+    assert resolver.code("삭제시") is None
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+교차 인코더 재순위기(CrossEncoderReranker) 시간 예산/캐시 테스트 (스텁 모델, 모델 다운로드 없이 실행)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from reranker import CrossEncoderReranker
+
+QUERIES = ["창업 지원", "수출 박람회", "소상공인 자금"]
+DOCUMENTS = [[f"{query} 문서 {j}" for j in range(4)] for query in QUERIES]
+
+
+class StubCrossEncoder:
+    """문서 끝 번호(없으면 0)를 점수로 주는 스텁 (쌍당 비용과 첫 호출 초기화 비용을 sleep으로 흉내)"""
+
+    def __init__(self, pair_cost=0.0, first_call_cost=0.0, scores=None):
+        self.pair_cost = pair_cost
+        self.first_call_cost = first_call_cost
+        self.scores = scores
+        self.batches = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        if not self.batches and self.first_call_cost:
+            time.sleep(self.first_call_cost)
+        self.batches.append(list(pairs))
+        time.sleep(self.pair_cost * len(pairs))
+        if self.scores is not None:
+            return np.array([self.scores(query, document) for query, document in pairs], dtype='float32')
+        numbers = [document.rsplit(" ", 1)[-1] for _, document in pairs]
+        return np.array([float(number) if number.isdigit() else 0.0 for number in numbers], dtype='float32')
+
+
+def test_scores_follow_document_order_and_are_cached():
+    model = StubCrossEncoder()
+    reranker = CrossEncoderReranker(model=model, batch_size=5, time_budget=0)
+
+    results = reranker.rerank(QUERIES, DOCUMENTS)
+
+    assert [scores.tolist() for scores in results] == [[0, 1, 2, 3]] * 3
+    assert [len(batch) for batch in model.batches] == [5, 5, 2]
+    # 같은 쌍은 캐시에서 (모델 호출 없음)
+    assert reranker.rerank(QUERIES[:1], DOCUMENTS[:1])[0].tolist() == [0, 1, 2, 3]
+    assert len(model.batches) == 3
+    stats = reranker.stats()
+    assert stats["calls"] == 2 and stats["queries"] == 4 and stats["pairs_scored"] == 12
+    assert stats["fallbacks"] == 0
+
+
+def test_doc_chars_truncates_documents():
+    model = StubCrossEncoder(scores=lambda query, document: len(document))
+    reranker = CrossEncoderReranker(model=model, doc_chars=5, time_budget=0)
+
+    assert reranker.rerank(["쿼리"], [["가" * 3, "나" * 50]])[0].tolist() == [3, 5]
+
+
+def test_time_budget_falls_back_and_keeps_partial_scores():
+    # 한 배치(쿼리 하나, 4쌍)에 약 40ms - 50ms 예산이면 첫 배치 뒤 다음 배치는 예산을 넘긴다고 추정
+    model = StubCrossEncoder(pair_cost=0.01)
+    reranker = CrossEncoderReranker(model=model, batch_size=4, time_budget=0.05)
+
+    first = reranker.rerank(QUERIES, DOCUMENTS)
+
+    assert first[0] is not None
+    assert first[1] is None and first[2] is None
+    assert reranker.stats()["fallbacks"] == 2
+
+    # 채점한 점수는 캐시에 남고, 건너뛸 때마다 추정값이 줄어 다음 호출에서 이어서 채점
+    rounds = 1
+    while any(scores is None for scores in reranker.rerank(QUERIES, DOCUMENTS)):
+        rounds += 1
+        assert rounds < 10
+    assert reranker.stats()["pairs_scored"] == 12
+
+
+def test_warmup_is_excluded_from_pair_time():
+    slow_start = StubCrossEncoder(pair_cost=0.001, first_call_cost=0.3)
+    reranker = CrossEncoderReranker(model=slow_start, batch_size=4, time_budget=0.1)
+    reranker.warmup()
+
+    assert all(scores is not None for scores in reranker.rerank(QUERIES, DOCUMENTS))
+    assert reranker.stats()["pair_seconds"] < 0.01
+
+    # 워밍업 없이 첫 배치에서 초기화 비용을 치르면 남은 배치는 예산을 넘김
+    cold = CrossEncoderReranker(model=StubCrossEncoder(pair_cost=0.001, first_call_cost=0.3),
+                                batch_size=4, time_budget=0.1)
+    results = cold.rerank(QUERIES, DOCUMENTS)
+    assert results[0] is not None and results[1] is None
+
+
+def test_rejects_invalid_options():
+    with pytest.raises(ValueError):
+        CrossEncoderReranker(model=StubCrossEncoder(), candidates=0)
+    with pytest.raises(ValueError):
+        CrossEncoderReranker(model=StubCrossEncoder(), batch_size=0)
+
+
+def titles(results):
+    return [result['title'] for result in results]
+
+
+def test_chatbot_reorders_first_stage_candidates(make_chatbot, csv_path):
+    target = {}
+    model = StubCrossEncoder(scores=lambda query, document: float(document.startswith(target['title'])))
+    chatbot = make_chatbot(csv_path, reranker=CrossEncoderReranker(model=model, candidates=10, time_budget=0))
+    first_stage = titles(chatbot.search_policies("창업 지원", top_k=10, rerank=False))
+    target['title'] = first_stage[7]
+
+    reranked = titles(chatbot.search_policies("창업 지원", top_k=3))
+
+    assert reranked[0] == first_stage[7]
+    assert reranked[1:] == [title for title in first_stage if title != first_stage[7]][:2]
+
+
+def test_chatbot_uses_first_stage_order_when_over_budget(make_chatbot, csv_path):
+    reranker = CrossEncoderReranker(model=StubCrossEncoder(pair_cost=0.005), candidates=20, batch_size=5,
+                                    time_budget=0.001)
+    chatbot = make_chatbot(csv_path, reranker=reranker)
+    first_stage = titles(chatbot.search_policies("수출 박람회", top_k=5, rerank=False))
+
+    assert titles(chatbot.search_policies("수출 박람회", top_k=5)) == first_stage
+    # 재순위하지 못한 결과는 결과 캐시에 넣지 않으므로 다음 검색에서 다시 재순위를 시도
+    chatbot.search_policies("수출 박람회", top_k=5)
+    assert reranker.stats()["calls"] == 2
+    assert reranker.stats()["fallbacks"] == 2
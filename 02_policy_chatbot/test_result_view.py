@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+검색 결과 필드 선택/스니펫/강조 위치(result_view) 테스트
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from result_view import ELLIPSIS, RESULT_FIELDS, find_highlights, make_snippet, project_result, project_results, query_pattern
+
+RESULT = {
+    'title': "포천시 스마트공장 구축 지원사업",
+    'body': ("관내 제조기업의 생산성 향상을 위한 사업입니다. " * 8
+             + "스마트공장 구축 비용의 50%를 지원하며 기술 지원도 함께 제공합니다. "
+             + "신청 서류는 누리집에서 내려받을 수 있습니다. " * 8),
+    'target': "중소기업",
+    'organization': "포천시",
+    'field_major': "기술",
+    'field_minor': "스마트공장",
+    'executing_org': "포천시 기업지원과",
+    'contact': "031-000-0000",
+    'period': "2025-07-01 ~ 2025-08-31",
+    'application_method': "온라인 접수",
+    'similarity_score': 0.82,
+}
+
+
+def highlighted(text, spans):
+    return [text[start:end] for start, end in spans]
+
+
+def test_query_pattern_matches_bigrams_and_skips_single_characters():
+    pattern = query_pattern("기술지원 AI 및")
+
+    assert highlighted("기술 지원과 ai 교육", find_highlights("기술 지원과 ai 교육", pattern)) == ["기술", "지원", "ai"]
+    assert query_pattern("및 그") is None
+    assert find_highlights("아무 텍스트", None) == []
+
+
+def test_find_highlights_merges_adjacent_spans():
+    pattern = query_pattern("기술 지원")
+
+    assert find_highlights("기술지원 사업", pattern) == [[0, 4]]
+
+
+def test_short_text_is_returned_whole():
+    pattern = query_pattern("지원")
+
+    snippet, spans = make_snippet("기술 지원", pattern, 50)
+
+    assert snippet == "기술 지원"
+    assert highlighted(snippet, spans) == ["지원"]
+
+
+def test_snippet_offsets_include_ellipsis():
+    pattern = query_pattern("스마트공장 구축")
+    body = RESULT['body']
+
+    snippet, spans = make_snippet(body, pattern, 60)
+
+    assert snippet.startswith(ELLIPSIS) and snippet.endswith(ELLIPSIS)
+    assert len(snippet) <= 60 + 2
+    assert spans and all(0 < start < end <= len(snippet) - 1 for start, end in spans)
+    assert highlighted(snippet, spans)[:2] == ["스마트공장", "구축"]
+    for text in highlighted(snippet, spans):
+        assert pattern.search(text)
+        assert text in body
+
+
+def test_snippet_without_matches_keeps_leading_text():
+    snippet, spans = make_snippet(RESULT['body'], query_pattern("수출"), 30)
+
+    assert spans == []
+    assert not snippet.startswith(ELLIPSIS) and snippet.endswith(ELLIPSIS)
+    assert RESULT['body'].startswith(snippet[:-1])
+
+
+def test_project_result_keeps_requested_fields_and_score():
+    projected = project_result(RESULT, fields=['title', 'contact'])
+
+    assert list(projected) == ['title', 'contact', 'similarity_score']
+    assert 'highlights' not in projected
+    assert list(project_result(RESULT)) == list(RESULT_FIELDS)
+
+
+def test_project_result_snippets_and_highlights():
+    pattern = query_pattern("스마트공장")
+
+    projected = project_result(RESULT, fields=['title', 'body', 'organization'], snippet_length=40, pattern=pattern)
+
+    assert len(projected['body']) < len(RESULT['body'])
+    assert projected['organization'] == RESULT['organization']
+    assert set(projected['highlights']) == {'title', 'body'}
+    assert highlighted(projected['title'], projected['highlights']['title']) == ["스마트공장"]
+    assert highlighted(projected['body'], projected['highlights']['body']) == ["스마트공장"]
+    # 원본 결과는 바꾸지 않음
+    assert RESULT['body'].count("스마트공장") == 1 and 'highlights' not in RESULT
+
+
+def test_project_results_without_options_returns_same_list():
+    results = [RESULT]
+
+    assert project_results(results, "스마트공장") is results
+    assert project_results(results, "스마트공장", snippet_length=40)[0]['highlights']['title'] == [[4, 9]]
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+검색 스레드 풀(SearchExecutor) 거절/타임아웃 테스트
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from search_executor import ExecutorSaturatedError, ExecutorTimeoutError, SearchExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = SearchExecutor(max_workers=1, max_queue=1, timeout=0)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_run_returns_result(executor):
+    assert asyncio.run(executor.run(lambda a, b=0: a + b, 1, b=2)) == 3
+    assert executor.stats()["in_flight"] == 0
+
+
+def test_rejects_when_workers_and_queue_are_full(executor):
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        queued = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(release.wait, 5)
+        release.set()
+        return await asyncio.gather(running, queued)
+
+    assert asyncio.run(scenario()) == [True, True]
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_timeout_keeps_slot_until_work_finishes(executor):
+    executor.timeout = 0.05
+    release = threading.Event()
+    finished = threading.Event()
+
+    def slow():
+        release.wait(5)
+        finished.set()
+
+    async def scenario():
+        with pytest.raises(ExecutorTimeoutError):
+            await executor.run(slow)
+        # 타임아웃된 작업은 계속 돌고 있으므로 슬롯을 반환하지 않음
+        assert executor.stats()["in_flight"] == 1
+        release.set()
+        await asyncio.get_running_loop().run_in_executor(None, finished.wait, 5)
+
+    asyncio.run(scenario())
+    executor.shutdown(wait=True)
+    stats = executor.stats()
+    assert stats["timed_out"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_task_error_is_raised_and_slot_released(executor):
+    def fail():
+        raise RuntimeError("검색 실패")
+
+    with pytest.raises(RuntimeError, match="검색 실패"):
+        asyncio.run(executor.run(fail))
+    assert executor.stats()["in_flight"] == 0
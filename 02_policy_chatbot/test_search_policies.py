@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+정책 검색(search_policies) 순위/필터/임계값 테스트 (스텁 인코더, 모델 다운로드 없이 실행)
+
+기준 결과는 top_k를 전체 정책 수로, 임계값을 최소 유사도 아래로 준 전수 검색입니다.
+필터를 준 검색은 전수 검색 결과 중 필터를 통과한 정책을 같은 순서로 돌려줘야 합니다.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = ["창업 지원", "수출 박람회 해외 진출", "소상공인 경영 개선 자금"]
+
+
+@pytest.fixture
+def chatbot(make_chatbot, csv_path):
+    return make_chatbot(csv_path)
+
+
+def titles(results):
+    return [result['title'] for result in results]
+
+
+def exhaustive(chatbot, query):
+    return chatbot.search_policies(query, top_k=len(chatbot.data), similarity_threshold=-1.0)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_top_k_matches_exhaustive_ranking(chatbot, query):
+    full = exhaustive(chatbot, query)
+    scores = [result['similarity_score'] for result in full]
+
+    assert len(full) == len(chatbot.data)
+    assert scores == sorted(scores, reverse=True)
+    assert titles(chatbot.search_policies(query, top_k=5)) == titles(full[:5])
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_filters_fetch_past_initial_candidates(chatbot, query):
+    full = exhaustive(chatbot, query)
+    expected = [result for result in full if '예비창업자' in result['target'] and '수출' in result['field_major']][:5]
+    # 필터를 통과하는 정책이 초기 후보 범위 밖에도 있어야 후보 확장 경로를 검사
+    assert expected and full.index(expected[-1]) >= 5 * chatbot.initial_fetch_factor
+
+    results = chatbot.search_policies(query, top_k=5, target_filter='예비창업자', field_filter='수출',
+                                      target_weight=0.2, field_weight=0.1, similarity_threshold=-1.0)
+
+    assert titles(results) == titles(expected)
+    for result, reference in zip(results, expected):
+        assert result['similarity_score'] == pytest.approx(reference['similarity_score'] + 0.3, abs=1e-5)
+
+
+def test_region_filter_keeps_ranking_order(chatbot):
+    full = titles(exhaustive(chatbot, "창업 지원"))
+
+    results = chatbot.search_policies("창업 지원", top_k=10, region_filter='포천시')
+
+    assert len(results) == 10
+    positions = [full.index(title) for title in titles(results)]
+    assert positions == sorted(positions)
+    # 소관기관이 포천시인 정책은 마지막 결과보다 순위가 높으면 모두 포함
+    own = [result['title'] for result in exhaustive(chatbot, "창업 지원")[:positions[-1]]
+           if result['organization'] == '포천시']
+    assert set(own) <= set(titles(results))
+
+
+def test_similarity_threshold_stops_at_lower_scores(chatbot):
+    full = exhaustive(chatbot, "창업 지원")
+    threshold = full[7]['similarity_score']
+
+    results = chatbot.search_policies("창업 지원", top_k=50, similarity_threshold=threshold)
+
+    assert titles(results) == titles([result for result in full if result['similarity_score'] >= threshold])
+    assert chatbot.search_policies("창업 지원", top_k=5, similarity_threshold=2.0) == []
+
+
+def test_batch_matches_single_searches(chatbot):
+    requests = [
+        "창업 지원",
+        {"query": "수출 박람회 해외 진출", "target_filter": "예비창업자", "field_filter": "수출"},
+        {"query": "소상공인 경영 개선 자금", "region_filter": "포천시", "top_k": 3},
+    ]
+
+    results = chatbot.search_policies_batch(requests, top_k=5)
+
+    expected = [
+        chatbot.search_policies("창업 지원", top_k=5),
+        chatbot.search_policies("수출 박람회 해외 진출", top_k=5, target_filter="예비창업자", field_filter="수출"),
+        chatbot.search_policies("소상공인 경영 개선 자금", top_k=3, region_filter="포천시"),
+    ]
+    assert [titles(batch) for batch in results] == [titles(single) for single in expected]
+    for batch, single in zip(results, expected):
+        assert [r['similarity_score'] for r in batch] == pytest.approx([r['similarity_score'] for r in single], abs=1e-5)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+BM25 역색인(BM25Index)과 RRF 융합(reciprocal_rank_fusion) 테스트
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sparse_index import BM25Index, KoreanTokenizer, reciprocal_rank_fusion, texts_fingerprint
+
+TEXTS = [
+    "포천시 소상공인 경영안정자금 지원",
+    "스마트물류기술사업화 지원사업 공고",
+    "청년 창업 지원금 신청 안내",
+    "소상공인 온라인 판로 지원",
+    "수출 박람회 참가 지원",
+]
+
+
+@pytest.fixture
+def tokenizer():
+    return KoreanTokenizer("regex")
+
+
+@pytest.fixture
+def index(tokenizer):
+    return BM25Index.build(TEXTS, tokenizer)
+
+
+def test_regex_tokenizer_adds_bigrams(tokenizer):
+    tokens = tokenizer("소상공인을 지원")
+    assert "소상공인을" in tokens
+    assert "소상" in tokens and "인을" in tokens
+    assert "지원" in tokens
+
+
+def test_search_ranks_by_score(index):
+    rows, scores = index.search("소상공인 지원", top_k=3)
+
+    assert set(rows[:2].tolist()) == {0, 3}
+    assert np.all(np.diff(scores) <= 0)
+    assert len(rows) == 3
+
+
+def test_partial_match_on_compound_word(index):
+    rows, _ = index.search("물류기술", top_k=1)
+    assert rows.tolist() == [1]
+
+
+def test_mask_excludes_rows(index):
+    mask = np.ones(len(TEXTS), dtype=bool)
+    mask[0] = False
+
+    rows, _ = index.search("소상공인", top_k=5, mask=mask)
+
+    assert rows.tolist() == [3]
+
+
+def test_unknown_terms_return_empty(index):
+    rows, scores = index.search("존재하지않는단어", top_k=5)
+    assert len(rows) == 0 and len(scores) == 0
+
+
+def test_updated_matches_fresh_build(index, tokenizer):
+    keep = np.array([True, False, True, True, False])
+    new_texts = ["해양 드론 실증 지원"]
+
+    updated = index.updated(keep, new_texts)
+    fresh = BM25Index.build([text for text, kept in zip(TEXTS, keep) if kept] + new_texts, tokenizer)
+
+    assert len(updated) == 4
+    for query in ["소상공인 지원", "해양 드론", "창업"]:
+        rows, scores = updated.search(query, top_k=4)
+        expected_rows, expected_scores = fresh.search(query, top_k=4)
+        assert rows.tolist() == expected_rows.tolist()
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-5)
+
+
+def test_save_load_round_trip(tmp_path, index, tokenizer):
+    path = str(tmp_path / "bm25.npz")
+    fingerprint = texts_fingerprint(TEXTS, tokenizer.name)
+    index.save(path, fingerprint)
+
+    loaded, saved = BM25Index.load(path, tokenizer)
+
+    assert saved == fingerprint
+    rows, scores = loaded.search("소상공인 지원", top_k=5)
+    expected_rows, expected_scores = index.search("소상공인 지원", top_k=5)
+    assert rows.tolist() == expected_rows.tolist()
+    np.testing.assert_allclose(scores, expected_scores)
+
+
+def test_load_or_build_rebuilds_on_changed_texts(tmp_path, tokenizer):
+    path = str(tmp_path / "bm25.npz")
+    BM25Index.load_or_build(path, TEXTS, tokenizer)
+
+    changed = TEXTS + ["해양 드론 실증 지원"]
+    index = BM25Index.load_or_build(path, changed, tokenizer)
+
+    assert len(index) == len(changed)
+    assert BM25Index.load(path, tokenizer)[1] == texts_fingerprint(changed, tokenizer.name)
+
+
+def test_rrf_sums_reciprocal_ranks():
+    rows, scores = reciprocal_rank_fusion([np.array([1, 2, 3]), np.array([3, 1])], k=60)
+
+    assert rows.tolist() == [1, 3, 2]
+    np.testing.assert_allclose(scores, [1 / 61 + 1 / 62, 1 / 63 + 1 / 61, 1 / 62], rtol=1e-6)
+    assert rows.dtype == np.int64 and scores.dtype == np.float32
+
+
+def test_rrf_ties_follow_first_ranking():
+    # 두 목록에서 순위가 뒤바뀐 문서는 동점 - 먼저 전달한 목록의 순서를 따름
+    rows, scores = reciprocal_rank_fusion([np.array([7, 4]), np.array([4, 7])])
+
+    assert rows.tolist() == [7, 4]
+    assert scores[0] == scores[1]
+
+
+def test_rrf_empty_input():
+    rows, scores = reciprocal_rank_fusion([np.array([], dtype='int64')])
+    assert len(rows) == 0 and len(scores) == 0
+    assert len(reciprocal_rank_fusion([])[0]) == 0
+
+
+def test_hybrid_search_finds_exact_program_name(make_chatbot, csv_path):
+    chatbot = make_chatbot(csv_path, hybrid_search=True)
+    title = chatbot.data['title(공고명)'].iloc[17]
+
+    results = chatbot.search_policies(title, top_k=3)
+
+    assert chatbot._state.sparse_index is not None
+    assert title in [result['title'] for result in results]
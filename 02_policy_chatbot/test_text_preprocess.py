@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+검색 텍스트 전처리(text_preprocess) 테스트 - 행 단위 정규식 구현과 같은 결과인지, 전처리 캐시 재사용/무효화
+"""
+
+import os
+import re
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import synthetic_policies
+from policy_chatbot import POLICY_TEXT_COLUMNS
+from text_preprocess import ProcessedTextCache, clean_texts, preprocess_texts
+
+SAMPLES = [
+    "[공고] 2025년 ‘스마트공장’ 지원사업 (1차)!!",
+    "  문의: 031-123-4567 / e-mail: biz@example.com  ",
+    "소상공인·중소기업\t대상\n\n온라인 접수 ※ 예산 소진 시 마감",
+    "under_score 와 ①②③ 및 ＡＢＣ 전각",
+    "",
+    "★★★",
+]
+
+
+def reference(text):
+    """기존 행 단위 전처리 (re 모듈)"""
+    text = re.sub(r'[^\w\s가-힣]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def test_clean_texts_matches_row_wise_regex():
+    cleaned = clean_texts(pa.array(SAMPLES, type=pa.large_string())).to_pylist()
+
+    assert cleaned == [reference(text) for text in SAMPLES]
+
+
+def test_parallel_chunks_match_single_pass():
+    texts = pa.array(SAMPLES * 50, type=pa.large_string())
+
+    assert clean_texts(texts, workers=4).to_pylist() == clean_texts(texts, workers=1).to_pylist()
+
+
+def test_preprocess_texts_combines_columns():
+    data = synthetic_policies(30, seed=3)
+    data.loc[0, '문의처'] = "031-000-0000 (내선 12)"
+    data.index = data.index + 100
+
+    texts = preprocess_texts(data, POLICY_TEXT_COLUMNS)
+
+    assert texts.index.equals(data.index)
+    expected = data[POLICY_TEXT_COLUMNS].astype(str).agg(" ".join, axis=1).map(reference)
+    assert texts.tolist() == expected.tolist()
+    # 누락된 컬럼은 빈 문자열로 결합
+    assert preprocess_texts(data[['title(공고명)']], ['title(공고명)', '없는컬럼']).tolist() == \
+        data['title(공고명)'].map(reference).tolist()
+
+
+def test_cache_reused_until_source_changes(tmp_path, capsys):
+    data = synthetic_policies(20, seed=1)
+    cache = ProcessedTextCache(str(tmp_path))
+    source = {"path": "policies.csv", "size": 100, "mtime": 1.0}
+
+    first = cache.get_or_preprocess(source, data, POLICY_TEXT_COLUMNS)
+    capsys.readouterr()
+    second = cache.get_or_preprocess(source, data, POLICY_TEXT_COLUMNS)
+
+    assert "전처리 캐시 사용" in capsys.readouterr().out
+    assert second.tolist() == first.tolist()
+
+    data.loc[0, 'title(공고명)'] = "변경된 공고명"
+    changed = cache.get_or_preprocess(dict(source, mtime=2.0), data, POLICY_TEXT_COLUMNS)
+    assert "전처리 캐시 사용" not in capsys.readouterr().out
+    assert changed[0].startswith("변경된 공고명")
+
+
+@pytest.mark.parametrize("rows", [19, 21])
+def test_cache_ignored_when_row_count_differs(tmp_path, rows):
+    cache = ProcessedTextCache(str(tmp_path))
+    source = {"path": "policies.csv"}
+    cache.get_or_preprocess(source, synthetic_policies(20), POLICY_TEXT_COLUMNS)
+
+    assert cache.load(cache.cache_key(source, POLICY_TEXT_COLUMNS), rows) is None
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# 검색 텍스트 정리 규칙 버전 (규칙이 바뀌면 올려서 저장된 전처리 캐시를 무효화)
+PREPROCESS_VERSION = 1
+
+# 글자/숫자/_ 이외 문자(특수문자, 공백)의 연속을 공백 하나로 치환
+# (`[^\w\s가-힣]` -> 공백, `\s+` -> 공백 두 단계와 같은 결과, RE2의 \w는 ASCII만 포함하므로 유니코드 속성으로 표현)
+NON_WORD_PATTERN = r'[^\p{L}\p{N}_]+'
+
+# 행 수가 이 값 이상이면 청크로 나눠 스레드 풀에서 정리 (pyarrow 연산은 GIL을 놓으므로 프로세스 풀 없이 병렬 실행)
+PARALLEL_MIN_ROWS = 50000
+MAX_WORKERS = 8
+
+
+def combine_columns(data: pd.DataFrame, columns: Sequence[str]) -> pa.Array:
+    """여러 텍스트 컬럼을 행별로 공백으로 이어 붙인 arrow 문자열 배열 (누락된 컬럼은 빈 문자열)"""
+    arrays = [
+        pa.array(data[column].astype(str) if column in data.columns else [""] * len(data), type=pa.large_string())
+        for column in columns
+    ]
+    if len(arrays) == 1:
+        return arrays[0]
+    return pc.binary_join_element_wise(*arrays, pa.scalar(" ", pa.large_string()))
+
+
+def _clean_chunk(texts: pa.Array) -> pa.Array:
+    return pc.utf8_trim(pc.replace_substring_regex(texts, NON_WORD_PATTERN, " "), " ")
+
+
+def clean_texts(texts: pa.Array, workers: Optional[int] = None) -> pa.Array:
+    """
+    특수문자 제거 및 공백 정리 (열 전체에 RE2 정규식 한 번 적용)
+
+    Args:
+        texts: arrow 문자열 배열
+        workers: 병렬 청크 수 (None이면 PARALLEL_MIN_ROWS 이상일 때 CPU 수, 최대 MAX_WORKERS)
+    """
+    if workers is None:
+        workers = min(os.cpu_count() or 1, MAX_WORKERS) if len(texts) >= PARALLEL_MIN_ROWS else 1
+    if workers <= 1 or len(texts) < workers:
+        return _clean_chunk(texts)
+    step = -(-len(texts) // workers)
+    chunks = [texts.slice(start, step) for start in range(0, len(texts), step)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        cleaned = list(executor.map(_clean_chunk, chunks))
+    return pa.concat_arrays(cleaned)
+
+
+def preprocess_texts(data: pd.DataFrame, columns: Sequence[str], workers: Optional[int] = None) -> pd.Series:
+    """
+    검색용 텍스트 생성 (주요 필드 결합 후 특수문자 제거/공백 정리)
+
+    행마다 Python 정규식을 돌리지 않고 컬럼 단위로 결합/치환하므로 20만 행도 수 초 안에 처리합니다.
+
+    Returns:
+        data와 같은 인덱스의 문자열 Series
+    """
+    cleaned = clean_texts(combine_columns(data, columns), workers)
+    # to_pandas()는 RangeIndex Series이므로 인덱스를 맞춰 줌 (index=로 넘기면 재정렬되어 NaN이 됨)
+    texts = cleaned.to_pandas()
+    texts.index = data.index
+    return texts.rename("processed_text")
+
+
+class ProcessedTextCache:
+    """CSV 파일 정보(경로/크기/수정 시각) + 전처리 규칙을 키로 하는 전처리 텍스트 디스크 캐시
+
+    `<CSV 이름>.processed.parquet` 파일에 processed_text 컬럼을 저장하고, 키는 parquet 스키마 메타데이터에
+    기록합니다. CSV나 전처리 규칙(PREPROCESS_VERSION, 결합 컬럼)이 바뀌면 다시 만듭니다.
+    """
+
+    def __init__(self, cache_dir: str, prefix: str = "policies"):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, f"{prefix}.processed.parquet")
+
+    @classmethod
+    def for_csv(cls, csv_path: str, cache_dir: Optional[str] = None) -> "ProcessedTextCache":
+        """CSV 파일 옆(또는 cache_dir)에 위치하는 캐시 생성"""
+        prefix = os.path.splitext(os.path.basename(csv_path))[0]
+        return cls(cache_dir or os.path.dirname(os.path.abspath(csv_path)), prefix)
+
+    @staticmethod
+    def cache_key(source: Dict, columns: Sequence[str]) -> str:
+        return json.dumps({"source": source, "columns": list(columns), "version": PREPROCESS_VERSION},
+                          ensure_ascii=False, sort_keys=True)
+
+    def load(self, key: str, rows: int) -> Optional[pd.Series]:
+        """같은 키/행 수로 저장된 전처리 텍스트 (없거나 다르면 None)"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            metadata = pq.read_schema(self.path).metadata or {}
+            if metadata.get(b"cache_key", b"").decode("utf-8") != key:
+                return None
+            texts = pq.read_table(self.path).column("processed_text")
+        except (OSError, KeyError, ValueError, pa.ArrowException) as e:
+            print(f"전처리 캐시 로드 실패, 다시 생성합니다: {e}")
+            return None
+        if len(texts) != rows:
+            return None
+        return pd.Series(texts.to_pandas(), name="processed_text")
+
+    def save(self, key: str, texts: pd.Series):
+        """임시 파일에 쓴 뒤 원자적으로 교체"""
+        table = pa.table({"processed_text": pa.array(texts, type=pa.large_string())})
+        table = table.replace_schema_metadata({"cache_key": key})
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_or_preprocess(self, source: Optional[Dict], data: pd.DataFrame, columns: Sequence[str],
+                          workers: Optional[int] = None) -> pd.Series:
+        """
+        저장된 전처리 텍스트가 같은 CSV/규칙으로 만든 것이면 재사용, 아니면 preprocess_texts 후 저장
+
+        Args:
+            source: index_bundle.csv_fingerprint 결과 (None이면 캐시를 쓰지 않음)
+        """
+        if source is None:
+            return preprocess_texts(data, columns, workers)
+        key = self.cache_key(source, columns)
+        cached = self.load(key, len(data))
+        if cached is not None:
+            print(f"전처리 캐시 사용: {len(cached)}개 행")
+            cached.index = data.index
+            return cached
+        texts = preprocess_texts(data, columns, workers)
+        try:
+            self.save(key, texts)
+        except OSError as e:
+            print(f"전처리 캐시 저장 실패: {e}")
+        return texts